@@ -0,0 +1,439 @@
+# ============================================================================
+# bench_nucleo.py — Micro-benchmark del núcleo (no es un test)
+# Uso:  python bench_nucleo.py [ticks]
+# Mide lo que cuesta “copiar con cambios” los estados inmutables:
+#   1) por operación: dataclasses.replace vs .con(...) vs .con_<campo>(...)
+#   2) por instancia: bytes con slots vs la misma dataclass sin slots
+#   3) por tick: copias creadas, bytes y tiempo, con los atajos generados
+#      y con los mismos métodos redirigidos a replace (como antes)
+#   4) por tick: encadenar EstadoJuego nuevos vs UNA edición congelada al final
+#   5) instantáneas: codec binario (completo y delta) vs pickle
+#   6) huella por tick: incremental (Zobrist) vs calcularla entera
+#   7) vecinos de enemigos (líder + separación): barrido directo vs cubetas
+#   8) actualizar_enemigos_ia: oleada clásica vs oleadas por tabla
+#   9) paso() con el JEFE y la cortina llena (~2000 balas) + su instantánea
+#  10) balas contra el jefe por partes: BVH vs probar parte por parte
+#  11) verificar una repetición de 10 min: tick a tick vs por tramos (fotos)
+# Todo corre sin pygame: reproduce el bucle de la cáscara de forma headless.
+# ============================================================================
+
+import math
+import pickle
+import sys
+import time
+import timeit
+import tracemalloc
+from dataclasses import dataclass, field, fields, replace, MISSING
+
+import random
+import nucleo.codec as codec
+import nucleo.enemigos as enemigos
+import nucleo.estados as estados
+import nucleo.patrones as patrones
+import nucleo.partes as partes
+from nucleo.constantes import ANCHO, ALTO, PLAYER_W, PLAYER_H
+from nucleo.zobrist import HuellaIncremental, huella_estado
+from nucleo import (
+    ModoJuego, inicializar_juego, mover_jugador, disparar_bala, actualizar_balas,
+    actualizar_meteoros, reponer_meteoros, actualizar_enemigos_ia, logica_disparo_enemigo,
+    actualizar_balas_enemigas, actualizar_jefe, resolver_colisiones,
+    avanzar_explosiones, logica_juego, ajustar_ia, predecir_jugador, editar,
+)
+
+CLASES = (
+    estados.EstadoJugador, estados.EstadoMeteoro, estados.EstadoBala, estados.EstadoBalaEnemiga,
+    estados.EstadoEnemigo, estados.EstadoBoss, estados.EstadoExplosion, estados.EstadoIA,
+    estados.EstadoJuego,
+)
+
+
+def _sin_slots(cls):
+    """Misma dataclass congelada pero SIN slots (referencia para medir bytes)."""
+    ns = {"__annotations__": {f.name: f.type for f in fields(cls)}}
+    for f in fields(cls):
+        if f.default is not MISSING:
+            ns[f.name] = f.default
+        elif f.default_factory is not MISSING:
+            ns[f.name] = field(default_factory=f.default_factory)
+    return dataclass(frozen=True)(type(cls.__name__ + "SinSlots", (), ns))
+
+
+def _bytes(cls, valores, n: int = 2000) -> float:
+    """Bytes por instancia medidos con tracemalloc (incluye el __dict__ si hay)."""
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    vivos = [cls(**valores) for _ in range(n)]
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del vivos
+    return (despues - antes) / n
+
+
+def _tick(estado, t):
+    """Un tick headless con entradas fijas (mover en zigzag y disparar cada 6)."""
+    jugador = mover_jugador(estado.jugador, 1 if (t // 90) % 2 else -1)
+    balas = estado.balas
+    ia = ajustar_ia(estado.ia, estado.puntaje, estado.jugador.vivo)
+    if t % 6 == 0 and estado.jugador.vivo:
+        balas = disparar_bala(jugador, balas)
+    balas = actualizar_balas(balas)
+    if estado.modo == ModoJuego.METEORITOS:
+        meteoros, sem = actualizar_meteoros(estado.meteoros, estado.semilla_azar, estado.ia.meteor_bonus)
+        tmp = estado.con(jugador=jugador, meteoros=meteoros, balas=balas, semilla_azar=sem, ia=ia)
+    elif estado.modo in (ModoJuego.ENEMIGOS, ModoJuego.MIXTO):
+        ia, x_pred = predecir_jugador(ia, jugador)
+        enemigos = actualizar_enemigos_ia(estado.enemigos, jugador, ia)
+        be = actualizar_balas_enemigas(estado.balas_enemigas)
+        enemigos, nuevas, sem = logica_disparo_enemigo(enemigos, estado.azar_disparos, ia, x_pred)
+        tmp = estado.con(jugador=jugador, enemigos=enemigos, balas=balas,
+                         balas_enemigas=be + nuevas, azar_disparos=sem, ia=ia)
+        if tmp.modo == ModoJuego.MIXTO:
+            mets, sem = actualizar_meteoros(tmp.meteoros, tmp.semilla_azar, tmp.ia.meteor_bonus)
+            tmp = tmp.con(meteoros=mets, semilla_azar=sem)
+    else:
+        be = actualizar_balas_enemigas(estado.balas_enemigas)
+        cortina = (estado.cortina or patrones.Cortina()).avanzar()
+        boss, cortina = patrones.emitir(actualizar_jefe(estado.boss, jugador), cortina, ia, jugador)
+        tmp = estado.con(jugador=jugador, balas=balas, balas_enemigas=be, boss=boss, cortina=cortina, ia=ia)
+    estado = resolver_colisiones(tmp)
+    if estado.modo in (ModoJuego.METEORITOS, ModoJuego.MIXTO):
+        estado = reponer_meteoros(estado)
+    estado = logica_juego(avanzar_explosiones(estado))
+    if not estado.jugador.vivo:
+        # Benchmark: el jugador no muere (como la gracia de spawn de la cáscara)
+        estado = estado.con_jugador(estado.jugador.con(corazones=7, vivo=True))
+    return estado.con_eventos(())
+
+
+def _partida(ticks: int, transitorio: bool = False):
+    estado = inicializar_juego()
+    # Arrancamos con puntaje alto para pasar también por ENEMIGOS/MIXTO
+    estado = estado.con(puntaje=950)
+    for t in range(ticks):
+        if transitorio:
+            # Mismo tick, pero sobre una edición que se congela una vez
+            estado = _tick(editar(estado), t).congelar()
+        else:
+            estado = _tick(estado, t)
+    return estado
+
+
+def _instrumentar(contador, via_replace):
+    """
+    Reemplaza temporalmente con/con_<campo> por versiones que cuentan copias
+    (y opcionalmente las hacen con replace, como antes). Devuelve cómo deshacerlo.
+    """
+    originales = []
+    for cls in CLASES:
+        for f in [None] + [f.name for f in fields(cls)]:
+            nombre = "con" if f is None else f"con_{f}"
+            orig = getattr(cls, nombre)
+            originales.append((cls, nombre, orig))
+
+            def envuelto(self, *args, _orig=orig, _f=f, _cls=cls, **kw):
+                contador[_cls.__name__] = contador.get(_cls.__name__, 0) + 1
+                if not via_replace:
+                    return _orig(self, *args, **kw)
+                return replace(self, **kw) if _f is None else replace(self, **{_f: args[0]})
+            setattr(cls, nombre, envuelto)
+
+    def deshacer():
+        for cls, nombre, orig in originales:
+            setattr(cls, nombre, orig)
+    return deshacer
+
+
+def _medir_partida(ticks: int, via_replace: bool) -> float:
+    # Ambos casos pasan por el mismo envoltorio: solo cambia cómo se copia
+    deshacer = _instrumentar({}, via_replace)
+    try:
+        mejor = float("inf")
+        for _ in range(3):
+            t0 = time.perf_counter()
+            _partida(ticks)
+            mejor = min(mejor, time.perf_counter() - t0)
+        return mejor / ticks
+    finally:
+        deshacer()
+
+
+def main(ticks: int = 3000):
+    print("== 1) Copia con cambios (µs por operación) ==")
+    j = inicializar_juego()
+    e = estados.EstadoEnemigo(x=10, y=20, velocidad_x=2, direccion=1)
+    casos = (
+        ("EstadoJugador invul_frames", "replace(j.jugador, invul_frames=3)",
+         "j.jugador.con(invul_frames=3)", "j.jugador.con_invul_frames(3)"),
+        ("EstadoEnemigo x", "replace(e, x=5)", "e.con(x=5)", "e.con_x(5)"),
+        ("EstadoJuego eventos", "replace(j, eventos=())", "j.con(eventos=())", "j.con_eventos(())"),
+    )
+    for titulo, *sentencias in casos:
+        tiempos = [min(timeit.repeat(s, globals={"replace": replace, "j": j, "e": e},
+                                     number=50_000, repeat=3)) / 50_000 * 1e6 for s in sentencias]
+        print(f"  {titulo:28s} replace {tiempos[0]:5.2f}  .con {tiempos[1]:5.2f}  .con_<campo> {tiempos[2]:5.2f}")
+
+    print("\n== 2) Bytes por instancia (slots vs sin slots) ==")
+    tamaños = {}
+    for cls in CLASES:
+        inst = _partida(0) if cls is estados.EstadoJuego else None
+        if inst is None:
+            campos = {f.name: 0 for f in fields(cls) if f.default is MISSING and f.default_factory is MISSING}
+            inst = cls(**campos)
+        valores = {f.name: getattr(inst, f.name) for f in fields(cls)}
+        tamaños[cls.__name__] = (_bytes(cls, valores), _bytes(_sin_slots(cls), valores))
+        print(f"  {cls.__name__:18s} {tamaños[cls.__name__][0]:5.0f} B  (sin slots: {tamaños[cls.__name__][1]:5.0f} B)")
+
+    print(f"\n== 3) Por tick ({ticks} ticks, entradas fijas) ==")
+    copias = {}
+    deshacer = _instrumentar(copias, via_replace=False)
+    try:
+        _partida(ticks)
+    finally:
+        deshacer()
+    por_tick = sum(copias.values()) / ticks
+    con_slots = sum(n * tamaños[c][0] for c, n in copias.items()) / ticks
+    sin_slots = sum(n * tamaños[c][1] for c, n in copias.items()) / ticks
+    print(f"  copias de estados por tick: {por_tick:.1f}")
+    print(f"  bytes asignados en copias:  {con_slots:.0f} B/tick (sin slots serían {sin_slots:.0f} B/tick)")
+    nuevo, viejo = _medir_partida(ticks, False), _medir_partida(ticks, True)
+    print(f"  tiempo por tick: {nuevo * 1e6:.1f} µs con .con  vs  {viejo * 1e6:.1f} µs vía replace"
+          f"  ({(viejo - nuevo) * 1e6:.1f} µs ahorrados)")
+
+    print(f"\n== 4) Edición transitoria ({ticks} ticks) ==")
+    for transitorio in (False, True):
+        copias = {}
+        deshacer = _instrumentar(copias, via_replace=False)
+        try:
+            _partida(ticks, transitorio)
+        finally:
+            deshacer()
+        # Con edición, el único EstadoJuego del tick es el de congelar()
+        por_tick = copias.get("EstadoJuego", 0) / ticks + (1 if transitorio else 0)
+        mejor = min(_cronometrar(ticks, transitorio) for _ in range(5))
+        nombre = "editar + congelar" if transitorio else "EstadoJuego encadenados"
+        print(f"  {nombre:24s} {por_tick:4.1f} EstadoJuego/tick  {mejor * 1e6:6.1f} µs/tick")
+
+    print(f"\n== 5) Instantáneas de EstadoJuego ({ticks} ticks) ==")
+    estados_partida, estado = [], _partida(0)
+    for t in range(ticks):
+        estados_partida.append(estado)
+        estado = _tick(estado, t)
+    pares = list(zip(estados_partida, estados_partida[1:]))
+    casos = (
+        ("codec completo", lambda: [codec.codificar(e) for e in estados_partida],
+         lambda ds: [codec.decodificar(d) for d in ds]),
+        ("codec delta", lambda: [codec.codificar(e, a) for a, e in pares],
+         lambda ds: [codec.decodificar(d, a) for d, (a, _) in zip(ds, pares)]),
+        ("pickle", lambda: [pickle.dumps(e, pickle.HIGHEST_PROTOCOL) for e in estados_partida],
+         lambda ds: [pickle.loads(d) for d in ds]),
+    )
+    for nombre, cod, dec in casos:
+        t0 = time.perf_counter()
+        datos = cod()
+        t1 = time.perf_counter()
+        dec(datos)
+        t2 = time.perf_counter()
+        n = len(datos)
+        print(f"  {nombre:15s} {sum(map(len, datos)) / n:6.1f} B/instantánea  "
+              f"{n / (t1 - t0):8,.0f} cod/s  {n / (t2 - t1):8,.0f} dec/s")
+
+    print(f"\n== 6) Huella de 64 bits por tick ({ticks} ticks) ==")
+    # Mismos estados y también con 300 balas extra que se mueven (el peor caso:
+    # todas son entidades nuevas en cada tick)
+    con_balas = [e.con(balas=e.balas + tuple(estados.EstadoBala(i % 700, 500 - (t + i) % 500)
+                                             for i in range(300)))
+                 for t, e in enumerate(estados_partida)]
+    for nombre, serie in (("partida", estados_partida), ("+300 balas", con_balas)):
+        h = HuellaIncremental()
+        t0 = time.perf_counter()
+        for e in serie:
+            h(e)
+        t1 = time.perf_counter()
+        for e in serie:
+            huella_estado(e)
+        t2 = time.perf_counter()
+        h = HuellaIncremental()
+        for _ in serie:
+            h(serie[0])
+        t3 = time.perf_counter()
+        n = len(serie)
+        print(f"  {nombre:11s} incremental {(t1 - t0) / n * 1e6:6.1f} µs/tick  entera {(t2 - t1) / n * 1e6:6.1f} µs"
+              f"  sin cambios {(t3 - t2) / n * 1e6:4.1f} µs")
+    # 400 balas enemigas que NO cambian; por tick entra una y/o se va otra
+    quietas = tuple(estados.EstadoBalaEnemiga(x=i % 700, y=i) for i in range(400))
+    nuevas = [estados.EstadoBalaEnemiga(x=i % 700, y=-i) for i in range(ticks + 1)]
+    casos = (("+1 al final", lambda s, t: s + (nuevas[t],)),
+             ("-1 adelante", lambda s, t: s[1:] if s else quietas),
+             ("-1 y +1", lambda s, t: s[1:] + (nuevas[t],)),
+             ("-1 al medio", lambda s, t: s[:len(s) // 2] + s[len(s) // 2 + 1:] if s else quietas))
+    base = estados_partida[0]
+    for nombre, cambio in casos:
+        serie, s = [], quietas
+        for t in range(300):
+            s = cambio(s, t)
+            serie.append(base.con(balas_enemigas=s))
+        h = HuellaIncremental()
+        h(base.con(balas_enemigas=quietas))
+        t0 = time.perf_counter()
+        for e in serie:
+            h(e)
+        print(f"  400 balas quietas, {nombre:12s} {(time.perf_counter() - t0) / len(serie) * 1e6:6.1f} µs/tick")
+
+    print("\n== 7) Vecinos de enemigos (µs por llamada: líder + separación) ==")
+    rng = random.Random(1)
+    jugador = j.jugador
+    for n in (5, 50, 200, 400, 1000):
+        enj = tuple(estados.EstadoEnemigo(x=rng.randint(0, 740), y=rng.randint(40, 400), velocidad_x=2,
+                                          direccion=1, entrando=False) for _ in range(n))
+        tiempos = []
+        for lider, empuje in ((enemigos._lider_directo, enemigos._empuje_directo),
+                              (enemigos._lider_cubetas, enemigos._empuje_cubetas)):
+            veces = max(1, 20_000 // (n * n // 10 + n))
+            tiempos.append(min(timeit.repeat(lambda: (lider(enj, jugador), empuje(enj)),
+                                             number=veces, repeat=3)) / veces * 1e6)
+        print(f"  {n:5d} enemigos  directo {tiempos[0]:10.1f}  cubetas {tiempos[1]:8.1f}"
+              f"  ({tiempos[1] / n:.2f} µs/enemigo)")
+
+
+    print("\n== 8) Mover una oleada (µs por tick, actualizar_enemigos_ia) ==")
+    from nucleo.enemigos import crear_oleada
+    for cant in (5, 50):
+        fila = []
+        for nombre in ("clasica", "ese", "onda", "picada"):
+            ola, _ = crear_oleada(nombre, cant, 7)
+            for _ in range(200):                      # que ya hayan entrado
+                ola = actualizar_enemigos_ia(ola, jugador, j.ia)
+            veces = 2000 // cant
+            seg = min(timeit.repeat(lambda: actualizar_enemigos_ia(ola, jugador, j.ia), number=veces, repeat=3))
+            fila.append(f"{nombre} {seg / veces * 1e6:7.1f}")
+        print(f"  {cant:3d} enemigos  " + "  ".join(fila))
+
+    print("\n== 9) JEFE con cortina (ms por tick de paso(); presupuesto 16.7 ms) ==")
+    from nucleo.paso import paso, NADA
+    originales = patrones.PATRONES
+    # Patrón de estrés: anillos de 40 balas lentas cada 6 ticks (~2000 vivas)
+    patrones.PATRONES = (("estres", (patrones.Emisor(40, giro=4.5, cadencia=6, curva="lenta"),), 10**9),)
+    try:
+        e = inicializar_juego(1)
+        e = e.con(modo=ModoJuego.JEFE, jugador=e.jugador.con(x=-1000),
+                  boss=estados.EstadoBoss(x=300, y=150, vida=10**9, entrando=False))
+        for _ in range(400):
+            e = paso(e, NADA)
+        for _ in range(3):
+            t0 = time.perf_counter()
+            for _ in range(100):
+                previo, e = e, paso(e, NADA)
+            ms = (time.perf_counter() - t0) / 100 * 1e3
+            print(f"  {len(e.cortina):5d} balas  {ms:5.2f} ms/tick  "
+                  f"instantánea {len(codec.codificar(e)):6d} B  delta (1 tick) {len(codec.codificar(e, previo)):6d} B")
+    finally:
+        patrones.PATRONES = originales
+    print("  Cortina sola (µs por llamada; avanzar incluye calcular posiciones):")
+    con_np = patrones.np
+    for n in (100, 500, 2000, 5000):
+        fila = []
+        for nombre, modulo_np in (("sin NumPy", None), ("NumPy", con_np)):
+            if nombre == "NumPy" and con_np is None:
+                continue
+            patrones.np = modulo_np
+            try:
+                c = _cortina_llena(n)
+                fresca = lambda: patrones.Cortina(c.tick, *c.columnas())
+                rect = (300, 300, PLAYER_W, PLAYER_H)
+                t = [min(timeit.repeat(f, number=50, repeat=3)) / 50 * 1e6 for f in (
+                    lambda: c.avanzar(), lambda: fresca().posiciones(),
+                    lambda: c.tocadas(rect), lambda: c.sin(range(0, n, 97)))]
+            finally:
+                patrones.np = con_np
+            fila.append(f"{nombre} avanzar {t[0]:6.0f} posiciones {t[1]:6.0f} tocadas {t[2]:5.0f} sin {t[3]:5.0f}")
+        print(f"  {n:5d} balas  " + "\n               ".join(fila))
+
+    print("\n== 10) Balas contra el jefe por partes (µs por bala) ==")
+    rng = random.Random(2)
+    balas = [(rng.randint(-40, 200), rng.randint(-40, 160), 10, 25) for _ in range(2000)]
+    for nombre, armazon in (("armazón", partes.ARMAZON),
+                            ("rejilla 8×6", tuple(partes.Parte(f"p{k}", partes.NUCLEO if k == 0 else partes.PLACA,
+                                                               4 + 19 * (k % 8), 4 + 19 * (k // 8), 16, 16, 50)
+                                                  for k in range(48)))):
+        bvh, vidas = partes.construir_bvh(armazon), [p.vida for p in armazon]
+
+        def directo():
+            for x, y, w, h in balas:
+                next((k for k, p in enumerate(armazon) if vidas[k] > 0 and x < p.x + p.w and x + w > p.x
+                      and y < p.y + p.h and y + h > p.y), -1)
+
+        def arbol():
+            x1, y1, x2, y2 = bvh[0][:4]
+            for x, y, w, h in balas:
+                if x < x2 and x + w > x1 and y < y2 and y + h > y1:
+                    partes.parte_tocada(vidas, x, y, w, h, bvh)
+
+        fuera = [(x + 400, y, w, h) for x, y, w, h in balas]
+        boss = estados.EstadoBoss(x=0, y=0, vida=1, partes=tuple(p.vida for p in partes.ARMAZON))
+        t = [min(timeit.repeat(f, number=3, repeat=3)) / 3 / len(balas) * 1e6 for f in (directo, arbol)]
+        print(f"  {nombre:12s} {len(armazon):3d} partes  directo {t[0]:5.2f}  BVH {t[1]:5.2f}", end="")
+        if armazon is partes.ARMAZON:
+            seg = min(timeit.repeat(lambda: partes.golpear(boss, fuera), number=3, repeat=3)) / 3 / len(fuera)
+            print(f"  fuera de la caja {seg * 1e6:5.2f}", end="")
+        print()
+
+    print("\n== 11) Verificar 10 min de juego (36 000 ticks, jugador al azar) ==")
+    from nucleo import lockstep, repeticion
+    from nucleo.sim import entradas
+    fuente = entradas("azar", 5)
+    rep, _ = repeticion.grabar(5, bytes(next(fuente).bits() for _ in range(36_000)), cada_foto=125)
+    sin_fotos = replace(rep, cada_foto=0, fotos=())
+    t0 = time.perf_counter()
+    ok = repeticion.verificar(sin_fotos)[0]
+    print(f"  sin fotos            {len(repeticion.codificar(sin_fotos)):6d} B  verificar       "
+          f"{time.perf_counter() - t0:5.2f} s  {'OK' if ok else 'DISTINTO'}")
+    if not lockstep.disponible():
+        print("  (verificar_rapido necesita NumPy)")
+        return
+    for cada, fotos in ((250, rep.fotos[1::2]), (125, rep.fotos)):
+        con = replace(rep, cada_foto=cada, fotos=fotos)
+        t0 = time.perf_counter()
+        ok = repeticion.verificar_rapido(con)[0]
+        print(f"  una foto c/{cada:3d} ticks {len(repeticion.codificar(con)):6d} B  verificar_rapido "
+              f"{time.perf_counter() - t0:5.2f} s  {'OK' if ok else 'DISTINTO'}")
+    # Como las del juego: con máscaras de píxeles (acá elipses del tamaño de cada sprite)
+    from nucleo.constantes import ENEMY_W, ENEMY_H, EBULLET_W, EBULLET_H
+    from nucleo.mascaras import empaquetar_filas
+
+    def elipse(w, h):
+        return empaquetar_filas([[((x + .5) / w - .5) ** 2 + ((y + .5) / h - .5) ** 2 <= .25
+                                  for x in range(w)] for y in range(h)])
+
+    mascaras = {"jugador": elipse(PLAYER_W, PLAYER_H), "meteoro": elipse(50, 50),
+                "enemigo": elipse(ENEMY_W, ENEMY_H), "bala_enemiga": elipse(EBULLET_W, EBULLET_H)}
+    fuente = entradas("azar", 5)
+    con, _ = repeticion.grabar(5, bytes(next(fuente).bits() for _ in range(36_000)), mascaras=mascaras)
+    for nombre, verificar in (("verificar      ", repeticion.verificar),
+                              ("verificar_rapido", repeticion.verificar_rapido)):
+        t0 = time.perf_counter()
+        ok = verificar(con, mascaras)[0]
+        print(f"  con máscaras c/{con.cada_foto:3d}   {len(repeticion.codificar(con)):6d} B  {nombre} "
+              f"{time.perf_counter() - t0:5.2f} s  {'OK' if ok else 'DISTINTO'}")
+
+
+def _cortina_llena(n: int):
+    """Cortina de n balas lentas repartidas por la pantalla, de edades variadas."""
+    rng = random.Random(n)
+    c = patrones.Cortina(tick=200)
+    for lote in range(10):
+        m = n // 10
+        ang = [rng.uniform(0, 6.3) for _ in range(m)]
+        c = c.agregar([rng.uniform(100, ANCHO - 100) for _ in range(m)], [rng.uniform(100, ALTO - 100) for _ in range(m)],
+                      [math.cos(a) for a in ang], [math.sin(a) for a in ang], 1)
+        c = patrones.Cortina(c.tick + 5, *c.columnas())
+    return c
+
+
+def _cronometrar(ticks: int, transitorio: bool) -> float:
+    t0 = time.perf_counter()
+    _partida(ticks, transitorio)
+    return (time.perf_counter() - t0) / ticks
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3000)
@@ -1,5 +1,5 @@
 # Reexporta utilidades de la cáscara imperativa
-from .assets import cargar_imagen, cargar_fondo_cover, cargar_recursos
+from .assets import cargar_imagen, cargar_fondo_cover, cargar_recursos, construir_mascaras
 from .audio import play_sound, cargar_sonidos, iniciar_musica, parar_musica
 from .records import cargar_records, guardar_record, top3
 from .estilos_ui import Button, draw_text, draw_title_plain, draw_hearts
@@ -10,7 +10,7 @@ from .pantallas import (
 from .renderizado import dibujar_escena, draw_boss_bar
 from .bucle import ejecutar_juego
 # Reexporta utilidades de la cáscara imperativa
-from .assets import cargar_imagen, cargar_fondo_cover, cargar_recursos
+from .assets import cargar_imagen, cargar_fondo_cover, cargar_recursos, construir_mascaras
 from .audio import play_sound, cargar_sonidos, iniciar_musica, parar_musica
 from .records import cargar_records, guardar_record, top3
 from .estilos_ui import Button, draw_text, draw_title_plain, draw_hearts, set_heart_image
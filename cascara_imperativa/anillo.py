@@ -0,0 +1,96 @@
+import struct
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+# ============================================================================
+# anillo.py — Anillo de mensajes en memoria compartida (un escritor)
+# Para pasar “lo último” entre procesos sin colas ni pickle: el escritor
+# pisa ranuras en ronda y el lector se queda con la más nueva. NUNCA
+# bloquea a ninguno de los dos (si el lector se atrasa, se saltea mensajes).
+# Memoria:  publicados u64 | ranuras u32 | tam u32 | ranura × ranuras
+# Ranura:   secuencia u64 | largo u32 | datos (tam bytes)
+# Cada ranura es un “seqlock”: la secuencia es IMPAR mientras se escribe;
+# el lector copia y compara la secuencia antes/después; si cambió (el
+# escritor dio la vuelta justo ahí), prueba de nuevo con la más nueva.
+#   a = AnilloCompartido(ranuras=8, tam=4096)    # crea; a.nombre → al otro proceso
+#   b = AnilloCompartido(a.nombre)               # se engancha al mismo
+#   a.publicar(b"...");  b.ultimo() → (n, b"...")
+# ============================================================================
+
+_CABECERA = struct.Struct("<QII")
+_RANURA = struct.Struct("<QI")
+_SEQ = struct.Struct("<Q")
+
+
+class AnilloCompartido:
+    """
+    Sin `nombre` crea el bloque (y lo borra al cerrar); con `nombre` se
+    engancha a uno existente. Un solo proceso publica; leer puede
+    cualquiera. Usar con `with` o cerrar().
+    """
+
+    def __init__(self, nombre: Optional[str] = None, ranuras: int = 8, tam: int = 4096):
+        self._dueño = nombre is None
+        if self._dueño:
+            self._shm = shared_memory.SharedMemory(create=True, size=_CABECERA.size + ranuras * (_RANURA.size + tam))
+            _CABECERA.pack_into(self._shm.buf, 0, 0, ranuras, tam)
+        else:
+            # Pensado para procesos hijos (multiprocessing): comparten el
+            # resource_tracker del dueño, que es quien lo borra
+            self._shm = shared_memory.SharedMemory(name=nombre)
+        self._buf = self._shm.buf
+        _, self.ranuras, self.tam = _CABECERA.unpack_from(self._buf, 0)
+        self.publicados = 0 if self._dueño else self._publicados()
+
+    @property
+    def nombre(self) -> str:
+        return self._shm.name
+
+    def _publicados(self) -> int:
+        return _SEQ.unpack_from(self._buf, 0)[0]
+
+    def _inicio(self, n: int) -> int:
+        return _CABECERA.size + (n % self.ranuras) * (_RANURA.size + self.tam)
+
+    def publicar(self, datos: bytes) -> int:
+        """Escribe el mensaje número `publicados + 1` (ValueError si no entra en la ranura)."""
+        if len(datos) > self.tam:
+            raise ValueError(f"mensaje de {len(datos)} bytes; la ranura tiene {self.tam}")
+        n = self.publicados + 1
+        i = self._inicio(n)
+        _RANURA.pack_into(self._buf, i, 2 * n - 1, len(datos))   # impar: escribiendo
+        self._buf[i + _RANURA.size:i + _RANURA.size + len(datos)] = datos
+        _SEQ.pack_into(self._buf, i, 2 * n)                      # par: listo
+        _SEQ.pack_into(self._buf, 0, n)
+        self.publicados = n
+        return n
+
+    def ultimo(self) -> Optional[Tuple[int, bytes]]:
+        """
+        (número, datos) del mensaje más nuevo, o None si todavía no hay
+        ninguno (o si el escritor murió a mitad de una ranura).
+        """
+        for _ in range(4 * self.ranuras):
+            n = self._publicados()
+            if n == 0:
+                return None
+            i = self._inicio(n)
+            seq, largo = _RANURA.unpack_from(self._buf, i)
+            if seq != 2 * n:
+                continue   # el escritor ya la está pisando: ir por la siguiente
+            datos = bytes(self._buf[i + _RANURA.size:i + _RANURA.size + largo])
+            if _SEQ.unpack_from(self._buf, i)[0] == seq:
+                return n, datos
+        return None
+
+    def cerrar(self):
+        self._buf = None
+        self._shm.close()
+        if self._dueño:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
@@ -1,10 +1,30 @@
+import argparse
 import pygame
 from cascara_imperativa.assets import cargar_recursos
 from cascara_imperativa.audio import cargar_sonidos
 from cascara_imperativa.bucle import ejecutar_juego
 from cascara_imperativa.estilos_ui import set_heart_image
 
-def main():
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Los Hombres Funcionales")
+    ap.add_argument("--repeticion", metavar="RUTA", help="reproduce una partida grabada (.rep)")
+    ap.add_argument("--coop", type=int, choices=(1, 2), help="cooperativo en red: qué nave maneja esta ventana")
+    ap.add_argument("--puerto", type=int, default=5000, help="puerto UDP local (cooperativo)")
+    ap.add_argument("--par", type=int, default=5001, help="puerto UDP de la otra ventana (cooperativo)")
+    ap.add_argument("--latencia", type=int, default=0, metavar="MS", help="latencia simulada de ida")
+    ap.add_argument("--jitter", type=int, default=0, metavar="MS", help="± al azar sobre la latencia")
+    ap.add_argument("--retardo", type=int, default=0, metavar="TICKS",
+                    help="retardo de entrada (igual en las dos ventanas)")
+    ap.add_argument("--procesos", action="store_true",
+                    help="simula en otro proceso y dibuja en este (muestra latencia y uso)")
+    ap.add_argument("--fps", type=int, default=60, help="tope de cuadros por segundo (30-240)")
+    ap.add_argument("--hz", type=int, default=60, help="ticks por segundo del núcleo (60 = velocidad original)")
+    args = ap.parse_args(argv)
+    repeticion = None
+    if args.repeticion:
+        from nucleo.repeticion import cargar
+        repeticion = cargar(args.repeticion)
+
     pygame.init()
     pygame.mixer.init()
     pygame.mixer.set_num_channels(64)
@@ -19,7 +39,24 @@ def main():
     set_heart_image(recursos.get("heart_img"))
 
     sonidos = cargar_sonidos()
-    ejecutar_juego(pantalla, reloj, recursos, sonidos, ANCHO=ANCHO, ALTO=ALTO)
+    if args.coop:
+        from cascara_imperativa.cooperativo import ejecutar_cooperativo
+        pygame.display.set_caption(f"Los Hombres Funcionales — nave {args.coop}")
+        ejecutar_cooperativo(pantalla, reloj, recursos, sonidos, nave=args.coop, puerto=args.puerto,
+                             par=args.par, latencia_ms=args.latencia, jitter_ms=args.jitter,
+                             retardo=args.retardo, ANCHO=ANCHO, ALTO=ALTO)
+        pygame.quit()
+        return
+    if args.procesos:
+        from cascara_imperativa.procesos import ejecutar_en_procesos
+        medidas = ejecutar_en_procesos(pantalla, reloj, recursos, sonidos, fps=args.fps, hz=args.hz,
+                                       ANCHO=ANCHO, ALTO=ALTO)
+        print("[procesos] " + "  ".join(f"{k}={v:.3g}" if isinstance(v, float) else f"{k}={v}"
+                                        for k, v in medidas.items()))
+        pygame.quit()
+        return
+    ejecutar_juego(pantalla, reloj, recursos, sonidos, ANCHO=ANCHO, ALTO=ALTO, repeticion=repeticion,
+                  fps=args.fps, hz=args.hz)
 
 if __name__ == "__main__":
     main()
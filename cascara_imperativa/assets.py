@@ -1,4 +1,5 @@
 import pygame, os
+from nucleo.mascaras import empaquetar_filas
 
 def cargar_imagen(ruta, tam=None, colorkey=None):
     try:
@@ -68,3 +69,48 @@ def cargar_recursos(ANCHO, ALTO):
         img_enemigo=img_enemigo, heart_img=heart_img
     )
     return recursos
+
+
+def cargar_recursos_partida(recursos):
+    """
+    Sprites que se cargan al empezar a jugar (jefe y explosiones); si falta
+    alguno queda en None y el render usa su reemplazo. Modifica `recursos`.
+    """
+    from nucleo.constantes import BOSS_W, BOSS_H
+    try:
+        recursos["img_boss"] = cargar_imagen("assets/enemigofinal.png", (BOSS_W, BOSS_H), (0, 0, 0))
+    except Exception:
+        try:
+            recursos["img_boss"] = pygame.transform.scale(recursos["img_enemigo"], (BOSS_W, BOSS_H))
+        except Exception:
+            recursos["img_boss"] = None
+    try:
+        recursos["img_explosion_enemy"] = cargar_imagen("assets/regularExplosion00.png")
+    except Exception:
+        recursos["img_explosion_enemy"] = None
+    try:
+        recursos["img_explosion_meteor"] = cargar_imagen("assets/regularExplosion01.png")
+    except Exception:
+        recursos["img_explosion_meteor"] = None
+    return recursos
+
+
+def _mascara_de(surface):
+    """Lee el alfa/colorkey de una superficie y lo empaqueta como filas de bits."""
+    m = pygame.mask.from_surface(surface)
+    w, h = m.get_size()
+    return empaquetar_filas([[bool(m.get_at((x, y))) for x in range(w)] for y in range(h)])
+
+def construir_mascaras(recursos):
+    """
+    Precalcula UNA vez las máscaras de colisión de los sprites ya escalados.
+    Devuelve un dict plano {clave: MascaraBits} que se le pasa al núcleo.
+    Si falta alguna imagen, esa entidad sigue usando su rectángulo.
+    """
+    metas = recursos.get("imgs_meteoros") or [None]
+    fuentes = dict(
+        jugador=recursos.get("img_jugador"), meteoro=metas[0],
+        enemigo=recursos.get("img_enemigo"), jefe=recursos.get("img_boss"),
+        bala=recursos.get("img_bala"), bala_enemiga=recursos.get("img_bala_enemiga"),
+    )
+    return {clave: _mascara_de(img) for clave, img in fuentes.items() if img is not None}
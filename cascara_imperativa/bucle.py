@@ -1,27 +1,49 @@
 import pygame
-from dataclasses import replace
 from .audio import play_sound, iniciar_musica, parar_musica
 from .pantallas import (
     mostrar_menu, mostrar_instrucciones, mostrar_records,
     mostrar_pantalla_game_over, mostrar_pausa, pedir_nombre
 )
 from .renderizado import dibujar_escena
-from .records import cargar_records, guardar_record, top3
-from .assets import cargar_imagen
+from .records import cargar_records, guardar_record, guardar_repeticion, top3
+from .assets import cargar_recursos_partida, construir_mascaras
 from .estilos_ui import Button, draw_text, draw_title_plain
+from .viaje import viajar
 
 # Importa todo lo necesario del núcleo funcional
 from nucleo import *
+from nucleo.repeticion import Repeticion, teclas_de, huella_mascaras, CADA_FOTO
+from nucleo.codec import codificar as codificar_estado
+from nucleo.zobrist import huella_estado
+from nucleo.tiempo import Acumulador, acumular, interpolar
+from nucleo.historial import Historial
+
+SEMILLA_PARTIDA = 42   # todas las partidas arrancan igual; la repetición la guarda igual
 
 def _nueva_partida():
-    estado = inicializar_juego()
-    return estado, 24  # frames de gracia
+    # La gracia de spawn y la cadencia de disparo ya vienen dentro del estado
+    return inicializar_juego(SEMILLA_PARTIDA)
+
+def _historial(estado):
+    # ~8 MiB: unos 20 minutos de partida; lo más viejo se va tirando
+    h = Historial(cada=60, presupuesto=8 << 20)
+    h.guardar(0, estado)
+    return h
 
-def ejecutar_juego(pantalla, reloj, recursos, sonidos, ANCHO=800, ALTO=600):
+def ejecutar_juego(pantalla, reloj, recursos, sonidos, ANCHO=800, ALTO=600, repeticion=None, fps=60, hz=60):
+    """
+    Game loop. Cada partida se graba (teclas por tick) y al terminar se guarda
+    como repetición. Con `repeticion` (una nucleo.repeticion.Repeticion) no hay
+    menú ni teclado: se reproduce esa partida y se vuelve al terminar (o con ESC).
+    F3 congela y abre el viaje en el tiempo (cascara_imperativa/viaje.py).
+    `fps` es el tope de cuadros por segundo (de 30 a 240 va bien) y `hz` los
+    ticks por segundo del núcleo (ojo: las reglas son por tick, así que
+    cambiar `hz` cambia la velocidad del juego; 60 es la original).
+    """
     iniciar_musica(True)
 
     # --- Menú inicial ---
-    while True:
+    while repeticion is None:
         accion = mostrar_menu(pantalla, recursos["fondo_menu"], ANCHO)
         if accion == "salir":
             pygame.quit(); raise SystemExit
@@ -33,7 +55,11 @@ def ejecutar_juego(pantalla, reloj, recursos, sonidos, ANCHO=800, ALTO=600):
             jugador_actual = pedir_nombre(pantalla, reloj, recursos["fondo_menu"], ANCHO, ALTO)
             break
 
-    estado, gracia_spawn = _nueva_partida()
+    estado = _nueva_partida() if repeticion is None else inicializar_juego(repeticion.semilla)
+    teclas_partida = bytearray()   # un byte por tick: lo que se guarda en la repetición
+    fotos_partida = []             # una foto cada CADA_FOTO ticks (para verificar_rapido)
+    historial = _historial(estado)  # para el viaje en el tiempo (F3)
+    tick_repeticion = 0
 
     # fondos
     fondo_actual = recursos["fondo"]
@@ -44,49 +70,44 @@ def ejecutar_juego(pantalla, reloj, recursos, sonidos, ANCHO=800, ALTO=600):
     fondo_y1, fondo_y2 = 0, -ALTO
 
     prev_fx_ids = set()
-    FIRE_RATE_FRAMES = 6
-    fire_cooldown = 0
 
     # intenta cargar boss y explosiones si existen
-    try:
-        recursos["img_boss"] = cargar_imagen("assets/enemigofinal.png", (BOSS_W, BOSS_H), (0, 0, 0))
-    except Exception:
-        try:
-            recursos["img_boss"] = pygame.transform.scale(recursos["img_enemigo"], (BOSS_W, BOSS_H))
-        except Exception:
-            recursos["img_boss"] = None
-    try:
-        recursos["img_explosion_enemy"] = cargar_imagen("assets/regularExplosion00.png")
-    except Exception:
-        recursos["img_explosion_enemy"] = None
-    try:
-        recursos["img_explosion_meteor"] = cargar_imagen("assets/regularExplosion01.png")
-    except Exception:
-        recursos["img_explosion_meteor"] = None
+    cargar_recursos_partida(recursos)
 
-    corriendo = True
-    while corriendo:
-        reloj.tick(60)
-        teclas = pygame.key.get_pressed()
+    # hitboxes por máscara (una sola vez, ya con los sprites definitivos)
+    mascaras = construir_mascaras(recursos)
+    huella = huella_mascaras(mascaras)
+    if repeticion is not None and repeticion.huella != huella:
+        print("[repeticion] se grabó con otras hitboxes: la partida puede no coincidir")
 
-        # Entrada
-        jugador = estado.jugador
-        if teclas[pygame.K_LEFT]:  jugador = mover_jugador(jugador, -1)
-        if teclas[pygame.K_RIGHT]: jugador = mover_jugador(jugador,  1)
+    # Paso fijo: el núcleo corre a `hz` ticks por segundo pase lo que pase con
+    # los FPS; se dibuja interpolando entre el estado anterior y el actual
+    def _al_dia():
+        reloj.tick()   # lo que se tardó en menús/pausa no se “recupera”
+        return Acumulador(hz, max(1, hz // 10))   # ponerse al día hasta ~100 ms
+    acum = _al_dia()
+    anterior = estado
+    esc_pendiente = False   # el ESC se graba en el próximo tick que corra
 
-        balas = estado.balas
-        balas_enemigas = estado.balas_enemigas
-        ia = ajustar_ia(estado.ia, estado.puntaje, estado.jugador.vivo)
+    corriendo = True
+    while corriendo:
+        acum, n_ticks = acumular(acum, reloj.tick(fps) / 1000)
 
         # Eventos / Pausa
-        esc_pulsado = False
+        esc_pulsado = viaje_pulsado = False
         for e in pygame.event.get():
             if e.type == pygame.QUIT:
                 corriendo = False
             if e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE:
                 esc_pulsado = True
+            if e.type == pygame.KEYDOWN and e.key == pygame.K_F3:
+                viaje_pulsado = True
+
+        if repeticion is not None and (esc_pulsado or not corriendo):
+            return   # ESC corta la repetición
 
         if esc_pulsado and estado.jugador.vivo:
+            esc_pendiente = True
             botones = [
                 Button("REANUDAR",  220, 160, 360, 70, "resume",  theme="neon"),
                 Button("REINICIAR", 220, 254, 360, 70, "restart", theme="neon"),
@@ -94,11 +115,14 @@ def ejecutar_juego(pantalla, reloj, recursos, sonidos, ANCHO=800, ALTO=600):
             ]
             accion_pausa = mostrar_pausa(pantalla, ANCHO, ALTO, draw_title_plain=draw_title_plain, botones=botones, reloj=reloj)
             if accion_pausa == "restart":
-                estado, gracia_spawn = _nueva_partida()
+                estado = _nueva_partida()
+                teclas_partida = bytearray()
+                fotos_partida = []
+                historial = _historial(estado)
                 fondo_actual, fondo_siguiente = fondo, None
                 alfa_transicion, en_transicion = 0, False
                 prev_fx_ids = set()
-                fire_cooldown = 0
+                esc_pendiente = False
                 iniciar_musica(True)
             elif accion_pausa == "exit":
                 while True:
@@ -109,121 +133,103 @@ def ejecutar_juego(pantalla, reloj, recursos, sonidos, ANCHO=800, ALTO=600):
                     if accion == "jugar":
                         jugador_actual = pedir_nombre(pantalla, reloj, recursos["fondo_menu"], ANCHO, ALTO)
                         iniciar_musica(True)
-                        estado, gracia_spawn = _nueva_partida()
+                        estado = _nueva_partida()
+                        teclas_partida = bytearray()
+                        fotos_partida = []
+                        historial = _historial(estado)
                         fondo_actual, fondo_siguiente = fondo, None
                         alfa_transicion, en_transicion = 0, False
                         prev_fx_ids = set()
-                        fire_cooldown = 0
+                        esc_pendiente = False
                         break
+            acum, n_ticks = _al_dia(), 0
+            anterior = estado
 
-        # Disparo continuo
-        if fire_cooldown > 0:
-            fire_cooldown -= 1
-        if teclas[pygame.K_SPACE] and fire_cooldown <= 0 and estado.jugador.vivo:
-            balas = disparar_bala(jugador, balas)
-            play_sound(sonidos["laser"], 0.55)
-            fire_cooldown = FIRE_RATE_FRAMES
-
-        # --- Actualización por modo ---
-        if estado.modo == ModoJuego.METEORITOS:
-            balas = actualizar_balas(balas)
-            meteoros, sem = actualizar_meteoros(estado.meteoros, estado.semilla_azar, estado.ia.meteor_bonus)
-            tmp = replace(estado, jugador=jugador, meteoros=meteoros, balas=balas, semilla_azar=sem, ia=ia)
-            tmp = detectar_colisiones(tmp)
-            estado = reponer_meteoros(tmp)
-
-        elif estado.modo in (ModoJuego.ENEMIGOS, ModoJuego.MIXTO):
-            balas = actualizar_balas(balas)
-            ia, x_pred = predecir_jugador(ia, jugador)
-            enemigos = actualizar_enemigos_ia(estado.enemigos, jugador, ia)
-            balas_enemigas = actualizar_balas_enemigas(estado.balas_enemigas)
-            enemigos2, nuevas_be, sem = logica_disparo_enemigo(enemigos, estado.semilla_azar, ia, x_pred)
-            if len(nuevas_be) == 0: sem, _ = siguiente_semilla(sem)
-            todas_be = balas_enemigas + nuevas_be
-            tmp = replace(estado, jugador=jugador, enemigos=enemigos2, balas=balas,
-                          balas_enemigas=todas_be, semilla_azar=sem, ia=ia)
-            tmp = detectar_colisiones_enemigo(tmp)
-            if tmp.modo == ModoJuego.MIXTO:
-                mets, sem2 = actualizar_meteoros(tmp.meteoros, tmp.semilla_azar, tmp.ia.meteor_bonus)
-                tmp = replace(tmp, meteoros=mets, semilla_azar=sem2)
-                tmp = detectar_colisiones(tmp)
-                tmp = reponer_meteoros(tmp)
-            estado = tmp
-
-        elif estado.modo == ModoJuego.JEFE:
-            balas = actualizar_balas(balas)
-            balas_enemigas = actualizar_balas_enemigas(estado.balas_enemigas)
-            boss = actualizar_jefe(estado.boss, jugador)
-            boss, nuevas_boss = disparo_jefe(boss, ia)
-            todas_be = balas_enemigas + nuevas_boss
-            tmp = replace(estado, jugador=jugador, balas=balas, balas_enemigas=todas_be, boss=boss, ia=ia)
-            if tmp.meteoros:
-                mets, sem2 = actualizar_meteoros(tmp.meteoros, tmp.semilla_azar, tmp.ia.meteor_bonus)
-                tmp = replace(tmp, meteoros=mets, semilla_azar=sem2)
-                tmp = detectar_colisiones(tmp)
-            tmp = detectar_colisiones_enemigo(tmp)
-            estado = detectar_colisiones_jefe(tmp)
-
-        # FX + lógica global
-        estado = avanzar_explosiones(estado)
-        estado = logica_juego(estado)
-
-        # Gracia de spawn
-        if gracia_spawn > 0:
-            gracia_spawn -= 1
-            estado = replace(
-                estado,
-                jugador=replace(estado.jugador, corazones=7, vivo=True, invul_frames=max(estado.jugador.invul_frames, 10))
-            )
+        # Viaje en el tiempo (debug): congelar, recorrer la historia y retomar desde cualquier tick
+        if viaje_pulsado and estado.jugador.vivo:
+            desde = viajar(pantalla, reloj, historial, recursos, fondo_actual, ANCHO, ALTO)
+            if desde is not None and desde != historial.ultimo:
+                historial.recortar(desde)
+                estado = historial.estado(desde)
+                del teclas_partida[desde:]   # la repetición también sigue desde ahí
+                del fotos_partida[desde // CADA_FOTO:]
+                tick_repeticion = desde
+                prev_fx_ids = set()
+            acum, n_ticks = _al_dia(), 0
+            anterior = estado
+
+        # Entrada: lo único que el núcleo necesita saber del teclado (una vez por frame)
+        if repeticion is None:
+            teclas = pygame.key.get_pressed()
+            entrada = Entrada(izquierda=bool(teclas[pygame.K_LEFT]),
+                              derecha=bool(teclas[pygame.K_RIGHT]),
+                              disparo=bool(teclas[pygame.K_SPACE]))
+
+        # --- Los ticks que entran en este frame (0, 1 o varios) del núcleo (puro) ---
+        for _ in range(n_ticks):
+            if repeticion is not None:
+                if tick_repeticion >= repeticion.ticks:
+                    return   # fin de la repetición
+                entrada = Entrada.desde_bits(repeticion.teclas[tick_repeticion])
+                tick_repeticion += 1
+
+            anterior = estado
+            estado = paso(estado, entrada, mascaras)
+            teclas_partida.append(teclas_de(entrada, esc_pendiente))
+            esc_pendiente = False
+            historial.guardar(len(teclas_partida), estado)
+            if len(teclas_partida) % CADA_FOTO == 0:
+                fotos_partida.append(codificar_estado(estado))
 
-        # Eventos del núcleo
-        if estado.eventos:
+            # Eventos del núcleo → sonidos (paso() los descarta al empezar el tick siguiente)
             for ev in estado.eventos:
-                if ev.tipo == EventoTipo.JEFE_ENTRA:
+                if ev.tipo == EventoTipo.DISPARO:
+                    play_sound(sonidos["laser"], 0.55)
+                elif ev.tipo == EventoTipo.JEFE_ENTRA:
                     play_sound(sonidos["alerta"], 0.35)
                 elif ev.tipo == EventoTipo.JEFE_MUERTO:
                     play_sound(sonidos["explosion_enemy"], 0.75)
-            estado = replace(estado, eventos=tuple())
 
-        # Scroll y transiciones
-        velocidad_scroll = 2 if estado.modo == ModoJuego.METEORITOS else 4
-        fondo_y1 += velocidad_scroll; fondo_y2 += velocidad_scroll
-        if fondo_y1 >= ALTO: fondo_y1 = -ALTO
-        if fondo_y2 >= ALTO: fondo_y2 = -ALTO
-
-        if not en_transicion:
-            if estado.modo == ModoJuego.METEORITOS and fondo_actual is not fondo:
-                fondo_siguiente, en_transicion, alfa_transicion = fondo, True, 0
-            elif estado.modo in (ModoJuego.ENEMIGOS, ModoJuego.MIXTO, ModoJuego.JEFE) and fondo_actual is not ambiente:
-                fondo_siguiente, en_transicion, alfa_transicion = ambiente, True, 0
-
-        if en_transicion and fondo_siguiente:
-            alfa_transicion += 5
-            if alfa_transicion >= 255:
-                alfa_transicion, en_transicion = 255, False
-                fondo_actual, fondo_siguiente = fondo_siguiente, None
-            pantalla.blit(fondo_actual, (0, fondo_y1))
-            pantalla.blit(fondo_actual, (0, fondo_y2))
-            if fondo_siguiente:
-                t1 = fondo_siguiente.copy(); t2 = fondo_siguiente.copy()
-                t1.set_alpha(alfa_transicion); t2.set_alpha(alfa_transicion)
-                pantalla.blit(t1, (0, fondo_y1)); pantalla.blit(t2, (0, fondo_y2))
-        else:
-            pantalla.blit(fondo_actual, (0, fondo_y1))
-            pantalla.blit(fondo_actual, (0, fondo_y2))
-
-        # Render + HUD
-        fx_birth_now = dibujar_escena(pantalla, estado, recursos, prev_fx_ids, HUD=True, BOSS_HP=BOSS_HP, ANCHO=ANCHO, ALTO=ALTO)
-
-        # Sonidos de explosión al nacer
-        for key in fx_birth_now:
-            if key not in prev_fx_ids:
-                _, _, tipo = key
+            # Sonidos de explosión al nacer (por tick: con varios ticks por frame no se pierden)
+            fx_birth_now = {(fx.x, fx.y, fx.tipo) for fx in estado.explosiones if fx.timer >= 17}
+            for _, _, tipo in fx_birth_now - prev_fx_ids:
                 if tipo == "meteor":
                     play_sound(sonidos["explosion_meteor"], 0.6)
                 else:
                     play_sound(sonidos["explosion_enemy"], 0.65)
-        prev_fx_ids = fx_birth_now
+            prev_fx_ids = fx_birth_now
+
+            # Scroll y transiciones (también van por tick)
+            velocidad_scroll = 2 if estado.modo == ModoJuego.METEORITOS else 4
+            fondo_y1 += velocidad_scroll; fondo_y2 += velocidad_scroll
+            if fondo_y1 >= ALTO: fondo_y1 = -ALTO
+            if fondo_y2 >= ALTO: fondo_y2 = -ALTO
+
+            if not en_transicion:
+                if estado.modo == ModoJuego.METEORITOS and fondo_actual is not fondo:
+                    fondo_siguiente, en_transicion, alfa_transicion = fondo, True, 0
+                elif estado.modo in (ModoJuego.ENEMIGOS, ModoJuego.MIXTO, ModoJuego.JEFE) and fondo_actual is not ambiente:
+                    fondo_siguiente, en_transicion, alfa_transicion = ambiente, True, 0
+
+            if en_transicion and fondo_siguiente:
+                alfa_transicion += 5
+                if alfa_transicion >= 255:
+                    alfa_transicion, en_transicion = 255, False
+                    fondo_actual, fondo_siguiente = fondo_siguiente, None
+
+            if not estado.jugador.vivo:
+                break
+
+        pantalla.blit(fondo_actual, (0, fondo_y1))
+        pantalla.blit(fondo_actual, (0, fondo_y2))
+        if en_transicion and fondo_siguiente:
+            t1 = fondo_siguiente.copy(); t2 = fondo_siguiente.copy()
+            t1.set_alpha(alfa_transicion); t2.set_alpha(alfa_transicion)
+            pantalla.blit(t1, (0, fondo_y1)); pantalla.blit(t2, (0, fondo_y2))
+
+        # Render + HUD (posiciones interpoladas: suave a cualquier FPS)
+        dibujar_escena(pantalla, interpolar(anterior, estado, acum.alfa), recursos, prev_fx_ids,
+                       HUD=True, BOSS_HP=BOSS_HP, ANCHO=ANCHO, ALTO=ALTO)
 
         # Indicador de modo
         draw_text(pantalla, f"Modo: {estado.modo.value}", 70, 36, size=18, anchor="center")
@@ -233,8 +239,15 @@ def ejecutar_juego(pantalla, reloj, recursos, sonidos, ANCHO=800, ALTO=600):
         # Game Over
                
         if not estado.jugador.vivo:
-            # ← GUARDA el record antes de la pantalla Game Over
+            if repeticion is not None:
+                pygame.time.wait(1500)
+                return
+            # ← GUARDA el record (y la repetición) antes de la pantalla Game Over
             guardar_record(jugador_actual, estado.puntaje)
+            fotos = tuple(fotos_partida[:(len(teclas_partida) - 1) // CADA_FOTO])   # las de antes del último tick
+            guardar_repeticion(jugador_actual, Repeticion(SEMILLA_PARTIDA, bytes(teclas_partida),
+                                                          estado.puntaje, huella, huella_estado(estado),
+                                                          CADA_FOTO if fotos else 0, fotos))
 
             parar_musica()
             acc = mostrar_pantalla_game_over(
@@ -244,11 +257,13 @@ def ejecutar_juego(pantalla, reloj, recursos, sonidos, ANCHO=800, ALTO=600):
                 reloj=reloj
             )
             if acc == "reiniciar":
-                estado, gracia_spawn = _nueva_partida()
+                estado = _nueva_partida()
+                teclas_partida = bytearray()
+                fotos_partida = []
+                historial = _historial(estado)
                 fondo_actual, fondo_siguiente = fondo, None
                 alfa_transicion, en_transicion = 0, False
                 prev_fx_ids = set()
-                fire_cooldown = 0
                 iniciar_musica(True)
             else:
                 cargar_records()
@@ -266,9 +281,13 @@ def ejecutar_juego(pantalla, reloj, recursos, sonidos, ANCHO=800, ALTO=600):
                     if accion == "jugar":
                         jugador_actual = pedir_nombre(pantalla, reloj, recursos["fondo_menu"], ANCHO, ALTO)
                         iniciar_musica(True)
-                        estado, gracia_spawn = _nueva_partida()
+                        estado = _nueva_partida()
+                        teclas_partida = bytearray()
+                        fotos_partida = []
+                        historial = _historial(estado)
                         fondo_actual, fondo_siguiente = fondo, None
                         alfa_transicion, en_transicion = 0, False
                         prev_fx_ids = set()
-                        fire_cooldown = 0
-                        break
\ No newline at end of file
+                        break
+            acum = _al_dia()
+            anterior = estado
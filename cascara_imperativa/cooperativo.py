@@ -0,0 +1,99 @@
+import pygame
+from .audio import play_sound, iniciar_musica, parar_musica
+from .renderizado import dibujar_escena
+from .assets import cargar_recursos_partida, construir_mascaras
+from .estilos_ui import draw_text
+from .red import TransporteUDP
+
+from nucleo import *
+from nucleo.paso import hay_naves_vivas
+from nucleo.rollback import SesionRollback
+
+# ============================================================================
+# cooperativo.py — Partida de a dos (una instancia del juego por jugador)
+# Cada instancia corre la partida entera con rollback (nucleo.rollback) y
+# se habla con la otra por UDP en localhost (red.TransporteUDP). El frame
+# NUNCA espera a la red: se lee el teclado, se simula y se dibuja; si la
+# entrada del otro llega tarde y era distinta, el núcleo re-simula solo.
+#   python -m cascara_imperativa.arranque --coop 1 --puerto 5000 --par 5001 --latencia 60
+#   python -m cascara_imperativa.arranque --coop 2 --puerto 5001 --par 5000 --latencia 60
+# ============================================================================
+
+SEMILLA_COOP = 42
+
+
+def ejecutar_cooperativo(pantalla, reloj, recursos, sonidos, nave=1, puerto=5000, par=5001,
+                         latencia_ms=0, jitter_ms=0, retardo=0, ANCHO=800, ALTO=600):
+    """
+    Juega una partida cooperativa como la nave `nave` (1 o 2) contra el par
+    en el puerto `par`. Las dos instancias tienen que usar la misma
+    semilla, retardo y assets (las máscaras forman parte de la simulación).
+    Vuelve cuando no queda ninguna nave (confirmado por los dos) o con ESC.
+    """
+    cargar_recursos_partida(recursos)
+    mascaras = construir_mascaras(recursos)
+    sesion = SesionRollback(inicializar_juego(SEMILLA_COOP, cooperativo=True), local=nave - 1,
+                            retardo=retardo, mascaras=mascaras)
+    fondo = recursos["ambiente"]
+    fondo_y1, fondo_y2 = 0, -ALTO
+    prev_fx_ids = set()
+    iniciar_musica(True)
+
+    with TransporteUDP(puerto, latencia=latencia_ms / 1000, jitter=jitter_ms / 1000) as red:
+        red.conectar(par)
+        while True:
+            reloj.tick(60)
+            for e in pygame.event.get():
+                if e.type == pygame.QUIT or (e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE):
+                    parar_musica()
+                    return
+
+            for datos in red.recibir():
+                try:
+                    sesion.recibir(datos)
+                except ValueError:
+                    pass   # datagrama ajeno: se ignora
+            teclas = pygame.key.get_pressed()
+            avanzo = sesion.avanzar(Entrada(izquierda=bool(teclas[pygame.K_LEFT]),
+                                            derecha=bool(teclas[pygame.K_RIGHT]),
+                                            disparo=bool(teclas[pygame.K_SPACE])))
+            red.enviar(sesion.mensaje())
+            estado = sesion.estado
+
+            # Sonidos solo del tick nuevo (si se esperó, el estado es el mismo de antes)
+            for ev in (estado.eventos if avanzo else ()):
+                if ev.tipo == EventoTipo.DISPARO:
+                    play_sound(sonidos["laser"], 0.45)
+                elif ev.tipo == EventoTipo.JEFE_ENTRA:
+                    play_sound(sonidos["alerta"], 0.35)
+                elif ev.tipo == EventoTipo.JEFE_MUERTO:
+                    play_sound(sonidos["explosion_enemy"], 0.75)
+
+            fondo_y1 = (fondo_y1 + 3) if fondo_y1 + 3 < ALTO else -ALTO
+            fondo_y2 = (fondo_y2 + 3) if fondo_y2 + 3 < ALTO else -ALTO
+            pantalla.blit(fondo, (0, fondo_y1))
+            pantalla.blit(fondo, (0, fondo_y2))
+            fx_birth_now = dibujar_escena(pantalla, estado, recursos, prev_fx_ids, HUD=True,
+                                          BOSS_HP=BOSS_HP, ANCHO=ANCHO, ALTO=ALTO)
+            for _, _, tipo in fx_birth_now - prev_fx_ids:
+                play_sound(sonidos["explosion_meteor" if tipo == "meteor" else "explosion_enemy"], 0.6)
+            prev_fx_ids = fx_birth_now
+
+            draw_text(pantalla, f"Nave {nave}  ·  Modo: {estado.modo.value}", ANCHO // 2, 36, size=18)
+            atraso = sesion.tick - sesion.confirmado
+            draw_text(pantalla, f"rollbacks {sesion.rollbacks}  predicción {max(0, atraso)} ticks"
+                                + ("  (esperando al otro)" if not avanzo else ""),
+                      ANCHO // 2, ALTO - 20, size=14)
+            if sesion.desincronizado is not None:
+                draw_text(pantalla, f"DESINCRONIZADO desde el tick {sesion.desincronizado}",
+                          ANCHO // 2, 60, size=18, color=(255, 80, 80))
+            pygame.display.flip()
+
+            # Fin: solo cuando ya no puede cambiar (sin naves en el estado confirmado)
+            _, firme = sesion.estado_confirmado()
+            if not hay_naves_vivas(firme):
+                parar_musica()
+                draw_text(pantalla, f"FIN  ·  Puntaje: {firme.puntaje}", ANCHO // 2, ALTO // 2, size=40)
+                pygame.display.flip()
+                pygame.time.wait(2500)
+                return
@@ -0,0 +1,178 @@
+import collections
+import multiprocessing
+import struct
+import time
+import pygame
+from .audio import play_sound, iniciar_musica, parar_musica
+from .renderizado import dibujar_escena
+from .assets import cargar_recursos_partida, construir_mascaras
+from .estilos_ui import draw_text
+from .anillo import AnilloCompartido
+
+from nucleo import *
+from nucleo.codec import codificar, decodificar
+from nucleo.tiempo import Acumulador, acumular
+
+# ============================================================================
+# procesos.py — Modo “en tubería”: simular y dibujar en procesos separados
+# Proceso SIMULADOR: es dueño del EstadoJuego; corre paso() a `hz` fijo con
+# la última entrada que haya y publica cada estado como instantánea
+# (nucleo.codec) en un anillo de memoria compartida.
+# Proceso de PANTALLA (este): lee el teclado, publica la entrada en otro
+# anillo y dibuja la instantánea más nueva. Ninguno espera al otro.
+#   python -m cascara_imperativa.arranque --procesos
+# Mediciones (HUD y al terminar):
+#   latencia: de que se leyó el teclado a que se ve un estado simulado con
+#             esa entrada (flip incluido)
+#   uso:      fracción del tiempo real que cada proceso pasa trabajando
+# Limitación: se mandan “estados”, no “historia”; si la pantalla se saltea
+# una instantánea, también se saltea sus sonidos.
+# ============================================================================
+
+SEMILLA_PROCESOS = 42
+SALIR = 0x80                           # bit extra en la entrada: “terminá”
+_ENTRADA = struct.Struct("<Bd")        # bits | hora de lectura del teclado
+_FOTO = struct.Struct("<Idd")          # tick | hora de la entrada usada | uso del simulador
+TAM_FOTO = 256 * 1024                  # típica ~150-2000 bytes; con la cortina del jefe llena, ~100 KB
+
+
+def _simulador(nombre_entradas: str, nombre_fotos: str, semilla: int, hz: int, mascaras):
+    """Cuerpo del proceso simulador (solo núcleo + anillos: nada de pygame)."""
+    entradas, fotos = AnilloCompartido(nombre_entradas), AnilloCompartido(nombre_fotos)
+    try:
+        estado, tick = inicializar_juego(semilla), 0
+        bits, hora_entrada = 0, 0.0
+        acum, antes = Acumulador(hz, max(1, hz // 10)), time.monotonic()
+        inicio, ocupado = antes, 0.0
+        while True:
+            ahora = time.monotonic()
+            acum, n = acumular(acum, ahora - antes)
+            antes = ahora
+            ultima = entradas.ultimo()
+            if ultima is not None:
+                bits, hora_entrada = _ENTRADA.unpack(ultima[1])
+                if bits & SALIR:
+                    return
+            if n:
+                for _ in range(n):
+                    estado = paso(estado, Entrada.desde_bits(bits), mascaras)
+                    tick += 1
+                    if not estado.jugador.vivo:
+                        break
+                cuerpo = codificar(estado)
+                fin = time.monotonic()
+                ocupado += fin - ahora
+                fotos.publicar(_FOTO.pack(tick, hora_entrada, ocupado / max(1e-9, fin - inicio)) + cuerpo)
+                if not estado.jugador.vivo:
+                    return
+            # Dormir hasta el próximo tick (el resto del acumulador dice cuánto falta)
+            time.sleep(max(0.0, acum.paso - acum.resto - (time.monotonic() - antes)))
+    finally:
+        entradas.cerrar()
+        fotos.cerrar()
+
+
+def _percentil(valores, p: float) -> float:
+    orden = sorted(valores)
+    return orden[min(len(orden) - 1, int(p * len(orden)))] if orden else 0.0
+
+
+def ejecutar_en_procesos(pantalla, reloj, recursos, sonidos, fps=60, hz=60, ANCHO=800, ALTO=600) -> dict:
+    """
+    Juega una partida con la simulación en otro proceso. Vuelve al morir
+    (o con ESC) con las mediciones: latencia_ms_p50/p95/max, uso_simulador,
+    uso_pantalla, fotos (dibujadas) y salteadas (publicadas y no vistas).
+    """
+    cargar_recursos_partida(recursos)
+    mascaras = construir_mascaras(recursos)
+    fondo = recursos["ambiente"]
+    fondo_y1, fondo_y2 = 0, -ALTO
+    prev_fx_ids = set()
+    latencias = collections.deque(maxlen=4096)   # las últimas ~minuto a 60 FPS
+    iniciar_musica(True)
+
+    # spawn: el simulador arranca limpio (sin heredar SDL/audio de este proceso)
+    ctx = multiprocessing.get_context("spawn")
+    with AnilloCompartido(ranuras=4, tam=_ENTRADA.size) as entradas, \
+            AnilloCompartido(ranuras=8, tam=TAM_FOTO) as fotos:
+        proceso = ctx.Process(target=_simulador, daemon=True,
+                              args=(entradas.nombre, fotos.nombre, SEMILLA_PROCESOS, hz, mascaras))
+        proceso.start()
+        estado, visto, dibujadas, uso_sim = None, 0, 0, 0.0
+        hora_vista = None
+        inicio, ocupado = time.monotonic(), 0.0
+        try:
+            while True:
+                reloj.tick(fps)
+                t0 = time.monotonic()
+                salir = False
+                for e in pygame.event.get():
+                    if e.type == pygame.QUIT or (e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE):
+                        salir = True
+                teclas = pygame.key.get_pressed()
+                bits = Entrada(izquierda=bool(teclas[pygame.K_LEFT]),
+                               derecha=bool(teclas[pygame.K_RIGHT]),
+                               disparo=bool(teclas[pygame.K_SPACE])).bits()
+                entradas.publicar(_ENTRADA.pack(bits | (SALIR if salir else 0), t0))
+                if salir:
+                    break
+
+                foto = fotos.ultimo()
+                nueva = foto is not None and foto[0] != visto
+                if nueva:
+                    visto = foto[0]
+                    _, hora_entrada, uso_sim = _FOTO.unpack_from(foto[1])
+                    estado = decodificar(foto[1][_FOTO.size:])
+                    dibujadas += 1
+                    for ev in estado.eventos:
+                        if ev.tipo == EventoTipo.DISPARO:
+                            play_sound(sonidos["laser"], 0.55)
+                        elif ev.tipo == EventoTipo.JEFE_ENTRA:
+                            play_sound(sonidos["alerta"], 0.35)
+                        elif ev.tipo == EventoTipo.JEFE_MUERTO:
+                            play_sound(sonidos["explosion_enemy"], 0.75)
+                elif not proceso.is_alive() and proceso.exitcode:
+                    raise RuntimeError(f"el simulador terminó con código {proceso.exitcode}")
+                if estado is None:
+                    continue
+
+                fondo_y1 = (fondo_y1 + 3) if fondo_y1 + 3 < ALTO else -ALTO
+                fondo_y2 = (fondo_y2 + 3) if fondo_y2 + 3 < ALTO else -ALTO
+                pantalla.blit(fondo, (0, fondo_y1))
+                pantalla.blit(fondo, (0, fondo_y2))
+                fx_birth_now = dibujar_escena(pantalla, estado, recursos, prev_fx_ids, HUD=True,
+                                              BOSS_HP=BOSS_HP, ANCHO=ANCHO, ALTO=ALTO)
+                for _, _, tipo in fx_birth_now - prev_fx_ids:
+                    play_sound(sonidos["explosion_meteor" if tipo == "meteor" else "explosion_enemy"], 0.6)
+                prev_fx_ids = fx_birth_now
+                uso_pan = ocupado / max(1e-9, t0 - inicio)
+                draw_text(pantalla, f"latencia {1000 * _percentil(latencias, 0.5):.0f} ms  ·  "
+                                    f"uso sim {100 * uso_sim:.0f}%  pantalla {100 * uso_pan:.0f}%",
+                          ANCHO // 2, ALTO - 20, size=14)
+                pygame.display.flip()
+                t1 = time.monotonic()
+                ocupado += t1 - t0
+                # Una sola medición por entrada nueva: la primera vez que se ve en pantalla
+                if nueva and hora_entrada != hora_vista:
+                    hora_vista = hora_entrada
+                    latencias.append(t1 - hora_entrada)
+
+                if not estado.jugador.vivo:
+                    parar_musica()
+                    pygame.time.wait(1500)
+                    break
+        finally:
+            proceso.join(timeout=2)
+            if proceso.is_alive():
+                proceso.terminate()
+
+    parar_musica()
+    return {
+        "latencia_ms_p50": 1000 * _percentil(latencias, 0.5),
+        "latencia_ms_p95": 1000 * _percentil(latencias, 0.95),
+        "latencia_ms_max": 1000 * max(latencias, default=0.0),
+        "uso_simulador": uso_sim,
+        "uso_pantalla": ocupado / max(1e-9, time.monotonic() - inicio),
+        "fotos": dibujadas,
+        "salteadas": max(0, visto - dibujadas),
+    }
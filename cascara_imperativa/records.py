@@ -1,9 +1,15 @@
 # cascara_imperativa/records.py
 import os
+import re
+import time
 from typing import Dict, Tuple, List
 
+from nucleo.repeticion import Repeticion, guardar
+
 # Archivo de récords junto al paquete
 RECORDS_PATH = os.path.join(os.path.dirname(__file__), "records.txt")
+# Carpeta de repeticiones (una por partida terminada), también junto al paquete
+REPETICIONES_DIR = os.path.join(os.path.dirname(__file__), "repeticiones")
 
 # En memoria: nombre_normalizado -> (nombre_mostrado, mejor_puntaje)
 _best: Dict[str, Tuple[str, int]] = {}
@@ -101,4 +107,13 @@ def top3() -> List[Tuple[str, int]]:
 def todos() -> List[Tuple[str, int]]:
     """(Opcional) Devuelve todos los récords ordenados desc."""
     _ensure_loaded()
-    return sorted(_best.values(), key=lambda x: x[1], reverse=True)
\ No newline at end of file
+    return sorted(_best.values(), key=lambda x: x[1], reverse=True)
+
+
+def guardar_repeticion(nombre: str, rep: Repeticion) -> str:
+    """Guarda la partida como <fecha>-<nombre>.rep y devuelve la ruta."""
+    os.makedirs(REPETICIONES_DIR, exist_ok=True)
+    limpio = re.sub(r"[^A-Za-z0-9_-]+", "_", (nombre or "").strip()) or "jugador"
+    ruta = os.path.join(REPETICIONES_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{limpio}.rep")
+    guardar(ruta, rep)
+    return ruta
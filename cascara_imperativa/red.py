@@ -0,0 +1,87 @@
+import heapq
+import random
+import socket
+import time
+from typing import List, Optional, Tuple
+
+# ============================================================================
+# red.py — Transporte UDP entre dos instancias del juego (localhost)
+# No bloquea NUNCA: enviar() encola y recibir() vacía el socket sin esperar,
+# así el bucle sigue a 60 FPS pase lo que pase en la red.
+# Para probar el netcode sin otra máquina, la latencia/jitter/pérdida se
+# SIMULAN al enviar: cada paquete sale recién a su “hora de llegada”.
+#   latencia = ida (RTT ≈ 2 × latencia), jitter = ± al azar (puede desordenar)
+# ============================================================================
+
+HOST = "127.0.0.1"
+
+
+class TransporteUDP:
+    """
+    Un extremo UDP. puerto=0 elige uno libre (ver .puerto); el destino se
+    puede dar al crear o después con conectar(). Usar con `with` o cerrar().
+    """
+
+    def __init__(self, puerto: int = 0, destino: Optional[Tuple[str, int]] = None,
+                 latencia: float = 0.0, jitter: float = 0.0, perdida: float = 0.0,
+                 semilla: int = 0, reloj=time.monotonic, host: str = HOST):
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.bind((host, puerto))
+        self._sock.setblocking(False)
+        self.puerto = self._sock.getsockname()[1]
+        self.destino = destino
+        self.latencia, self.jitter, self.perdida = latencia, jitter, perdida
+        self._reloj = reloj
+        self._azar = random.Random(semilla)
+        self._cola = []          # (hora_de_salida, orden, datos)
+        self._orden = 0
+        self.enviados = self.perdidos = self.recibidos = 0
+
+    def conectar(self, puerto: int, host: str = HOST):
+        self.destino = (host, puerto)
+
+    def enviar(self, datos: bytes):
+        """Encola un datagrama (con su demora simulada); sale en el próximo recibir()."""
+        if self.perdida and self._azar.random() < self.perdida:
+            self.perdidos += 1
+            return
+        demora = self.latencia + (self._azar.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+        heapq.heappush(self._cola, (self._reloj() + max(0.0, demora), self._orden, datos))
+        self._orden += 1
+        self._despachar()
+
+    def _despachar(self):
+        ahora = self._reloj()
+        while self._cola and self._cola[0][0] <= ahora:
+            _, _, datos = heapq.heappop(self._cola)
+            if self.destino is None:
+                continue
+            try:
+                self._sock.sendto(datos, self.destino)
+                self.enviados += 1
+            except OSError:
+                pass   # el otro todavía no abrió su puerto (o ya cerró): UDP no garantiza nada
+
+    def recibir(self) -> List[bytes]:
+        """Despacha lo que ya “llegó” y devuelve los datagramas recibidos (sin esperar)."""
+        self._despachar()
+        recibidos = []
+        while True:
+            try:
+                datos, _ = self._sock.recvfrom(2048)
+            except ConnectionError:
+                continue   # ICMP “puerto cerrado” de un envío anterior: se ignora
+            except OSError:
+                break      # vacío (BlockingIOError) o socket cerrado
+            recibidos.append(datos)
+        self.recibidos += len(recibidos)
+        return recibidos
+
+    def cerrar(self):
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
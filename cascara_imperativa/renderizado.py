@@ -1,5 +1,6 @@
 import pygame
 from .estilos_ui import draw_text, draw_hearts
+from nucleo.partes import ARMAZON, NUCLEO
 
 def draw_boss_bar(surface, x, y, vida, total):
     w, h = 320, 14
@@ -8,18 +9,43 @@ def draw_boss_bar(surface, x, y, vida, total):
     pygame.draw.rect(surface, (180, 0, 0), (x, y, int(w*pct), h), border_radius=4)
     pygame.draw.rect(surface, (230, 230, 230), (x, y, w, h), 2, border_radius=4)
 
+def _img_bala_jefe(recursos):
+    # Se dibuja una vez (círculo con borde) y se reusa para toda la cortina
+    img = recursos.get("img_bala_jefe")
+    if img is None:
+        r = 6
+        img = pygame.Surface((2 * r, 2 * r), pygame.SRCALPHA)
+        pygame.draw.circle(img, (255, 90, 160), (r, r), r)
+        pygame.draw.circle(img, (255, 230, 245), (r, r), r - 3)
+        recursos["img_bala_jefe"] = img
+    return img
+
+def _dibujar_partes(pantalla, boss):
+    # Jefe por partes: las rotas quedan como un hueco oscuro y las vivas
+    # dañadas se marcan con un borde (rojo si es el núcleo)
+    for p, vida in zip(ARMAZON, boss.partes):
+        rect = (boss.x + p.x, boss.y + p.y, p.w, p.h)
+        if vida <= 0:
+            pygame.draw.rect(pantalla, (25, 20, 30), rect, border_radius=4)
+        elif vida < p.vida:
+            color = (255, 60, 60) if p.tipo == NUCLEO else (255, 200, 80)
+            pygame.draw.rect(pantalla, color, rect, 2, border_radius=4)
+
+def _dibujar_nave(pantalla, img_jugador, jug):
+    # Parpadeo más notorio (≈ 4 veces por segundo a 60 FPS) si está invulnerable
+    if jug.invul_frames <= 0 or (jug.invul_frames // 15) % 2 == 0:
+        pantalla.blit(img_jugador, (jug.x, jug.y))
+
 def dibujar_escena(pantalla, estado, recursos, prev_fx_ids,
                    HUD=True, BOSS_HP=600, ANCHO=800, ALTO=600):
     # --- Jugador con efecto de daño (parpadeo si está invulnerable) ---
-    jug = estado.jugador
     img_jugador = recursos["img_jugador"]
-
-    if jug.invul_frames > 0:
-        # Parpadeo más notorio (≈ 4 veces por segundo a 60 FPS)
-        if (jug.invul_frames // 15) % 2 == 0:
-            pantalla.blit(img_jugador, (jug.x, jug.y))
-    else:
-        pantalla.blit(img_jugador, (jug.x, jug.y))
+    jug2 = estado.jugador2
+    if jug2 is None or estado.jugador.vivo:
+        _dibujar_nave(pantalla, img_jugador, estado.jugador)
+    # --- Segunda nave (cooperativo): mismo sprite, solo mientras viva ---
+    if jug2 is not None and jug2.vivo:
+        _dibujar_nave(pantalla, img_jugador, jug2)
 
     # --- Meteoros ---
     for m in estado.meteoros:
@@ -34,6 +60,8 @@ def dibujar_escena(pantalla, estado, recursos, prev_fx_ids,
         img_boss = recursos.get("img_boss")
         if img_boss:
             pantalla.blit(img_boss, (estado.boss.x, estado.boss.y))
+        if estado.boss.partes:
+            _dibujar_partes(pantalla, estado.boss)
         draw_boss_bar(pantalla, ANCHO//2 - 160, 56, estado.boss.vida, BOSS_HP)
 
     # --- Balas ---
@@ -41,6 +69,13 @@ def dibujar_escena(pantalla, estado, recursos, prev_fx_ids,
         pantalla.blit(recursos["img_bala_enemiga"], (be.x, be.y))
     for b in estado.balas:
         pantalla.blit(recursos["img_bala"], (b.x, b.y))
+    # Cortina del jefe (pueden ser miles): un solo blits() con la misma imagen
+    cortina = getattr(estado, "cortina", None)
+    if cortina:
+        img = _img_bala_jefe(recursos)
+        r = img.get_width() // 2
+        xs, ys = cortina.posiciones()
+        pantalla.blits([(img, (x - r, y - r)) for x, y in zip(xs, ys)], doreturn=False)
 
     # --- FX: nacimiento (para audio afuera) ---
     fx_birth_now = set()
@@ -82,5 +117,7 @@ def dibujar_escena(pantalla, estado, recursos, prev_fx_ids,
         draw_text(pantalla, f"Puntaje: {estado.puntaje}", ANCHO//2, 8, size=24)
        #-- draw_text(pantalla, f"Dif: {estado.ia.dificultad:.1f}", 742, 8, size=18, anchor="topright")
         draw_hearts(pantalla, 12, 8, estado.jugador.corazones, max_hearts=7, size=22, spacing=6)
+        if jug2 is not None:
+            draw_hearts(pantalla, ANCHO - 12 - 7 * 28, 8, jug2.corazones, max_hearts=7, size=22, spacing=6)
 
     return fx_birth_now
\ No newline at end of file
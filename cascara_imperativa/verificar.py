@@ -0,0 +1,37 @@
+# cascara_imperativa/verificar.py
+# Verificador de repeticiones con las MISMAS máscaras de colisión que usa el
+# juego (salen de los sprites, así que hace falta pygame, aunque sin ventana).
+# Uso:  python -m cascara_imperativa.verificar cascara_imperativa/repeticiones/*.rep
+import argparse
+import os
+import sys
+
+from nucleo.repeticion import verificar_archivos
+
+
+def mascaras_del_juego(ANCHO=800, ALTO=600):
+    """Carga los sprites sin mostrar nada y arma las máscaras como en el juego."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from .assets import cargar_recursos, cargar_recursos_partida, construir_mascaras
+    pygame.display.init()
+    pygame.display.set_mode((ANCHO, ALTO))
+    recursos = cargar_recursos_partida(cargar_recursos(ANCHO, ALTO))
+    return construir_mascaras(recursos)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m cascara_imperativa.verificar",
+                                 description="Verifica repeticiones del juego re-simulándolas sin ventana")
+    ap.add_argument("rutas", nargs="+")
+    ap.add_argument("--sin-mascaras", action="store_true", help="para repeticiones grabadas sin máscaras")
+    args = ap.parse_args(argv)
+    try:
+        return verificar_archivos(args.rutas, None if args.sin_mascaras else mascaras_del_juego())
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,53 @@
+import pygame
+from .renderizado import dibujar_escena
+from .estilos_ui import draw_text
+
+from nucleo.constantes import BOSS_HP
+
+# ============================================================================
+# viaje.py — Pantalla de “viaje en el tiempo” (debug, tecla F3 en el juego)
+# Congela la partida y deja recorrer la historia (nucleo.historial):
+#   ← / →        un tick (manteniendo: sigue corriendo)
+#   SHIFT + ← →  de a 10 ticks
+#   INICIO / FIN  el tick más viejo guardado / el presente
+#   ENTER         retomar la partida DESDE el tick que se ve (se olvida el futuro)
+#   F3 / ESC      volver al presente sin tocar nada
+# ============================================================================
+
+
+def viajar(pantalla, reloj, historial, recursos, fondo, ANCHO=800, ALTO=600):
+    """
+    Devuelve el tick desde el que hay que retomar (ENTER) o None para
+    seguir donde estaba la partida.
+    """
+    tick = historial.ultimo
+    while True:
+        reloj.tick(60)
+        for e in pygame.event.get():
+            if e.type == pygame.QUIT or (e.type == pygame.KEYDOWN and e.key in (pygame.K_F3, pygame.K_ESCAPE)):
+                return None
+            if e.type == pygame.KEYDOWN:
+                if e.key == pygame.K_RETURN:
+                    return tick
+                if e.key == pygame.K_HOME:
+                    tick = historial.primero
+                elif e.key == pygame.K_END:
+                    tick = historial.ultimo
+
+        teclas = pygame.key.get_pressed()
+        salto = 10 if teclas[pygame.K_LSHIFT] or teclas[pygame.K_RSHIFT] else 1
+        if teclas[pygame.K_LEFT]:
+            tick = max(historial.primero, tick - salto)
+        elif teclas[pygame.K_RIGHT]:
+            tick = min(historial.ultimo, tick + salto)
+
+        pantalla.blit(fondo, (0, 0))
+        dibujar_escena(pantalla, historial.estado(tick), recursos, set(), HUD=True,
+                       BOSS_HP=BOSS_HP, ANCHO=ANCHO, ALTO=ALTO)
+        atras = historial.ultimo - tick
+        draw_text(pantalla, f"VIAJE · tick {tick}" + (f" (−{atras / 60:.1f} s)" if atras else " (presente)"),
+                  ANCHO // 2, 60, size=22, color=(120, 220, 255))
+        draw_text(pantalla, f"guardado {historial.primero}–{historial.ultimo}  ·  {historial.bytes // 1024} KB"
+                            "  ·  ←/→ SHIFT INICIO FIN  ·  ENTER retomar  ·  F3 volver",
+                  ANCHO // 2, ALTO - 20, size=14)
+        pygame.display.flip()
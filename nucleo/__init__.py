@@ -3,27 +3,38 @@
 from .constantes     import *            # <-- aquí viene BOSS_HP
 from .enums_eventos   import ModoJuego, EventoTipo, Evento
 from .estados        import *
-from .rng            import siguiente_semilla, azar_en_rango
-from .geom           import _rects_collide, _clamp
+from .rng            import siguiente_semilla, azar_en_rango, flujo_de, azar_flujo, lote, lote_rangos, saltar
+from .geom           import _rects_collide, _swept_collide, _clamp
+from .edicion        import EdicionJuego, editar
+from .mascaras       import MascaraBits, empaquetar_filas, mascara_llena
+from .broadphase     import construir_rejilla, consultar, pares_en_colision, pares
 
 from .jugador        import mover_jugador, disparar_bala, actualizar_balas
 from .meteoritos     import actualizar_meteoros, reponer_meteoros
 from .enemigos       import actualizar_enemigos_ia, logica_disparo_enemigo, actualizar_balas_enemigas
 from .jefe           import crear_jefe, actualizar_jefe, disparo_jefe
-from .colisiones     import detectar_colisiones, detectar_colisiones_enemigo, detectar_colisiones_jefe, avanzar_explosiones
+from .colisiones     import resolver_colisiones, CAPAS, detectar_colisiones, detectar_colisiones_enemigo, detectar_colisiones_jefe, avanzar_explosiones
 from .flujo          import inicializar_juego, logica_juego, ajustar_ia, predecir_jugador   # <-- ¡aquí!
 from .flujo import inicializar_juego, logica_juego, ajustar_ia, predecir_jugador
+from .paso           import Entrada, paso
 
 
 __all__ = [
     "ModoJuego", "EventoTipo", "Evento",
     # constantes usadas fuera (incluye BOSS_HP):
-    "BOSS_W", "BOSS_H", "BOSS_HP",
+    "BOSS_W", "BOSS_H", "BOSS_HP", "FIRE_RATE_FRAMES", "SPAWN_GRACE_TICKS",
     # estados:
     "EstadoJuego", "EstadoJugador", "EstadoMeteoro", "EstadoEnemigo",
     "EstadoBala", "EstadoBalaEnemiga", "EstadoBoss", "EstadoIA", "EstadoExplosion",
     # rng / geom:
-    "siguiente_semilla", "azar_en_rango", "_rects_collide", "_clamp",
+    "siguiente_semilla", "azar_en_rango", "flujo_de", "azar_flujo", "lote", "lote_rangos", "saltar",
+    "_rects_collide", "_swept_collide", "_clamp",
+    # edición transitoria (un solo “congelar” por tick):
+    "EdicionJuego", "editar",
+    # máscaras:
+    "MascaraBits", "empaquetar_filas", "mascara_llena",
+    # broadphase:
+    "construir_rejilla", "consultar", "pares_en_colision", "pares",
     # jugador:
     "mover_jugador", "disparar_bala", "actualizar_balas",
     # meteoritos:
@@ -33,7 +44,10 @@ __all__ = [
     # jefe:
     "crear_jefe", "actualizar_jefe", "disparo_jefe",
     # colisiones:
+    "resolver_colisiones", "CAPAS",
     "detectar_colisiones", "detectar_colisiones_enemigo", "detectar_colisiones_jefe", "avanzar_explosiones",
     # flujo / IA:
     "inicializar_juego", "logica_juego", "ajustar_ia", "predecir_jugador",
+    # tick completo (puro):
+    "Entrada", "paso",
 ]
\ No newline at end of file
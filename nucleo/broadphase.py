@@ -0,0 +1,120 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, Tuple
+from .constantes import ANCHO, ALTO
+from .geom import _rects_collide
+from . import vectorizado
+
+# ============================================================================
+# broadphase.py — Rejilla uniforme (spatial hash) para colisiones
+# En vez de comparar TODAS las balas contra TODOS los objetivos (M×B),
+# repartimos los rectángulos en celdas fijas y solo probamos los pares
+# que comparten celda. La rejilla se arma una vez y luego solo se consulta.
+# Todo es puro: construir y consultar no modifica nada.
+# ============================================================================
+
+# --- Tamaño de celda derivado de la ventana (8×6 celdas de 100×100 px) ---
+CELDAS_X, CELDAS_Y = 8, 6
+CELDA_W = ANCHO // CELDAS_X
+CELDA_H = ALTO // CELDAS_Y
+
+# Con tan pocos pares el barrido directo gana a armar la rejilla
+PARES_DIRECTOS = 64
+
+Rect = Tuple[int, int, int, int]   # (x, y, ancho, alto)
+
+
+@dataclass(frozen=True)
+class Rejilla:
+    """
+    Rejilla de solo lectura:
+    - rects: los rectángulos indexados (mismo orden que la tupla original)
+    - celdas: (cx, cy) -> índices de rects que tocan esa celda
+    """
+    rects: Tuple[Rect, ...]
+    celdas: Dict[Tuple[int, int], Tuple[int, ...]]
+
+
+def _rango_celdas(x: int, y: int, w: int, h: int):
+    """
+    Columnas y filas de celdas que cubre un rectángulo.
+    Usamos x + w - 1 porque el AABB es estricto (<): el borde derecho no cuenta.
+    La división entera funciona también con coordenadas negativas (fuera de pantalla).
+    """
+    cx0, cx1 = x // CELDA_W, (x + max(w, 1) - 1) // CELDA_W
+    cy0, cy1 = y // CELDA_H, (y + max(h, 1) - 1) // CELDA_H
+    return range(cx0, cx1 + 1), range(cy0, cy1 + 1)
+
+
+def construir_rejilla(rects: Iterable[Rect]) -> Rejilla:
+    """
+    Reparte cada rectángulo en todas las celdas que toca.
+    Devuelve una Rejilla nueva (los índices respetan el orden de entrada).
+    """
+    rects = tuple(rects)
+    celdas: Dict[Tuple[int, int], list] = {}
+    for i, (x, y, w, h) in enumerate(rects):
+        cols, filas = _rango_celdas(x, y, w, h)
+        for cx in cols:
+            for cy in filas:
+                celdas.setdefault((cx, cy), []).append(i)
+    return Rejilla(rects=rects, celdas={k: tuple(v) for k, v in celdas.items()})
+
+
+def consultar(rejilla: Rejilla, x: int, y: int, w: int, h: int) -> Tuple[int, ...]:
+    """
+    Índices (ordenados y sin repetir) de los rectángulos de la rejilla
+    que chocan con el rectángulo (x, y, w, h).
+    El orden ascendente importa: así se respeta el “primer impacto gana”
+    de los bucles originales.
+    """
+    cols, filas = _rango_celdas(x, y, w, h)
+    celdas = rejilla.celdas
+    if len(cols) == 1 and len(filas) == 1:
+        # Caso típico (balas chicas): una celda, índices ya vienen en orden
+        candidatos = celdas.get((cols[0], filas[0]), ())
+    else:
+        vistos = set()
+        for cx in cols:
+            for cy in filas:
+                vistos.update(celdas.get((cx, cy), ()))
+        candidatos = sorted(vistos)
+    if not candidatos:
+        return ()
+    # Narrowphase AABB (misma regla que _rects_collide, en línea por velocidad)
+    x2, y2 = x + w, y + h
+    rects = rejilla.rects
+    res = []
+    for i in candidatos:
+        bx, by, bw, bh = rects[i]
+        if x < bx + bw and x2 > bx and y < by + bh and y2 > by:
+            res.append(i)
+    return tuple(res)
+
+
+def pares_en_colision(rects_a: Iterable[Rect], rejilla_b: Rejilla) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Para cada rectángulo de A, la tupla de índices de B con los que choca.
+    Cada par (a, b) se prueba UNA sola vez.
+    """
+    return tuple(consultar(rejilla_b, *r) for r in rects_a)
+
+
+def pares(rects_a: Iterable[Rect], rects_b: Iterable[Rect]) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Punto de entrada con selección automática del “kernel”:
+    - una consulta o escena mínima → barrido directo
+    - escenas medianas → rejilla uniforme (solo librería estándar)
+    - muchos pares y NumPy instalado → matriz de impactos vectorizada
+    Los tres caminos devuelven exactamente lo mismo.
+    """
+    rects_a, rects_b = tuple(rects_a), tuple(rects_b)
+    if vectorizado.conviene(len(rects_a), len(rects_b)):
+        return vectorizado.pares_en_colision_np(rects_a, rects_b)
+    if len(rects_a) <= 1 or len(rects_a) * len(rects_b) <= PARES_DIRECTOS:
+        # Una sola consulta (jugador, jefe) o escena mínima: armar la rejilla
+        # costaría más que el barrido directo
+        return tuple(
+            tuple(i for i, b in enumerate(rects_b) if _rects_collide(*a, *b))
+            for a in rects_a
+        )
+    return pares_en_colision(rects_a, construir_rejilla(rects_b))
@@ -0,0 +1,518 @@
+import struct
+import sys
+from bisect import bisect_right
+from array import array
+from dataclasses import fields
+from typing import Optional, Tuple
+from .enums_eventos import Evento, EventoTipo, ModoJuego
+from .estados import (
+    EstadoJugador, EstadoMeteoro, EstadoBala, EstadoBalaEnemiga, EstadoEnemigo,
+    EstadoBoss, EstadoExplosion, EstadoIA, EstadoJuego,
+)
+from .patrones import Cortina
+
+# ============================================================================
+# codec.py — Instantáneas binarias compactas de EstadoJuego (con versión)
+# pickle de dataclasses anidadas es lento y pesado (guarda nombres de clase
+# y de campo en cada objeto). Acá cada clase tiene un ESQUEMA explícito:
+#   i → entero con zigzag + varint (1 byte si |n| < 64)
+#   b → booleano, todos los de la entidad juntos en UN byte de bits
+#   f → float64 exacto (struct "<d")
+#   e → índice en una lista fija de valores (fase, tipo de explosión)
+#   t → tupla de enteros (largo + cada uno; vida de las partes del jefe)
+# y de cada esquema se GENERA (con exec, una vez al importar, como en
+# estados.py) su codificador/decodificador sin bucles por campo.
+#   datos = codificar(estado)                 # instantánea completa
+#   delta = codificar(estado, anterior)       # solo diferencias
+#   estado = decodificar(delta, anterior)
+# En un delta los campos que no cambiaron (mismo objeto) no se escriben y
+# los enteros van como diferencia con la entidad de igual índice del estado
+# anterior: casi todo cabe en 1 byte. Cambiar un esquema = subir VERSION.
+# La cortina del jefe (miles de balas) va aparte: sus columnas float64 se
+# copian tal cual (little endian). Una bala no cambia después de nacer, así
+# que el delta es: qué índices del estado anterior se fueron + las nuevas.
+# ============================================================================
+
+MAGIA = b"EJ"
+VERSION = 6   # 2: jugador2/fire_cooldown2 (cooperativo); 3: flujos de azar; 4: enemigos por tabla;
+              # 5: patrones del jefe (cortina); 6: jefe por partes
+COMPLETO, DELTA = 0, 1
+_CABECERA = struct.Struct("<2sBB")
+_F64 = struct.Struct("<d")
+
+_VALORES = {
+    "fase": ("rest", "burst"),
+    "tipo": ("meteor", "enemy"),
+}
+
+ESQUEMAS = {
+    EstadoJugador: "x:i y:i corazones:i vivo:b invul_frames:i",
+    EstadoMeteoro: "x:i y:i velocidad_x:i velocidad_y:i ancho:i alto:i",
+    EstadoBala: "x:i y:i velocidad_y:i activa:b",
+    EstadoBalaEnemiga: "x:i y:i velocidad_y:i velocidad_x:i activa:b",
+    EstadoEnemigo: ("x:i y:i velocidad_x:i direccion:i vivo:b explotando:b temporizador_explosion:i "
+                    "patrulla_min_x:i patrulla_max_x:i cooldown:i spawn_protect:i entrando:b y_objetivo:i "
+                    "tramo:i t:i ancla_x:i ancla_y:i"),
+    EstadoBoss: ("x:i y:i vida:i vivo:b entrando:b y_objetivo:i cooldown:i fase:e fase_timer:i "
+                 "disparos_en_rafaga:i cadencia_frames:i pausa_frames:i max_disparos_rafaga:i patron:i patron_t:i "
+                 "partes:t"),
+    EstadoExplosion: "x:i y:i tipo:e timer:i",
+    EstadoIA: ("dificultad:f velocidad_reaccion:f ultimo_x_jugador:i oleada:i siguiente_tam:i "
+               "wave_cooldown:i mix_threshold:i mixed_waves_spawned:i mixed_rounds_target:i "
+               "reponer_meteoros:b preboss_pause:i meteor_bonus:i cycles:i"),
+}
+
+_MODOS = tuple(ModoJuego)
+_EVENTOS = tuple(EventoTipo)
+
+
+# --- varints --------------------------------------------------------------------
+def poner_varint(salida: bytearray, n: int):
+    """Entero sin signo en bytes de 7 bits (el bit alto dice “sigue”)."""
+    while n >= 0x80:
+        salida.append((n & 0x7F) | 0x80)
+        n >>= 7
+    salida.append(n)
+
+
+def leer_varint(datos: bytes, i: int) -> Tuple[int, int]:
+    """(valor, siguiente_posición). ValueError si los datos se cortan."""
+    n = corrimiento = 0
+    while True:
+        if i >= len(datos):
+            raise ValueError("datos truncados (varint incompleto)")
+        b = datos[i]
+        i += 1
+        n |= (b & 0x7F) << corrimiento
+        if b < 0x80:
+            return n, i
+        corrimiento += 7
+
+
+def _varint_resto(datos: bytes, i: int, primero: int) -> Tuple[int, int]:
+    # El primer byte ya se leyó (y tenía el bit “sigue”)
+    resto, i = leer_varint(datos, i)
+    return (primero & 0x7F) | (resto << 7), i
+
+
+def zigzag(n: int) -> int:
+    """Entero con signo → sin signo chico: 0, -1, 1, -2… → 0, 1, 2, 3…"""
+    return n << 1 if n >= 0 else (~n << 1) | 1
+
+
+def _entero(out: bytearray, n: int):
+    poner_varint(out, zigzag(n))
+
+
+def _tupla(out: bytearray, t, previa=()):
+    """Tupla de enteros: largo + cada uno (como diferencia con el de igual índice de `previa`)."""
+    poner_varint(out, len(t))
+    for k, v in enumerate(t):
+        _entero(out, v - previa[k] if k < len(previa) else v)
+
+
+def _leer_entero(datos: bytes, i: int) -> Tuple[int, int]:
+    v, i = leer_varint(datos, i)
+    return (v >> 1) ^ -(v & 1), i
+
+
+def _leer_tupla(datos: bytes, i: int, previa=()) -> Tuple[Tuple[int, ...], int]:
+    n, i = leer_varint(datos, i)
+    out = []
+    for k in range(n):
+        v, i = _leer_entero(datos, i)
+        out.append(v + previa[k] if k < len(previa) else v)
+    return tuple(out), i
+
+
+# --- generación de codificadores por esquema -----------------------------------
+def _generar(cls, esquema: str):
+    """
+    Arma (con exec) cuatro funciones para `cls`:
+      cod(o, out) / cod_delta(o, previo, out) → escriben en el bytearray
+      dec(d, i) / dec_delta(d, i, previo)     → (objeto, siguiente_posición)
+    """
+    campos = [c.split(":") for c in esquema.split()]
+    nombres = [f.name for f in fields(cls)]
+    if [n for n, _ in campos] != nombres:
+        raise TypeError(f"el esquema de {cls.__name__} no coincide con sus campos: subir VERSION y actualizarlo")
+    bools = [n for n, t in campos if t == "b"]
+    if len(bools) > 7:
+        raise TypeError("más de 7 booleanos no entran en un byte de bits")
+
+    def cuerpo_cod(delta: bool) -> str:
+        lineas = []
+        for n, t in campos:
+            if t == "i":
+                lineas.append(f"    v = o.{n}" + (f" - p.{n}" if delta else ""))
+                lineas.append("    v = v << 1 if v >= 0 else (~v << 1) | 1")
+                lineas.append("    if v < 128: ap(v)\n    else: _var(out, v)")
+            elif t == "f":
+                lineas.append(f"    out += _pf(o.{n})")
+            elif t == "e":
+                lineas.append(f"    ap(_idx_{n}[o.{n}])")
+            elif t == "t":
+                lineas.append(f"    _tup(out, o.{n}" + (f", p.{n})" if delta else ")"))
+        if bools:
+            bits = " | ".join(f"({1 << k} if o.{n} else 0)" for k, n in enumerate(bools))
+            lineas.append(f"    ap({bits})")
+        return "\n".join(lineas) + "\n"
+
+    def cuerpo_dec(delta: bool) -> str:
+        lineas = []
+        for n, t in campos:
+            if t == "i":
+                lineas.append("    v = d[i]; i += 1")
+                lineas.append("    if v >= 128: v, i = _resto(d, i, v)")
+                lineas.append(f"    {n} = " + (f"p.{n} + " if delta else "") + "((v >> 1) ^ -(v & 1))")
+            elif t == "f":
+                lineas.append(f"    {n}, = _uf(d, i); i += 8")
+            elif t == "e":
+                lineas.append(f"    {n} = _val_{n}[d[i]]; i += 1")
+            elif t == "t":
+                lineas.append(f"    {n}, i = _ltup(d, i" + (f", p.{n})" if delta else ")"))
+        if bools:
+            lineas.append("    bits = d[i]; i += 1")
+            for k, n in enumerate(bools):
+                lineas.append(f"    {n} = bool(bits & {1 << k})")
+        # Igual que los .con de estados.py: sin __init__ congelado
+        lineas.append("    c = _nuevo(_cls)")
+        lineas += [f"    _s_{n}(c, {n})" for n in nombres]
+        lineas.append("    return c, i")
+        return "\n".join(lineas) + "\n"
+
+    fuente = (
+        "def cod(o, out):\n    ap = out.append\n" + cuerpo_cod(False)
+        + "def cod_delta(o, p, out):\n    ap = out.append\n" + cuerpo_cod(True)
+        + "def dec(d, i):\n" + cuerpo_dec(False)
+        + "def dec_delta(d, i, p):\n" + cuerpo_dec(True)
+    )
+    ns = {"_cls": cls, "_nuevo": object.__new__, "_var": poner_varint, "_resto": _varint_resto,
+          "_pf": _F64.pack, "_uf": lambda d, i: _F64.unpack_from(d, i), "_tup": _tupla, "_ltup": _leer_tupla}
+    for n, t in campos:
+        ns[f"_s_{n}"] = cls.__dict__[n].__set__
+        if t == "e":
+            ns[f"_val_{n}"] = _VALORES[n]
+            ns[f"_idx_{n}"] = {v: k for k, v in enumerate(_VALORES[n])}
+    exec(fuente, ns)
+    return ns["cod"], ns["cod_delta"], ns["dec"], ns["dec_delta"]
+
+
+_COD, _COD_DELTA, _DEC, _DEC_DELTA = {}, {}, {}, {}
+for _cls, _esq in ESQUEMAS.items():
+    _COD[_cls], _COD_DELTA[_cls], _DEC[_cls], _DEC_DELTA[_cls] = _generar(_cls, _esq)
+
+# Cómo se guarda cada campo de EstadoJuego (en su orden; el bit k de la máscara
+# de un delta dice si el campo k cambió)
+_JUEGO = (
+    ("jugador", "obj", EstadoJugador),
+    ("meteoros", "seq", EstadoMeteoro),
+    ("balas", "seq", EstadoBala),
+    ("enemigos", "seq", EstadoEnemigo),
+    ("balas_enemigas", "seq", EstadoBalaEnemiga),
+    ("puntaje", "int", None),
+    ("semilla_azar", "int", None),
+    ("modo", "modo", None),
+    ("ia", "obj", EstadoIA),
+    ("boss", "opcional", EstadoBoss),
+    ("explosiones", "seq", EstadoExplosion),
+    ("eventos", "eventos", None),
+    ("fire_cooldown", "int", None),
+    ("gracia_spawn", "int", None),
+    ("jugador2", "opcional", EstadoJugador),
+    ("fire_cooldown2", "int", None),
+    ("azar_enemigos", "int", None),
+    ("azar_disparos", "int", None),
+    ("cortina", "cortina", None),
+)
+if tuple(c for c, _, _ in _JUEGO) != tuple(f.name for f in fields(EstadoJuego)):
+    raise TypeError("el esquema de EstadoJuego no coincide con sus campos: subir VERSION y actualizarlo")
+
+
+def _cod_eventos(eventos, out: bytearray):
+    poner_varint(out, len(eventos))
+    for ev in eventos:
+        out.append(_EVENTOS.index(ev.tipo))
+        poner_varint(out, len(ev.detalle))
+        for x in ev.detalle:
+            if isinstance(x, int):
+                out.append(1)
+                _entero(out, x)
+            else:
+                texto = str(x).encode("utf-8")
+                out.append(0)
+                poner_varint(out, len(texto))
+                out += texto
+
+
+def _dec_eventos(d: bytes, i: int):
+    n, i = leer_varint(d, i)
+    evs = []
+    for _ in range(n):
+        tipo = _EVENTOS[d[i]]
+        k, i = leer_varint(d, i + 1)
+        detalle = []
+        for _ in range(k):
+            marca = d[i]
+            if marca == 1:
+                x, i = _leer_entero(d, i + 1)
+            else:
+                largo, i = leer_varint(d, i + 1)
+                x, i = bytes(d[i:i + largo]).decode("utf-8"), i + largo
+            detalle.append(x)
+        evs.append(Evento(tipo, tuple(detalle)))
+    return tuple(evs), i
+
+
+def _bytes_le(columna: array) -> bytes:
+    if sys.byteorder == "little":
+        return columna.tobytes()
+    copia = array(columna.typecode, columna)
+    copia.byteswap()
+    return copia.tobytes()
+
+
+def _cod_balas(c, desde: int, out: bytearray):
+    """Columnas de las balas desde `desde` hasta el final (crudas, little-endian)."""
+    n = len(c) - desde
+    poner_varint(out, n)
+    for col in (c.x0, c.y0, c.dx, c.dy):
+        out += _bytes_le(col[desde:])
+    antes = c.nace[desde] if n else 0
+    _entero(out, antes)
+    for k in range(desde, len(c)):     # ordenados: diferencias chicas (casi siempre 0)
+        poner_varint(out, c.nace[k] - antes)
+        antes = c.nace[k]
+    out += c.curva[desde:].tobytes()
+
+
+def _dec_balas(d: bytes, i: int):
+    n, i = leer_varint(d, i)
+    cols = []
+    for _ in range(4):
+        if i + 8 * n > len(d):
+            raise IndexError
+        col = array("d", bytes(d[i:i + 8 * n]))
+        if sys.byteorder != "little":
+            col.byteswap()
+        cols.append(col)
+        i += 8 * n
+    nace = array("q")
+    antes, i = _leer_entero(d, i)
+    for _ in range(n):
+        dn, i = leer_varint(d, i)
+        antes += dn
+        nace.append(antes)
+    if i + n > len(d):
+        raise IndexError
+    return (*cols, nace, array("B", bytes(d[i:i + n]))), i + n
+
+
+def _quitadas(c, previo):
+    """
+    Índices de `previo` que ya no están en `c`, si `c` = previo sin esas +
+    balas nacidas después de previo.tick (lo normal de un tick a otro).
+    None si no se puede escribir así. → (quitadas, índice de la primera nueva)
+    """
+    nuevas = bisect_right(c.nace, previo.tick)
+    cols, ant = c.columnas(), previo.columnas()
+    quitadas, i = [], 0
+    for k in range(nuevas):
+        while i < len(previo) and any(a[i] != b[k] for a, b in zip(ant, cols)):
+            quitadas.append(i)
+            i += 1
+        if i == len(previo):
+            return None
+        i += 1
+    quitadas.extend(range(i, len(previo)))
+    return quitadas, nuevas
+
+
+def _cod_cortina(c, previo, out: bytearray):
+    """
+    0 = sin cortina; 1 = completa; 2 = las mismas balas que `previo`, otro tick;
+    3 = las de `previo` menos algunas (índices) + las nuevas al final.
+    """
+    if c is None:
+        out.append(0)
+        return
+    if previo is not None:
+        if all(a is b for a, b in zip(c.columnas(), previo.columnas())):
+            out.append(2)
+            _entero(out, c.tick - previo.tick)
+            return
+        cambio = _quitadas(c, previo)
+        if cambio is not None:
+            quitadas, nuevas = cambio
+            out.append(3)
+            _entero(out, c.tick - previo.tick)
+            poner_varint(out, len(quitadas))
+            antes = 0
+            for q in quitadas:
+                poner_varint(out, q - antes)
+                antes = q
+            _cod_balas(c, nuevas, out)
+            return
+    out.append(1)
+    _entero(out, c.tick)
+    _cod_balas(c, 0, out)
+
+
+def _dec_cortina(d: bytes, i: int, previo):
+    marca = d[i]
+    i += 1
+    if marca == 0:
+        return None, i
+    if marca == 1:
+        tick, i = _leer_entero(d, i)
+        cols, i = _dec_balas(d, i)
+        return Cortina(tick, *cols), i
+    if previo is None:
+        raise ValueError("delta de la cortina sin cortina en el estado anterior")
+    dt, i = _leer_entero(d, i)
+    if marca == 2:
+        return Cortina(previo.tick + dt, *previo.columnas()), i
+    n, i = leer_varint(d, i)
+    fuera, q = set(), 0
+    for _ in range(n):
+        dq, i = leer_varint(d, i)
+        q += dq
+        fuera.add(q)
+    quedan = [k for k in range(len(previo)) if k not in fuera]
+    cols, i = _dec_balas(d, i)
+    return Cortina(previo.tick + dt, *(array(a.typecode, [a[k] for k in quedan]) + b
+                                       for a, b in zip(previo.columnas(), cols))), i
+
+
+def _cod_campo(tipo, cls, valor, previo, out: bytearray):
+    """Escribe un campo; con `previo` (no None) lo escribe como diferencia."""
+    if tipo == "obj":
+        if previo is None:
+            _COD[cls](valor, out)
+        else:
+            _COD_DELTA[cls](valor, previo, out)
+    elif tipo == "seq":
+        poner_varint(out, len(valor))
+        cod = _COD[cls]
+        if previo is None:
+            for e in valor:
+                cod(e, out)
+        else:
+            anterior = previo if isinstance(previo, tuple) else tuple(previo)
+            cod_d = _COD_DELTA[cls]
+            comun = min(len(valor), len(anterior))
+            for k, e in enumerate(valor):
+                if k < comun:
+                    cod_d(e, anterior[k], out)
+                else:
+                    cod(e, out)
+    elif tipo == "int":
+        _entero(out, valor - previo if previo is not None else valor)
+    elif tipo == "modo":
+        out.append(_MODOS.index(valor))
+    elif tipo == "cortina":
+        _cod_cortina(valor, previo, out)
+    elif tipo == "opcional":
+        if valor is None:
+            out.append(0)
+        elif previo is None:
+            out.append(1)
+            _COD[cls](valor, out)
+        else:
+            out.append(2)
+            _COD_DELTA[cls](valor, previo, out)
+    else:  # eventos
+        _cod_eventos(valor, out)
+
+
+def _dec_campo(tipo, cls, d: bytes, i: int, previo):
+    if tipo == "obj":
+        return _DEC[cls](d, i) if previo is None else _DEC_DELTA[cls](d, i, previo)
+    if tipo == "seq":
+        n, i = leer_varint(d, i)
+        dec, dec_d = _DEC[cls], _DEC_DELTA[cls]
+        anterior = () if previo is None else (previo if isinstance(previo, tuple) else tuple(previo))
+        out = []
+        for k in range(n):
+            e, i = dec_d(d, i, anterior[k]) if k < len(anterior) else dec(d, i)
+            out.append(e)
+        return tuple(out), i
+    if tipo == "int":
+        v, i = _leer_entero(d, i)
+        return (v + previo if previo is not None else v), i
+    if tipo == "modo":
+        return _MODOS[d[i]], i + 1
+    if tipo == "cortina":
+        return _dec_cortina(d, i, previo)
+    if tipo == "opcional":
+        marca = d[i]
+        if marca == 0:
+            return None, i + 1
+        if marca == 1:
+            return _DEC[cls](d, i + 1)
+        if previo is None:
+            raise ValueError("delta de un campo opcional que no estaba en el estado anterior")
+        return _DEC_DELTA[cls](d, i + 1, previo)
+    return _dec_eventos(d, i)
+
+
+# --- API --------------------------------------------------------------------------
+def codificar(estado: EstadoJuego, anterior: Optional[EstadoJuego] = None) -> bytes:
+    """
+    EstadoJuego → bytes. Sin `anterior`: instantánea completa. Con `anterior`:
+    delta contra ese estado (para decodificar hace falta EL MISMO anterior).
+    """
+    out = bytearray(_CABECERA.pack(MAGIA, VERSION, COMPLETO if anterior is None else DELTA))
+    if anterior is None:
+        for campo, tipo, cls in _JUEGO:
+            _cod_campo(tipo, cls, getattr(estado, campo), None, out)
+        return bytes(out)
+
+    # Máscara de campos cambiados: “mismo objeto” = sin cambios (las funciones
+    # del núcleo devuelven el mismo objeto cuando no tocan algo)
+    mascara = 0
+    cambios = []
+    for k, (campo, tipo, cls) in enumerate(_JUEGO):
+        valor, previo = getattr(estado, campo), getattr(anterior, campo)
+        if valor is not previo:
+            mascara |= 1 << k
+            cambios.append((tipo, cls, valor, previo))
+    poner_varint(out, mascara)
+    for tipo, cls, valor, previo in cambios:
+        _cod_campo(tipo, cls, valor, None if tipo in ("modo", "eventos") else previo, out)
+    return bytes(out)
+
+
+def decodificar(datos: bytes, anterior: Optional[EstadoJuego] = None) -> EstadoJuego:
+    """bytes → EstadoJuego (un delta necesita el `anterior` con que se armó)."""
+    if len(datos) < _CABECERA.size:
+        raise ValueError("instantánea truncada")
+    magia, version, clase = _CABECERA.unpack_from(datos)
+    if magia != MAGIA:
+        raise ValueError("no es una instantánea de EstadoJuego")
+    if version != VERSION:
+        raise ValueError(f"versión de instantánea no soportada: {version}")
+    i = _CABECERA.size
+    valores = {}
+    try:
+        if clase == COMPLETO:
+            for campo, tipo, cls in _JUEGO:
+                valores[campo], i = _dec_campo(tipo, cls, datos, i, None)
+        elif clase == DELTA:
+            if anterior is None:
+                raise ValueError("para decodificar un delta hace falta el estado anterior")
+            mascara, i = leer_varint(datos, i)
+            for k, (campo, tipo, cls) in enumerate(_JUEGO):
+                previo = getattr(anterior, campo)
+                if mascara >> k & 1:
+                    usar = None if tipo in ("modo", "eventos") else previo
+                    valores[campo], i = _dec_campo(tipo, cls, datos, i, usar)
+                else:
+                    valores[campo] = previo if tipo != "seq" or isinstance(previo, tuple) else tuple(previo)
+        else:
+            raise ValueError(f"clase de instantánea desconocida: {clase}")
+    except IndexError:
+        raise ValueError("instantánea truncada") from None
+    if i != len(datos):
+        raise ValueError("sobran bytes al final de la instantánea")
+    return EstadoJuego(**valores)
@@ -1,208 +1,374 @@
-from dataclasses import replace
 from typing import Tuple
 from .constantes import (
     PLAYER_W, PLAYER_H, ENEMY_W, ENEMY_H, BOSS_W, BOSS_H,
     BULLET_W, BULLET_H, EBULLET_W, EBULLET_H
 )
-from .geom import _rects_collide
+from .geom import _swept_collide
+from .broadphase import pares
+from .mascaras import confirmar_impacto
+from . import vectorizado
 from .estados import EstadoJuego, EstadoExplosion
-from .enums_eventos import Evento, EventoTipo
+from .enums_eventos import Evento, EventoTipo, ModoJuego
 from .jugador import _daño, _tick_invul
+from .partes import ARMAZON, golpear
 
 
-def _con_eventos(estado: EstadoJuego, *evs: Evento) -> EstadoJuego:
+def _origen(p, pasos: int):
     """
-    Devuelve una COPIA del estado pero agregando eventos.
-    Esto nos sirve para avisarle a la cáscara imperativa cosas como:
-    - “el jefe entró”
-    - “el jugador murió”
-    Sin efectos secundarios: solo devolvemos un nuevo estado.
+    Dónde estaba un proyectil hace `pasos` ticks (deshaciendo su velocidad).
+    Las balas del jugador no tienen velocidad_x: solo se mueven en vertical.
     """
-    return replace(estado, eventos=estado.eventos + evs)
+    return p.x - getattr(p, "velocidad_x", 0) * pasos, p.y - p.velocidad_y * pasos
 
 
-def detectar_colisiones(estado: EstadoJuego) -> EstadoJuego:
+def _rects_proyectiles(proyectiles, w: int, h: int, pasos: int):
+    """
+    Rect de consulta de cada proyectil para el broadphase:
+    - pasos == 0 → su caja actual (colisión discreta de siempre)
+    - pasos > 0  → la caja que envuelve TODO su recorrido en esos ticks
+    """
+    if pasos <= 0:
+        return tuple((p.x, p.y, w, h) for p in proyectiles)
+    rects = []
+    for p in proyectiles:
+        x0, y0 = _origen(p, pasos)
+        rects.append((min(x0, p.x), min(y0, p.y), w + abs(p.x - x0), h + abs(p.y - y0)))
+    return tuple(rects)
+
+
+def _barrido_exacto(p, w: int, h: int, objetivo, pasos: int) -> bool:
+    """
+    Narrowphase del modo barrido. Si el proyectil se mueve en un solo eje
+    la caja envolvente ya es exacta; en diagonal probamos el barrido AABB real.
+    """
+    x0, y0 = _origen(p, pasos)
+    if x0 == p.x or y0 == p.y:
+        return True
+    return _swept_collide(x0, y0, p.x, p.y, w, h, *objetivo)
+
+
+# ----------------------------------------------------------------------------
+# Etapa ÚNICA de colisiones guiada por una tabla de capas
+# Cada capa es un par (fuente, objetivo). El ORDEN de la tabla es la
+# prioridad: una bala que ya se consumió en una capa no llega a las siguientes.
+# Todas las capas trabajan sobre la misma “ronda” y al final armamos UN solo
+# EstadoJuego nuevo (y la invulnerabilidad se descuenta una sola vez).
+# ----------------------------------------------------------------------------
+
+CAPAS = (
+    ("balas", "enemigos"),
+    ("balas", "meteoros"),
+    ("balas", "boss"),
+    ("balas_enemigas", "jugador"),
+    ("cortina", "jugador"),
+    ("meteoros", "jugador"),
+)
+
+# Subconjuntos que reproducen las funciones históricas por separado
+CAPAS_METEORITOS = (("balas", "meteoros"), ("meteoros", "jugador"))
+CAPAS_ENEMIGOS   = (("balas", "enemigos"), ("balas_enemigas", "jugador"))
+CAPAS_JEFE       = (("balas", "boss"),)
+
+
+class _Ronda:
+    """
+    Acumulador INTERNO de una pasada de colisiones (nunca sale del módulo).
+    Guarda qué se consumió/destruyó; el estado original no se toca.
+    """
+    def __init__(self, estado: EstadoJuego, pasos: int, mascaras):
+        self.estado = estado
+        self.pasos = pasos
+        self.mascaras = mascaras
+        self.puntaje = estado.puntaje
+        self.fx = list(estado.explosiones)
+        # Naves (la 2 solo en cooperativo) y si cada una recibió golpe
+        self.naves = [estado.jugador] if estado.jugador2 is None else [estado.jugador, estado.jugador2]
+        self.recibio = [False] * len(self.naves)
+        self.balas_usadas = set()      # índices de balas del jugador consumidas
+        self.meteoros_rotos = set()    # índices de meteoros destruidos
+        self.be_usadas = set()         # índices de balas enemigas consumidas
+        self.enemigos = list(estado.enemigos)
+        self.boss = estado.boss
+        self.cortina = estado.cortina
+        self.eventos = []
+        self._rects_balas = None
+
+    def balas_libres(self):
+        """Índices y rects (ya barridos si corresponde) de las balas aún sin usar."""
+        if self._rects_balas is None:
+            self._rects_balas = _rects_proyectiles(self.estado.balas, BULLET_W, BULLET_H, self.pasos)
+        idx = [i for i in range(len(self.estado.balas)) if i not in self.balas_usadas]
+        return idx, tuple(self._rects_balas[i] for i in idx)
+
+    def naves_en_juego(self):
+        """(índice, nave) de las que pueden recibir golpes: en cooperativo, las caídas no."""
+        if len(self.naves) == 1:
+            return [(0, self.naves[0])]
+        return [(k, j) for k, j in enumerate(self.naves) if j.vivo]
+
+    def dañar_jugador(self, k: int = 0):
+        """Un golpe a la nave k; _daño ya respeta la invulnerabilidad."""
+        self.naves[k] = _daño(self.naves[k], 1)   # por defecto ~5s de invulnerabilidad
+        self.recibio[k] = True
+
+
+def _capa_balas_meteoros(r: _Ronda):
+    """Cada meteoro tocado por alguna bala se destruye (+10 y explosión); la bala se consume."""
+    idx, rects = r.balas_libres()
+    mets = r.estado.meteoros
+    balas = r.estado.balas
+    impactos = pares(rects, ((m.x, m.y, m.ancho, m.alto) for m in mets))
+    for i, hits in zip(idx, impactos):
+        b = balas[i]
+        for k in hits:
+            m = mets[k]
+            if not confirmar_impacto(r.mascaras, "bala", b.x, b.y, BULLET_W, BULLET_H,
+                                     "meteoro", m.x, m.y, m.ancho, m.alto):
+                continue
+            r.meteoros_rotos.add(k)
+            r.balas_usadas.add(i)
+    # Puntaje y FX en el orden de los meteoros (igual que siempre)
+    for k in sorted(r.meteoros_rotos):
+        m = mets[k]
+        r.puntaje += 10
+        r.fx.append(EstadoExplosion(x=m.x + m.ancho // 2, y=m.y + m.alto // 2, tipo="meteor", timer=18))
+
+
+def _capa_balas_enemigos(r: _Ronda):
+    """Primer enemigo elegible que toca la bala muere (+50, explosión); la bala se consume."""
+    idx, rects = r.balas_libres()
+    enemigos = r.enemigos
+    balas = r.estado.balas
+    rects_ene = tuple((e.x, e.y, ENEMY_W, ENEMY_H) for e in enemigos)
+    # Solo colisiona si está vivo, no explotando y ya sin protección de spawn
+    elegibles = [e.vivo and not e.explotando and e.spawn_protect == 0 for e in enemigos]
+    if not r.mascaras and vectorizado.conviene(len(rects), len(rects_ene)):
+        elegido = vectorizado.primer_impacto(rects, rects_ene, elegibles)
+    else:
+        # Candidatos en orden de índice: el primer enemigo válido se lleva la bala
+        elegido = []
+        for i, hits in zip(idx, pares(rects, rects_ene)):
+            b = balas[i]
+            k = next((k for k in hits if elegibles[k] and confirmar_impacto(
+                r.mascaras, "bala", b.x, b.y, BULLET_W, BULLET_H,
+                "enemigo", enemigos[k].x, enemigos[k].y, ENEMY_W, ENEMY_H)), -1)
+            if k >= 0:
+                elegibles[k] = False
+            elegido.append(k)
+    for i, k in zip(idx, elegido):
+        if k < 0:
+            continue
+        e = enemigos[k]
+        enemigos[k] = e.con(vivo=False, explotando=True, temporizador_explosion=10)
+        r.puntaje += 50
+        r.fx.append(EstadoExplosion(x=e.x + ENEMY_W // 2, y=e.y + ENEMY_H // 2, tipo="enemy", timer=18))
+        r.balas_usadas.add(i)
+
+
+def _capa_balas_boss(r: _Ronda):
+    """
+    Cada bala que toca al jefe le quita 10 de vida y se consume.
+    Jefe por partes: si hay máscaras, la del jefe confirma primero el toque;
+    después la bala va a la parte que toca (nucleo.partes); romper una da
+    sus puntos y una explosión, y el jefe muere con el núcleo.
+    """
+    boss = r.boss
+    if boss is None:
+        # Si el modo dice “JEFE” pero no hay jefe creado, lo reportamos como “estado inválido”
+        if r.estado.modo == ModoJuego.JEFE:
+            r.eventos.append(Evento(EventoTipo.ESTADO_INVALIDO, ("modo_jefe_sin_instancia",)))
+        return
+    if not boss.vivo:
+        return
+    idx, rects = r.balas_libres()
+    balas = r.estado.balas
+    if boss.partes:
+        # La silueta (máscara “jefe”) decide si la bala lo toca; las partes, a quién le pega
+        if r.mascaras:
+            pasan = [t for t, i in enumerate(idx) if confirmar_impacto(
+                r.mascaras, "jefe", boss.x, boss.y, BOSS_W, BOSS_H,
+                "bala", balas[i].x, balas[i].y, BULLET_W, BULLET_H)]
+            idx, rects = [idx[t] for t in pasan], tuple(rects[t] for t in pasan)
+        r.boss, usadas, rotas = golpear(boss, rects)
+        r.balas_usadas.update(idx[t] for t in usadas)
+        for k in rotas:
+            p = ARMAZON[k]
+            r.puntaje += p.puntos
+            r.fx.append(EstadoExplosion(x=boss.x + p.x + p.w // 2, y=boss.y + p.y + p.h // 2,
+                                        tipo="enemy", timer=18))
+        if not r.boss.vivo:
+            r.eventos.append(Evento(EventoTipo.JEFE_MUERTO))
+        return
+    tocadas, = pares(((boss.x, boss.y, BOSS_W, BOSS_H),), rects)
+    vida = boss.vida
+    murio = False
+    for t in tocadas:
+        b = balas[idx[t]]
+        if not confirmar_impacto(r.mascaras, "jefe", boss.x, boss.y, BOSS_W, BOSS_H,
+                                 "bala", b.x, b.y, BULLET_W, BULLET_H):
+            continue
+        # Cada bala del jugador le quita 10 de vida al jefe
+        nv = max(0, vida - 10)
+        murio = (vida > 0 and nv == 0)
+        vida = nv
+        r.balas_usadas.add(idx[t])
+    r.boss = boss.con(vida=vida, vivo=(vida > 0))
+    # Si el jefe murió justo aquí, avisamos con un evento para que la cáscara haga sonido/FX
+    if murio:
+        r.eventos.append(Evento(EventoTipo.JEFE_MUERTO))
+
+
+def _capa_balas_enemigas_jugador(r: _Ronda):
+    """Toda bala enemiga que toca una nave desaparece; el daño se aplica una vez por nave."""
+    be = r.estado.balas_enemigas
+    rects_be = _rects_proyectiles(be, EBULLET_W, EBULLET_H, r.pasos)
+    for k, j in r.naves_en_juego():
+        rect_j = (j.x, j.y, PLAYER_W, PLAYER_H)
+        tocadas, = pares((rect_j,), rects_be)
+        tocadas = [
+            i for i in tocadas
+            if i not in r.be_usadas
+            and (r.pasos <= 0 or _barrido_exacto(be[i], EBULLET_W, EBULLET_H, rect_j, r.pasos))
+            and confirmar_impacto(r.mascaras, "jugador", j.x, j.y, PLAYER_W, PLAYER_H,
+                                  "bala_enemiga", be[i].x, be[i].y, EBULLET_W, EBULLET_H)
+        ]
+        if tocadas:
+            r.be_usadas.update(tocadas)
+            r.dañar_jugador(k)
+
+
+def _capa_cortina_jugador(r: _Ronda):
+    """
+    Balas del jefe (nucleo.patrones) contra las naves: caja chica por bala,
+    sin barrido ni máscaras (son muchas y lentas). Igual que las enemigas:
+    las que tocan desaparecen y el daño es uno por nave.
+    """
+    if not r.cortina:
+        return
+    for k, j in r.naves_en_juego():
+        tocadas = r.cortina.tocadas((j.x, j.y, PLAYER_W, PLAYER_H))
+        if tocadas:
+            r.cortina = r.cortina.sin(tocadas)
+            r.dañar_jugador(k)
+
+
+def _capa_meteoros_jugador(r: _Ronda):
+    """Un meteoro (que siga entero) tocando una nave le hace daño; el meteoro sigue."""
+    mets = r.estado.meteoros
+    naves = r.naves_en_juego()
+    rects_j = tuple((j.x, j.y, PLAYER_W, PLAYER_H) for _, j in naves)
+    for (n, j), toca in zip(naves, pares(rects_j, ((m.x, m.y, m.ancho, m.alto) for m in mets))):
+        if any(k not in r.meteoros_rotos and confirmar_impacto(
+                r.mascaras, "jugador", j.x, j.y, PLAYER_W, PLAYER_H,
+                "meteoro", mets[k].x, mets[k].y, mets[k].ancho, mets[k].alto) for k in toca):
+            r.dañar_jugador(n)
+
+
+_RESOLVER = {
+    ("balas", "enemigos"): _capa_balas_enemigos,
+    ("balas", "meteoros"): _capa_balas_meteoros,
+    ("balas", "boss"): _capa_balas_boss,
+    ("balas_enemigas", "jugador"): _capa_balas_enemigas_jugador,
+    ("cortina", "jugador"): _capa_cortina_jugador,
+    ("meteoros", "jugador"): _capa_meteoros_jugador,
+}
+
+
+def resolver_colisiones(estado: EstadoJuego, capas=CAPAS, pasos_barrido: int = 0, mascaras=None) -> EstadoJuego:
+    """
+    Resuelve TODAS las colisiones del tick en una sola pasada:
+    - recorre la tabla de capas en orden (la prioridad la da la tabla)
+    - descuenta invulnerabilidad UNA vez si hubo capas contra el jugador y no recibió golpe
+    - mantiene el temporizador de explosión de enemigos si hubo capa de enemigos
+    - arma UN solo EstadoJuego nuevo al final (con JUGADOR_MUERTO si corresponde)
+    pasos_barrido y mascaras funcionan igual que en las funciones por modo.
+    """
+    r = _Ronda(estado, pasos_barrido, mascaras)
+    for capa in capas:
+        try:
+            resolver = _RESOLVER[tuple(capa)]
+        except KeyError:
+            raise ValueError(f"capa de colisión desconocida: {capa!r}") from None
+        resolver(r)
+
+    destinos = {destino for _, destino in capas}
+    naves = r.naves
+    # La nave que NO recibió golpe este frame simplemente descuenta 1 frame de invulnerabilidad
+    if "jugador" in destinos:
+        naves = [n if golpe else _tick_invul(n) for n, golpe in zip(naves, r.recibio)]
+    j = naves[0]
+
+    enemigos = r.enemigos
+    if "enemigos" in destinos:
+        # --- mantener explosiones de enemigos hasta agotar temporizador ---
+        enemigos = []
+        for e in r.enemigos:
+            if e.vivo:
+                enemigos.append(e)
+            elif e.explotando and e.temporizador_explosion > 0:
+                enemigos.append(e.con_temporizador_explosion(e.temporizador_explosion - 1))
+            # Si explotó y el timer ya llegó a 0, simplemente desaparece (no lo agregamos)
+
+    eventos = list(r.eventos)
+    # Si pasó de vivo -> muerto, mandamos evento para que la cáscara actúe (sonido, pantalla, etc.)
+    if estado.jugador.vivo and not j.vivo:
+        eventos.append(Evento(EventoTipo.JUGADOR_MUERTO))
+    j2 = naves[1] if len(naves) > 1 else estado.jugador2
+    if j2 is not None and estado.jugador2.vivo and not j2.vivo:
+        eventos.append(Evento(EventoTipo.JUGADOR_MUERTO, (2,)))
+
+    return estado.con(
+        jugador=j,
+        jugador2=j2,
+        meteoros=tuple(m for k, m in enumerate(estado.meteoros) if k not in r.meteoros_rotos),
+        balas=tuple(b for i, b in enumerate(estado.balas) if i not in r.balas_usadas),
+        enemigos=tuple(enemigos),
+        balas_enemigas=tuple(b for i, b in enumerate(estado.balas_enemigas) if i not in r.be_usadas),
+        boss=r.boss,
+        cortina=r.cortina,
+        puntaje=r.puntaje,
+        explosiones=tuple(r.fx),
+        eventos=estado.eventos + tuple(eventos),
+    )
+
+
+def detectar_colisiones(estado: EstadoJuego, pasos_barrido: int = 0, mascaras=None) -> EstadoJuego:
     """
     Colisiones en el modo “meteoritos”:
     - Balas del jugador vs meteoritos (sumamos puntaje y creamos explosión)
     - Meteoritos vs jugador (aplicamos daño con invulnerabilidad de ~5s)
     - Limpiamos balas que ya chocaron
     Nota: todo es INMUTABLE, siempre retornamos un NUEVO estado.
+    Con pasos_barrido > 0 las balas chocan contra todo lo que cruzaron en
+    esos ticks (colisión continua), no solo contra lo que tocan ahora.
+    Con `mascaras` (ver nucleo.mascaras) los pares que pasan el AABB se
+    confirman pixel a pixel.
     """
-    puntaje = estado.puntaje
-    meteoros_vivos = []
-    balas_rest = []
-    fx = list(estado.explosiones)  # acumulamos FX nuevas aquí
-
-    # --- balas del jugador contra meteoritos ---
-    for m in estado.meteoros:
-        golpeado = False
-        for b in estado.balas:
-            if _rects_collide(b.x, b.y, BULLET_W, BULLET_H, m.x, m.y, m.ancho, m.alto):
-                # Si le damos a un meteoro: +10 puntos y una explosión visual
-                puntaje += 10
-                fx.append(EstadoExplosion(
-                    x=m.x + m.ancho // 2,
-                    y=m.y + m.alto // 2,
-                    tipo="meteor",
-                    timer=18
-                ))
-                golpeado = True
-                break
-        if not golpeado:
-            # Solo conservamos los meteoritos que no fueron destruidos
-            meteoros_vivos.append(m)
-
-    # --- conservar balas que NO chocaron con ningún meteoro ---
-    for b in estado.balas:
-        hay_impacto = False
-        for m in estado.meteoros:
-            if _rects_collide(b.x, b.y, BULLET_W, BULLET_H, m.x, m.y, m.ancho, m.alto):
-                hay_impacto = True
-                break
-        if not hay_impacto:
-            balas_rest.append(b)
-
-    # --- meteoritos chocando contra el jugador ---
-    j = estado.jugador
-    prev_vivo = j.vivo
-    recibio = False
-    for m in meteoros_vivos:
-        if _rects_collide(j.x, j.y, PLAYER_W, PLAYER_H, m.x, m.y, m.ancho, m.alto):
-            # _daño respeta la invulnerabilidad: si ya está invulnerable, NO baja vida.
-            j = _daño(j, 1)   # por defecto deja 300 frames (~5s) de invulnerabilidad
-            recibio = True
-            break
-
-    # Si este frame NO recibió golpe, simplemente descontamos 1 frame de invulnerabilidad
-    if not recibio:
-        j = _tick_invul(j)
-
-    # Armamos el nuevo estado con TODO actualizado
-    nuevo = replace(
-        estado,
-        jugador=j,
-        meteoros=tuple(meteoros_vivos),
-        balas=tuple(balas_rest),
-        puntaje=puntaje,
-        explosiones=tuple(fx)
-    )
+    return resolver_colisiones(estado, CAPAS_METEORITOS, pasos_barrido, mascaras)
 
-    # Si pasó de vivo -> muerto, mandamos evento para que la cáscara actúe (sonido, pantalla, etc.)
-    if prev_vivo and not j.vivo:
-        return _con_eventos(nuevo, Evento(EventoTipo.JUGADOR_MUERTO))
-    return nuevo
 
-
-def detectar_colisiones_enemigo(estado: EstadoJuego) -> EstadoJuego:
+def detectar_colisiones_enemigo(estado: EstadoJuego, pasos_barrido: int = 0, mascaras=None) -> EstadoJuego:
     """
     Colisiones cuando hay ENEMIGOS:
     - Balas del jugador vs enemigos (mata, suma puntos y deja explosión temporizada)
     - Balas enemigas vs jugador (aplica daño solo si NO está invulnerable)
     - Mantiene explosiones de enemigos hasta que terminen su temporizador
+    Con pasos_barrido > 0 ambos tipos de bala usan colisión continua.
+    Con `mascaras` los impactos se confirman pixel a pixel.
     """
-    puntaje = estado.puntaje
-    j = estado.jugador
-    prev_vivo = j.vivo
-    fx = list(estado.explosiones)
-
-    # --- balas del jugador contra enemigos ---
-    enemigos = list(estado.enemigos)
-    balas_rest = []
-    for b in estado.balas:
-        impacto = False
-        for idx, e in enumerate(enemigos):
-            # Solo colisiona si está vivo, no explotando y ya sin protección de spawn
-            if e.vivo and not e.explotando and e.spawn_protect == 0:
-                if _rects_collide(b.x, b.y, BULLET_W, BULLET_H, e.x, e.y, ENEMY_W, ENEMY_H):
-                    enemigos[idx] = replace(e, vivo=False, explotando=True, temporizador_explosion=10)
-                    puntaje += 50
-                    fx.append(EstadoExplosion(
-                        x=e.x + ENEMY_W // 2,
-                        y=e.y + ENEMY_H // 2,
-                        tipo="enemy",
-                        timer=18
-                    ))
-                    impacto = True
-                    break
-        if not impacto:
-            balas_rest.append(b)
-
-    # --- balas enemigas contra el jugador ---
-    be_rest = []
-    recibio = False
-    for eb in estado.balas_enemigas:
-        if _rects_collide(j.x, j.y, PLAYER_W, PLAYER_H, eb.x, eb.y, EBULLET_W, EBULLET_H):
-            if j.invul_frames == 0:
-                j = _daño(j, 1)  # activa invulnerabilidad (~5s) si no la tenía
-            recibio = True
-        else:
-            be_rest.append(eb)
-
-    if not recibio:
-        j = _tick_invul(j)
-
-    # --- mantener explosiones de enemigos hasta agotar temporizador ---
-    enemigos_final = []
-    for e in enemigos:
-        if e.vivo:
-            enemigos_final.append(e)
-        elif e.explotando and e.temporizador_explosion > 0:
-            enemigos_final.append(replace(e, temporizador_explosion=e.temporizador_explosion - 1))
-        # Si explotó y el timer ya llegó a 0, simplemente desaparece (no lo agregamos)
-
-    nuevo = replace(
-        estado,
-        jugador=j,
-        enemigos=tuple(enemigos_final),
-        balas=tuple(balas_rest),
-        balas_enemigas=tuple(be_rest),
-        puntaje=puntaje,
-        explosiones=tuple(fx)
-    )
-
-    if prev_vivo and not j.vivo:
-        return _con_eventos(nuevo, Evento(EventoTipo.JUGADOR_MUERTO))
-    return nuevo
+    return resolver_colisiones(estado, CAPAS_ENEMIGOS, pasos_barrido, mascaras)
 
 
-def detectar_colisiones_jefe(estado: EstadoJuego) -> EstadoJuego:
+def detectar_colisiones_jefe(estado: EstadoJuego, pasos_barrido: int = 0, mascaras=None) -> EstadoJuego:
     """
     Colisiones contra el JEFE:
     - Balas del jugador vs jefe (baja vida del jefe)
     - Si la vida llega a 0, disparamos evento JEFE_MUERTO
     - Si nos ponen en modo JEFE pero no existe instancia -> evento ESTADO_INVALIDO
+    Con pasos_barrido > 0 cuenta también las balas que cruzaron al jefe.
+    Con `mascaras` solo cuentan las balas que tocan la silueta del jefe.
     """
-    boss = estado.boss
-    if boss is None:
-        # Si el modo dice “JEFE” pero no hay jefe creado, lo reportamos como “estado inválido”
-        from .enums_eventos import ModoJuego
-        if estado.modo == ModoJuego.JEFE:
-            return _con_eventos(estado, Evento(EventoTipo.ESTADO_INVALIDO, ("modo_jefe_sin_instancia",)))
-        return estado
-
-    if not boss.vivo:
-        return estado
-
-    puntaje = estado.puntaje  # (no sumamos aquí, pero mantenemos el patrón)
-    balas_rest = []
-    vida = boss.vida
-    murio = False
-
-    for b in estado.balas:
-        if _rects_collide(b.x, b.y, BULLET_W, BULLET_H, boss.x, boss.y, BOSS_W, BOSS_H):
-            # Cada bala del jugador le quita 10 de vida al jefe
-            nv = max(0, vida - 10)
-            murio = (vida > 0 and nv == 0)
-            vida = nv
-        else:
-            balas_rest.append(b)
-
-    boss = replace(boss, vida=vida, vivo=(vida > 0))
-    nuevo = replace(estado, boss=boss, balas=tuple(balas_rest), puntaje=puntaje)
-
-    # Si el jefe murió justo aquí, avisamos con un evento para que la cáscara haga sonido/FX
-    return _con_eventos(nuevo, Evento(EventoTipo.JEFE_MUERTO)) if murio else nuevo
+    return resolver_colisiones(estado, CAPAS_JEFE, pasos_barrido, mascaras)
 
 
 def avanzar_explosiones(estado: EstadoJuego) -> EstadoJuego:
@@ -213,5 +379,5 @@ def avanzar_explosiones(estado: EstadoJuego) -> EstadoJuego:
     Retorno una tupla nueva (inmutabilidad).
     """
     activas = filter(lambda e: e.timer > 0, estado.explosiones)
-    nuevas = map(lambda e: replace(e, timer=e.timer - 1), activas)
-    return replace(estado, explosiones=tuple(nuevas))
+    nuevas = map(lambda e: e.con_timer(e.timer - 1), activas)
+    return estado.con_explosiones(tuple(nuevas))
@@ -0,0 +1,178 @@
+import math
+from dataclasses import dataclass
+from typing import Dict, Mapping, Tuple
+from .constantes import ANCHO, ENEMY_W, ENEMY_H
+
+# ============================================================================
+# comportamientos.py — Comportamientos de enemigos “por tabla” (datos puros)
+# Una oleada nueva se arma con DATOS, sin tocar código:
+#   TRAYECTORIAS     nombre → recorrido ya calculado: (dx, dy) por tick,
+#                    relativo al punto donde arrancó (curvas Bezier, ondas,
+#                    picadas…). Se calculan UNA vez al importar.
+#   COMPORTAMIENTOS  máquina de estados por tabla:
+#                    estado → (trayectoria, {evento: siguiente estado})
+#                    El PRIMER estado es la entrada (enemigo “entrando”).
+#                    Eventos: FIN (se acabó la tabla) y ALINEADO (el
+#                    jugador quedó debajo). LIBRE = la IA clásica de
+#                    enemigos.py (patrulla + líder), para siempre.
+#   OLEADAS          nombre → qué comportamientos y con qué formación.
+# compilar() aplana todo en tablas indexadas por “tramo” (un estado de un
+# comportamiento; 0 = LIBRE). Cada enemigo guarda tramo, t (ticks dentro
+# del tramo) y su ancla; moverlo es mirar dx[tramo][t], dy[tramo][t].
+# ============================================================================
+
+FIN, ALINEADO = "fin", "alineado"
+LIBRE = "libre"
+VENTANA_ALINEADO = 24     # px entre centros (en X) para disparar ALINEADO
+PATRULLA_LIBRE = 60       # media patrulla al pasar a LIBRE (± px alrededor de donde quedó)
+
+Recorrido = Tuple[Tuple[int, int], ...]
+
+
+# --- Trayectorias (generadores: se usan al importar, no por tick) ----------------
+def bezier(p1, p2, p3, ticks: int) -> Recorrido:
+    """Bezier cúbica desde (0, 0) con controles p1, p2 y final p3, en `ticks` pasos."""
+    out = []
+    for k in range(ticks + 1):
+        u = k / ticks
+        v = 1 - u
+        a, b, c = 3 * v * v * u, 3 * v * u * u, u * u * u
+        out.append((round(a * p1[0] + b * p2[0] + c * p3[0]), round(a * p1[1] + b * p2[1] + c * p3[1])))
+    return tuple(out)
+
+
+def seno(amplitud: float, periodo: int, vx: float, vy: float, ticks: int) -> Recorrido:
+    """Onda lateral (“vaivén”) sobre un avance recto de (vx, vy) px por tick."""
+    return tuple((round(vx * k + amplitud * math.sin(2 * math.pi * k / periodo)), round(vy * k))
+                 for k in range(ticks + 1))
+
+
+def picada(profundidad: float, ticks: int, deriva: float = 0.0) -> Recorrido:
+    """Cae `profundidad` px y vuelve al punto de partida (con `deriva` lateral a mitad)."""
+    return tuple((round(deriva * math.sin(math.pi * k / ticks)),
+                  round(profundidad * (1 - math.cos(2 * math.pi * k / ticks)) / 2))
+                 for k in range(ticks + 1))
+
+
+def recta(dx: float, dy: float, ticks: int) -> Recorrido:
+    return tuple((round(dx * k / ticks), round(dy * k / ticks)) for k in range(ticks + 1))
+
+
+def espejo(recorrido: Recorrido) -> Recorrido:
+    """El mismo recorrido reflejado en X."""
+    return tuple((-x, y) for x, y in recorrido)
+
+
+# --- Datos ------------------------------------------------------------------------
+_ESE = bezier((130, 30), (130, 170), (0, 150), 110)   # bucle hacia un costado y a su línea
+
+TRAYECTORIAS: Dict[str, Recorrido] = {
+    "ese": _ESE,
+    "ese_espejo": espejo(_ESE),
+    "bajada": recta(0, 150, 75),             # como la entrada clásica: -ENEMY_H → y = 90
+    "vaiven": seno(50, 120, 0, 0, 120),      # un período: termina donde empezó
+    "acecho": seno(24, 90, 0, 0, 90),
+    "picada": picada(300, 80, deriva=30),
+}
+
+COMPORTAMIENTOS: Dict[str, Dict[str, Tuple[str, Mapping[str, str]]]] = {
+    "ese": {"entra": ("ese", {FIN: LIBRE})},
+    "ese_espejo": {"entra": ("ese_espejo", {FIN: LIBRE})},
+    "onda": {"entra": ("bajada", {FIN: "ondea"}),
+             "ondea": ("vaiven", {FIN: "ondea"})},
+    "picada": {"entra": ("bajada", {FIN: "acecha"}),
+               "acecha": ("acecho", {FIN: "acecha", ALINEADO: "cae"}),
+               "cae": ("picada", {FIN: "vuelve"}),
+               "vuelve": ("acecho", {FIN: "acecha"})},     # una vuelta sin picar
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Oleada:
+    """
+    comportamientos: se reparten en ronda (enemigo k → comportamientos[k % len]).
+    Arrancan repartidos en fila como la oleada clásica, arriba de la pantalla;
+    `retraso` = ticks de espera extra entre uno y el siguiente (entrada en cascada).
+    """
+    comportamientos: Tuple[str, ...]
+    retraso: int = 0
+
+
+OLEADAS: Dict[str, Oleada] = {
+    "ese": Oleada(("ese", "ese_espejo"), retraso=8),
+    "onda": Oleada(("onda",), retraso=4),
+    "picada": Oleada(("picada",), retraso=15),
+}
+# Orden en que logica_juego lanza las oleadas desde el segundo ciclo
+# (el primero, hasta el primer jefe, es todo “clasica” = crear_enemigos)
+ORDEN_OLEADAS = ("clasica", "ese", "onda", "picada")
+
+
+# --- Compilación ------------------------------------------------------------------
+@dataclass(frozen=True, slots=True)
+class Tablas:
+    """Todo aplanado por tramo (índice 0 = LIBRE, sin tabla)."""
+    nombres: Tuple[str, ...]               # "comportamiento.estado"
+    dx: Tuple[Tuple[int, ...], ...]
+    dy: Tuple[Tuple[int, ...], ...]
+    largo: Tuple[int, ...]                 # ticks del tramo (la tabla tiene largo + 1 filas)
+    sig_fin: Tuple[int, ...]
+    sig_alineado: Tuple[int, ...]          # -1 = ese tramo no mira al jugador
+    entra: Tuple[bool, ...]                # ¿cuenta como “entrando”?
+    inicio: Mapping[str, int]              # comportamiento → tramo inicial
+
+
+def compilar(trayectorias=None, comportamientos=None) -> Tablas:
+    """Aplana trayectorias + comportamientos. ValueError si algo no cierra."""
+    trayectorias = TRAYECTORIAS if trayectorias is None else trayectorias
+    comportamientos = COMPORTAMIENTOS if comportamientos is None else comportamientos
+    ids = {LIBRE: 0}
+    for comp, estados in comportamientos.items():
+        for est in estados:
+            ids[f"{comp}.{est}"] = len(ids)
+
+    nombres, dx, dy, largo = [LIBRE], [(0,)], [(0,)], [0]
+    sig_fin, sig_ali, entra, inicio = [0], [-1], [False], {}
+    for comp, estados in comportamientos.items():
+        for n, (est, (tray, transiciones)) in enumerate(estados.items()):
+            if tray not in trayectorias:
+                raise ValueError(f"{comp}.{est}: no existe la trayectoria {tray!r}")
+            recorrido = trayectorias[tray]
+            if len(recorrido) < 2 or recorrido[0] != (0, 0):
+                raise ValueError(f"trayectoria {tray!r}: tiene que arrancar en (0, 0) y durar 1 tick o más")
+            desconocidos = set(transiciones) - {FIN, ALINEADO}
+            if desconocidos:
+                raise ValueError(f"{comp}.{est}: eventos desconocidos {sorted(desconocidos)}")
+            if FIN not in transiciones:
+                raise ValueError(f"{comp}.{est}: falta la transición {FIN!r}")
+
+            def destino(nombre):
+                clave = LIBRE if nombre == LIBRE else f"{comp}.{nombre}"
+                if clave not in ids:
+                    raise ValueError(f"{comp}.{est}: no existe el estado {nombre!r}")
+                return ids[clave]
+
+            if n == 0:
+                inicio[comp] = len(nombres)
+            nombres.append(f"{comp}.{est}")
+            dx.append(tuple(p[0] for p in recorrido))
+            dy.append(tuple(p[1] for p in recorrido))
+            largo.append(len(recorrido) - 1)
+            sig_fin.append(destino(transiciones[FIN]))
+            sig_ali.append(destino(transiciones[ALINEADO]) if ALINEADO in transiciones else -1)
+            entra.append(n == 0)
+    return Tablas(tuple(nombres), tuple(dx), tuple(dy), tuple(largo),
+                  tuple(sig_fin), tuple(sig_ali), tuple(entra), inicio)
+
+
+TABLAS = compilar()
+
+
+def formacion(nombre: str, cant: int) -> Tuple[Tuple[int, int, int, int], ...]:
+    """(tramo inicial, x, y, t inicial) de cada enemigo de la oleada `nombre`."""
+    oleada = OLEADAS[nombre]
+    espacio = ANCHO // (cant + 1)
+    m = len(oleada.comportamientos)
+    return tuple((TABLAS.inicio[oleada.comportamientos[k % m]], espacio * (k + 1) - ENEMY_W // 2,
+                  -ENEMY_H, -oleada.retraso * k)
+                 for k in range(cant))
@@ -25,6 +25,10 @@ PREBOSS_PAUSE_TICKS = 180   # Pequeña pausa antes de que aparezca el jefe
 ENEMY_WAVE_COOLDOWN = 90    # Tiempo entre una oleada de enemigos y la siguiente
 MIXED_WAVE_COOLDOWN = 90    # Pausa para oleadas mixtas (enemigos + meteoritos)
 
+# --- Ritmo del jugador (antes vivían en el bucle de la cáscara) ---
+FIRE_RATE_FRAMES  = 6    # Frames mínimos entre dos disparos seguidos
+SPAWN_GRACE_TICKS = 24   # Frames de gracia al empezar: el jugador no puede morir
+
 # ============================================================================
 # Nota:
 # - Estos valores ayudan a mantener orden y equilibrio en el juego.
@@ -0,0 +1,67 @@
+from dataclasses import fields
+from .estados import EstadoJuego, _FALTA
+
+# ============================================================================
+# edicion.py — “Transient” del EstadoJuego (estilo Clojure)
+# Un tick encadena varias funciones puras (colisiones → reponer meteoros →
+# explosiones → lógica de flujo) y cada una devuelve un EstadoJuego NUEVO
+# aunque el anterior se tire enseguida. Con una edición:
+#   ed = editar(estado)            # copia de trabajo MUTABLE (privada)
+#   ed = resolver_colisiones(ed)   # las mismas funciones de siempre…
+#   ed = logica_juego(ed)          # …su .con(...) escribe sobre la edición
+#   estado = ed.congelar()         # UN solo EstadoJuego inmutable al final
+# Las funciones no cambian: solo usan .con / .con_<campo> y atributos, y la
+# edición ofrece exactamente eso. Con un EstadoJuego normal siguen siendo puras.
+# Regla de oro: la edición no se comparte ni se guarda; tras congelar() queda
+# cerrada y cualquier .con(...) posterior es un error.
+# ============================================================================
+
+_CAMPOS = tuple(f.name for f in fields(EstadoJuego))
+
+
+class EdicionJuego:
+    """
+    Copia de trabajo mutable de un EstadoJuego (mismos campos).
+    .con(...) y .con_<campo>(...) modifican la edición y devuelven la MISMA
+    edición, así el código escrito para estados inmutables funciona igual.
+    """
+    __slots__ = _CAMPOS + ("_cerrada",)
+
+    def __repr__(self):
+        return f"EdicionJuego(modo={self.modo}, puntaje={self.puntaje}, cerrada={self._cerrada})"
+
+
+def _cerrada():
+    raise RuntimeError("la edición ya se congeló: abrir otra con editar(estado)")
+
+
+def _generar_metodos():
+    """Genera con/con_<campo>/congelar y editar (una vez al importar, como en estados.py)."""
+    ns = {"_FALTA": _FALTA, "_cerrada": _cerrada, "_nuevo": object.__new__, "_cls": EstadoJuego}
+    for n in _CAMPOS:
+        ns[f"_s_{n}"] = EstadoJuego.__dict__[n].__set__
+
+    params = ", ".join(f"{n}=_FALTA" for n in _CAMPOS)
+    cuerpo = "".join(f"    if {n} is not _FALTA: self.{n} = {n}\n" for n in _CAMPOS)
+    fuente = [f"def con(self, *, {params}):\n    if self._cerrada: _cerrada()\n{cuerpo}    return self\n"]
+    for n in _CAMPOS:
+        fuente.append(f"def con_{n}(self, valor):\n    if self._cerrada: _cerrada()\n"
+                      f"    self.{n} = valor\n    return self\n")
+    copiar = "".join(f"    _s_{n}(c, self.{n})\n" for n in _CAMPOS)
+    fuente.append(f"def congelar(self):\n    if self._cerrada: _cerrada()\n    self._cerrada = True\n"
+                  f"    c = _nuevo(_cls)\n{copiar}    return c\n")
+    abrir = "".join(f"    ed.{n} = estado.{n}\n" for n in _CAMPOS)
+    fuente.append(f"def editar(estado):\n    ed = _nuevo(EdicionJuego)\n{abrir}    ed._cerrada = False\n    return ed\n")
+    ns["EdicionJuego"] = EdicionJuego
+    exec("".join(fuente), ns)
+
+    ns["con"].__doc__ = "Cambia los campos indicados EN LA EDICIÓN y la devuelve (misma firma que EstadoJuego.con)."
+    ns["congelar"].__doc__ = "Cierra la edición y devuelve UN EstadoJuego inmutable con sus valores actuales."
+    for nombre in ("con", "congelar") + tuple(f"con_{n}" for n in _CAMPOS):
+        ns[nombre].__qualname__ = f"EdicionJuego.{nombre}"
+        setattr(EdicionJuego, nombre, ns[nombre])
+    ns["editar"].__doc__ = "Abre una edición (copia de trabajo mutable) a partir de un EstadoJuego."
+    return ns["editar"]
+
+
+editar = _generar_metodos()
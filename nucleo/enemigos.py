@@ -1,9 +1,10 @@
-from dataclasses import replace
-from typing import Tuple
+import math
+from typing import Dict, List, Tuple
 from .constantes import ANCHO, ENEMY_W, ENEMY_H, EBULLET_W, ALTO
 from .geom import _clamp
-from .rng import azar_en_rango
+from .rng import azar_flujo, lote_rangos
 from .estados import EstadoEnemigo, EstadoBalaEnemiga, EstadoJugador
+from .comportamientos import TABLAS, VENTANA_ALINEADO, PATRULLA_LIBRE, OLEADAS, formacion
 
 def crear_enemigos(cant: int, semilla: int):
     """
@@ -14,23 +15,21 @@ def crear_enemigos(cant: int, semilla: int):
 
     Args:
         cant: cuántos enemigos queremos generar
-        semilla: semilla del RNG del núcleo (sin usar random global)
+        semilla: flujo de azar “enemigos” (nucleo.rng; sin random global)
 
     Returns:
         (enemigos, semilla_actualizada)
     """
     espacio = ANCHO // (cant + 1)  # separación uniforme en X
     enemigos = []
-    s = semilla
     Y_LINEA = 90  # altura a la que “se estacionan” al terminar la entrada
+    # azar controlado para el ancho de patrulla y dirección inicial: toda la oleada en un lote
+    s, azar = lote_rangos(semilla, ((100, 140), (0, 1)) * cant)
 
     for i in range(cant):
         # posición “base” en X, centrada por ranuras
         x_ini = espacio * (i + 1) - ENEMY_W // 2
-
-        # azar controlado para el ancho de patrulla y dirección inicial
-        s, ancho_rango = azar_en_rango(s, 100, 140)
-        s, dir_rand = azar_en_rango(s, 0, 1)
+        ancho_rango, dir_rand = azar[2 * i], azar[2 * i + 1]
 
         # límites de patrulla y dirección de arranque
         min_x = _clamp(x_ini - ancho_rango // 2, 0, ANCHO - ENEMY_W)
@@ -47,22 +46,156 @@ def crear_enemigos(cant: int, semilla: int):
     return tuple(enemigos), s
 
 
-def _indice_lider(enemigos: Tuple[EstadoEnemigo, ...], jugador: EstadoJugador) -> int:
+def crear_oleada(nombre: str, cant: int, semilla: int):
     """
-    Busca cuál enemigo está “más alineado” con el jugador en X
-    (el más cercano horizontalmente a la nave).
-    Ese será el “líder” que tratará de seguir al jugador.
+    Oleada `nombre` de nucleo.comportamientos.OLEADAS ("clasica" = crear_enemigos).
+    Las oleadas por tabla no usan azar: la semilla vuelve tal cual.
 
     Returns:
-        índice del líder o -1 si no hay vivos
+        (enemigos, semilla_actualizada)
     """
+    if nombre == "clasica":
+        return crear_enemigos(cant, semilla)
+    if nombre not in OLEADAS:
+        raise ValueError(f"oleada desconocida: {nombre!r}")
+    return tuple(EstadoEnemigo(x=x, y=y, velocidad_x=2, direccion=1 if k % 2 == 0 else -1,
+                               patrulla_min_x=x, patrulla_max_x=x, entrando=True,
+                               spawn_protect=24, tramo=tramo, t=t, ancla_x=x, ancla_y=y)
+                 for k, (tramo, x, y, t) in enumerate(formacion(nombre, cant))), semilla
+
+
+def _avanzar_tramo(e: EstadoEnemigo, jugador: EstadoJugador) -> EstadoEnemigo:
+    """
+    Un tick de un enemigo por tabla: posición = ancla + tabla[tramo][t]
+    (en X sujeta a la pantalla: un bucle cerca del borde no se sale).
+    Al terminar la tabla (FIN) o con el jugador debajo (ALINEADO, si el tramo
+    lo mira) pasa al tramo siguiente, anclado donde quedó.
+    """
+    k, t = e.tramo, e.t + 1
+    if t <= 0:                      # todavía esperando su turno (se queda en el ancla)
+        return e.con_t(t)
+    x, y = _clamp(e.ancla_x + TABLAS.dx[k][t], 0, ANCHO - ENEMY_W), e.ancla_y + TABLAS.dy[k][t]
+    if t == TABLAS.largo[k]:
+        sig = TABLAS.sig_fin[k]
+    elif TABLAS.sig_alineado[k] >= 0 and abs((x + ENEMY_W // 2) - (jugador.x + 30)) < VENTANA_ALINEADO:
+        sig = TABLAS.sig_alineado[k]
+    else:
+        return e.con(x=x, y=y, t=t)
+    if sig == 0:                    # LIBRE: desde acá, la IA clásica (patrulla alrededor de x)
+        return e.con(x=x, y=y, tramo=0, t=0, ancla_x=x, ancla_y=y, entrando=False,
+                     patrulla_min_x=_clamp(x - PATRULLA_LIBRE, 0, ANCHO - ENEMY_W),
+                     patrulla_max_x=_clamp(x + PATRULLA_LIBRE, 0, ANCHO - ENEMY_W))
+    return e.con(x=x, y=y, tramo=sig, t=0, ancla_x=x, ancla_y=y, entrando=TABLAS.entra[sig])
+
+
+# --- Vecinos por cubetas (para oleadas grandes) ---------------------------------
+# Líder y separación miran a los enemigos “cercanos”. Con pocos, el barrido
+# directo es lo más barato; con muchos (enjambres) se reparten por tick en
+# cubetas de SEP_MIN × ENEMY_H (2-D) o columnas de SEP_MIN (1-D) y solo se
+# miran las vecinas. Los dos caminos dan EXACTAMENTE el mismo resultado.
+ENEMIGOS_DIRECTOS = 12       # hasta acá conviene el barrido directo
+SEP_MIN = ENEMY_W * 0.8      # distancia mínima deseada en X entre enemigos
+_CUBETA_X = math.ceil(SEP_MIN)
+
+
+def _lider_directo(enemigos, jugador: EstadoJugador) -> int:
     vivos = [
         (i, abs((e.x + ENEMY_W // 2) - (jugador.x + 30)))  # 30 ≈ mitad nave jugador
-        for i, e in enumerate(enemigos) if e.vivo and not e.explotando
+        for i, e in enumerate(enemigos) if e.vivo and not e.explotando and not e.tramo
     ]
     return min(vivos, key=lambda t: t[1])[0] if vivos else -1
 
 
+def _lider_cubetas(enemigos, jugador: EstadoJugador) -> int:
+    """
+    Como _lider_directo, con columnas de _CUBETA_X px: se recorre desde la
+    columna del jugador hacia afuera y se corta cuando ninguna columna más
+    lejana puede tener a alguien más cerca (ni empatado con menor índice).
+    """
+    objetivo = jugador.x + 30 - ENEMY_W // 2     # distancia = |e.x - objetivo|
+    columnas: Dict[int, List[int]] = {}
+    for i, e in enumerate(enemigos):
+        if e.vivo and not e.explotando and not e.tramo:
+            columnas.setdefault(e.x // _CUBETA_X, []).append(i)
+    if not columnas:
+        return -1
+    c0, primera, ultima = objetivo // _CUBETA_X, min(columnas), max(columnas)
+    mejor_d, mejor_i = None, -1
+    r = 0
+    while c0 - r >= primera or c0 + r <= ultima:
+        # En las columnas c0 ± r nadie está a menos de (r - 1) · ancho + 1
+        if mejor_d is not None and r > 0 and (r - 1) * _CUBETA_X + 1 > mejor_d:
+            break
+        for c in ((c0,) if r == 0 else (c0 - r, c0 + r)):
+            for i in columnas.get(c, ()):
+                d = abs(enemigos[i].x - objetivo)
+                if mejor_d is None or d < mejor_d or (d == mejor_d and i < mejor_i):
+                    mejor_d, mejor_i = d, i
+        r += 1
+    return mejor_i
+
+
+def _indice_lider(enemigos: Tuple[EstadoEnemigo, ...], jugador: EstadoJugador) -> int:
+    """
+    Busca cuál enemigo está “más alineado” con el jugador en X
+    (el más cercano horizontalmente a la nave; empate → el de menor índice).
+    Solo compiten los de IA clásica (los que siguen una tabla, no).
+    Ese será el “líder” que tratará de seguir al jugador.
+
+    Returns:
+        índice del líder o -1 si no hay vivos
+    """
+    if len(enemigos) <= ENEMIGOS_DIRECTOS:
+        return _lider_directo(enemigos, jugador)
+    return _lider_cubetas(enemigos, jugador)
+
+
+def _empuje_directo(provisional) -> List[int]:
+    """Corrección en X de cada enemigo: +1/-1 por cada vecino demasiado cerca (todos contra todos)."""
+    corrs = [0] * len(provisional)
+    for i, e_i in enumerate(provisional):
+        # Solo aplicamos si está en escena (no entrando) y vivo
+        if not (e_i.vivo and not e_i.entrando and not e_i.explotando):
+            continue
+        ex, ey = e_i.x, e_i.y
+        corr = 0
+        for j, e_j in enumerate(provisional):
+            if i == j or not (e_j.vivo and not e_j.explotando):
+                continue
+            # Si están muy cerca en X y más o menos a la misma altura, empujamos
+            if abs(ex - e_j.x) < SEP_MIN and abs(ey - e_j.y) < ENEMY_H:
+                corr += 1 if ex <= e_j.x else -1
+        corrs[i] = corr
+    return corrs
+
+
+def _empuje_cubetas(provisional) -> List[int]:
+    """
+    Como _empuje_directo, pero cada enemigo solo mira las 3×3 cubetas de
+    _CUBETA_X × ENEMY_H alrededor de la suya: si |dx| < SEP_MIN y
+    |dy| < ENEMY_H, el vecino está sí o sí en una cubeta contigua.
+    """
+    cubetas: Dict[Tuple[int, int], List[int]] = {}
+    for j, e in enumerate(provisional):
+        if e.vivo and not e.explotando:
+            cubetas.setdefault((e.x // _CUBETA_X, e.y // ENEMY_H), []).append(j)
+    corrs = [0] * len(provisional)
+    for i, e_i in enumerate(provisional):
+        if not (e_i.vivo and not e_i.entrando and not e_i.explotando):
+            continue
+        ex, ey = e_i.x, e_i.y
+        cx, cy = ex // _CUBETA_X, ey // ENEMY_H
+        corr = 0
+        for bx in (cx - 1, cx, cx + 1):
+            for by in (cy - 1, cy, cy + 1):
+                for j in cubetas.get((bx, by), ()):
+                    e_j = provisional[j]
+                    if j != i and abs(ex - e_j.x) < SEP_MIN and abs(ey - e_j.y) < ENEMY_H:
+                        corr += 1 if ex <= e_j.x else -1
+        corrs[i] = corr
+    return corrs
+
+
 def actualizar_enemigos_ia(enemigos: Tuple[EstadoEnemigo, ...], jugador: EstadoJugador, ia) -> Tuple[EstadoEnemigo, ...]:
     """
     Mueve enemigos con reglas simples:
@@ -71,6 +204,8 @@ def actualizar_enemigos_ia(enemigos: Tuple[EstadoEnemigo, ...], jugador: EstadoJ
     - El resto patrulla entre min_x y max_x rebotando en los bordes.
     - Pequeño “empuje” para que no se amontonen entre ellos (se separan en X).
     - Se reduce el spawn_protect de todos por frame.
+    - Los que tienen comportamiento por tabla (tramo != 0) solo miran su tabla
+      (nucleo.comportamientos): no lideran ni se corren por la separación.
     """
     if not enemigos:
         return enemigos
@@ -84,13 +219,17 @@ def actualizar_enemigos_ia(enemigos: Tuple[EstadoEnemigo, ...], jugador: EstadoJ
             provisional[i] = e
             continue
 
+        if e.tramo:
+            provisional[i] = _avanzar_tramo(e, jugador)
+            continue
+
         if e.entrando:
             # Entran de arriba hacia su línea objetivo
             ny = e.y + 2
             fin = ny >= e.y_objetivo
             dx_enter = 1 if e.direccion > 0 else -1  # pequeño corrimiento lateral mientras baja
             nx = _clamp(e.x + dx_enter, 0, ANCHO - ENEMY_W)
-            provisional[i] = replace(e, x=nx, y=(e.y_objetivo if fin else ny), entrando=(not fin))
+            provisional[i] = e.con(x=nx, y=(e.y_objetivo if fin else ny), entrando=(not fin))
             continue
 
         if i == idx_lider:
@@ -98,7 +237,7 @@ def actualizar_enemigos_ia(enemigos: Tuple[EstadoEnemigo, ...], jugador: EstadoJ
             objetivo = _clamp(jugador.x, 0, ANCHO - ENEMY_W)
             dx = 2 if objetivo > e.x else (-2 if objetivo < e.x else 0)
             nx = _clamp(e.x + dx, 0, ANCHO - ENEMY_W)
-            provisional[i] = replace(e, x=nx)
+            provisional[i] = e.con_x(nx)
         else:
             # Patrulla simple entre límites
             nx = e.x + e.velocidad_x * e.direccion
@@ -107,42 +246,24 @@ def actualizar_enemigos_ia(enemigos: Tuple[EstadoEnemigo, ...], jugador: EstadoJ
                 nx = e.patrulla_min_x; nd = 1
             elif nx >= e.patrulla_max_x:
                 nx = e.patrulla_max_x; nd = -1
-            provisional[i] = replace(e, x=nx, direccion=nd)
+            provisional[i] = e.con(x=nx, direccion=nd)
 
-    # 2) “Separación” para que no se peguen demasiado (evita solapamientos feos)
-    sep_min = ENEMY_W * 0.8  # distancia mínima deseada en X
-    empuje = 1               # cuánto corregimos por frame
+    # 2) “Separación” para que no se peguen demasiado (evita solapamientos feos):
+    #    1 px por frame por cada vecino demasiado cerca
     final = list(provisional)
+    empujes = (_empuje_directo if len(provisional) <= ENEMIGOS_DIRECTOS else _empuje_cubetas)(provisional)
 
-    for i in range(len(provisional)):
-        e_i = provisional[i]
-        # Solo aplicamos si está en escena (no entrando) y vivo
-        if not (e_i.vivo and not e_i.entrando and not e_i.explotando):
-            continue
-
-        ex, ey = e_i.x, e_i.y
-        corr = 0
-        for j in range(len(provisional)):
-            if i == j:
-                continue
-            e_j = provisional[j]
-            if not (e_j.vivo and not e_j.explotando):
-                continue
-
-            ox, oy = e_j.x, e_j.y
-            # Si están muy cerca en X y más o menos a la misma altura, empujamos
-            if abs(ex - ox) < sep_min and abs(ey - oy) < ENEMY_H:
-                corr += (empuje if ex <= ox else -empuje)
-
-        if corr != 0:
+    for i, corr in enumerate(empujes):
+        if corr != 0 and not provisional[i].tramo:
+            ex = provisional[i].x
             nx = _clamp(ex - corr, 0, ANCHO - ENEMY_W)
             # Evita que se queden “pegados” a los extremos si ya estaban en borde
             if (nx == 0 and corr > 0) or (nx == ANCHO - ENEMY_W and corr < 0):
                 nx = ex
-            final[i] = replace(final[i], x=nx)
+            final[i] = final[i].con_x(nx)
 
     # 3) Reducimos la protección de spawn (después de unos frames ya pueden recibir daño)
-    return tuple(replace(e, spawn_protect=max(0, e.spawn_protect - 1)) for e in final)
+    return tuple(e.con_spawn_protect(max(0, e.spawn_protect - 1)) for e in final)
 
 
 def logica_disparo_enemigo(enemigos: Tuple[EstadoEnemigo, ...], semilla: int, ia, x_predicho: int):
@@ -150,7 +271,7 @@ def logica_disparo_enemigo(enemigos: Tuple[EstadoEnemigo, ...], semilla: int, ia
     Genera disparos enemigos de forma “semi-inteligente”:
     - Solo disparan si el jugador (predicho) está más o menos alineado en X.
     - La ventana de alineación y el cooldown dependen de la dificultad.
-    - Todo se hace con la semilla (sin random global).
+    - Todo se hace con el flujo “disparos” (sin random global).
     """
     nuevas = []
     s = semilla
@@ -174,26 +295,27 @@ def logica_disparo_enemigo(enemigos: Tuple[EstadoEnemigo, ...], semilla: int, ia
             # calculamos un nuevo cooldown pseudoaleatorio basado en dificultad
             base_min = max(12, 26 - int(ia.dificultad * 3))
             base_max = max(base_min + 2, 36 - int(ia.dificultad * 2))
-            s, cd = azar_en_rango(s, base_min, base_max)
+            s, cd = azar_flujo(s, base_min, base_max)
 
         if disparo:
             cx = e.x + ENEMY_W // 2 - EBULLET_W // 2
             vel = 6 + int(ia.dificultad * 0.5)
             nuevas.append(EstadoBalaEnemiga(x=cx, y=e.y + ENEMY_H - 8, velocidad_y=vel))
 
-        actualizados.append(replace(e, cooldown=cd))
+        actualizados.append(e.con_cooldown(cd))
 
     return tuple(actualizados), tuple(nuevas), s
 
 
-def actualizar_balas_enemigas(balas: Tuple[EstadoBalaEnemiga, ...]) -> Tuple[EstadoBalaEnemiga, ...]:
+def actualizar_balas_enemigas(balas: Tuple[EstadoBalaEnemiga, ...], pasos: int = 1) -> Tuple[EstadoBalaEnemiga, ...]:
     """
     Avanza las balas enemigas de forma FUNCIONAL:
     - filter: me quedo solo con las que siguen “en cámara” (o un poco fuera)
     - map: muevo cada bala según su velocidad (sin mutar nada)
+    - pasos > 1 avanza varios ticks de una (usar luego colisión barrida)
     """
     # Filtra las balas dentro de pantalla (un margen para que no “desaparezcan” de golpe)
     dentro = filter(lambda b: (b.y < ALTO + 60) and (-40 <= b.x <= ANCHO + 40), balas)
-    # Aplica un desplazamiento funcional a cada bala (crea copias con replace)
-    movidas = map(lambda b: replace(b, x=b.x + b.velocidad_x, y=b.y + b.velocidad_y), dentro)
+    # Aplica un desplazamiento funcional a cada bala (crea copias con .con)
+    movidas = map(lambda b: b.con(x=b.x + b.velocidad_x * pasos, y=b.y + b.velocidad_y * pasos), dentro)
     return tuple(movidas)
\ No newline at end of file
@@ -0,0 +1,251 @@
+import multiprocessing as mp
+from array import array
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+from .constantes import ANCHO, ALTO, PLAYER_W, ENEMY_W, BOSS_W, BOSS_H, BOSS_HP, FIRE_RATE_FRAMES
+from .enums_eventos import ModoJuego
+from .estados import EstadoJuego
+from .flujo import inicializar_juego
+from .paso import Entrada, paso
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+
+# ============================================================================
+# entorno.py — El juego como “entorno” reset/step (estilo Gym, sin pygame)
+#   env = Entorno(semilla=0)
+#   obs, info = env.reset()
+#   obs, recompensa, terminado, truncado, info = env.step(accion)
+# - Acción discreta 0..7 = los bits de Entrada (1 izq, 2 der, 4 disparo)
+# - Observación: vector fijo de OBS_TAM floats, relativo al jugador
+# - Recompensa: cuánto subió el puntaje en ese tick
+# VecEntorno corre K entornos en procesos aparte y deja observaciones,
+# recompensas y fines en memoria compartida (no viajan por el pipe).
+# No dependemos de gym/gymnasium: solo imitamos su forma.
+# ============================================================================
+
+N_ACCIONES = 8
+MAX_METEOROS, MAX_ENEMIGOS, MAX_BALAS_ENEMIGAS = 8, 5, 8
+_MODOS = tuple(ModoJuego)
+OBS_TAM = 4 + len(_MODOS) + 5 * MAX_METEOROS + 3 * MAX_ENEMIGOS + 3 * MAX_BALAS_ENEMIGAS + 4 + 1
+
+
+def observar(estado: EstadoJuego) -> List[float]:
+    """
+    Vector compacto (OBS_TAM floats, más o menos en [-1, 1]) a partir del estado:
+    jugador, modo (one-hot), meteoros, enemigos, las balas enemigas más
+    cercanas y el jefe. Posiciones relativas al centro del jugador; los
+    huecos (menos entidades que lugares) quedan en 0.
+    """
+    j = estado.jugador
+    cx, cy = j.x + PLAYER_W // 2, j.y
+    obs = [j.x / ANCHO, j.corazones / 7, 1.0 if j.invul_frames > 0 else 0.0,
+           estado.fire_cooldown / FIRE_RATE_FRAMES]
+    obs += [1.0 if estado.modo == m else 0.0 for m in _MODOS]
+
+    mets = list(estado.meteoros)[:MAX_METEOROS]
+    for m in mets:
+        obs += [1.0, (m.x + m.ancho // 2 - cx) / ANCHO, (m.y - cy) / ALTO, m.velocidad_x / 5, m.velocidad_y / 10]
+    obs += [0.0] * (5 * (MAX_METEOROS - len(mets)))
+
+    enes = [e for e in estado.enemigos if e.vivo][:MAX_ENEMIGOS]
+    for e in enes:
+        obs += [1.0, (e.x + ENEMY_W // 2 - cx) / ANCHO, (e.y - cy) / ALTO]
+    obs += [0.0] * (3 * (MAX_ENEMIGOS - len(enes)))
+
+    cercanas = sorted(estado.balas_enemigas, key=lambda b: abs(b.x - cx) + abs(b.y - cy))[:MAX_BALAS_ENEMIGAS]
+    for b in cercanas:
+        obs += [(b.x - cx) / ANCHO, (b.y - cy) / ALTO, b.velocidad_y / 10]
+    obs += [0.0] * (3 * (MAX_BALAS_ENEMIGAS - len(cercanas)))
+
+    boss = estado.boss
+    if boss is not None and boss.vivo:
+        obs += [1.0, (boss.x + BOSS_W // 2 - cx) / ANCHO, (boss.y + BOSS_H - cy) / ALTO, boss.vida / BOSS_HP]
+    else:
+        obs += [0.0] * 4
+    obs.append(len(estado.balas) / 10)
+    return obs
+
+
+class Entorno:
+    """
+    Una partida como entorno. Cada reset() sin semilla usa la siguiente
+    (semilla, semilla + 1, …) para que una corrida completa sea reproducible.
+    max_ticks corta la partida (truncado=True) aunque el jugador siga vivo.
+    """
+    n_acciones = N_ACCIONES
+    tam_observacion = OBS_TAM
+
+    def __init__(self, semilla: int = 0, max_ticks: int = 36_000):
+        self.max_ticks = max_ticks
+        self._proxima = semilla
+        self.estado: Optional[EstadoJuego] = None
+        self.ticks = 0
+
+    def _info(self) -> Dict[str, object]:
+        return {"puntaje": self.estado.puntaje, "modo": self.estado.modo.value, "ticks": self.ticks}
+
+    def reset(self, seed: Optional[int] = None):
+        """Empieza una partida nueva y devuelve (observación, info)."""
+        if seed is not None:
+            self._proxima = seed
+        self.estado = inicializar_juego(self._proxima)
+        self._proxima += 1
+        self.ticks = 0
+        return observar(self.estado), self._info()
+
+    def step(self, accion: int):
+        """Avanza un tick con la acción (0..7) → (obs, recompensa, terminado, truncado, info)."""
+        if self.estado is None:
+            raise RuntimeError("llamar a reset() antes de step()")
+        antes = self.estado.puntaje
+        self.estado = paso(self.estado, Entrada.desde_bits(int(accion)))
+        self.ticks += 1
+        terminado = not self.estado.jugador.vivo
+        truncado = (not terminado) and self.ticks >= self.max_ticks
+        return observar(self.estado), float(self.estado.puntaje - antes), terminado, truncado, self._info()
+
+
+# ----------------------------------------------------------------------------
+# K entornos en procesos, con buffers en memoria compartida
+# Cada proceso atiende un bloque de entornos. Por el pipe solo viaja la
+# orden (“paso”, “reset”, “cerrar”); acciones, observaciones, recompensas
+# y fines se leen/escriben directo en los bloques compartidos.
+# ----------------------------------------------------------------------------
+
+def _bloques(k: int, tam_obs: int) -> Dict[str, Tuple[str, int]]:
+    """Tipo (código de array) y cantidad de cada buffer compartido."""
+    return {"obs": ("f", k * tam_obs), "recompensa": ("d", k), "terminado": ("b", k),
+            "truncado": ("b", k), "accion": ("b", k), "puntaje": ("q", k)}
+
+
+def _vistas(memorias, k: int):
+    return {n: memorias[n].buf.cast(tipo) for n, (tipo, _) in _bloques(k, OBS_TAM).items()}
+
+
+def _trabajador(conexion, nombres: Dict[str, str], k: int, indices: Sequence[int],
+                semilla: int, max_ticks: int):
+    memorias = {n: shared_memory.SharedMemory(name=nom) for n, nom in nombres.items()}
+    v = _vistas(memorias, k)
+    envs = {i: Entorno(semilla + i * 1_000_003, max_ticks) for i in indices}
+
+    def escribir_obs(i, obs):
+        v["obs"][i * OBS_TAM:(i + 1) * OBS_TAM] = array("f", obs)
+
+    try:
+        while True:
+            orden = conexion.recv()
+            if orden == "cerrar":
+                break
+            for i, env in envs.items():
+                if orden == "reset":
+                    obs, _ = env.reset()
+                    v["recompensa"][i], v["terminado"][i], v["truncado"][i] = 0.0, 0, 0
+                else:
+                    obs, r, term, trunc, _ = env.step(v["accion"][i])
+                    v["recompensa"][i], v["terminado"][i], v["truncado"][i] = r, term, trunc
+                    v["puntaje"][i] = env.estado.puntaje
+                    if term or trunc:
+                        obs, _ = env.reset()      # auto-reset: la obs ya es de la partida nueva
+                escribir_obs(i, obs)
+            conexion.send("ok")
+    finally:
+        for vista in v.values():
+            vista.release()
+        for m in memorias.values():
+            m.close()
+
+
+class VecEntorno:
+    """
+    K entornos en `trabajadores` procesos (0 = uno por núcleo, nunca más que K).
+    step(acciones) devuelve (obs, recompensas, terminados, truncados) como
+    arreglos NumPy (listas si no hay NumPy). Con copiar=False son VISTAS
+    sobre la memoria compartida: valen hasta el próximo step/reset y no hay
+    que guardarlas después de close(). Un entorno que termina se reinicia
+    solo (su obs ya es la de la partida nueva); puntajes() trae el puntaje
+    de cada uno ANTES de ese reinicio, o sea el final de la partida que terminó.
+    """
+    n_acciones = N_ACCIONES
+    tam_observacion = OBS_TAM
+
+    def __init__(self, k: int, semilla: int = 0, max_ticks: int = 36_000,
+                 trabajadores: int = 0, copiar: bool = True):
+        from .lote import trabajadores_disponibles
+        if k < 1:
+            raise ValueError("VecEntorno necesita al menos un entorno")
+        self.k = k
+        self.copiar = copiar
+        trabajadores = min(k, trabajadores or trabajadores_disponibles())
+        self._memorias = {n: shared_memory.SharedMemory(create=True, size=cant * array(tipo).itemsize)
+                          for n, (tipo, cant) in _bloques(k, OBS_TAM).items()}
+        self._v = _vistas(self._memorias, k)
+        self._np = None
+        if np is not None:
+            self._np = (np.frombuffer(self._v["obs"], np.float32).reshape(k, OBS_TAM),
+                        np.frombuffer(self._v["recompensa"], np.float64),
+                        np.frombuffer(self._v["terminado"], np.int8).view(np.bool_),
+                        np.frombuffer(self._v["truncado"], np.int8).view(np.bool_))
+        nombres = {n: m.name for n, m in self._memorias.items()}
+        self._conexiones, self._procesos = [], []
+        for w in range(trabajadores):
+            propia, remota = mp.Pipe()
+            p = mp.Process(target=_trabajador, daemon=True,
+                           args=(remota, nombres, k, range(w, k, trabajadores), semilla, max_ticks))
+            p.start()
+            self._conexiones.append(propia)
+            self._procesos.append(p)
+
+    def _ordenar(self, orden: str):
+        for c in self._conexiones:
+            c.send(orden)
+        for c in self._conexiones:
+            c.recv()
+
+    def _salida(self):
+        if self._np is not None:
+            return tuple(a.copy() for a in self._np) if self.copiar else self._np
+        o = self._v["obs"]
+        return ([list(o[i * OBS_TAM:(i + 1) * OBS_TAM]) for i in range(self.k)],
+                list(self._v["recompensa"]), [bool(x) for x in self._v["terminado"]],
+                [bool(x) for x in self._v["truncado"]])
+
+    def reset(self):
+        """Reinicia los K entornos y devuelve las observaciones (K, OBS_TAM)."""
+        self._ordenar("reset")
+        return self._salida()[0]
+
+    def step(self, acciones: Sequence[int]):
+        """Una acción por entorno (0..7) → (obs, recompensas, terminados, truncados)."""
+        a = self._v["accion"]
+        for i, x in enumerate(acciones):
+            a[i] = int(x)
+        self._ordenar("paso")
+        return self._salida()
+
+    def puntajes(self) -> List[int]:
+        return list(self._v["puntaje"])
+
+    def close(self):
+        """Cierra los procesos y libera la memoria compartida (idempotente)."""
+        if not self._procesos:
+            return
+        for c in self._conexiones:
+            c.send("cerrar")
+        for p in self._procesos:
+            p.join()
+        self._procesos = []
+        self._np = None
+        for vista in self._v.values():
+            vista.release()
+        for m in self._memorias.values():
+            m.close()
+            m.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -29,12 +29,16 @@ class EventoTipo(Enum):
     - JEFE_ENTRA: el jefe va a aparecer (sirve para alertas/sonidos).
     - JEFE_MUERTO: el jefe fue derrotado (cambiar música, animaciones, etc).
     - JUGADOR_MUERTO: el jugador se quedó sin corazones (Game Over).
+      En cooperativo la nave 2 lo manda con detalle (2,) y la partida
+      termina cuando no queda ninguna (ver paso.hay_naves_vivas).
     - ESTADO_INVALIDO: algo no cuadra con el modo/estado (para debug/telemetría).
+    - DISPARO: el jugador disparó una bala este tick (sonido del láser).
     """
     JEFE_ENTRA      = "jefe_entra"
     JEFE_MUERTO     = "jefe_muerto"
     JUGADOR_MUERTO  = "jugador_muerto"
     ESTADO_INVALIDO = "estado_invalido"
+    DISPARO         = "disparo"
 
 
 @dataclass(frozen=True)
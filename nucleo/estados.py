@@ -1,4 +1,4 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import Tuple, Optional
 from .constantes import ANCHO, ENEMY_W, BOSS_W
 
@@ -6,9 +6,50 @@ from .constantes import ANCHO, ENEMY_W, BOSS_W
 # estados.py (núcleo de datos inmutables)
 # Nota: usamos @dataclass(frozen=True) y tuplas para mantener inmutabilidad.
 # Cada “cambio” se logra creando una NUEVA copia desde la lógica pura.
+# Además usamos slots=True (menos memoria, acceso más rápido) y cada clase
+# trae atajos generados para copiar con cambios sin pasar por replace:
+#   j.con(x=3, vivo=False)   → igual que replace(j, x=3, vivo=False)
+#   j.con_invul_frames(0)    → cambia un solo campo (el camino más rápido)
 # ============================================================================
 
-@dataclass(frozen=True)
+_FALTA = object()   # centinela: “este campo no se cambia”
+
+
+def _generar_actualizadores(cls):
+    """
+    Genera (con exec, UNA vez al importar) los métodos con(**cambios) y
+    con_<campo>(valor) de una dataclass congelada con slots.
+    Crean la instancia con object.__new__ y escriben cada slot con su
+    descriptor: así se evita la reflexión de replace (fields(), dict de
+    kwargs, __init__ congelado con object.__setattr__ por campo).
+    El objeto publicado sigue siendo inmutable: solo se escribe mientras
+    se arma la copia nueva.
+    """
+    nombres = [f.name for f in fields(cls)]
+    ns = {"_FALTA": _FALTA, "_nuevo": object.__new__, "_cls": cls}
+    for n in nombres:
+        ns[f"_s_{n}"] = cls.__dict__[n].__set__
+
+    params = ", ".join(f"{n}=_FALTA" for n in nombres)
+    cuerpo = "".join(f"    _s_{n}(c, self.{n} if {n} is _FALTA else {n})\n" for n in nombres)
+    fuente = [f"def con(self, *, {params}):\n    c = _nuevo(_cls)\n{cuerpo}    return c\n"]
+    for campo in nombres:
+        cuerpo = "".join(f"    _s_{n}(c, {'valor' if n == campo else 'self.' + n})\n" for n in nombres)
+        fuente.append(f"def con_{campo}(self, valor):\n    c = _nuevo(_cls)\n{cuerpo}    return c\n")
+    exec("".join(fuente), ns)
+
+    cls.con = ns["con"]
+    cls.con.__doc__ = f"Copia de {cls.__name__} con los campos indicados cambiados (como replace)."
+    for campo in nombres:
+        metodo = ns[f"con_{campo}"]
+        metodo.__qualname__ = f"{cls.__name__}.con_{campo}"
+        setattr(cls, f"con_{campo}", metodo)
+    cls.con.__qualname__ = f"{cls.__name__}.con"
+    return cls
+
+
+@_generar_actualizadores
+@dataclass(frozen=True, slots=True)
 class EstadoJugador:
     """
     Jugador del juego: posición, corazones (vida), estado vivo/muerto
@@ -17,7 +58,8 @@ class EstadoJugador:
     x: int; y: int; corazones: int; vivo: bool
     invul_frames: int = 0
 
-@dataclass(frozen=True)
+@_generar_actualizadores
+@dataclass(frozen=True, slots=True)
 class EstadoMeteoro:
     """
     Meteoro con posición, velocidad y tamaño básico para colisiones AABB.
@@ -25,14 +67,16 @@ class EstadoMeteoro:
     x: int; y: int; velocidad_x: int; velocidad_y: int
     ancho: int = 50; alto: int = 50
 
-@dataclass(frozen=True)
+@_generar_actualizadores
+@dataclass(frozen=True, slots=True)
 class EstadoBala:
     """
     Bala del jugador: avanza hacia arriba, puede marcarse como activa/inactiva.
     """
     x: int; y: int; velocidad_y: int = -10; activa: bool = True
 
-@dataclass(frozen=True)
+@_generar_actualizadores
+@dataclass(frozen=True, slots=True)
 class EstadoBalaEnemiga:
     """
     Bala enemiga: permite movimiento en Y (y opcionalmente en X) y estado activo.
@@ -41,12 +85,15 @@ class EstadoBalaEnemiga:
     velocidad_y: int = 6; velocidad_x: int = 0
     activa: bool = True
 
-@dataclass(frozen=True)
+@_generar_actualizadores
+@dataclass(frozen=True, slots=True)
 class EstadoEnemigo:
     """
     Enemigo estándar: posición, dirección/patrulla, ciclo de explosión,
     cooldown de disparo y protección de aparición (spawn_protect).
     Incluye fase de “entrada” hasta llegar a y_objetivo.
+    tramo/t/ancla_x/ancla_y: comportamiento por tabla (nucleo.comportamientos);
+    tramo 0 = la IA clásica de siempre. t < 0 = esperando su turno para entrar.
     """
     x: int; y: int; velocidad_x: int; direccion: int
     vivo: bool = True; explotando: bool = False
@@ -57,27 +104,40 @@ class EstadoEnemigo:
     spawn_protect: int = 18
     entrando: bool = True
     y_objetivo: int = 80
+    tramo: int = 0
+    t: int = 0
+    ancla_x: int = 0
+    ancla_y: int = 0
 
-@dataclass(frozen=True)
+@_generar_actualizadores
+@dataclass(frozen=True, slots=True)
 class EstadoBoss:
     """
     Jefe final: vida/estado, entrada inicial hasta y_objetivo y
     pequeña máquina de estados para ráfagas (fase/cooldown/timers).
+    patron/patron_t: fase del “bullet hell” (nucleo.patrones.PATRONES) y
+    ticks que lleva en ella.
+    partes: vida de cada pieza de nucleo.partes.ARMAZON (en su orden);
+    vacío = jefe de una sola caja con toda la vida en `vida`.
     """
     x: int; y: int; vida: int; vivo: bool = True
     entrando: bool = True; y_objetivo: int = 20
     cooldown: int = 0; fase: str = "rest"; fase_timer: int = 0
     disparos_en_rafaga: int = 0
     cadencia_frames: int = 8; pausa_frames: int = 60; max_disparos_rafaga: int = 10
+    patron: int = 0; patron_t: int = 0
+    partes: Tuple[int, ...] = ()
 
-@dataclass(frozen=True)
+@_generar_actualizadores
+@dataclass(frozen=True, slots=True)
 class EstadoExplosion:
     """
     Efecto visual de explosión con contador de vida en frames y tipo (“meteor”/“enemy”).
     """
     x: int; y: int; tipo: str; timer: int = 18  # "meteor" | "enemy"
 
-@dataclass(frozen=True)
+@_generar_actualizadores
+@dataclass(frozen=True, slots=True)
 class EstadoIA:
     """
     Parámetros de dificultad y control de flujo/oleadas:
@@ -92,12 +152,20 @@ class EstadoIA:
     reponer_meteoros: bool = True; preboss_pause: int = 0
     meteor_bonus: int = 0; cycles: int = 0
 
-@dataclass(frozen=True)
+@_generar_actualizadores
+@dataclass(frozen=True, slots=True)
 class EstadoJuego:
     """
     Estado global del juego (la “fuente de la verdad”):
     agrupa jugador, meteoros, enemigos, balas, puntaje, modo, IA, jefe,
     explosiones y eventos que el núcleo emite para que la cáscara actúe.
+    fire_cooldown y gracia_spawn son los contadores del ritmo de disparo y
+    de la gracia inicial (los usa paso(); antes vivían en la cáscara).
+    jugador2/fire_cooldown2: segunda nave del modo cooperativo (None = un
+    jugador, y todo funciona exactamente como siempre).
+    Azar: un flujo por consumidor (nucleo.rng): semilla_azar = meteoros,
+    azar_enemigos = oleadas nuevas, azar_disparos = cooldowns enemigos.
+    cortina: balas del jefe (nucleo.patrones.Cortina); None fuera de la pelea.
     """
     from .enums_eventos import Evento
     from .enums_eventos import ModoJuego
@@ -112,4 +180,11 @@ class EstadoJuego:
     ia: "EstadoIA"
     boss: Optional["EstadoBoss"] = None
     explosiones: Tuple["EstadoExplosion", ...] = field(default_factory=tuple)
-    eventos: Tuple["Evento", ...] = field(default_factory=tuple)
\ No newline at end of file
+    eventos: Tuple["Evento", ...] = field(default_factory=tuple)
+    fire_cooldown: int = 0
+    gracia_spawn: int = 0
+    jugador2: Optional["EstadoJugador"] = None
+    fire_cooldown2: int = 0
+    azar_enemigos: int = 0
+    azar_disparos: int = 0
+    cortina: Optional["Cortina"] = None
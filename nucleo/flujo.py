@@ -1,9 +1,10 @@
-from dataclasses import replace
-from .constantes import ENEMY_WAVE_COOLDOWN, MIXED_WAVE_COOLDOWN, PREBOSS_PAUSE_TICKS
+from .constantes import ENEMY_WAVE_COOLDOWN, MIXED_WAVE_COOLDOWN, PREBOSS_PAUSE_TICKS, SPAWN_GRACE_TICKS
 from .enums_eventos import Evento, EventoTipo, ModoJuego
 from .estados import EstadoJuego, EstadoMeteoro, EstadoJugador, EstadoIA
-from .rng import azar_en_rango
-from .enemigos import crear_enemigos
+from .rng import flujo_de, lote_rangos
+from .enemigos import crear_enemigos, crear_oleada
+from .comportamientos import ORDEN_OLEADAS
+from .meteoritos import _rangos as _rangos_meteoro
 from .jefe import crear_jefe
 
 # ============================================================================
@@ -18,7 +19,7 @@ def _con_eventos(estado: EstadoJuego, *evs: Evento) -> EstadoJuego:
     Ej: JEFE_ENTRA, JUGADOR_MUERTO. Mantiene la pureza: el núcleo
     solo “emite” eventos como datos, y afuera reaccionan.
     """
-    return replace(estado, eventos=estado.eventos + evs)
+    return estado.con_eventos(estado.eventos + evs)
 
 def _todos_fuera(enemigos) -> bool:
     """
@@ -27,12 +28,21 @@ def _todos_fuera(enemigos) -> bool:
     """
     return all((not e.vivo) and (not e.explotando) for e in enemigos)
 
+def _tipo_oleada(ia: EstadoIA, n: int) -> str:
+    """
+    Qué oleada lanzar como n-ésima del modo. El primer ciclo (hasta el primer
+    jefe) es el de siempre: solo oleadas clásicas, así ENEMIGOS y el primer
+    MIXTO no cambian. Desde el segundo ciclo rotan por ORDEN_OLEADAS.
+    """
+    return ORDEN_OLEADAS[n % len(ORDEN_OLEADAS)] if ia.cycles else "clasica"
+
 def logica_juego(estado: EstadoJuego) -> EstadoJuego:
     """
     Máquina de estados del juego:
     - Pasa de METEORITOS → ENEMIGOS cuando el puntaje lo permita.
     - En ENEMIGOS, al llegar al umbral (mix_threshold) cambia a MIXTO.
-    - En MIXTO, alterna oleadas de enemigos y mete una pausa antes del JEFE.
+    - En MIXTO, alterna oleadas de enemigos y mete una pausa antes del JEFE
+      (desde el segundo ciclo, las oleadas por tabla entran en la ronda).
     - En JEFE, cuando muere, reinicia ciclo con más dificultad.
     Todo de forma pura, devolviendo un NUEVO EstadoJuego.
     """
@@ -40,29 +50,29 @@ def logica_juego(estado: EstadoJuego) -> EstadoJuego:
 
     # --- 1) Cambio a ENEMIGOS cuando ya hay puntaje suficiente ---
     if estado.modo == ModoJuego.METEORITOS and estado.puntaje >= 300:
-        enemigos, s = crear_enemigos(ia.siguiente_tam, estado.semilla_azar)
-        ia2 = replace(ia, oleada=1, wave_cooldown=0)
-        return replace(estado, modo=ModoJuego.ENEMIGOS, enemigos=enemigos, semilla_azar=s, meteoros=tuple(), ia=ia2)
+        enemigos, s = crear_enemigos(ia.siguiente_tam, estado.azar_enemigos)
+        ia2 = ia.con(oleada=1, wave_cooldown=0)
+        return estado.con(modo=ModoJuego.ENEMIGOS, enemigos=enemigos, azar_enemigos=s, meteoros=tuple(), ia=ia2)
 
     # --- 2) Cambio a MIXTO cuando se supera el umbral de la IA ---
     if estado.modo == ModoJuego.ENEMIGOS and estado.puntaje >= ia.mix_threshold:
-        enemigos, s = crear_enemigos(5, estado.semilla_azar)
-        nuevo_ia = replace(ia, mixed_waves_spawned=1, wave_cooldown=0, reponer_meteoros=True, preboss_pause=0)
-        return replace(estado, modo=ModoJuego.MIXTO, enemigos=enemigos, semilla_azar=s, ia=nuevo_ia)
+        enemigos, s = crear_enemigos(5, estado.azar_enemigos)
+        nuevo_ia = ia.con(mixed_waves_spawned=1, wave_cooldown=0, reponer_meteoros=True, preboss_pause=0)
+        return estado.con(modo=ModoJuego.MIXTO, enemigos=enemigos, azar_enemigos=s, ia=nuevo_ia)
 
     # --- 3) Bucle de oleadas en ENEMIGOS (sin meteoros) ---
     if estado.modo == ModoJuego.ENEMIGOS:
         if _todos_fuera(estado.enemigos):
             # cooldown entre oleadas
             if ia.wave_cooldown > 0:
-                return replace(estado, ia=replace(ia, wave_cooldown=ia.wave_cooldown - 1))
+                return estado.con_ia(ia.con_wave_cooldown(ia.wave_cooldown - 1))
             # aumenta dificultad y lanza nueva oleada
             nueva_dif = min(10, ia.dificultad + 0.6)
             tam = 5
-            enemigos, s = crear_enemigos(tam, estado.semilla_azar)
-            ia3 = replace(ia, dificultad=nueva_dif, velocidad_reaccion=1.0 + (nueva_dif / 3),
-                          oleada=ia.oleada + 1, siguiente_tam=tam, wave_cooldown=ENEMY_WAVE_COOLDOWN)
-            return replace(estado, enemigos=enemigos, semilla_azar=s, ia=ia3)
+            enemigos, s = crear_oleada(_tipo_oleada(ia, ia.oleada), tam, estado.azar_enemigos)
+            ia3 = ia.con(dificultad=nueva_dif, velocidad_reaccion=1.0 + (nueva_dif / 3),
+                     oleada=ia.oleada + 1, siguiente_tam=tam, wave_cooldown=ENEMY_WAVE_COOLDOWN)
+            return estado.con(enemigos=enemigos, azar_enemigos=s, ia=ia3)
         return estado
 
     # --- 4) Modo MIXTO: alterna oleadas y prepara al JEFE ---
@@ -74,56 +84,56 @@ def logica_juego(estado: EstadoJuego) -> EstadoJuego:
         # (a) Aún faltan rondas mixtas → generar otra oleada
         if ia.mixed_waves_spawned < ia.mixed_rounds_target:
             if ia.wave_cooldown > 0:
-                return replace(estado, ia=replace(ia, wave_cooldown=ia.wave_cooldown - 1))
-            enemigos, s = crear_enemigos(5, estado.semilla_azar)
-            return replace(estado, enemigos=enemigos, semilla_azar=s,
-                           ia=replace(ia, mixed_waves_spawned=ia.mixed_waves_spawned + 1,
-                                      reponer_meteoros=True, wave_cooldown=MIXED_WAVE_COOLDOWN))
+                return estado.con_ia(ia.con_wave_cooldown(ia.wave_cooldown - 1))
+            enemigos, s = crear_oleada(_tipo_oleada(ia, ia.mixed_waves_spawned), 5, estado.azar_enemigos)
+            return estado.con(enemigos=enemigos, azar_enemigos=s,
+                              ia=ia.con(mixed_waves_spawned=ia.mixed_waves_spawned + 1,
+                                        reponer_meteoros=True, wave_cooldown=MIXED_WAVE_COOLDOWN))
 
         # (b) Ya se cumplieron rondas → quitar reposición y activar pausa pre-JEFE
         if ia.reponer_meteoros:
-            ia = replace(ia, reponer_meteoros=False, preboss_pause=PREBOSS_PAUSE_TICKS)
-            return replace(estado, ia=ia)
+            ia = ia.con(reponer_meteoros=False, preboss_pause=PREBOSS_PAUSE_TICKS)
+            return estado.con_ia(ia)
 
         # (c) Contador de pausa antes del JEFE
         if ia.preboss_pause > 0:
-            return replace(estado, ia=replace(ia, preboss_pause=ia.preboss_pause - 1))
+            return estado.con_ia(ia.con_preboss_pause(ia.preboss_pause - 1))
 
         # (d) Instanciar JEFE y notificar evento (la cáscara pone música/FX)
         if estado.boss is None:
-            nuevo = replace(estado, modo=ModoJuego.JEFE, boss=crear_jefe(), meteoros=tuple())
+            nuevo = estado.con(modo=ModoJuego.JEFE, boss=crear_jefe(), meteoros=tuple())
             return _con_eventos(nuevo, Evento(EventoTipo.JEFE_ENTRA))
         return estado
 
     # --- 5) Al matar al JEFE: subir dificultad y reiniciar ciclo MIXTO ---
     if estado.modo == ModoJuego.JEFE and (estado.boss is not None) and (not estado.boss.vivo):
         nueva_dif = min(10, ia.dificultad + 1.0)
-        nuevo_ia = replace(ia, dificultad=nueva_dif, velocidad_reaccion=1.0 + (nueva_dif / 3),
-                           meteor_bonus=min(5, ia.meteor_bonus + 1),
-                           mixed_waves_spawned=0, reponer_meteoros=True, preboss_pause=0,
-                           wave_cooldown=0, cycles=ia.cycles + 1)
-        return replace(estado, modo=ModoJuego.MIXTO, enemigos=tuple(), boss=None, ia=nuevo_ia)
+        nuevo_ia = ia.con(dificultad=nueva_dif, velocidad_reaccion=1.0 + (nueva_dif / 3),
+                          meteor_bonus=min(5, ia.meteor_bonus + 1),
+                          mixed_waves_spawned=0, reponer_meteoros=True, preboss_pause=0,
+                          wave_cooldown=0, cycles=ia.cycles + 1)
+        return estado.con(modo=ModoJuego.MIXTO, enemigos=tuple(), boss=None, cortina=None, ia=nuevo_ia)
 
     # Si nada aplica, el estado sigue igual
     return estado
 
-def inicializar_juego(semilla: int = 42) -> EstadoJuego:
+def inicializar_juego(semilla: int = 42, cooperativo: bool = False) -> EstadoJuego:
     """
     Crea el estado inicial: meteoroides aleatorios, jugador centrado,
     IA en valores base y sin jefe. Todo inmutable y listo para testear.
+    cooperativo=True agrega la segunda nave (jugador2) y separa las dos.
+    Cada consumidor de azar arranca su propio flujo derivado de `semilla`.
     """
-    meteoros = []
-    s = semilla
     from .constantes import ANCHO
-    for _ in range(8):
-        s, nx = azar_en_rango(s, 0, ANCHO - 40)
-        s, ny = azar_en_rango(s, -140, -100)
-        s, sx = azar_en_rango(s, -3, 3)
-        s, sy = azar_en_rango(s, 1, 4)
-        meteoros.append(EstadoMeteoro(nx, ny, sx, sy))
+    s, vs = lote_rangos(flujo_de(semilla, "meteoros"), _rangos_meteoro(40, 0) * 8)
+    meteoros = [EstadoMeteoro(*vs[k:k + 4]) for k in range(0, len(vs), 4)]
 
     from .constantes import ALTO
     jugador = EstadoJugador(ANCHO // 2, ALTO - 50, 7, True, 0)
+    jugador2 = None
+    if cooperativo:
+        jugador = jugador.con_x(ANCHO // 2 - 120)
+        jugador2 = EstadoJugador(ANCHO // 2 + 120, ALTO - 50, 7, True, 0)
 
     ia = EstadoIA(
         dificultad=1.0, velocidad_reaccion=1.0, ultimo_x_jugador=ANCHO // 2,
@@ -139,7 +149,9 @@ def inicializar_juego(semilla: int = 42) -> EstadoJuego:
         jugador=jugador, meteoros=tuple(meteoros), balas=tuple(),
         enemigos=tuple(), balas_enemigas=tuple(), puntaje=0,
         semilla_azar=s, modo=ModoJuego.METEORITOS, ia=ia,
-        boss=None, explosiones=tuple(), eventos=tuple()
+        boss=None, explosiones=tuple(), eventos=tuple(),
+        fire_cooldown=0, gracia_spawn=SPAWN_GRACE_TICKS, jugador2=jugador2,
+        azar_enemigos=flujo_de(semilla, "enemigos"), azar_disparos=flujo_de(semilla, "disparos"),
     )
 
 # ----------------------------------------------------------------------------
@@ -155,7 +167,7 @@ def ajustar_ia(ia, puntaje: int, jugador_vivo: bool):
     try:
         inc = 0.002 if jugador_vivo else 0.0
         nueva_dif = min(10.0, ia.dificultad + inc)
-        return replace(ia, dificultad=nueva_dif)
+        return ia.con_dificultad(nueva_dif)
     except Exception:
         # Por si llegara un tipo inesperado en tests/uso externo
         return ia
@@ -166,7 +178,7 @@ def predecir_jugador(ia, jugador):
     Devuelve (ia_actualizada, x_predicho). Sirve para disparos enemigos.
     """
     try:
-        ia2 = replace(ia, ultimo_x_jugador=jugador.x)
+        ia2 = ia.con_ultimo_x_jugador(jugador.x)
     except Exception:
         ia2 = ia
     return ia2, getattr(jugador, "x", 0)
\ No newline at end of file
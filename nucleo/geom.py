@@ -16,4 +16,29 @@ def _clamp(v, a, b):
     - Si a ≤ v ≤ b → devuelve v
     Útil para no salirnos de la pantalla ni de límites.
     """
-    return max(a, min(b, v))
\ No newline at end of file
+    return max(a, min(b, v))
+
+
+def _swept_collide(x0, y0, x1, y1, aw, ah, bx, by, bw, bh):
+    """
+    Colisión AABB “barrida” (continua):
+    el rect A (aw×ah) viaja en línea recta de (x0, y0) a (x1, y1) durante el tick;
+    B está quieto. Devuelve True si en ALGÚN instante t ∈ [0, 1] se traslapan.
+    Así un proyectil rápido no “atraviesa” objetivos finos entre dos ticks.
+    Método de “slabs”: intervalo de tiempo de traslape en X ∩ en Y ∩ [0, 1].
+    """
+    # Cada eje aporta un intervalo ABIERTO (el AABB usa desigualdades estrictas)
+    lo, hi = float("-inf"), float("inf")
+    for p0, p1, a, b, bl in ((x0, x1, aw, bx, bw), (y0, y1, ah, by, bh)):
+        d = p1 - p0
+        if d == 0:
+            # Sin movimiento en este eje: o se traslapan siempre o nunca
+            if not (p0 < b + bl and p0 + a > b):
+                return False
+            continue
+        t_a, t_b = (b - a - p0) / d, (b + bl - p0) / d
+        if t_a > t_b:
+            t_a, t_b = t_b, t_a
+        lo, hi = max(lo, t_a), min(hi, t_b)
+    # (lo, hi) abierto ∩ [0, 1] no vacío
+    return lo < hi and lo < 1 and hi > 0
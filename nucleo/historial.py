@@ -0,0 +1,127 @@
+from array import array
+from collections import deque
+from typing import Optional, Tuple
+from .codec import codificar, decodificar
+from .estados import EstadoJuego
+
+# ============================================================================
+# historial.py — Historia de la partida para “viajar en el tiempo” (debug)
+# Guarda cada tick como bytes de nucleo.codec: una instantánea COMPLETA
+# cada `cada` ticks (clave) y entre medio solo deltas contra el tick
+# anterior. Ticks [clave, clave+cada) forman un bloque; cuando se pasa del
+# presupuesto de bytes se tira el bloque MÁS VIEJO entero, así la memoria
+# queda plana aunque la partida dure horas.
+#   h = Historial(cada=60, presupuesto=8 << 20)
+#   h.guardar(tick, estado)          # en orden: 0, 1, 2, ...
+#   h.estado(t)                      # clave + hasta cada-1 deltas
+#   h.recortar(t)                    # retomar desde t: se olvida el futuro
+# Los deltas de un bloque van pegados en un solo bytearray (más los
+# índices donde termina cada uno): pocos objetos, bytes contados de verdad.
+# ============================================================================
+
+_FIJO = 200   # sobrecarga aproximada por bloque (objetos de Python), para la cuenta
+
+
+class _Bloque:
+    __slots__ = ("tick", "clave", "deltas", "fines")
+
+    def __init__(self, tick: int, clave: bytes):
+        self.tick = tick
+        self.clave = clave
+        self.deltas = bytearray()
+        self.fines = array("I")
+
+    def __len__(self):         # ticks guardados
+        return 1 + len(self.fines)
+
+    def tamaño(self) -> int:
+        return _FIJO + len(self.clave) + len(self.deltas) + self.fines.itemsize * len(self.fines)
+
+
+class Historial:
+    """
+    Historia acotada de una partida (ticks consecutivos). `cada` = ticks
+    por clave (scrubear hacia atrás cuesta hasta `cada` decodificaciones);
+    `presupuesto` = bytes máximos (siempre queda al menos el bloque actual).
+    """
+
+    def __init__(self, cada: int = 60, presupuesto: int = 8 << 20):
+        if cada < 1:
+            raise ValueError("cada tiene que ser >= 1")
+        self.cada = cada
+        self.presupuesto = presupuesto
+        self.bytes = 0
+        self._bloques: deque = deque()
+        self._ultimo: Optional[EstadoJuego] = None   # para armar el próximo delta
+        self._cursor: Optional[Tuple[int, EstadoJuego]] = None   # último estado() (scrub de a 1)
+
+    @property
+    def primero(self) -> Optional[int]:
+        return self._bloques[0].tick if self._bloques else None
+
+    @property
+    def ultimo(self) -> Optional[int]:
+        if not self._bloques:
+            return None
+        b = self._bloques[-1]
+        return b.tick + len(b) - 1
+
+    def guardar(self, tick: int, estado: EstadoJuego):
+        """Agrega el estado DESPUÉS de `tick` ticks (tiene que ser ultimo + 1, o el primero)."""
+        if self._bloques and tick != self.ultimo + 1:
+            raise ValueError(f"tick {tick} fuera de orden (se esperaba {self.ultimo + 1})")
+        actual = self._bloques[-1] if self._bloques else None
+        if actual is None or len(actual) >= self.cada:
+            actual = _Bloque(tick, codificar(estado))
+            self._bloques.append(actual)
+            self.bytes += actual.tamaño()
+        else:
+            antes = actual.tamaño()
+            actual.deltas += codificar(estado, self._ultimo)
+            actual.fines.append(len(actual.deltas))
+            self.bytes += actual.tamaño() - antes
+        self._ultimo = estado
+        while self.bytes > self.presupuesto and len(self._bloques) > 1:
+            self.bytes -= self._bloques.popleft().tamaño()
+        if self._cursor is not None and self._cursor[0] < self.primero:
+            self._cursor = None
+
+    def _bloque(self, tick: int) -> _Bloque:
+        if not self._bloques or not self.primero <= tick <= self.ultimo:
+            raise KeyError(tick)
+        # Todos los bloques menos el último están llenos: la cuenta es directa
+        return self._bloques[(tick - self.primero) // self.cada]
+
+    def estado(self, tick: int) -> EstadoJuego:
+        """Estado guardado después de `tick` ticks (KeyError si ya se tiró o no existe)."""
+        b = self._bloque(tick)
+        cursor = self._cursor
+        if cursor is not None and b.tick <= cursor[0] <= tick:
+            k, estado = cursor          # seguir desde donde quedó (scrub hacia adelante)
+        else:
+            k, estado = b.tick, decodificar(b.clave)
+        ini = 0 if k == b.tick else b.fines[k - b.tick - 1]
+        for j in range(k - b.tick, tick - b.tick):
+            fin = b.fines[j]
+            estado = decodificar(bytes(b.deltas[ini:fin]), estado)
+            ini = fin
+        self._cursor = (tick, estado)
+        return estado
+
+    def recortar(self, tick: int):
+        """
+        Olvida todo lo posterior a `tick` (para retomar la partida desde
+        ahí). El próximo guardar() tiene que ser tick + 1.
+        """
+        estado = self.estado(tick)
+        while self._bloques[-1].tick > tick:
+            self.bytes -= self._bloques.pop().tamaño()
+        b = self._bloques[-1]
+        n = tick - b.tick                  # deltas que se quedan
+        antes = b.tamaño()
+        if n < len(b.fines):
+            del b.deltas[b.fines[n - 1] if n else 0:]
+            del b.fines[n:]
+        self.bytes += b.tamaño() - antes
+        self._ultimo = estado
+        self._cursor = (tick, estado)
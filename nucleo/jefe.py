@@ -1,18 +1,19 @@
-from dataclasses import replace
 from typing import Tuple
 from .constantes import ANCHO, BOSS_W, BOSS_H, EBULLET_W, BOSS_HP
 from .geom import _clamp
 from .estados import EstadoBoss, EstadoBalaEnemiga, EstadoJugador
+from .partes import vidas_iniciales, origen_activo
 
 def crear_jefe() -> EstadoBoss:
     """
     Crea el jefe al inicio de su aparición:
       - Entra desde arriba (y = -BOSS_H) hasta y_objetivo
       - Empieza vivo, en fase "rest" (descanso) con temporizadores en 0
+      - Armado por partes (nucleo.partes.ARMAZON), todas con la vida entera
     """
     return EstadoBoss(x=ANCHO//2 - BOSS_W//2, y=-BOSS_H, vida=BOSS_HP, vivo=True,
                       entrando=True, y_objetivo=20, fase="rest", fase_timer=0,
-                      disparos_en_rafaga=0, cooldown=0)
+                      disparos_en_rafaga=0, cooldown=0, partes=vidas_iniciales())
 
 def actualizar_jefe(boss: EstadoBoss, jugador: EstadoJugador) -> EstadoBoss:
     """
@@ -30,8 +31,8 @@ def actualizar_jefe(boss: EstadoBoss, jugador: EstadoJugador) -> EstadoBoss:
         if ny >= boss.y_objetivo:
             ny = boss.y_objetivo
             # Al terminar la entrada, queda en reposo un ratito
-            return replace(boss, y=ny, entrando=False, fase="rest", fase_timer=30, cooldown=0)
-        return replace(boss, y=ny, cooldown=0)
+            return boss.con(y=ny, entrando=False, fase="rest", fase_timer=30, cooldown=0)
+        return boss.con(y=ny, cooldown=0)
 
     # En combate: tick de temporizadores (no bajan de 0)
     nuevo_cd = boss.cooldown - 1 if boss.cooldown > 0 else 0
@@ -43,7 +44,7 @@ def actualizar_jefe(boss: EstadoBoss, jugador: EstadoJugador) -> EstadoBoss:
     dx = 3 if objetivo > cx else (-3 if objetivo < cx else 0)
     nx = _clamp(boss.x + dx, 0, ANCHO - BOSS_W)
 
-    return replace(boss, x=nx, cooldown=nuevo_cd, fase_timer=nuevo_timer)
+    return boss.con(x=nx, cooldown=nuevo_cd, fase_timer=nuevo_timer)
 
 def disparo_jefe(boss: EstadoBoss, ia) -> Tuple[EstadoBoss, Tuple[EstadoBalaEnemiga, ...]]:
     """
@@ -52,7 +53,9 @@ def disparo_jefe(boss: EstadoBoss, ia) -> Tuple[EstadoBoss, Tuple[EstadoBalaEnem
           "rest": descansa hasta que se agota fase_timer, luego cambia a "burst"
           "burst": dispara en parejas (izq+der). Cuando alcanza el máximo, vuelve a "rest"
       - La dificultad del juego (ia.dificultad) ajusta cadencia, pausa y cantidad de disparos
+      - Un cañón cuya torreta está rota ya no dispara (la ráfaga sigue su ritmo igual)
       - Devuelve (nuevo_boss, balas_nuevas) sin efectos secundarios
+    paso() ya no lo usa: en el juego el jefe dispara con nucleo.patrones.emitir.
     """
     if not boss.vivo or boss.entrando:
         return boss, tuple()
@@ -67,7 +70,7 @@ def disparo_jefe(boss: EstadoBoss, ia) -> Tuple[EstadoBoss, Tuple[EstadoBalaEnem
         if boss.fase_timer > 0:
             return boss, tuple()
         # Cambia a ráfaga y reinicia contador
-        boss = replace(boss, fase="burst", disparos_en_rafaga=0, cooldown=0)
+        boss = boss.con(fase="burst", disparos_en_rafaga=0, cooldown=0)
 
     # Fase de ráfaga: dispara en parejas desde los “cañones” izquierdo y derecho
     if boss.fase == "burst":
@@ -80,9 +83,10 @@ def disparo_jefe(boss: EstadoBoss, ia) -> Tuple[EstadoBoss, Tuple[EstadoBalaEnem
         y       = boss.y + BOSS_H - 10
         vel     = 6 + int(ia.dificultad * 0.5)
 
-        balas = (
-            EstadoBalaEnemiga(x=left_x,  y=y, velocidad_y=vel),
-            EstadoBalaEnemiga(x=right_x, y=y, velocidad_y=vel)
+        balas = tuple(
+            EstadoBalaEnemiga(x=bx, y=y, velocidad_y=vel)
+            for bx in (left_x, right_x)
+            if origen_activo(boss, bx - boss.x + EBULLET_W // 2, y - boss.y)
         )
 
         # Contar parejas disparadas en la ráfaga actual
@@ -90,11 +94,11 @@ def disparo_jefe(boss: EstadoBoss, ia) -> Tuple[EstadoBoss, Tuple[EstadoBalaEnem
 
         # ¿Se terminó la ráfaga? → volver a "rest" con una pausa
         if disparos >= max_pairs:
-            boss = replace(boss, fase="rest", fase_timer=pausa_base,
-                           disparos_en_rafaga=0, cooldown=cad_base)
+            boss = boss.con(fase="rest", fase_timer=pausa_base,
+                            disparos_en_rafaga=0, cooldown=cad_base)
         else:
             # Todavía quedan disparos en la ráfaga → poner cooldown corto
-            boss = replace(boss, disparos_en_rafaga=disparos, cooldown=cad_base)
+            boss = boss.con(disparos_en_rafaga=disparos, cooldown=cad_base)
 
         return boss, balas
 
@@ -1,4 +1,3 @@
-from dataclasses import replace
 from typing import Tuple
 from .constantes import ANCHO, PLAYER_W
 from .geom import _clamp
@@ -22,14 +21,14 @@ def _daño(j: EstadoJugador, cantidad: int = 1, invul: int = 300) -> EstadoJugad
         return j
     nuevo = max(0, j.corazones - cantidad)
     # Se devuelve un NUEVO jugador con corazones reducidos e invul_frames activos.
-    return replace(j, corazones=nuevo, vivo=(nuevo > 0), invul_frames=invul)
+    return j.con(corazones=nuevo, vivo=(nuevo > 0), invul_frames=invul)
 
 def _tick_invul(j: EstadoJugador) -> EstadoJugador:
     """
     Disminuye el contador de invulnerabilidad en 1 por cada frame.
     Cuando llega a 0, el jugador vuelve a ser vulnerable.
     """
-    return replace(j, invul_frames=max(0, j.invul_frames - 1)) if j.invul_frames > 0 else j
+    return j.con_invul_frames(max(0, j.invul_frames - 1)) if j.invul_frames > 0 else j
 
 def mover_jugador(jugador: EstadoJugador, direccion: int) -> EstadoJugador:
     """
@@ -39,7 +38,7 @@ def mover_jugador(jugador: EstadoJugador, direccion: int) -> EstadoJugador:
     Usa _clamp() para no salir del borde de la pantalla.
     """
     nuevo_x = _clamp(jugador.x + direccion * 5, 0, ANCHO - PLAYER_W)
-    return replace(jugador, x=nuevo_x)
+    return jugador.con_x(nuevo_x)
 
 def disparar_bala(jugador: EstadoJugador, balas: Tuple[EstadoBala, ...]) -> Tuple[EstadoBala, ...]:
     """
@@ -50,13 +49,14 @@ def disparar_bala(jugador: EstadoJugador, balas: Tuple[EstadoBala, ...]) -> Tupl
     bx = jugador.x + (PLAYER_W // 2 - BULLET_W // 2)
     return balas + (EstadoBala(x=bx, y=jugador.y),)
 
-def actualizar_balas(balas: Tuple[EstadoBala, ...]) -> Tuple[EstadoBala, ...]:
+def actualizar_balas(balas: Tuple[EstadoBala, ...], pasos: int = 1) -> Tuple[EstadoBala, ...]:
     """
     Actualiza la posición de todas las balas activas:
       - Usa funciones de orden superior (filter + map).
       - Elimina las que salieron de pantalla (y < -40).
       - Devuelve una nueva tupla con las posiciones actualizadas.
+      - pasos > 1 avanza varios ticks de una (usar luego colisión barrida).
     """
-    visibles = filter(lambda b: b.y + b.velocidad_y > -40, balas)
-    nuevas = map(lambda b: replace(b, y=b.y + b.velocidad_y), visibles)
+    visibles = filter(lambda b: b.y + b.velocidad_y * pasos > -40, balas)
+    nuevas = map(lambda b: b.con_y(b.y + b.velocidad_y * pasos), visibles)
     return tuple(nuevas)
@@ -0,0 +1,666 @@
+from dataclasses import fields
+from typing import Dict, Sequence
+from .constantes import (
+    ANCHO, ALTO, PLAYER_W, PLAYER_H, ENEMY_W, ENEMY_H,
+    BULLET_W, BULLET_H, EBULLET_W, EBULLET_H,
+    FIRE_RATE_FRAMES, PREBOSS_PAUSE_TICKS,
+)
+from .enums_eventos import Evento, EventoTipo, ModoJuego
+from .estados import (
+    EstadoJuego, EstadoJugador, EstadoMeteoro, EstadoBala, EstadoBalaEnemiga,
+    EstadoEnemigo, EstadoExplosion, EstadoIA,
+)
+from .flujo import logica_juego
+from .mascaras import confirmar_impacto
+from .paso import PASOS_BARRIDO, Entrada, paso
+from .rng import GAMMA
+from .comportamientos import TABLAS, VENTANA_ALINEADO, PATRULLA_LIBRE
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+
+# ============================================================================
+# lockstep.py — N partidas a la vez, en arreglos NumPy (OPCIONAL)
+# Para entrenar/ajustar queremos mover 1024 partidas por tick. En vez de
+# 1024 EstadoJuego guardamos UNA fila por partida:
+#   - jugador, IA, puntaje, semilla… → arreglos (N,)
+#   - meteoros, balas, enemigos…     → columnas (N, capacidad) + cuántos hay
+# y aplicamos las MISMAS reglas que el núcleo escalar (actualizar_meteoros,
+# actualizar_balas, actualizar_enemigos_ia, logica_disparo_enemigo,
+# resolver_colisiones…) para todas las filas de una. El azar también va en
+# paralelo (azar_flujo_np): cada fila consume sus flujos (uint64) en el
+# mismo orden que el juego escalar, así que partidas.estado(i) == paso(...).
+# Lo raro (pelea del JEFE, cambios de modo, oleadas nuevas) pasa pocas veces
+# por partida: esas filas se convierten a EstadoJuego, avanzan con el núcleo
+# escalar y se vuelven a escribir. Con máscaras de píxeles, los pares que
+# pasan el AABB (pocos por tick) se confirman de a uno con confirmar_impacto.
+# Las balas chocan con la caja de TODO su recorrido del tick (PASOS_BARRIDO,
+# como colisiones._rects_proyectiles) y las diagonales con el barrido exacto.
+# ============================================================================
+
+_MODOS = tuple(ModoJuego)
+_M_METEORITOS, _M_ENEMIGOS, _M_MIXTO, _M_JEFE = (_MODOS.index(m) for m in (
+    ModoJuego.METEORITOS, ModoJuego.ENEMIGOS, ModoJuego.MIXTO, ModoJuego.JEFE))
+_TIPOS_FX = ("meteor", "enemy")
+_X_MAX_ENEMIGO = ANCHO - ENEMY_W
+
+
+def disponible() -> bool:
+    """True si NumPy está instalado (sin NumPy este módulo no se puede usar)."""
+    return np is not None
+
+
+def _mezclar64_np(z):
+    """rng.mezclar64 sobre un arreglo uint64 (los productos dan la vuelta solos, mod 2^64)."""
+    z = z + np.uint64(GAMMA)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def azar_flujo_np(flujos, a, b, mascara=None):
+    """
+    Versión vectorizada de rng.azar_flujo sobre flujos uint64 (N,):
+    devuelve (flujos, valores). a y b pueden ser escalares o arreglos por
+    fila; las filas fuera de la máscara NO avanzan su flujo (su valor
+    devuelto no se usa).
+    """
+    r = _mezclar64_np(flujos)
+    ancho = np.asarray(np.asarray(b) - np.asarray(a) + 1, dtype=np.uint64)
+    valores = a + (((r >> np.uint64(32)) * ancho) >> np.uint64(32)).astype(np.int64)
+    nuevos = flujos + np.uint64(GAMMA)
+    return (nuevos if mascara is None else np.where(mascara, nuevos, flujos)), valores
+
+
+_TABLAS_NP = None
+
+
+def _tablas_np():
+    """nucleo.comportamientos.TABLAS como arreglos (dx/dy rellenados al tramo más largo)."""
+    global _TABLAS_NP
+    if _TABLAS_NP is None:
+        ancho = max(TABLAS.largo) + 1
+        dx = np.zeros((len(TABLAS.largo), ancho), np.int64)
+        dy = np.zeros_like(dx)
+        for k, (fx, fy) in enumerate(zip(TABLAS.dx, TABLAS.dy)):
+            dx[k, :len(fx)], dy[k, :len(fy)] = fx, fy
+        _TABLAS_NP = (dx, dy, np.array(TABLAS.largo), np.array(TABLAS.sig_fin),
+                      np.array(TABLAS.sig_alineado), np.array(TABLAS.entra, np.int64))
+    return _TABLAS_NP
+
+
+def _conversor(tipo):
+    nombre = tipo if isinstance(tipo, str) else getattr(tipo, "__name__", "")
+    return {"bool": bool, "float": float}.get(nombre, int)
+
+
+def _toca(ax, ay, aw, ah, bx, by, bw, bh):
+    """_rects_collide con broadcasting (mismas desigualdades estrictas)."""
+    return (ax < bx + bw) & (ax + aw > bx) & (ay < by + bh) & (ay + ah > by)
+
+
+def _recorrido(x, y, vx, vy, w, h):
+    """colisiones._rects_proyectiles con broadcasting: la caja que envuelve los PASOS_BARRIDO ticks."""
+    x0, y0 = x - vx * PASOS_BARRIDO, y - vy * PASOS_BARRIDO
+    return np.minimum(x0, x), np.minimum(y0, y), w + np.abs(x - x0), h + np.abs(y - y0)
+
+
+def _barrido_exacto(x, y, vx, vy, w, h, bx, by, bw, bh):
+    """
+    colisiones._barrido_exacto con broadcasting: True si la bala se mueve en
+    un solo eje (la caja ya es exacta); en diagonal, geom._swept_collide con
+    las mismas cuentas (mismos floats, mismas desigualdades).
+    """
+    x0, y0 = x - vx * PASOS_BARRIDO, y - vy * PASOS_BARRIDO
+    recta = (x0 == x) | (y0 == y)
+    lo, hi = -np.inf, np.inf
+    for p0, p1, a, b, bl in ((x0, x, w, bx, bw), (y0, y, h, by, bh)):
+        d = np.where(recta, 1, p1 - p0)           # las rectas no usan el resultado
+        t_a, t_b = (b - a - p0) / d, (b + bl - p0) / d
+        lo, hi = np.maximum(lo, np.minimum(t_a, t_b)), np.minimum(hi, np.maximum(t_a, t_b))
+    return recta | ((lo < hi) & (lo < 1) & (hi > 0))
+
+
+class _Grupo:
+    """
+    Entidades de UN tipo para las N partidas: una columna (N, capacidad)
+    por campo de la dataclass y `n[i]` = cuántas hay en la fila i. Las
+    posiciones >= n[i] son basura. Agregar y compactar respetan el orden,
+    igual que las tuplas del núcleo.
+    """
+    def __init__(self, cls, filas: int, capacidad: int, codigos: Dict[str, tuple] = None):
+        self.cls = cls
+        self.codigos = codigos or {}
+        self.campos = tuple(f.name for f in fields(cls))
+        self.conv = tuple(_conversor(f.type) for f in fields(cls))
+        self.col = {c: np.zeros((filas, capacidad), np.int64) for c in self.campos}
+        self.n = np.zeros(filas, np.int64)
+
+    @property
+    def capacidad(self) -> int:
+        return self.col[self.campos[0]].shape[1]
+
+    def validos(self):
+        return np.arange(self.capacidad) < self.n[:, None]
+
+    def _crecer(self, minimo: int):
+        cap = max(minimo, 2 * self.capacidad)
+        for c, v in self.col.items():
+            nueva = np.zeros((v.shape[0], cap), np.int64)
+            nueva[:, :v.shape[1]] = v
+            self.col[c] = nueva
+
+    def agregar(self, mascara, **valores):
+        """Agrega UNA entidad al final de cada fila marcada (valores escalares o (N,))."""
+        filas = np.flatnonzero(mascara)
+        if filas.size == 0:
+            return
+        pos = self.n[filas]
+        if pos.max() >= self.capacidad:
+            self._crecer(int(pos.max()) + 1)
+        for c, v in valores.items():
+            self.col[c][filas, pos] = v[filas] if np.ndim(v) else v
+        self.n[filas] += 1
+
+    def compactar(self, mantener):
+        """
+        Deja solo las entidades marcadas, corridas al principio y en su orden.
+        Si las filas quedaron medio vacías achica las columnas (a la mitad
+        de la capacidad o menos): todas las reglas trabajan sobre (N, capacidad),
+        así que el ancho de más se paga en cada operación de cada tick.
+        """
+        validos = self.validos()
+        mantener = mantener & validos
+        n = mantener.sum(axis=1)
+        if (mantener ^ validos).any():           # si no se va nadie no hay nada que correr
+            orden = np.argsort(~mantener, axis=1, kind="stable")
+            filas = np.arange(orden.shape[0])[:, None]
+            for c, v in self.col.items():
+                self.col[c] = v[filas, orden]
+        self.n = n
+        ancho = max(int(n.max(initial=0)), 1)
+        if ancho <= self.capacidad // 2:
+            for c, v in self.col.items():
+                self.col[c] = v[:, :ancho]
+
+    def fila(self, i: int) -> tuple:
+        cols = [self.col[c][i, :self.n[i]].tolist() for c in self.campos]
+        for j, c in enumerate(self.campos):
+            if c in self.codigos:
+                cols[j] = [self.codigos[c][v] for v in cols[j]]
+            elif self.conv[j] is bool:
+                cols[j] = [bool(v) for v in cols[j]]
+        return tuple(self.cls(*vals) for vals in zip(*cols))
+
+    def poner_fila(self, i: int, entidades):
+        entidades = tuple(entidades)
+        if len(entidades) > self.capacidad:
+            self._crecer(len(entidades))
+        for c in self.campos:
+            cod = self.codigos.get(c)
+            vals = [getattr(e, c) for e in entidades]
+            self.col[c][i, :len(vals)] = [cod.index(v) for v in vals] if cod else vals
+        self.n[i] = len(entidades)
+
+
+class PartidasNP:
+    """
+    N partidas del juego avanzando en “lockstep” (todas el mismo tick).
+        lote = PartidasNP.desde_estados([inicializar_juego(s) for s in range(1024)])
+        lote.paso(bits)          # bits: arreglo (N,) de Entrada.bits() o una Entrada
+        lote.estado(7)           # EstadoJuego de la partida 7 (igual al escalar)
+    Las secuencias del estado reconstruido son siempre tuplas. `mascaras`
+    son las mismas de paso(estado, entrada, mascaras), para todas las filas.
+    """
+    def __init__(self, filas: int, capacidad: int = 16, mascaras=None):
+        if np is None:
+            raise ImportError("PartidasNP necesita NumPy (pip install numpy)")
+        self.filas = filas
+        self.mascaras = mascaras
+        self.jugador = {f.name: np.zeros(filas, np.int64) for f in fields(EstadoJugador)}
+        self.ia = {f.name: np.zeros(filas, np.float64 if _conversor(f.type) is float else np.int64)
+                   for f in fields(EstadoIA)}
+        self.puntaje = np.zeros(filas, np.int64)
+        # Flujos de azar (nucleo.rng): meteoros (semilla_azar), enemigos, disparos
+        self.semilla = np.zeros(filas, np.uint64)
+        self.azar_enemigos = np.zeros(filas, np.uint64)
+        self.azar_disparos = np.zeros(filas, np.uint64)
+        self.modo = np.zeros(filas, np.int64)
+        self.fire_cooldown = np.zeros(filas, np.int64)
+        self.gracia_spawn = np.zeros(filas, np.int64)
+        self.boss = [None] * filas
+        self.cortina = [None] * filas          # balas del jefe: solo en filas escalares
+        self.meteoros = _Grupo(EstadoMeteoro, filas, capacidad)
+        self.balas = _Grupo(EstadoBala, filas, capacidad)
+        self.enemigos = _Grupo(EstadoEnemigo, filas, capacidad)
+        self.balas_enemigas = _Grupo(EstadoBalaEnemiga, filas, capacidad)
+        self.explosiones = _Grupo(EstadoExplosion, filas, capacidad, {"tipo": _TIPOS_FX})
+        # Eventos del último tick: banderas por fila + tuplas completas de las filas escalares
+        self._ev_disparo = np.zeros(filas, bool)
+        self._ev_muerto = np.zeros(filas, bool)
+        self._ev_escalares: Dict[int, tuple] = {}
+
+    @classmethod
+    def desde_estados(cls, estados: Sequence[EstadoJuego], mascaras=None) -> "PartidasNP":
+        """Empaqueta una lista de EstadoJuego (una partida por fila)."""
+        lote = cls(len(estados), mascaras=mascaras)
+        for i, e in enumerate(estados):
+            lote._escribir(i, e)
+        return lote
+
+    def __len__(self) -> int:
+        return self.filas
+
+    # --- fila ↔ EstadoJuego --------------------------------------------------
+    def _escribir(self, i: int, e: EstadoJuego):
+        if e.jugador2 is not None:
+            raise ValueError("el motor lockstep es de un jugador: las partidas cooperativas van con paso()")
+        for c, v in self.jugador.items():
+            v[i] = getattr(e.jugador, c)
+        for c, v in self.ia.items():
+            v[i] = getattr(e.ia, c)
+        self.puntaje[i] = e.puntaje
+        self.semilla[i] = e.semilla_azar
+        self.azar_enemigos[i] = e.azar_enemigos
+        self.azar_disparos[i] = e.azar_disparos
+        self.modo[i] = _MODOS.index(e.modo)
+        self.fire_cooldown[i] = e.fire_cooldown
+        self.gracia_spawn[i] = e.gracia_spawn
+        self.boss[i] = e.boss
+        self.cortina[i] = e.cortina
+        for nombre in ("meteoros", "balas", "enemigos", "balas_enemigas", "explosiones"):
+            getattr(self, nombre).poner_fila(i, getattr(e, nombre))
+        self._ev_escalares[i] = tuple(e.eventos)
+
+    def _eventos(self, i: int) -> tuple:
+        if i in self._ev_escalares:
+            return self._ev_escalares[i]
+        evs = ()
+        if self._ev_disparo[i]:
+            evs += (Evento(EventoTipo.DISPARO),)
+        if self._ev_muerto[i]:
+            evs += (Evento(EventoTipo.JUGADOR_MUERTO),)
+        return evs
+
+    def estado(self, i: int) -> EstadoJuego:
+        """Reconstruye el EstadoJuego de la partida i."""
+        jug = EstadoJugador(**{c: _conversor(f.type)(self.jugador[c][i])
+                               for c, f in zip(self.jugador, fields(EstadoJugador))})
+        ia = EstadoIA(**{c: _conversor(f.type)(self.ia[c][i].item())
+                         for c, f in zip(self.ia, fields(EstadoIA))})
+        return EstadoJuego(
+            jugador=jug, meteoros=self.meteoros.fila(i), balas=self.balas.fila(i),
+            enemigos=self.enemigos.fila(i), balas_enemigas=self.balas_enemigas.fila(i),
+            puntaje=int(self.puntaje[i]), semilla_azar=int(self.semilla[i]),
+            modo=_MODOS[self.modo[i]], ia=ia, boss=self.boss[i],
+            explosiones=self.explosiones.fila(i), eventos=self._eventos(i),
+            fire_cooldown=int(self.fire_cooldown[i]), gracia_spawn=int(self.gracia_spawn[i]),
+            azar_enemigos=int(self.azar_enemigos[i]), azar_disparos=int(self.azar_disparos[i]),
+            cortina=self.cortina[i],
+        )
+
+    def estados(self):
+        return [self.estado(i) for i in range(self.filas)]
+
+    # --- un tick para todas las filas ----------------------------------------
+    def paso(self, entradas=0):
+        """
+        Avanza TODAS las partidas un tick, igual que nucleo.paso.paso fila por fila.
+        entradas: Entrada, entero de bits o arreglo (N,) de bits.
+        """
+        if isinstance(entradas, Entrada):
+            entradas = entradas.bits()
+        bits = np.broadcast_to(np.asarray(entradas, np.int64), (self.filas,))
+
+        # Filas con jefe: se guardan ANTES y se avanzan con el núcleo escalar al final
+        escalares = np.flatnonzero((self.modo == _M_JEFE) | np.array([b is not None for b in self.boss]))
+        previos = {int(i): self.estado(int(i)) for i in escalares}
+        self._ev_escalares = {}
+
+        vivo0 = self.jugador["vivo"].astype(bool)
+        x = self.jugador["x"]
+        x = np.where(bits & 1, np.clip(x - 5, 0, ANCHO - PLAYER_W), x)
+        x = np.where(bits & 2, np.clip(x + 5, 0, ANCHO - PLAYER_W), x)
+        self.jugador["x"] = x
+        self.ia["dificultad"] = np.minimum(10.0, self.ia["dificultad"] + np.where(vivo0, 0.002, 0.0))
+
+        # Disparo con cadencia
+        cd = np.where(self.fire_cooldown > 0, self.fire_cooldown - 1, self.fire_cooldown)
+        dispara = ((bits & 4) != 0) & (cd <= 0) & vivo0
+        self.balas.agregar(dispara, x=x + (PLAYER_W // 2 - BULLET_W // 2), y=self.jugador["y"],
+                           velocidad_y=-10, activa=1)
+        self.fire_cooldown = np.where(dispara, FIRE_RATE_FRAMES, cd)
+        self._ev_disparo = dispara
+
+        # Actualización por modo
+        con_meteoros = (self.modo == _M_METEORITOS) | (self.modo == _M_MIXTO)
+        con_enemigos = (self.modo == _M_ENEMIGOS) | (self.modo == _M_MIXTO)
+        self._mover_balas()
+        self.ia["ultimo_x_jugador"] = np.where(con_enemigos, x, self.ia["ultimo_x_jugador"])
+        self._mover_enemigos(con_enemigos)
+        self._mover_balas_enemigas(con_enemigos)
+        self._disparo_enemigos(con_enemigos)
+        self._mover_meteoros(con_meteoros)
+
+        self._colisiones(vivo0)
+        self._reponer_meteoros(con_meteoros)
+        fx = self.explosiones
+        fx.compactar(fx.col["timer"] > 0)
+        fx.col["timer"] -= 1
+        self._logica()
+
+        # Gracia de spawn
+        g = self.gracia_spawn > 0
+        self.gracia_spawn = np.where(g, self.gracia_spawn - 1, self.gracia_spawn)
+        self.jugador["corazones"] = np.where(g, 7, self.jugador["corazones"])
+        self.jugador["vivo"] = np.where(g, 1, self.jugador["vivo"])
+        self.jugador["invul_frames"] = np.where(g, np.maximum(self.jugador["invul_frames"], 10),
+                                                self.jugador["invul_frames"])
+
+        for i, e in previos.items():
+            self._escribir(i, paso(e, Entrada.desde_bits(int(bits[i])), self.mascaras))
+        return self
+
+    # --- reglas por entidad (mismo orden que el núcleo escalar) ----------------
+    def _mover_balas(self):
+        b = self.balas
+        b.compactar(b.col["y"] + b.col["velocidad_y"] > -40)
+        b.col["y"] += b.col["velocidad_y"]
+
+    def _mover_balas_enemigas(self, filas):
+        b = self.balas_enemigas
+        bx, by = b.col["x"], b.col["y"]
+        dentro = (by < ALTO + 60) & (bx >= -40) & (bx <= ANCHO + 40)
+        b.compactar(dentro | ~filas[:, None])
+        mover = filas[:, None]
+        b.col["x"] = np.where(mover, b.col["x"] + b.col["velocidad_x"], b.col["x"])
+        b.col["y"] = np.where(mover, b.col["y"] + b.col["velocidad_y"], b.col["y"])
+
+    def _mover_meteoros(self, filas):
+        m = self.meteoros
+        c = m.col
+        bonus = self.ia["meteor_bonus"]
+        nx = c["x"] + c["velocidad_x"]
+        ny = c["y"] + c["velocidad_y"] + bonus[:, None]
+        activos = filas[:, None] & m.validos()
+        fuera = activos & ((ny > ALTO + 10) | (nx < -40) | (nx > ANCHO + 40))
+        c["x"] = np.where(activos, nx, c["x"])
+        c["y"] = np.where(activos, ny, c["y"])
+        # Solo los que se reciclan consumen azar, meteoro por meteoro (como en la tupla)
+        s = self.semilla
+        for k in np.flatnonzero(fuera.any(axis=0)):
+            f = fuera[:, k]
+            s, rx = azar_flujo_np(s, 0, ANCHO - c["ancho"][:, k], f)
+            s, ry = azar_flujo_np(s, -140, -100, f)
+            s, sx = azar_flujo_np(s, -3, 3, f)
+            s, sy = azar_flujo_np(s, 1 + bonus, 4 + bonus, f)
+            for campo, v in (("x", rx), ("y", ry), ("velocidad_x", sx), ("velocidad_y", sy)):
+                c[campo][:, k] = np.where(f, v, c[campo][:, k])
+        self.semilla = s
+        base = EstadoMeteoro(0, 0, 0, 0)
+        c["ancho"] = np.where(activos, base.ancho, c["ancho"])
+        c["alto"] = np.where(activos, base.alto, c["alto"])
+
+    def _mover_enemigos(self, filas):
+        e = self.enemigos
+        c = e.col
+        validos = filas[:, None] & e.validos()
+        if not validos.any():
+            return
+        ex, ey, dirs = c["x"], c["y"], c["direccion"]
+        vivo = validos & c["vivo"].astype(bool)
+        activo = vivo & ~c["explotando"].astype(bool)
+        tabla = vivo & (c["tramo"] != 0)
+        vivo &= ~tabla                          # de acá en más, “vivo” = IA clásica
+        entrando = vivo & c["entrando"].astype(bool)
+
+        # Líder: el activo más cercano en X al jugador (empate → el de menor índice)
+        jx = self.jugador["x"][:, None]
+        candidato = activo & ~tabla
+        dist = np.where(candidato, np.abs((ex + ENEMY_W // 2) - (jx + 30)), np.iinfo(np.int64).max)
+        lider = np.zeros_like(activo)
+        hay = candidato.any(axis=1)
+        lider[np.flatnonzero(hay), dist.argmin(axis=1)[hay]] = True
+        lider &= ~entrando
+
+        # Entrando: bajan y se corren 1 px
+        ny = ey + 2
+        fin = ny >= c["y_objetivo"]
+        x_entra = np.clip(ex + np.where(dirs > 0, 1, -1), 0, _X_MAX_ENEMIGO)
+        # Líder: persigue al jugador
+        objetivo = np.clip(jx, 0, _X_MAX_ENEMIGO)
+        x_lider = np.clip(ex + 2 * np.sign(objetivo - ex), 0, _X_MAX_ENEMIGO)
+        # Resto: patrulla rebotando en los bordes
+        x_pat = ex + c["velocidad_x"] * dirs
+        bajo = x_pat <= c["patrulla_min_x"]
+        alto = ~bajo & (x_pat >= c["patrulla_max_x"])
+        x_pat = np.where(bajo, c["patrulla_min_x"], np.where(alto, c["patrulla_max_x"], x_pat))
+        patrulla = vivo & ~entrando & ~lider
+
+        px = np.where(entrando, x_entra, np.where(lider, x_lider, np.where(patrulla, x_pat, ex)))
+        py = np.where(entrando, np.where(fin, c["y_objetivo"], ny), ey)
+        c["direccion"] = np.where(patrulla, np.where(bajo, 1, np.where(alto, -1, dirs)), dirs)
+        c["entrando"] = np.where(entrando, ~fin, c["entrando"]).astype(np.int64)
+        separa = vivo & ~(entrando & ~fin) & ~c["explotando"].astype(bool)
+
+        # Por tabla (nucleo.comportamientos): posición = ancla + tabla[tramo][t]
+        if tabla.any():
+            tdx, tdy, largo, sig_fin, sig_ali, entra = _tablas_np()
+            k, t = c["tramo"], c["t"] + 1
+            tt = np.clip(t, 0, largo[k])
+            mueve = tabla & (t > 0)
+            tx = np.where(mueve, np.clip(c["ancla_x"] + np.take_along_axis(tdx[k], tt[..., None], -1)[..., 0],
+                                         0, _X_MAX_ENEMIGO), ex)
+            ty = np.where(mueve, c["ancla_y"] + np.take_along_axis(tdy[k], tt[..., None], -1)[..., 0], ey)
+            fin_t = mueve & (t == largo[k])
+            ali = (mueve & ~fin_t & (sig_ali[k] >= 0)
+                   & (np.abs((tx + ENEMY_W // 2) - (jx + 30)) < VENTANA_ALINEADO))
+            cambia = fin_t | ali
+            sig = np.where(fin_t, sig_fin[k], sig_ali[k])
+            libre = cambia & (sig == 0)
+            px = np.where(tabla, tx, px)
+            py = np.where(tabla, ty, py)
+            c["t"] = np.where(tabla, np.where(cambia, 0, t), c["t"])
+            c["tramo"] = np.where(cambia, sig, k)
+            c["ancla_x"] = np.where(cambia, tx, c["ancla_x"])
+            c["ancla_y"] = np.where(cambia, ty, c["ancla_y"])
+            c["entrando"] = np.where(cambia, np.where(libre, 0, entra[np.maximum(sig, 0)]), c["entrando"])
+            c["patrulla_min_x"] = np.where(libre, np.clip(tx - PATRULLA_LIBRE, 0, _X_MAX_ENEMIGO), c["patrulla_min_x"])
+            c["patrulla_max_x"] = np.where(libre, np.clip(tx + PATRULLA_LIBRE, 0, _X_MAX_ENEMIGO), c["patrulla_max_x"])
+            # Los que pasaron a LIBRE este tick ya se separan (como en el escalar)
+            separa |= libre
+
+        # Separación sobre las posiciones provisionales (todos contra todos en la fila)
+        cerca = ((np.abs(px[:, :, None] - px[:, None, :]) < ENEMY_W * 0.8)
+                 & (np.abs(py[:, :, None] - py[:, None, :]) < ENEMY_H)
+                 & activo[:, None, :] & ~np.eye(e.capacidad, dtype=bool))
+        corr = np.where(cerca, np.where(px[:, :, None] <= px[:, None, :], 1, -1), 0).sum(axis=2)
+        nx = np.clip(px - corr, 0, _X_MAX_ENEMIGO)
+        tope = ((nx == 0) & (corr > 0)) | ((nx == _X_MAX_ENEMIGO) & (corr < 0))
+        nx = np.where(tope, px, nx)
+        c["x"] = np.where(validos, np.where(separa & (corr != 0), nx, px), ex)
+        c["y"] = np.where(validos, py, ey)
+        c["spawn_protect"] = np.where(validos, np.maximum(0, c["spawn_protect"] - 1), c["spawn_protect"])
+
+    def _disparo_enemigos(self, filas):
+        e = self.enemigos
+        c = e.col
+        dif = self.ia["dificultad"]
+        ventana = np.maximum(40, 140 - (dif * 8).astype(np.int64))
+        base_min = np.maximum(12, 26 - (dif * 3).astype(np.int64))
+        base_max = np.maximum(base_min + 2, 36 - (dif * 2).astype(np.int64))
+        vel = 6 + (dif * 0.5).astype(np.int64)
+        x_pred = self.jugador["x"]
+        s = self.azar_disparos
+        validos = filas[:, None] & e.validos()
+        for k in range(e.capacidad):
+            ok = validos[:, k] & c["vivo"][:, k].astype(bool) & ~c["explotando"][:, k].astype(bool)
+            if not ok.any():
+                continue
+            cd = np.where(ok, np.maximum(0, c["cooldown"][:, k] - 1), c["cooldown"][:, k])
+            alineado = np.abs(x_pred - (c["x"][:, k] + ENEMY_W // 2)) < ventana
+            tira = ok & (cd == 0) & alineado & (c["entrando"][:, k] == 0) & (c["spawn_protect"][:, k] == 0)
+            if not tira.any():                  # nadie tira: solo baja el cooldown
+                c["cooldown"][:, k] = cd
+                continue
+            s, r = azar_flujo_np(s, base_min, base_max, tira)
+            c["cooldown"][:, k] = np.where(tira, r, cd)
+            self.balas_enemigas.agregar(
+                tira, x=c["x"][:, k] + ENEMY_W // 2 - EBULLET_W // 2, y=c["y"][:, k] + ENEMY_H - 8,
+                velocidad_y=vel, velocidad_x=0, activa=1)
+        self.azar_disparos = s
+
+    def _colisiones(self, vivo0):
+        """Las capas de colisiones.CAPAS en el mismo orden (sin la del jefe)."""
+        b, m, e, be, fx = self.balas, self.meteoros, self.enemigos, self.balas_enemigas, self.explosiones
+        bc, mc, ec, bec = b.col, m.col, e.col, be.col
+        puntaje = self.puntaje.copy()
+
+        # 1) balas vs enemigos: el primer enemigo elegible se lleva la bala
+        bv = b.validos()
+        usada = np.zeros_like(bv)
+        elegible = e.validos() & ec["vivo"].astype(bool) & ~ec["explotando"].astype(bool) & (ec["spawn_protect"] == 0)
+        bala = (bc["x"][:, :, None], bc["y"][:, :, None], BULLET_W, BULLET_H)
+        barrida = _recorrido(bc["x"], bc["y"], 0, bc["velocidad_y"], BULLET_W, BULLET_H)
+        enemigo = (ec["x"][:, None, :], ec["y"][:, None, :], ENEMY_W, ENEMY_H)
+        toque = self._confirmar(_toca(*(c[:, :, None] for c in barrida), *enemigo)
+                                & bv[:, :, None] & e.validos()[:, None, :],
+                                "bala", bala, "enemigo", enemigo)
+        muere = np.zeros_like(elegible)
+        filas = np.arange(self.filas)
+        for i in np.flatnonzero(toque.any(axis=(0, 2))):
+            cand = toque[:, i, :] & elegible
+            hay = cand.any(axis=1)
+            if not hay.any():
+                continue
+            k = cand.argmax(axis=1)
+            elegible[filas[hay], k[hay]] = False
+            muere[filas[hay], k[hay]] = True
+            usada[:, i] |= hay
+            puntaje += 50 * hay
+            fx.agregar(hay, x=ec["x"][filas, k] + ENEMY_W // 2, y=ec["y"][filas, k] + ENEMY_H // 2,
+                       tipo=_TIPOS_FX.index("enemy"), timer=18)
+        ec["vivo"] = np.where(muere, 0, ec["vivo"])
+        ec["explotando"] = np.where(muere, 1, ec["explotando"])
+        ec["temporizador_explosion"] = np.where(muere, 10, ec["temporizador_explosion"])
+
+        # 2) balas vs meteoros: todos los meteoros tocados se rompen. Solo
+        #    las filas que tienen meteoros (en ENEMIGOS no hay ninguno)
+        mv = m.validos()
+        roto = np.zeros_like(mv)
+        golpe_meteoro = np.zeros(self.filas, bool)
+        jx, jy = self.jugador["x"][:, None], self.jugador["y"][:, None]
+        sub = np.flatnonzero(m.n)
+        if sub.size == self.filas:
+            sub = slice(None)
+        mx, my, mw, mh, mvs = mc["x"][sub], mc["y"][sub], mc["ancho"][sub], mc["alto"][sub], mv[sub]
+        if mvs.any():
+            bala = (bc["x"][sub][:, :, None], bc["y"][sub][:, :, None], BULLET_W, BULLET_H)
+            meteoro = (mx[:, None, :], my[:, None, :], mw[:, None, :], mh[:, None, :])
+            tm = self._confirmar(_toca(*(c[sub][:, :, None] for c in barrida), *meteoro)
+                                 & (bv & ~usada)[sub][:, :, None] & mvs[:, None, :],
+                                 "bala", bala, "meteoro", meteoro)
+            usada[sub] |= tm.any(axis=2)
+            roto[sub] = tm.any(axis=1)
+            # 4) meteoros (enteros) vs jugador
+            nave = (jx[sub], jy[sub], PLAYER_W, PLAYER_H)
+            meteoro = (mx, my, mw, mh)
+            golpe_meteoro[sub] = self._confirmar(_toca(*nave, *meteoro) & mvs & ~roto[sub],
+                                                 "jugador", nave, "meteoro", meteoro).any(axis=1)
+        for k in np.flatnonzero(roto.any(axis=0)):
+            fx.agregar(roto[:, k], x=mc["x"][:, k] + mc["ancho"][:, k] // 2,
+                       y=mc["y"][:, k] + mc["alto"][:, k] // 2, tipo=_TIPOS_FX.index("meteor"), timer=18)
+        puntaje += 10 * roto.sum(axis=1)
+
+        # 3) balas enemigas vs jugador
+        nave = (jx, jy, PLAYER_W, PLAYER_H)
+        bala = (bec["x"], bec["y"], EBULLET_W, EBULLET_H)
+        toque = _toca(*nave, *_recorrido(*bala[:2], bec["velocidad_x"], bec["velocidad_y"], *bala[2:])) & be.validos()
+        if toque.any():
+            toque &= _barrido_exacto(*bala[:2], bec["velocidad_x"], bec["velocidad_y"], *bala[2:], *nave)
+        be_usada = self._confirmar(toque, "jugador", nave, "bala_enemiga", bala)
+        golpe = be_usada.any(axis=1) | golpe_meteoro
+
+        # Daño (respeta invulnerabilidad) o tick de invulnerabilidad, una sola vez
+        j = self.jugador
+        daño = golpe & (j["invul_frames"] == 0)
+        j["corazones"] = np.where(daño, np.maximum(0, j["corazones"] - 1), j["corazones"])
+        j["vivo"] = np.where(daño, j["corazones"] > 0, j["vivo"]).astype(np.int64)
+        j["invul_frames"] = np.where(daño, 300, np.where(~golpe, np.maximum(0, j["invul_frames"] - 1),
+                                                          j["invul_frames"]))
+        self._ev_muerto = vivo0 & ~j["vivo"].astype(bool)
+
+        # Enemigos: los vivos siguen; los que explotan descuentan su temporizador
+        vivo = ec["vivo"].astype(bool)
+        sigue_explotando = ~vivo & ec["explotando"].astype(bool) & (ec["temporizador_explosion"] > 0)
+        ec["temporizador_explosion"] = np.where(sigue_explotando, ec["temporizador_explosion"] - 1,
+                                                ec["temporizador_explosion"])
+        e.compactar(vivo | sigue_explotando)
+        b.compactar(~usada)
+        m.compactar(~roto)
+        be.compactar(~be_usada)
+        self.puntaje = puntaje
+
+    def _confirmar(self, toque, clave_a: str, a, clave_b: str, b):
+        """
+        confirmar_impacto sobre los pares que ya dieron True en `toque`;
+        a y b son (x, y, w, h) que se estiran (broadcasting) a su forma.
+        """
+        m = self.mascaras
+        if not m or (clave_a not in m and clave_b not in m) or not toque.any():
+            return toque
+        donde = np.nonzero(toque)
+        va = [np.broadcast_to(v, toque.shape)[donde].tolist() for v in a]
+        vb = [np.broadcast_to(v, toque.shape)[donde].tolist() for v in b]
+        falla = [n for n, (ra, rb) in enumerate(zip(zip(*va), zip(*vb)))
+                 if not confirmar_impacto(m, clave_a, *ra, clave_b, *rb)]
+        if falla:
+            toque = toque.copy()
+            toque[tuple(d[falla] for d in donde)] = False
+        return toque
+
+    def _reponer_meteoros(self, filas):
+        m = self.meteoros
+        bonus = self.ia["meteor_bonus"]
+        faltan = np.where(filas, 8 - m.n, 0)
+        s = self.semilla
+        for k in range(int(faltan.max(initial=0))):
+            f = faltan > k
+            s, nx = azar_flujo_np(s, 0, ANCHO - 40, f)
+            s, ny = azar_flujo_np(s, -140, -100, f)
+            s, sx = azar_flujo_np(s, -3, 3, f)
+            s, sy = azar_flujo_np(s, 1 + bonus, 4 + bonus, f)
+            m.agregar(f, x=nx, y=ny, velocidad_x=sx, velocidad_y=sy, ancho=50, alto=50)
+        self.semilla = s
+
+    def _logica(self):
+        """
+        logica_juego: las esperas (cooldown de oleada, pausa pre-JEFE) van
+        vectorizadas; los cambios de modo y las oleadas nuevas, por fila escalar.
+        """
+        ia = self.ia
+        modo = self.modo
+        ec = self.enemigos.col
+        fuera = ~(self.enemigos.validos() & (ec["vivo"].astype(bool) | ec["explotando"].astype(bool))).any(axis=1)
+        ene = (modo == _M_ENEMIGOS) & (self.puntaje < ia["mix_threshold"])
+        mix = (modo == _M_MIXTO) & fuera
+        rondas = ia["mixed_waves_spawned"] < ia["mixed_rounds_target"]
+        reponer = ia["reponer_meteoros"].astype(bool)
+
+        espera = ((ene & fuera) | (mix & rondas)) & (ia["wave_cooldown"] > 0)
+        pre = mix & ~rondas & reponer
+        pausa = mix & ~rondas & ~reponer & (ia["preboss_pause"] > 0)
+        escalar = (((modo == _M_METEORITOS) & (self.puntaje >= 300))
+                   | ((modo == _M_ENEMIGOS) & ~ene)
+                   | (((ene & fuera) | (mix & rondas)) & (ia["wave_cooldown"] == 0))
+                   | (mix & ~rondas & ~reponer & (ia["preboss_pause"] == 0)))
+
+        ia["wave_cooldown"] = np.where(espera, ia["wave_cooldown"] - 1, ia["wave_cooldown"])
+        ia["reponer_meteoros"] = np.where(pre, 0, ia["reponer_meteoros"])
+        ia["preboss_pause"] = np.where(pre, PREBOSS_PAUSE_TICKS,
+                                       np.where(pausa, ia["preboss_pause"] - 1, ia["preboss_pause"]))
+        for i in np.flatnonzero(escalar):
+            i = int(i)
+            self._escribir(i, logica_juego(self.estado(i)))
@@ -0,0 +1,195 @@
+import argparse
+import csv
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, asdict, fields
+from typing import Dict, Iterable, Iterator, List, Sequence
+from .enums_eventos import EventoTipo, ModoJuego
+from .flujo import inicializar_juego
+from .paso import paso
+from .sim import entradas
+
+# ============================================================================
+# lote.py — Muchas partidas (una por semilla) repartidas en procesos
+# Uso:  python -m nucleo.lote --semillas 0:1000 --max-ticks 36000 --formato json
+# Cada partida es independiente y determinista (semilla + política de
+# entrada), así que repartimos las semillas en “tandas” entre procesos sin
+# nada compartido: el trabajo escala con los núcleos disponibles.
+# Los resultados por partida salen a medida que termina cada tanda (JSON
+# lines o filas CSV; por stdout, o a --salida) y al final va un resumen
+# agregado: a stdout si las partidas fueron a un archivo, si no a stderr
+# (así stdout queda limpio para encadenar:  ... | jq .puntaje).
+# ============================================================================
+
+# Orden de avance para “hasta qué modo llegó”
+_ORDEN_MODOS = (ModoJuego.METEORITOS, ModoJuego.ENEMIGOS, ModoJuego.MIXTO, ModoJuego.JEFE)
+
+
+@dataclass(frozen=True, slots=True)
+class ResultadoPartida:
+    """Resumen de UNA partida simulada (solo datos planos: viaja entre procesos)."""
+    semilla: int
+    puntaje: int
+    ticks: int          # ticks sobrevividos (o max_ticks si no murió)
+    modo_max: str       # modo más avanzado al que llegó
+    jefes: int          # jefes derrotados
+    ciclos: int         # ia.cycles al terminar
+    sobrevivio: bool    # True si llegó a max_ticks con vida
+
+
+def jugar_partida(semilla: int, politica: str = "azar", max_ticks: int = 36_000) -> ResultadoPartida:
+    """Juega una partida hasta morir (o hasta max_ticks) y devuelve su resumen."""
+    estado = inicializar_juego(semilla)
+    fuente = entradas(politica, semilla)
+    nivel, jefes, t = 0, 0, 0
+    while t < max_ticks and estado.jugador.vivo:
+        estado = paso(estado, next(fuente))
+        t += 1
+        nivel = max(nivel, _ORDEN_MODOS.index(estado.modo))
+        jefes += sum(1 for ev in estado.eventos if ev.tipo == EventoTipo.JEFE_MUERTO)
+    return ResultadoPartida(
+        semilla=semilla, puntaje=estado.puntaje, ticks=t, modo_max=_ORDEN_MODOS[nivel].value,
+        jefes=jefes, ciclos=estado.ia.cycles, sobrevivio=estado.jugador.vivo,
+    )
+
+
+def _jugar_tanda(semillas: Sequence[int], politica: str, max_ticks: int) -> List[ResultadoPartida]:
+    # Función de nivel módulo: es lo que se manda a cada proceso
+    return [jugar_partida(s, politica, max_ticks) for s in semillas]
+
+
+def _tandas(semillas: Sequence[int], tam: int) -> Iterator[Sequence[int]]:
+    for i in range(0, len(semillas), tam):
+        yield semillas[i:i + tam]
+
+
+def trabajadores_disponibles() -> int:
+    """Núcleos que este proceso puede usar (respeta afinidad/cgroups si se puede)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover - no existe en Windows/macOS
+        return os.cpu_count() or 1
+
+
+def correr_lote(semillas: Iterable[int], politica: str = "azar", max_ticks: int = 36_000,
+                trabajadores: int = 0, tam_tanda: int = 0) -> Iterator[ResultadoPartida]:
+    """
+    Genera los resultados de todas las semillas a medida que terminan.
+    - trabajadores = 0 → uno por núcleo; 1 → en este mismo proceso (sin pool)
+    - tam_tanda = 0 → automático (unas 4 tandas por trabajador, para repartir bien)
+    El ORDEN de salida depende de qué tanda termina primero; cada resultado
+    trae su semilla, y el resultado de cada semilla es siempre el mismo.
+    """
+    semillas = tuple(semillas)
+    trabajadores = trabajadores or trabajadores_disponibles()
+    tam = tam_tanda or max(1, len(semillas) // (trabajadores * 4))
+    if trabajadores == 1:
+        for tanda in _tandas(semillas, tam):
+            yield from _jugar_tanda(tanda, politica, max_ticks)
+        return
+    with ProcessPoolExecutor(max_workers=trabajadores) as pool:
+        futuros = [pool.submit(_jugar_tanda, tanda, politica, max_ticks) for tanda in _tandas(semillas, tam)]
+        for f in as_completed(futuros):
+            yield from f.result()
+
+
+def _percentil(ordenados: Sequence[float], p: float) -> float:
+    if not ordenados:
+        return 0.0
+    k = (len(ordenados) - 1) * p
+    i = int(k)
+    j = min(i + 1, len(ordenados) - 1)
+    return ordenados[i] + (ordenados[j] - ordenados[i]) * (k - i)
+
+
+def resumir(resultados: Iterable[ResultadoPartida]) -> Dict[str, object]:
+    """Estadísticas agregadas (balance) de un conjunto de partidas."""
+    rs = list(resultados)
+    if not rs:
+        return {"partidas": 0}
+    puntajes = sorted(r.puntaje for r in rs)
+    ticks = sorted(r.ticks for r in rs)
+    return {
+        "partidas": len(rs),
+        "puntaje_media": statistics.fmean(puntajes),
+        "puntaje_mediana": statistics.median(puntajes),
+        "puntaje_p10": _percentil(puntajes, 0.10),
+        "puntaje_p90": _percentil(puntajes, 0.90),
+        "puntaje_min": puntajes[0],
+        "puntaje_max": puntajes[-1],
+        "ticks_media": statistics.fmean(ticks),
+        "ticks_mediana": statistics.median(ticks),
+        "sobrevivieron": sum(r.sobrevivio for r in rs) / len(rs),
+        "jefes_total": sum(r.jefes for r in rs),
+        "ciclos_media": statistics.fmean(r.ciclos for r in rs),
+        "modo_max": {m.value: sum(r.modo_max == m.value for r in rs) for m in _ORDEN_MODOS},
+    }
+
+
+def _rango_semillas(texto: str) -> range:
+    """'0:1000' → range(0, 1000); '500' → range(0, 500)."""
+    if ":" in texto:
+        a, b = texto.split(":", 1)
+        return range(int(a), int(b))
+    return range(int(texto))
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m nucleo.lote", description="Partidas headless en lote")
+    ap.add_argument("--semillas", type=_rango_semillas, default=range(100), help="N o A:B (por defecto 100)")
+    ap.add_argument("--entrada", choices=("azar", "zigzag", "quieto"), default="azar")
+    ap.add_argument("--max-ticks", type=int, default=36_000, help="tope por partida (36000 = 10 min)")
+    ap.add_argument("--trabajadores", type=int, default=0, help="procesos (0 = uno por núcleo)")
+    ap.add_argument("--tanda", type=int, default=0, help="semillas por tarea (0 = automático)")
+    ap.add_argument("--formato", choices=("json", "csv"), default="json")
+    ap.add_argument("--salida", default="-",
+                    help="archivo para los resultados por partida (JSON lines o CSV; - = stdout)")
+    args = ap.parse_args(argv)
+
+    columnas = [f.name for f in fields(ResultadoPartida)]
+    a_stdout = args.salida == "-"
+    destino = sys.stdout if a_stdout else open(args.salida, "w", newline="")
+    escritor = csv.DictWriter(destino, fieldnames=columnas) if args.formato == "csv" else None
+    if escritor:
+        escritor.writeheader()
+
+    resultados = []
+    t0 = time.perf_counter()
+    try:
+        for r in correr_lote(args.semillas, args.entrada, args.max_ticks, args.trabajadores, args.tanda):
+            resultados.append(r)
+            if escritor:
+                escritor.writerow(asdict(r))
+            else:
+                destino.write(json.dumps(asdict(r)) + "\n")
+            destino.flush()          # que se vea partida por partida, no al final
+    finally:
+        if not a_stdout:
+            destino.close()
+    dt = time.perf_counter() - t0
+
+    resumen = resumir(resultados)
+    resumen["segundos"] = round(dt, 3)
+    resumen["ticks_por_segundo"] = round(sum(r.ticks for r in resultados) / dt) if dt else 0
+    salida_resumen = sys.stderr if a_stdout else sys.stdout
+    if args.formato == "json":
+        json.dump(resumen, salida_resumen, indent=2, ensure_ascii=False)
+        print(file=salida_resumen)
+    else:
+        w = csv.writer(salida_resumen)
+        w.writerow(("metrica", "valor"))
+        for k, v in resumen.items():
+            if isinstance(v, dict):
+                for sub, n in v.items():
+                    w.writerow((f"{k}.{sub}", n))
+            else:
+                w.writerow((k, v))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,87 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Mapping, Optional, Sequence, Tuple
+from .geom import _rects_collide
+
+# ============================================================================
+# mascaras.py — Hitboxes por máscara de bits (pixel-perfect, puro)
+# La cáscara lee el canal alfa de los sprites UNA vez al cargar y nos pasa
+# cada máscara como filas de enteros (bit x encendido = píxel opaco).
+# El núcleo solo ve datos planos: nada de pygame aquí.
+# La prueba fina (AND de filas desplazadas) solo corre si el AABB ya chocó.
+# ============================================================================
+
+# Claves que usan las colisiones para buscar la máscara de cada entidad
+CLAVES_MASCARA = ("jugador", "meteoro", "enemigo", "jefe", "bala", "bala_enemiga")
+
+
+@dataclass(frozen=True)
+class MascaraBits:
+    """
+    Máscara de colisión empaquetada:
+    - ancho/alto: tamaño de la hitbox (debe coincidir con el de la entidad)
+    - filas: un entero por fila; el bit x (LSB = columna 0) marca píxel sólido
+    """
+    ancho: int; alto: int
+    filas: Tuple[int, ...]
+
+
+def empaquetar_filas(pixeles: Sequence[Sequence[bool]]) -> MascaraBits:
+    """
+    Convierte una grilla de booleanos (fila por fila) en una MascaraBits.
+    Es la parte pura de “leer el alfa”: la cáscara solo arma la grilla.
+    """
+    filas = tuple(
+        sum(1 << x for x, sol in enumerate(fila) if sol)
+        for fila in pixeles
+    )
+    ancho = max((len(f) for f in pixeles), default=0)
+    return MascaraBits(ancho=ancho, alto=len(filas), filas=filas)
+
+
+@lru_cache(maxsize=None)
+def mascara_llena(ancho: int, alto: int) -> MascaraBits:
+    """Máscara rectangular completa (equivale al AABB de siempre)."""
+    return MascaraBits(ancho=ancho, alto=alto, filas=((1 << ancho) - 1,) * alto)
+
+
+def _mascaras_collide(ma: MascaraBits, ax: int, ay: int, mb: MascaraBits, bx: int, by: int) -> bool:
+    """
+    Narrowphase por bits: recorre solo las filas que comparten ambas máscaras
+    y hace AND de las filas alineadas con un corrimiento (shift) en X.
+    """
+    y0, y1 = max(ay, by), min(ay + ma.alto, by + mb.alto)
+    if y0 >= y1:
+        return False
+    fa, fb = ma.filas, mb.filas
+    dx = bx - ax
+    if dx >= 0:
+        # Columna j de B cae sobre la columna j + dx de A
+        return any((fa[y - ay] >> dx) & fb[y - by] for y in range(y0, y1))
+    return any(fa[y - ay] & (fb[y - by] >> -dx) for y in range(y0, y1))
+
+
+def _ajustada(m: Optional[MascaraBits], ancho: int, alto: int) -> MascaraBits:
+    """Usa la máscara solo si coincide con la hitbox; si no, rectángulo lleno."""
+    if m is None or m.ancho != ancho or m.alto != alto:
+        return mascara_llena(ancho, alto)
+    return m
+
+
+def confirmar_impacto(mascaras: Optional[Mapping[str, MascaraBits]],
+                      clave_a: str, ax: int, ay: int, aw: int, ah: int,
+                      clave_b: str, bx: int, by: int, bw: int, bh: int) -> bool:
+    """
+    Confirma con máscaras un par que YA pasó el AABB (o el barrido).
+    - Sin máscaras para ninguno de los dos → el AABB basta (True).
+    - Si el par solo chocó por barrido (no se tocan al final del tick)
+      aceptamos el impacto: la máscara describe una pose, no un recorrido.
+    """
+    if not mascaras:
+        return True
+    ma, mb = mascaras.get(clave_a), mascaras.get(clave_b)
+    if ma is None and mb is None:
+        return True
+    if not _rects_collide(ax, ay, aw, ah, bx, by, bw, bh):
+        return True
+    return _mascaras_collide(_ajustada(ma, aw, ah), ax, ay, _ajustada(mb, bw, bh), bx, by)
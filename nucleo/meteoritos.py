@@ -1,14 +1,19 @@
-from dataclasses import replace
 from typing import Tuple
 from .constantes import ANCHO, ALTO
 from .estados import EstadoMeteoro
-from .rng import azar_en_rango
+from .rng import lote_rangos
 
 # ============================================================================
 # meteoros.py — Actualización funcional de meteoritos
 # Idea clave: todo es inmutable. No “movemos” objetos, devolvemos NUEVOS.
+# El azar sale del flujo “meteoros” (estado.semilla_azar, ver nucleo.rng).
 # ============================================================================
 
+def _rangos(ancho: int, bonus_vel: int):
+    """x, y, velocidad_x, velocidad_y de un meteoro nuevo (de una tirada en lote)."""
+    return (0, ANCHO - ancho), (-140, -100), (-3, 3), (1 + bonus_vel, 4 + bonus_vel)
+
+
 def actualizar_meteoros(meteoros: Tuple[EstadoMeteoro, ...], semilla_azar: int, bonus_vel: int = 0):
     """
     Recorre todos los meteoritos y calcula su siguiente posición de forma pura.
@@ -27,11 +32,9 @@ def actualizar_meteoros(meteoros: Tuple[EstadoMeteoro, ...], semilla_azar: int,
 
         # Si se fue de pantalla (por abajo o a los costados), lo re-posicionamos arriba.
         if ny > ALTO + 10 or nx < -40 or nx > ANCHO + 40:
-            # Nuevas posiciones/velocidades determinísticas a partir de la semilla
-            s, rx = azar_en_rango(s, 0, ANCHO - m.ancho)     # x aleatoria dentro del ancho
-            s, ry = azar_en_rango(s, -140, -100)             # y aleatoria por encima de la pantalla
-            s, sx = azar_en_rango(s, -3, 3)                  # velocidad horizontal leve
-            s, sy = azar_en_rango(s, 1 + bonus_vel, 4 + bonus_vel)  # caída vertical con bonus
+            # Nuevas posiciones/velocidades determinísticas a partir del flujo:
+            # x dentro del ancho, y por encima de la pantalla, vx leve, caída con bonus
+            s, (rx, ry, sx, sy) = lote_rangos(s, _rangos(m.ancho, bonus_vel))
             nuevos.append(EstadoMeteoro(rx, ry, sx, sy))
         else:
             # Sigue en pantalla → devolvemos el mismo meteoro pero con (x,y) nuevos
@@ -50,20 +53,16 @@ def reponer_meteoros(estado):
     - Devuelve un NUEVO 'estado' con la tupla de meteoros repuesta y
       la semilla actualizada.
     """
-    from dataclasses import replace
-    from .rng import azar_en_rango
-
     s = estado.semilla_azar
-    mets = list(estado.meteoros)
+    nuevos = []
 
-    # Mientras haya menos de 8 meteoros, añadimos nuevos en la parte superior.
-    while len(mets) < 8:
-        s, nx = azar_en_rango(s, 0, ANCHO - 40)
-        s, ny = azar_en_rango(s, -140, -100)
-        s, sx = azar_en_rango(s, -3, 3)
-        s, sy = azar_en_rango(s, 1 + estado.ia.meteor_bonus, 4 + estado.ia.meteor_bonus)
-        mets.append(EstadoMeteoro(nx, ny, sx, sy))
+    # Mientras haya menos de 8 meteoros, añadimos nuevos en la parte superior
+    # (todos los que faltan en UNA tirada en lote: 4 valores por meteoro).
+    faltan = 8 - len(estado.meteoros)
+    if faltan > 0:
+        s, vs = lote_rangos(s, _rangos(40, estado.ia.meteor_bonus) * faltan)
+        nuevos = [EstadoMeteoro(*vs[k:k + 4]) for k in range(0, len(vs), 4)]
 
-    # Devolvemos un estado NUEVO (replace) con meteoros como tupla e
+    # Devolvemos un estado NUEVO (.con) con los meteoros agregados al final e
     # inyectamos la semilla actualizada para la próxima vez.
-    return replace(estado, meteoros=tuple(mets), semilla_azar=s)
+    return estado.con(meteoros=estado.meteoros + tuple(nuevos), semilla_azar=s)
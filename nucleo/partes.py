@@ -0,0 +1,164 @@
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+from .constantes import BOSS_W, BOSS_H, BOSS_HP
+
+# ============================================================================
+# partes.py — Jefe por partes (torretas, placas, núcleo) con BVH
+# El ARMAZÓN es DATO: cada Parte tiene su caja relativa a la esquina del
+# jefe y su vida inicial. En el estado solo va la vida que le queda a cada
+# una (EstadoBoss.partes, en el mismo orden); el jefe muere con el NÚCLEO.
+#   torreta  si se rompe, deja de disparar lo que sale de ella
+#            (los emisores de patrones.py que salen de ella)
+#   placa    blindaje: tapa lo que está detrás hasta que se rompe
+#   nucleo   punto débil; su vida es boss.vida (la barra del HUD)
+# Si una bala toca dos partes vivas se la lleva la PRIMERA del armazón
+# (por eso las placas van antes que el núcleo).
+# Colisión por jerarquía de cajas (BVH), armada UNA vez al importar: la
+# raíz envuelve todas las partes, así una bala que no toca la caja de
+# afuera cuesta una sola comparación, tenga el jefe 5 o 50 partes.
+#   boss, usadas, rotas = golpear(boss, rects)   # rects de las balas
+# ============================================================================
+
+TORRETA, PLACA, NUCLEO = "torreta", "placa", "nucleo"
+DAÑO_BALA = 10       # vida que quita cada bala del jugador (igual que el jefe de una pieza)
+HOJA = 2             # partes por hoja del BVH
+
+
+@dataclass(frozen=True, slots=True)
+class Parte:
+    """Pieza del jefe: caja (x, y, w, h) relativa a su esquina, vida inicial y puntos al romperla."""
+    nombre: str
+    tipo: str
+    x: int; y: int; w: int; h: int
+    vida: int
+    puntos: int = 0
+
+
+ARMAZON: Tuple[Parte, ...] = (
+    Parte("placa_abajo", PLACA, 52, 82, 56, 18, 120, 30),
+    Parte("placa_izq", PLACA, 40, 30, 18, 58, 80, 20),
+    Parte("placa_der", PLACA, 102, 30, 18, 58, 80, 20),
+    Parte("placa_arriba", PLACA, 52, 18, 56, 16, 80, 20),
+    Parte("torreta_izq", TORRETA, 14, 84, 28, 28, 100, 100),
+    Parte("torreta_der", TORRETA, BOSS_W - 42, 84, 28, 28, 100, 100),
+    Parte("nucleo", NUCLEO, 58, 34, 44, 48, BOSS_HP, 0),
+)
+
+
+# --- BVH --------------------------------------------------------------------------
+# Nodo = (x1, y1, x2, y2, izq, der, hojas): cajas semiabiertas [x1, x2) × [y1, y2).
+# Hoja: izq = der = -1 y `hojas` = ((índice, x1, y1, x2, y2), …) de sus partes;
+# nodo interno: hojas = ().
+Nodo = Tuple[int, int, int, int, int, int, Tuple[Tuple[int, int, int, int, int], ...]]
+
+
+def construir_bvh(partes: Sequence[Parte]) -> Tuple[Nodo, ...]:
+    """Árbol binario partiendo por la mediana del eje más largo. Nodo 0 = raíz."""
+    nodos: List[Nodo] = []
+
+    def armar(idx: List[int]) -> int:
+        x1 = min(partes[k].x for k in idx)
+        y1 = min(partes[k].y for k in idx)
+        x2 = max(partes[k].x + partes[k].w for k in idx)
+        y2 = max(partes[k].y + partes[k].h for k in idx)
+        n = len(nodos)
+        nodos.append(None)
+        if len(idx) <= HOJA:
+            nodos[n] = (x1, y1, x2, y2, -1, -1, tuple(
+                (k, partes[k].x, partes[k].y, partes[k].x + partes[k].w, partes[k].y + partes[k].h)
+                for k in sorted(idx)))
+            return n
+        if x2 - x1 >= y2 - y1:
+            idx = sorted(idx, key=lambda k: 2 * partes[k].x + partes[k].w)
+        else:
+            idx = sorted(idx, key=lambda k: 2 * partes[k].y + partes[k].h)
+        mitad = len(idx) // 2
+        izq = armar(idx[:mitad])
+        der = armar(idx[mitad:])
+        nodos[n] = (x1, y1, x2, y2, izq, der, ())
+        return n
+
+    if not partes:
+        raise ValueError("un armazón necesita al menos una parte")
+    if sum(p.tipo == NUCLEO for p in partes) != 1:
+        raise ValueError("el armazón tiene que tener exactamente un núcleo")
+    for p in partes:
+        if p.tipo not in (TORRETA, PLACA, NUCLEO):
+            raise ValueError(f"{p.nombre}: tipo de parte desconocido {p.tipo!r}")
+        if p.w <= 0 or p.h <= 0 or p.vida <= 0:
+            raise ValueError(f"{p.nombre}: caja vacía o sin vida")
+        if p.x < 0 or p.y < 0 or p.x + p.w > BOSS_W or p.y + p.h > BOSS_H:
+            raise ValueError(f"{p.nombre}: se sale de la caja del jefe ({BOSS_W}×{BOSS_H})")
+    armar(list(range(len(partes))))
+    return tuple(nodos)
+
+
+BVH = construir_bvh(ARMAZON)
+NUCLEO_IDX = next(k for k, p in enumerate(ARMAZON) if p.tipo == NUCLEO)
+
+
+def vidas_iniciales() -> Tuple[int, ...]:
+    return tuple(p.vida for p in ARMAZON)
+
+
+def parte_tocada(vidas, x: int, y: int, w: int, h: int, bvh=BVH) -> int:
+    """
+    Índice de la primera parte viva que toca el rect (x, y, w, h), en
+    coordenadas relativas al jefe; -1 si ninguna. Baja solo por los nodos
+    cuya caja toca el rect.
+    """
+    x2, y2 = x + w, y + h
+    mejor = -1
+    pila = [0]
+    while pila:
+        nx1, ny1, nx2, ny2, izq, der, hojas = bvh[pila.pop()]
+        if x >= nx2 or x2 <= nx1 or y >= ny2 or y2 <= ny1:
+            continue
+        if izq < 0:
+            for k, px1, py1, px2, py2 in hojas:
+                if vidas[k] > 0 and (mejor < 0 or k < mejor) and x < px2 and x2 > px1 and y < py2 and y2 > py1:
+                    mejor = k
+        else:
+            pila.append(der)
+            pila.append(izq)
+    return mejor
+
+
+def golpear(boss, rects, daño: int = DAÑO_BALA):
+    """
+    Balas (rects absolutos) contra un jefe por partes, en orden: cada bala
+    que toca una parte viva le quita `daño` y se consume; si la parte se
+    rompe, las siguientes ya pasan a lo que tapaba.
+    → (boss con vidas/vida/vivo nuevos, índices de rects usados, partes rotas)
+    """
+    vidas = list(boss.partes)
+    usadas, rotas = [], []
+    bx, by = boss.x, boss.y
+    # Caja de afuera (la raíz) en coordenadas absolutas: una comparación por bala
+    rx1, ry1, rx2, ry2 = bx + BVH[0][0], by + BVH[0][1], bx + BVH[0][2], by + BVH[0][3]
+    for i, (x, y, w, h) in enumerate(rects):
+        if x >= rx2 or x + w <= rx1 or y >= ry2 or y + h <= ry1:
+            continue
+        k = parte_tocada(vidas, x - bx, y - by, w, h)
+        if k < 0:
+            continue
+        usadas.append(i)
+        vidas[k] = max(0, vidas[k] - daño)
+        if vidas[k] == 0:
+            rotas.append(k)
+            if k == NUCLEO_IDX:
+                break
+    if not usadas:
+        return boss, usadas, rotas
+    vida = vidas[NUCLEO_IDX]
+    return boss.con(partes=tuple(vidas), vida=vida, vivo=vida > 0), usadas, rotas
+
+
+def origen_activo(boss, ox: int, oy: int) -> bool:
+    """¿Puede salir un disparo de (ox, oy) (relativo al jefe)? No si cae en una torreta rota."""
+    if not boss.partes:
+        return True
+    for k, p in enumerate(ARMAZON):
+        if p.tipo == TORRETA and boss.partes[k] == 0 and p.x <= ox < p.x + p.w and p.y <= oy < p.y + p.h:
+            return False
+    return True
@@ -0,0 +1,158 @@
+from dataclasses import dataclass
+from .constantes import FIRE_RATE_FRAMES
+from .enums_eventos import Evento, EventoTipo, ModoJuego
+from .estados import EstadoJuego
+from .edicion import editar
+from .jugador import mover_jugador, disparar_bala, actualizar_balas
+from .meteoritos import actualizar_meteoros, reponer_meteoros
+from .enemigos import actualizar_enemigos_ia, logica_disparo_enemigo, actualizar_balas_enemigas
+from .jefe import actualizar_jefe
+from .patrones import Cortina, emitir
+from .colisiones import resolver_colisiones, avanzar_explosiones
+from .flujo import logica_juego, ajustar_ia, predecir_jugador
+
+# ============================================================================
+# paso.py — UN tick completo del juego como función pura
+# Todo lo que antes orquestaba el bucle de pygame (mover, disparar con
+# cadencia, actualizar por modo, colisiones, reponer, explosiones, flujo,
+# gracia de spawn) vive acá:   estado_nuevo = paso(estado, entrada)
+# La cáscara solo traduce teclado → Entrada y eventos → sonidos; así el
+# juego se puede simular sin ventana (ver nucleo/sim.py).
+# ============================================================================
+
+# Cada paso mueve las balas UN tick: las colisiones barren ese recorrido
+# (colisión continua), así una bala rápida no atraviesa a nadie entre ticks.
+PASOS_BARRIDO = 1
+
+
+@dataclass(frozen=True, slots=True)
+class Entrada:
+    """
+    Entrada del jugador en UN tick (lo único que viene de afuera).
+    Cabe en 3 bits: ver bits() / desde_bits() para guardarla compacta.
+    """
+    izquierda: bool = False
+    derecha: bool = False
+    disparo: bool = False
+
+    def bits(self) -> int:
+        """Empaqueta la entrada en un entero: 1 = izquierda, 2 = derecha, 4 = disparo."""
+        return (1 if self.izquierda else 0) | (2 if self.derecha else 0) | (4 if self.disparo else 0)
+
+    @staticmethod
+    def desde_bits(bits: int) -> "Entrada":
+        """Inverso de bits() (usa las instancias precalculadas, no crea nuevas)."""
+        return _ENTRADAS[bits & 7]
+
+
+_ENTRADAS = tuple(Entrada(bool(b & 1), bool(b & 2), bool(b & 4)) for b in range(8))
+NADA = _ENTRADAS[0]
+
+
+def hay_naves_vivas(estado: EstadoJuego) -> bool:
+    """¿Sigue la partida? En cooperativo alcanza con que quede UNA nave viva."""
+    j2 = estado.jugador2
+    return estado.jugador.vivo or (j2 is not None and j2.vivo)
+
+
+def objetivo(jugador, jugador2):
+    """La nave que persiguen enemigos y jefe: la 1, salvo que haya caído y la 2 siga."""
+    if jugador2 is not None and jugador2.vivo and not jugador.vivo:
+        return jugador2
+    return jugador
+
+
+def _mover(jugador, entrada: Entrada):
+    if entrada.izquierda: jugador = mover_jugador(jugador, -1)
+    if entrada.derecha:   jugador = mover_jugador(jugador,  1)
+    return jugador
+
+
+def paso(estado: EstadoJuego, entrada: Entrada = NADA, mascaras=None, entrada2: Entrada = NADA) -> EstadoJuego:
+    """
+    Avanza el juego un tick (1/60 s) de forma PURA:
+    - los eventos del tick anterior se descartan al empezar; los de ESTE
+      tick quedan en estado.eventos para que la cáscara reaccione
+    - disparar respeta FIRE_RATE_FRAMES (y emite EventoTipo.DISPARO)
+    - durante gracia_spawn el jugador no puede morir
+    - entrada2 maneja la segunda nave si hay (cooperativo: cada nave con su
+      cadencia; sus disparos van con detalle (2,)); sin jugador2 se ignora
+    Internamente usa UNA edición (ver nucleo.edicion): un solo EstadoJuego nuevo.
+    """
+    jugador = _mover(estado.jugador, entrada)
+    jugador2 = estado.jugador2
+    if jugador2 is not None:
+        jugador2 = _mover(jugador2, entrada2)
+    blanco = objetivo(jugador, jugador2)
+
+    balas = estado.balas
+    ia = ajustar_ia(estado.ia, estado.puntaje, hay_naves_vivas(estado))
+    eventos = estado.eventos[:0]
+
+    # Disparo continuo con cadencia
+    fire_cd = estado.fire_cooldown - 1 if estado.fire_cooldown > 0 else estado.fire_cooldown
+    if entrada.disparo and fire_cd <= 0 and estado.jugador.vivo:
+        balas = disparar_bala(jugador, balas)
+        eventos = eventos + (Evento(EventoTipo.DISPARO),)
+        fire_cd = FIRE_RATE_FRAMES
+
+    ed = editar(estado).con(eventos=eventos, fire_cooldown=fire_cd)
+    if jugador2 is not None:
+        fire_cd2 = estado.fire_cooldown2 - 1 if estado.fire_cooldown2 > 0 else estado.fire_cooldown2
+        if entrada2.disparo and fire_cd2 <= 0 and estado.jugador2.vivo:
+            balas = disparar_bala(jugador2, balas)
+            ed = ed.con_eventos(ed.eventos + (Evento(EventoTipo.DISPARO, (2,)),))
+            fire_cd2 = FIRE_RATE_FRAMES
+        ed = ed.con(jugador2=jugador2, fire_cooldown2=fire_cd2)
+
+    # --- Actualización por modo (solo movimiento/IA; las colisiones van después) ---
+    if estado.modo == ModoJuego.METEORITOS:
+        balas = actualizar_balas(balas)
+        meteoros, sem = actualizar_meteoros(estado.meteoros, estado.semilla_azar, estado.ia.meteor_bonus)
+        ed = ed.con(jugador=jugador, meteoros=meteoros, balas=balas, semilla_azar=sem, ia=ia)
+
+    elif estado.modo in (ModoJuego.ENEMIGOS, ModoJuego.MIXTO):
+        balas = actualizar_balas(balas)
+        ia, x_pred = predecir_jugador(ia, blanco)
+        enemigos = actualizar_enemigos_ia(estado.enemigos, blanco, ia)
+        balas_enemigas = actualizar_balas_enemigas(estado.balas_enemigas)
+        enemigos2, nuevas_be, sem = logica_disparo_enemigo(enemigos, estado.azar_disparos, ia, x_pred)
+        ed = ed.con(jugador=jugador, enemigos=enemigos2, balas=balas,
+                    balas_enemigas=balas_enemigas + nuevas_be, azar_disparos=sem, ia=ia)
+        if ed.modo == ModoJuego.MIXTO:
+            mets, sem2 = actualizar_meteoros(ed.meteoros, ed.semilla_azar, ed.ia.meteor_bonus)
+            ed = ed.con(meteoros=mets, semilla_azar=sem2)
+
+    else:  # ModoJuego.JEFE
+        balas = actualizar_balas(balas)
+        balas_enemigas = actualizar_balas_enemigas(estado.balas_enemigas)
+        boss = actualizar_jefe(estado.boss, blanco)
+        # El jefe dispara SOLO con patrones “bullet hell”: la cortina avanza por
+        # lotes y el jefe le suma descargas (las balas enemigas que quedaban siguen)
+        cortina = (estado.cortina or Cortina()).avanzar()
+        boss, cortina = emitir(boss, cortina, ia, blanco)
+        ed = ed.con(jugador=jugador, balas=balas, balas_enemigas=balas_enemigas, boss=boss,
+                    cortina=cortina, ia=ia)
+        if ed.meteoros:
+            mets, sem2 = actualizar_meteoros(ed.meteoros, ed.semilla_azar, ed.ia.meteor_bonus)
+            ed = ed.con(meteoros=mets, semilla_azar=sem2)
+
+    # --- Una sola etapa de colisiones para todas las capas ---
+    ed = resolver_colisiones(ed, pasos_barrido=PASOS_BARRIDO, mascaras=mascaras)
+    if ed.modo in (ModoJuego.METEORITOS, ModoJuego.MIXTO):
+        ed = reponer_meteoros(ed)
+
+    # FX + lógica global
+    ed = avanzar_explosiones(ed)
+    ed = logica_juego(ed)
+
+    # Gracia de spawn: corazones llenos y un poco de invulnerabilidad
+    if ed.gracia_spawn > 0:
+        j = ed.jugador
+        ed = ed.con(gracia_spawn=ed.gracia_spawn - 1,
+                    jugador=j.con(corazones=7, vivo=True, invul_frames=max(j.invul_frames, 10)))
+        j2 = ed.jugador2
+        if j2 is not None:
+            ed = ed.con_jugador2(j2.con(corazones=7, vivo=True, invul_frames=max(j2.invul_frames, 10)))
+
+    return ed.congelar()
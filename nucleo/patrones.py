@@ -0,0 +1,294 @@
+import math
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from .constantes import ANCHO, ALTO, BOSS_W, BOSS_H
+from .partes import origen_activo
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+
+# ============================================================================
+# patrones.py — “Bullet hell” del JEFE: emisores declarativos + cortina de balas
+# Un patrón se describe con DATOS:
+#   CURVAS    nombre → velocidad de la bala según su edad (v0, aceleración,
+#             límite), compilada UNA vez en una tabla de distancia recorrida.
+#   Emisor    cuántas balas por descarga, abanico, giro entre descargas
+#             (espirales), apuntado al jugador, curva y cadencia (que baja
+#             con ia.dificultad).
+#   PATRONES  fases que el jefe recorre en ronda: (nombre, emisores, ticks).
+# Las balas viven en una Cortina: columnas (array) con origen, dirección
+# (floats), tick de nacimiento y curva de cada bala. La posición NO se
+# guarda: es origen + dirección · distancia[curva][edad], así una bala no
+# cambia nunca después de nacer y avanzar la cortina es sumar 1 al tick
+# (más sacar las que se fueron). Todo por lotes, sin un objeto por bala.
+#   c = Cortina()
+#   c = c.avanzar()                          # 1 tick (y limpia las que salieron)
+#   boss, c = emitir(boss, c, ia, jugador)   # descargas del tick
+#   c.tocadas((x, y, w, h))                  # índices que tocan un rectángulo
+# Con NumPy (OPCIONAL, como en vectorizado.py) y una cortina grande,
+# posiciones/avanzar/tocadas/sin trabajan sobre las mismas columnas vistas
+# como arreglos (np.frombuffer, sin copiar): mismas operaciones en el mismo
+# orden, así los floats salen idénticos bit a bit al camino escalar.
+# ============================================================================
+
+VIDA = 900          # ticks máximos de una bala (después se descarta)
+MARGEN = 20         # px fuera de pantalla antes de descartarla
+RADIO = 5           # caja de colisión: cuadrado de 2·RADIO centrado en la bala
+UMBRAL_NP = 48      # desde cuántas balas compensa pasar a arreglos (ver bench_nucleo.py, 9)
+
+
+# --- Curvas de velocidad ----------------------------------------------------------
+def curva(v0: float, aceleracion: float = 0.0, limite: Optional[float] = None) -> Tuple[float, ...]:
+    """
+    Distancia recorrida a cada edad (0..VIDA) con velocidad v0 + aceleracion·edad,
+    sin pasar de `limite` (tope si acelera, piso si frena).
+    """
+    dist, d = [0.0], 0.0
+    for edad in range(VIDA):
+        v = v0 + aceleracion * edad
+        if limite is not None:
+            v = min(v, limite) if aceleracion >= 0 else max(v, limite)
+        d += v
+        dist.append(d)
+    return tuple(dist)
+
+
+CURVAS: Dict[str, Tuple[float, ...]] = {
+    "constante": curva(2.5),
+    "lenta": curva(1.2),
+    "acelera": curva(1.0, 0.06, 5.5),
+    "frena": curva(6.0, -0.12, 1.6),
+}
+_NOMBRES_CURVAS = tuple(CURVAS)
+_DIST = tuple(CURVAS[n] for n in _NOMBRES_CURVAS)
+_DIST_NP = None if np is None else np.array(_DIST)    # (curva, edad) → distancia
+
+
+# --- Emisores y patrones ----------------------------------------------------------
+@dataclass(frozen=True, slots=True)
+class Emisor:
+    """
+    Una descarga = `cantidad` balas repartidas en `abanico` grados (360 = anillo)
+    alrededor de `angulo` (90 = hacia abajo) o del jugador si `apuntado`. Cada
+    descarga rota `giro` grados más que la anterior. Cadencia (ticks entre
+    descargas): cadencia - por_dificultad · ia.dificultad, nunca menos de cadencia_min.
+    origen: punto de salida relativo a la esquina del jefe.
+    """
+    cantidad: int
+    abanico: float = 360.0
+    giro: float = 0.0
+    angulo: float = 90.0
+    apuntado: bool = False
+    curva: str = "constante"
+    cadencia: int = 10
+    por_dificultad: float = 0.5
+    cadencia_min: int = 2
+    origen: Tuple[int, int] = (BOSS_W // 2, BOSS_H - 10)
+
+    def cada(self, dificultad: float) -> int:
+        return max(self.cadencia_min, self.cadencia - int(dificultad * self.por_dificultad))
+
+
+PATRONES: Tuple[Tuple[str, Tuple[Emisor, ...], int], ...] = (
+    ("espiral", (Emisor(3, giro=11, cadencia=7, por_dificultad=0.4),
+                 Emisor(3, giro=-11, cadencia=7, por_dificultad=0.4, angulo=270, curva="lenta")), 360),
+    ("abanico", (Emisor(7, abanico=60, apuntado=True, cadencia=30, por_dificultad=1.5, cadencia_min=10,
+                        curva="acelera"),), 300),
+    ("anillo", (Emisor(20, apuntado=True, cadencia=45, por_dificultad=2.0, cadencia_min=16, curva="frena"),
+                Emisor(2, abanico=24, angulo=90, cadencia=12, origen=(28, BOSS_H - 10)),
+                Emisor(2, abanico=24, angulo=90, cadencia=12, origen=(BOSS_W - 28, BOSS_H - 10))), 300),
+)
+
+
+# --- Cortina (balas del jefe en columnas) -----------------------------------------
+class Cortina:
+    """
+    Balas del jefe como columnas inmutables (copy-on-write: lo que no cambia se comparte):
+    x0/y0/dx/dy (floats), nace (tick) y curva (índice en CURVAS) por bala.
+    `nace` queda ordenado (se agrega por tick): las que superan VIDA son
+    siempre un prefijo. `atras` solo sirve para dibujar (ver tiempo.interpolar).
+    """
+    __slots__ = ("tick", "x0", "y0", "dx", "dy", "nace", "curva", "atras", "_pos")
+
+    def __init__(self, tick: int = 0, x0=None, y0=None, dx=None, dy=None, nace=None, curva=None, atras: float = 0.0):
+        self.tick = tick
+        self.x0 = array("d") if x0 is None else x0
+        self.y0 = array("d") if y0 is None else y0
+        self.dx = array("d") if dx is None else dx
+        self.dy = array("d") if dy is None else dy
+        self.nace = array("q") if nace is None else nace
+        self.curva = array("B") if curva is None else curva
+        self.atras = atras
+        self._pos = None
+
+    def __len__(self) -> int:
+        return len(self.nace)
+
+    def __eq__(self, otra):
+        if not isinstance(otra, Cortina):
+            return NotImplemented
+        return (self.tick == otra.tick and self.nace == otra.nace and self.curva == otra.curva
+                and self.x0 == otra.x0 and self.y0 == otra.y0 and self.dx == otra.dx and self.dy == otra.dy)
+
+    def __hash__(self):
+        return hash((self.tick, len(self), self.x0.tobytes(), self.y0.tobytes()))
+
+    def __repr__(self):
+        return f"Cortina(tick={self.tick}, {len(self)} balas)"
+
+    def columnas(self):
+        return self.x0, self.y0, self.dx, self.dy, self.nace, self.curva
+
+    def _np(self) -> bool:
+        """¿Esta cortina va por el camino NumPy? (hay NumPy y balas suficientes)"""
+        return np is not None and len(self) >= UMBRAL_NP
+
+    # --- posiciones -----------------------------------------------------------
+    def _xy(self):
+        """(xs, ys) en este tick: listas o arreglos según _np() (se calcula una vez y se cachea)."""
+        if self._pos is None:
+            t = self.tick
+            if self._np():
+                edad = t - np.frombuffer(self.nace, dtype="q")
+                curva = np.frombuffer(self.curva, dtype="B")
+                if self.atras:
+                    antes = np.maximum(edad - 1, 0)
+                    d0 = _DIST_NP[curva, antes]
+                    ds = np.where(edad > 0, d0 + (_DIST_NP[curva, edad] - d0) * (1.0 - self.atras), 0.0)
+                else:
+                    ds = _DIST_NP[curva, edad]
+                self._pos = (np.frombuffer(self.x0, dtype="d") + np.frombuffer(self.dx, dtype="d") * ds,
+                             np.frombuffer(self.y0, dtype="d") + np.frombuffer(self.dy, dtype="d") * ds)
+                return self._pos
+            if self.atras:
+                # Para dibujar entre dos ticks: distancia interpolada a edad - atras
+                f = 1.0 - self.atras
+                ds = [D[t - n - 1] + (D[t - n] - D[t - n - 1]) * f if t > n else 0.0
+                      for D, n in zip(map(_DIST.__getitem__, self.curva), self.nace)]
+            else:
+                ds = [_DIST[c][t - n] for c, n in zip(self.curva, self.nace)]
+            self._pos = ([x + dx * d for x, dx, d in zip(self.x0, self.dx, ds)],
+                         [y + dy * d for y, dy, d in zip(self.y0, self.dy, ds)])
+        return self._pos
+
+    def posiciones(self) -> Tuple[List[float], List[float]]:
+        """(xs, ys) de todas las balas en este tick, siempre como listas."""
+        xs, ys = self._xy()
+        if isinstance(xs, list):
+            return xs, ys
+        return xs.tolist(), ys.tolist()
+
+    def atrasada(self, atras: float) -> "Cortina":
+        """La misma cortina dibujada `atras` ticks antes (0..1; solo para la pantalla)."""
+        return Cortina(self.tick, *self.columnas(), atras=atras)
+
+    # --- “cambios” (siempre devuelven una Cortina NUEVA) -------------------------
+    def _elegir(self, tick: int, indices) -> "Cortina":
+        if np is not None and not isinstance(indices, (list, range)):
+            # Índices como arreglo: se copian los bytes elegidos de cada columna de una
+            return Cortina(tick, *(array(c.typecode, np.frombuffer(c, dtype=c.typecode)[indices].tobytes())
+                                   for c in self.columnas()))
+        return Cortina(tick, *(array(c.typecode, [c[i] for i in indices]) for c in self.columnas()))
+
+    def avanzar(self) -> "Cortina":
+        """Un tick más; descarta las que superaron VIDA o salieron de la pantalla."""
+        t = self.tick + 1
+        viejas = bisect_left(self.nace, t - VIDA + 1)     # edad >= VIDA → fuera (es un prefijo)
+        base = Cortina(t, *(c[viejas:] if viejas else c for c in self.columnas()))
+        xs, ys = base._xy()
+        x1, x2, y1, y2 = -MARGEN, ANCHO + MARGEN, -MARGEN, ALTO + MARGEN
+        if not isinstance(xs, list):
+            dentro = (x1 <= xs) & (xs <= x2) & (y1 <= ys) & (ys <= y2)
+            if dentro.all():
+                return base
+            quedan = np.flatnonzero(dentro)
+            nueva = base._elegir(t, quedan)
+            nueva._pos = (xs[quedan], ys[quedan])
+            return nueva
+        quedan = [i for i, (x, y) in enumerate(zip(xs, ys)) if x1 <= x <= x2 and y1 <= y <= y2]
+        if len(quedan) == len(base):
+            return base
+        nueva = base._elegir(t, quedan)
+        nueva._pos = ([xs[i] for i in quedan], [ys[i] for i in quedan])
+        return nueva
+
+    def agregar(self, x0s, y0s, dxs, dys, curva: int) -> "Cortina":
+        """Un lote de balas nuevas (nacen en este tick) al final."""
+        if not x0s:
+            return self
+        n = len(x0s)
+        return Cortina(self.tick, self.x0 + array("d", x0s), self.y0 + array("d", y0s),
+                       self.dx + array("d", dxs), self.dy + array("d", dys),
+                       self.nace + array("q", [self.tick]) * n, self.curva + array("B", [curva]) * n)
+
+    def sin(self, indices) -> "Cortina":
+        """Quita las balas en esas posiciones (p. ej. las que chocaron)."""
+        fuera = set(indices)
+        if not fuera:
+            return self
+        cache = self._pos if not self.atras else None
+        if self._np():
+            quedan = np.ones(len(self), dtype=bool)
+            quedan[list(fuera)] = False
+            quedan = np.flatnonzero(quedan)
+            nueva = self._elegir(self.tick, quedan)
+            if cache is not None and not isinstance(cache[0], list):
+                nueva._pos = (cache[0][quedan], cache[1][quedan])
+            return nueva
+        nueva = self._elegir(self.tick, [i for i in range(len(self)) if i not in fuera])
+        if cache is not None and isinstance(cache[0], list):
+            xs, ys = cache
+            nueva._pos = ([x for i, x in enumerate(xs) if i not in fuera],
+                          [y for i, y in enumerate(ys) if i not in fuera])
+        return nueva
+
+    def tocadas(self, rect) -> List[int]:
+        """Índices de las balas cuya caja (2·RADIO) toca el rectángulo (x, y, w, h)."""
+        x, y, w, h = rect
+        x1, x2, y1, y2 = x - RADIO, x + w + RADIO, y - RADIO, y + h + RADIO
+        xs, ys = self._xy()
+        if not isinstance(xs, list):
+            return np.flatnonzero((x1 < xs) & (xs < x2) & (y1 < ys) & (ys < y2)).tolist()
+        return [i for i, (bx, by) in enumerate(zip(xs, ys)) if x1 < bx < x2 and y1 < by < y2]
+
+
+# --- Emisión ----------------------------------------------------------------------
+def _angulos(emisor: Emisor, base: float, k: int) -> List[float]:
+    centro = base + emisor.giro * k
+    n = emisor.cantidad
+    if emisor.abanico >= 360.0:
+        return [centro + 360.0 * i / n for i in range(n)]
+    if n == 1:
+        return [centro]
+    return [centro - emisor.abanico / 2 + emisor.abanico * i / (n - 1) for i in range(n)]
+
+
+def emitir(boss, cortina: Cortina, ia, jugador):
+    """
+    Avanza el patrón del jefe un tick y agrega las descargas que tocan.
+    (boss, cortina) → (boss, cortina). Sin jefe vivo en combate, no hace nada.
+    Un emisor que sale de una torreta rota (nucleo.partes) se calla.
+    """
+    if boss is None or not boss.vivo or boss.entrando:
+        return boss, cortina
+    _, emisores, duracion = PATRONES[boss.patron % len(PATRONES)]
+    t = boss.patron_t
+    for emisor in emisores:
+        cada = emisor.cada(ia.dificultad)
+        if t % cada or not origen_activo(boss, *emisor.origen):
+            continue
+        ox, oy = boss.x + emisor.origen[0], boss.y + emisor.origen[1]
+        base = emisor.angulo
+        if emisor.apuntado:
+            base = math.degrees(math.atan2(jugador.y + 30 - oy, jugador.x + 30 - ox))
+        rads = [math.radians(a) for a in _angulos(emisor, base, t // cada)]
+        n = len(rads)
+        cortina = cortina.agregar([float(ox)] * n, [float(oy)] * n, [math.cos(a) for a in rads],
+                                  [math.sin(a) for a in rads], _NOMBRES_CURVAS.index(emisor.curva))
+    if t + 1 >= duracion:
+        return boss.con(patron=(boss.patron + 1) % len(PATRONES), patron_t=0), cortina
+    return boss.con_patron_t(t + 1), cortina
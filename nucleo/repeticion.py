@@ -0,0 +1,283 @@
+import argparse
+import struct
+import sys
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Mapping, Optional, Tuple
+from .codec import leer_varint, poner_varint, codificar as codificar_estado, decodificar as decodificar_estado
+from .estados import EstadoJuego
+from .flujo import inicializar_juego
+from .lockstep import PartidasNP, disponible
+from .mascaras import MascaraBits
+from .paso import Entrada, paso
+from .zobrist import huella_estado
+
+# ============================================================================
+# repeticion.py — Repeticiones por registro de entradas (formato binario)
+# El núcleo es determinista: con la semilla y las teclas de cada tick se
+# vuelve a jugar EXACTAMENTE la misma partida. Una repetición guarda solo:
+#   cabecera (semilla, ticks, puntaje final, huella de máscaras, huella
+#   del estado final)
+#   + las teclas por tick (IZQ/DER/ESPACIO/ESC) comprimidas por “corridas”
+# Cada corrida es UN varint: (largo - 1) << 4 | teclas. Mantener una tecla
+# medio segundo cuesta 1 byte; 10 minutos de juego entran en pocos KB.
+# Opcional: una “foto” (nucleo.codec) del estado cada `cada_foto` ticks
+# (el juego y grabar() las guardan). No cambian la partida; sirven para
+# verificar_rapido, que re-simula todos los tramos entre fotos A LA VEZ en
+# lockstep, con las mismas máscaras. Una foto cada 250 ticks son ~6 KB más
+# (zlib) y 10 min al azar (36k ticks, sin JEFE), con o sin máscaras, se
+# verifican en 0.4–0.65 s en vez de 2.6–3.4 s (bench_nucleo.py, sección 11).
+# Los ticks del JEFE van por el núcleo escalar, uno por uno (la cortina sí
+# usa NumPy, ver patrones.py): una partida de 13.6k ticks con 1.1k de jefe
+# (máscaras del juego, hasta ~450 balas) baja de 2.0–2.3 s a 0.9–1.1 s.
+# Formato (little endian):
+#   b"NVRP" | versión u8 | semilla u32 | ticks u32 | puntaje u32
+#   | huella u32 | huella_final u64 | cada_foto u16 | largo u32
+#   | fotos (zlib de [varint largo | instantánea]…, `largo` bytes)
+#   | corridas… | crc32 u32 (de todo lo anterior)
+# Si cambia la jugabilidad (mismas teclas → otra partida) o el formato, sube
+# VERSION y las repeticiones anteriores se rechazan con un error claro.
+# ============================================================================
+
+MAGIA = b"NVRP"
+VERSION = 1
+ESC = 8   # bit extra (los bits 1/2/4 son los de Entrada); no afecta al núcleo
+CADA_FOTO = 250   # ticks entre fotos al grabar (0 = sin fotos)
+_CABECERA = struct.Struct("<4sBIIIIQ")
+_FOTOS = struct.Struct("<HI")
+
+
+@dataclass(frozen=True, slots=True)
+class Repeticion:
+    """
+    Una partida grabada: semilla + un byte de teclas por tick.
+    huella = huella_mascaras(...) de las hitboxes con que se jugó (0 = sin máscaras).
+    huella_final = nucleo.zobrist.huella_estado del último estado (0 = no se sabe).
+    fotos = instantáneas (nucleo.codec) tras los ticks cada_foto, 2·cada_foto…
+    (solo las de ANTES del último tick; () = sin fotos).
+    """
+    semilla: int
+    teclas: bytes
+    puntaje: int
+    huella: int = 0
+    huella_final: int = 0
+    cada_foto: int = 0
+    fotos: Tuple[bytes, ...] = ()
+
+    @property
+    def ticks(self) -> int:
+        return len(self.teclas)
+
+
+def _revisar_fotos(ticks: int, cada_foto: int, fotos) -> None:
+    esperadas = (ticks - 1) // cada_foto if cada_foto and ticks else 0
+    if len(fotos) != esperadas:
+        raise ValueError(f"la repetición trae {len(fotos)} fotos y con {ticks} ticks "
+                         f"(una cada {cada_foto}) van {esperadas}")
+
+
+def teclas_de(entrada: Entrada, esc: bool = False) -> int:
+    """Byte de teclas de un tick (lo que guarda la repetición)."""
+    return entrada.bits() | (ESC if esc else 0)
+
+
+def huella_mascaras(mascaras: Optional[Mapping[str, MascaraBits]]) -> int:
+    """
+    CRC32 de las máscaras de colisión (0 si no hay). Con otras hitboxes la
+    misma entrada da otra partida: la huella detecta ese caso al verificar.
+    """
+    if not mascaras:
+        return 0
+    crc = 0
+    for clave in sorted(mascaras):
+        m = mascaras[clave]
+        crc = zlib.crc32(f"{clave}:{m.ancho}x{m.alto}:".encode(), crc)
+        crc = zlib.crc32(b"".join(f.to_bytes((m.ancho + 7) // 8, "little") for f in m.filas), crc)
+    return crc
+
+
+def corridas(teclas: bytes) -> List[Tuple[int, int]]:
+    """[(teclas, largo), …] agrupando ticks seguidos con las mismas teclas."""
+    out = []
+    for t in teclas:
+        if out and out[-1][0] == t:
+            out[-1][1] += 1
+        else:
+            out.append([t, 1])
+    return [tuple(c) for c in out]
+
+
+def codificar(rep: Repeticion) -> bytes:
+    """Repeticion → bytes (cabecera + corridas + CRC)."""
+    _revisar_fotos(rep.ticks, rep.cada_foto, rep.fotos)
+    datos = bytearray(_CABECERA.pack(MAGIA, VERSION, rep.semilla % 2**32, rep.ticks, rep.puntaje,
+                                     rep.huella, rep.huella_final))
+    bloque = bytearray()
+    for foto in rep.fotos:
+        poner_varint(bloque, len(foto))
+        bloque += foto
+    bloque = zlib.compress(bytes(bloque), 9) if bloque else b""
+    datos += _FOTOS.pack(rep.cada_foto if rep.fotos else 0, len(bloque)) + bloque
+    for t, largo in corridas(rep.teclas):
+        poner_varint(datos, (largo - 1) << 4 | (t & 0xF))
+    datos += struct.pack("<I", zlib.crc32(datos))
+    return bytes(datos)
+
+
+def decodificar(datos: bytes) -> Repeticion:
+    """bytes → Repeticion. ValueError si el archivo no es válido o está dañado."""
+    if len(datos) < _CABECERA.size + 4:
+        raise ValueError("repetición truncada")
+    cuerpo, (crc,) = datos[:-4], struct.unpack("<I", datos[-4:])
+    if zlib.crc32(cuerpo) != crc:
+        raise ValueError("repetición dañada (CRC no coincide)")
+    if cuerpo[:4] != MAGIA:
+        raise ValueError("no es un archivo de repetición")
+    if cuerpo[4] != VERSION:
+        raise ValueError(f"versión de repetición no soportada: {cuerpo[4]}")
+    if len(cuerpo) < _CABECERA.size + _FOTOS.size:
+        raise ValueError("repetición truncada")
+    _, _, semilla, ticks, puntaje, huella, huella_final = _CABECERA.unpack_from(cuerpo)
+    cada_foto, largo = _FOTOS.unpack_from(cuerpo, _CABECERA.size)
+    i = _CABECERA.size + _FOTOS.size
+    fotos = []
+    if largo:
+        try:
+            bloque = zlib.decompress(cuerpo[i:i + largo])
+        except zlib.error as e:
+            raise ValueError(f"fotos dañadas: {e}") from None
+        j = 0
+        while j < len(bloque):
+            n, j = leer_varint(bloque, j)
+            fotos.append(bytes(bloque[j:j + n]))
+            j += n
+        i += largo
+    _revisar_fotos(ticks, cada_foto, fotos)
+    teclas = bytearray()
+    while i < len(cuerpo):
+        v, i = leer_varint(cuerpo, i)
+        teclas += bytes((v & 0xF,)) * ((v >> 4) + 1)
+    if len(teclas) != ticks:
+        raise ValueError(f"la repetición dice {ticks} ticks pero trae {len(teclas)}")
+    return Repeticion(semilla=semilla, teclas=bytes(teclas), puntaje=puntaje, huella=huella,
+                      huella_final=huella_final, cada_foto=cada_foto if fotos else 0, fotos=tuple(fotos))
+
+
+def guardar(ruta: str, rep: Repeticion):
+    with open(ruta, "wb") as f:
+        f.write(codificar(rep))
+
+
+def cargar(ruta: str) -> Repeticion:
+    with open(ruta, "rb") as f:
+        return decodificar(f.read())
+
+
+# --- grabar y volver a jugar ----------------------------------------------------
+def grabar(semilla: int, teclas: bytes, cada_foto: int = CADA_FOTO, mascaras=None) -> Tuple[Repeticion, EstadoJuego]:
+    """
+    Juega las teclas (bots, simulaciones, CI; sin máscaras salvo que se
+    pasen) y arma la repetición completa: puntaje, huellas y una foto cada
+    `cada_foto` ticks para verificar_rapido. Devuelve (repetición, estado_final).
+    """
+    estado = inicializar_juego(semilla)
+    fotos = []
+    for t, b in enumerate(teclas, 1):
+        estado = paso(estado, Entrada.desde_bits(b), mascaras)
+        if cada_foto and t % cada_foto == 0 and t < len(teclas):
+            fotos.append(codificar_estado(estado))
+    return Repeticion(semilla, bytes(teclas), estado.puntaje, huella_mascaras(mascaras), huella_estado(estado),
+                      cada_foto if fotos else 0, tuple(fotos)), estado
+
+
+def reproducir(rep: Repeticion, mascaras=None) -> Iterator[EstadoJuego]:
+    """Estados tick a tick de la partida grabada (el primero es tras el tick 1)."""
+    estado = inicializar_juego(rep.semilla)
+    for t in rep.teclas:
+        estado = paso(estado, Entrada.desde_bits(t), mascaras)
+        yield estado
+
+
+def verificar(rep: Repeticion, mascaras=None) -> Tuple[bool, EstadoJuego]:
+    """
+    Re-simula a toda velocidad y compara el puntaje final con el grabado
+    (y, si la repetición la trae, la huella del estado final: cualquier
+    diferencia en cualquier entidad cuenta, no solo el puntaje).
+    Devuelve (coincide, estado_final). Si las máscaras no son las mismas con
+    que se grabó, ni lo intenta: ValueError (el resultado no significaría nada).
+    """
+    if huella_mascaras(mascaras) != rep.huella:
+        raise ValueError("las máscaras de colisión no coinciden con las de la grabación")
+    estado = inicializar_juego(rep.semilla)
+    for t in rep.teclas:
+        estado = paso(estado, Entrada.desde_bits(t), mascaras)
+    ok = estado.puntaje == rep.puntaje and (rep.huella_final == 0 or huella_estado(estado) == rep.huella_final)
+    return ok, estado
+
+
+def verificar_rapido(rep: Repeticion, mascaras=None) -> Tuple[bool, EstadoJuego]:
+    """
+    verificar() por tramos: cada foto arranca un tramo de cada_foto ticks y
+    TODOS avanzan juntos en lockstep (nucleo.lockstep). Es la misma prueba,
+    por inducción: el primer tramo sale de inicializar_juego, cada uno tiene
+    que terminar EXACTAMENTE en la foto siguiente y el último en el puntaje
+    (y la huella) grabados; una foto trucha rompe el tramo que termina en
+    ella. Las máscaras van igual que en verificar() (el lockstep también las
+    usa). Sin fotos, sin NumPy o con fotos de otra versión del codec, hace
+    lo mismo que verificar().
+    """
+    if huella_mascaras(mascaras) != rep.huella:
+        raise ValueError("las máscaras de colisión no coinciden con las de la grabación")
+    if not rep.fotos or not disponible():
+        return verificar(rep, mascaras)
+    _revisar_fotos(rep.ticks, rep.cada_foto, rep.fotos)
+    try:
+        fotos = [decodificar_estado(f) for f in rep.fotos]
+    except ValueError:
+        return verificar(rep, mascaras)
+
+    n = rep.cada_foto
+    tramos = len(fotos) + 1
+    ultimo = rep.ticks - n * len(fotos)        # ticks del último tramo (1..n); el resto se rellena
+    teclas = rep.teclas.ljust(n * tramos, b"\0")  # teclas[t::n] = el tick t de cada tramo
+    lote = PartidasNP.desde_estados([inicializar_juego(rep.semilla)] + fotos, mascaras)
+    for t in range(n):
+        lote.paso(list(teclas[t::n]))
+        if t + 1 == ultimo:
+            final = lote.estado(tramos - 1)
+    ok = (all(lote.estado(i) == foto for i, foto in enumerate(fotos))
+          and final.puntaje == rep.puntaje
+          and (rep.huella_final == 0 or huella_estado(final) == rep.huella_final))
+    return ok, final
+
+
+def verificar_archivos(rutas: Iterable[str], mascaras=None) -> int:
+    """Verifica varios archivos, imprime un renglón por cada uno; 0 si todos dan."""
+    fallos = 0
+    for ruta in rutas:
+        rep = cargar(ruta)
+        t0 = time.perf_counter()
+        ok, final = verificar_rapido(rep, mascaras)
+        dt = time.perf_counter() - t0
+        fallos += not ok
+        print(f"{ruta}: {'OK' if ok else 'DISTINTO'} ticks={rep.ticks} puntaje={final.puntaje} "
+              f"(grabado {rep.puntaje}) {rep.ticks / max(dt, 1e-9):,.0f} ticks/s")
+    return 1 if fallos else 0
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m nucleo.repeticion",
+                                 description="Verifica repeticiones grabadas SIN máscaras (para las del juego "
+                                             "usar python -m cascara_imperativa.verificar)")
+    ap.add_argument("rutas", nargs="+")
+    args = ap.parse_args(argv)
+    try:
+        return verificar_archivos(args.rutas)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
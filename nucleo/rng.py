@@ -1,7 +1,89 @@
+import zlib
+from typing import Sequence, Tuple
+
+# ============================================================================
+# rng.py — Azar del núcleo (puro: la semilla entra y la nueva sale)
+# 1) LCG de 32 bits (siguiente_semilla / azar_en_rango): el de siempre.
+#    Lo siguen usando los bots de sim.py; saltar_semilla() lo adelanta n
+#    pasos en O(log n).
+# 2) FLUJOS con contador (lo que usa la partida): cada consumidor tiene su
+#    propio flujo con nombre (meteoros, enemigos, disparos, jefe…), así una
+#    tirada de más en uno NO cambia los números de los otros.
+#    Un flujo es un entero de 64 bits: clave + contador × γ. El valor n es
+#    mezclar64(clave + n·γ) (splitmix64): depende solo de (clave, n), por
+#    eso saltar() es O(1) y lote() saca K valores sin encadenarlos.
+#      s = flujo_de(semilla, "meteoros")
+#      s, x = azar_flujo(s, 0, 759)
+#      s, (x, y, vx, vy) = lote_rangos(s, ((0, 759), (-140, -100), (-3, 3), (1, 4)))
+#    Sub-flujos: flujo_de(s, "oleada") deriva otro independiente de cualquiera.
+# ============================================================================
+
+_M = (1 << 64) - 1
+GAMMA = 0x9E3779B97F4A7C15     # γ de splitmix64 (impar: recorre los 2^64 estados)
+
+
 def siguiente_semilla(semilla: int):
     nueva = (semilla * 1664525 + 1013904223) % 2**32
     return nueva, nueva
 
 def azar_en_rango(semilla: int, a: int, b: int):
     nueva, r = siguiente_semilla(semilla)
-    return nueva, a + (r % (b - a + 1))
\ No newline at end of file
+    return nueva, a + (r % (b - a + 1))
+
+def saltar_semilla(semilla: int, n: int) -> int:
+    """
+    siguiente_semilla aplicada n veces, en O(log n): la función del LCG es
+    afín (s → a·s + c), y componerla consigo misma sigue siendo afín.
+    """
+    a, c = 1664525, 1013904223
+    ta, tc = 1, 0                  # transformación acumulada (identidad)
+    while n > 0:
+        if n & 1:
+            ta, tc = (ta * a) % 2**32, (tc * a + c) % 2**32
+        a, c = (a * a) % 2**32, (c * a + c) % 2**32
+        n >>= 1
+    return (ta * semilla + tc) % 2**32
+
+
+def mezclar64(z: int) -> int:
+    """Finalizador de splitmix64: cualquier bit de entrada afecta a todos los de salida."""
+    z = (z + GAMMA) & _M
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _M
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _M
+    return z ^ (z >> 31)
+
+
+def flujo_de(semilla: int, nombre: str) -> int:
+    """Flujo (contador 0) llamado `nombre`, derivado de `semilla` (u otro flujo)."""
+    return mezclar64((semilla & _M) ^ mezclar64(zlib.crc32(nombre.encode())))
+
+
+def en_rango(r: int, a: int, b: int) -> int:
+    """Valor de 64 bits → entero en [a, b] (multiplicando, sin el sesgo del %)."""
+    return a + (((r >> 32) * (b - a + 1)) >> 32)
+
+
+def sacar(s: int) -> Tuple[int, int]:
+    """(flujo_siguiente, valor de 64 bits)."""
+    return (s + GAMMA) & _M, mezclar64(s)
+
+
+def azar_flujo(s: int, a: int, b: int) -> Tuple[int, int]:
+    """Como azar_en_rango, pero sobre un flujo: (flujo_siguiente, entero en [a, b])."""
+    return (s + GAMMA) & _M, en_rango(mezclar64(s), a, b)
+
+
+def saltar(s: int, n: int) -> int:
+    """El flujo después de n valores (O(1): es sumar n·γ)."""
+    return (s + n * GAMMA) & _M
+
+
+def lote(s: int, k: int, a: int, b: int) -> Tuple[int, Tuple[int, ...]]:
+    """K valores en [a, b] de una (los mismos que K azar_flujo seguidos)."""
+    return saltar(s, k), tuple(en_rango(mezclar64((s + i * GAMMA) & _M), a, b) for i in range(k))
+
+
+def lote_rangos(s: int, rangos: Sequence[Tuple[int, int]]) -> Tuple[int, Tuple[int, ...]]:
+    """Un valor por cada (a, b) de `rangos`, de una (p. ej. x, y, vx, vy de un meteoro)."""
+    return saltar(s, len(rangos)), tuple(en_rango(mezclar64((s + i * GAMMA) & _M), a, b)
+                                         for i, (a, b) in enumerate(rangos))
@@ -0,0 +1,197 @@
+import struct
+from typing import Dict, Optional, Tuple
+from .estados import EstadoJuego
+from .paso import Entrada, paso
+from .zobrist import HuellaIncremental
+
+# ============================================================================
+# rollback.py — Netcode con rollback para el cooperativo (sin sockets)
+# Cada máquina simula la partida COMPLETA: su nave con la entrada local (sin
+# esperar a nadie) y la del compañero PREDICHA (repite su última entrada
+# conocida). Cuando llega la entrada real de un tick ya simulado y no es la
+# que se predijo, se vuelve al estado guardado de ese tick y se re-simula
+# hasta el presente. Como el núcleo es puro e inmutable, “guardar un estado”
+# es guardar una referencia: no se copia nada.
+#   sesion = SesionRollback(inicializar_juego(semilla, cooperativo=True), local=0)
+#   cada frame:  for datos in transporte.recibir(): sesion.recibir(datos)
+#                sesion.avanzar(entrada)          # False = esperando al otro
+#                transporte.enviar(sesion.mensaje())
+# Los bytes viajan por cualquier transporte (ver cascara_imperativa/red.py).
+# Mensaje: b"NR" | ack u32 | primer_tick u32 | n u8 | tick u32 | huella u64
+#          | n bytes (Entrada.bits())
+# Cada mensaje repite TODAS las entradas locales que el otro todavía no
+# confirmó (ack): si se pierde un paquete, el siguiente las trae igual.
+# También lleva la huella (nucleo.zobrist) del último estado confirmado:
+# si la del otro para ese tick no coincide, las simulaciones se separaron.
+# ============================================================================
+
+MAGIA = b"NR"
+_CABECERA = struct.Struct("<2sIIBIQ")
+HUELLAS_GUARDADAS = 128  # huellas confirmadas que se recuerdan para comparar
+VENTANA = 12            # ticks que se puede predecir como mucho (200 ms a 60 FPS)
+MAX_POR_MENSAJE = 255
+
+
+class SesionRollback:
+    """
+    Un extremo de una partida cooperativa.
+    - local: 0 si esta máquina maneja `jugador`, 1 si maneja `jugador2`
+    - ventana: cuántos ticks se puede ir por delante de la última entrada
+      confirmada del otro; más allá avanzar() devuelve False (el bucle
+      sigue dibujando a 60 FPS, solo no simula ese frame)
+    - retardo: ticks de retardo de la entrada local (EL MISMO en los dos
+      extremos); 1-2 ticks evitan casi todos los rollbacks con poca latencia
+    Solo se guardan los estados de la ventana: de `confirmado` a `tick`.
+    """
+
+    def __init__(self, estado: EstadoJuego, local: int = 0, ventana: int = VENTANA,
+                 retardo: int = 0, mascaras=None):
+        if estado.jugador2 is None:
+            raise ValueError("la sesión necesita un estado cooperativo (inicializar_juego(..., cooperativo=True))")
+        if local not in (0, 1):
+            raise ValueError("local tiene que ser 0 (jugador) o 1 (jugador2)")
+        self.estado = estado
+        self.tick = 0                   # ticks simulados: estado = después de `tick` ticks
+        self.local = local
+        self.ventana = ventana
+        self.retardo = retardo
+        self.mascaras = mascaras
+        # Los primeros `retardo` ticks no tienen entrada de nadie: ya están “confirmados”
+        self._locales: Dict[int, int] = {t: 0 for t in range(retardo)}
+        self._remotas: Dict[int, int] = {t: 0 for t in range(retardo)}
+        self.confirmado = retardo       # primer tick cuya entrada remota todavía no llegó
+        self._usadas: Dict[int, int] = {}                    # entrada remota con que se simuló cada tick
+        self._estados: Dict[int, EstadoJuego] = {0: estado}  # estado ANTES de cada tick
+        self._ack_remoto = retardo      # el otro ya tiene nuestras entradas anteriores a esto
+        self._base = 0                  # tick más viejo guardado
+        self._rehacer_desde: Optional[int] = None
+        # Huellas de estados confirmados (para detectar desincronización)
+        self._huellero = HuellaIncremental()
+        self._huellas: Dict[int, int] = {0: self._huellero(estado)}
+        self._ultima_huella = (0, self._huellas[0])
+        self._huella_remota: Optional[Tuple[int, int]] = None   # del otro, para un tick que no llegamos
+        self.desincronizado: Optional[int] = None               # primer tick en que no coincidieron
+        # Estadísticas (para el HUD / pruebas)
+        self.rollbacks = 0
+        self.resimulados = 0
+        self.esperas = 0
+
+    # --- red --------------------------------------------------------------------
+    def mensaje(self) -> bytes:
+        """Bytes a mandar este frame: ack + entradas locales sin confirmar."""
+        primero = self._ack_remoto
+        ultimo = max(primero, min(self.tick + self.retardo, primero + MAX_POR_MENSAJE))
+        bits = bytes(self._locales[t] for t in range(primero, ultimo))
+        return _CABECERA.pack(MAGIA, self.confirmado, primero, len(bits), *self._ultima_huella) + bits
+
+    def recibir(self, datos: bytes):
+        """
+        Procesa un mensaje del otro extremo (en cualquier orden, repetido o
+        no). Si trae una entrada distinta de la que se predijo para un tick ya
+        simulado, el próximo avanzar() re-simula desde ahí.
+        ValueError si no es un mensaje de esta sesión.
+        """
+        if len(datos) < _CABECERA.size:
+            raise ValueError("mensaje truncado")
+        magia, ack, primero, n, tick_huella, huella = _CABECERA.unpack_from(datos)
+        if magia != MAGIA or len(datos) != _CABECERA.size + n:
+            raise ValueError("no es un mensaje de rollback")
+        self._comparar_huella(tick_huella, huella)
+        self._ack_remoto = max(self._ack_remoto, min(ack, self.tick + self.retardo))
+        for k in range(n):
+            t = primero + k
+            if t < self.confirmado or t in self._remotas:
+                continue
+            bits = datos[_CABECERA.size + k] & 7
+            self._remotas[t] = bits
+            if t < self.tick and self._usadas[t] != bits:
+                self._rehacer_desde = t if self._rehacer_desde is None else min(self._rehacer_desde, t)
+        while self.confirmado in self._remotas:
+            self.confirmado += 1
+
+    def _comparar_huella(self, t: int, huella: int):
+        propia = self._huellas.get(t)
+        if propia is not None:
+            if propia != huella and self.desincronizado is None:
+                self.desincronizado = t
+        elif t > self._ultima_huella[0]:
+            self._huella_remota = (t, huella)   # se compara cuando confirmemos ese tick
+
+    # --- simulación -------------------------------------------------------------
+    def _prediccion(self, t: int) -> int:
+        # La real si ya llegó; si no, la última confirmada (“sigue haciendo lo mismo”)
+        bits = self._remotas.get(t)
+        return bits if bits is not None else self._remotas.get(self.confirmado - 1, 0)
+
+    def _simular(self, t: int, estado: EstadoJuego) -> EstadoJuego:
+        remota = self._prediccion(t)
+        self._usadas[t] = remota
+        self._estados[t] = estado
+        local = Entrada.desde_bits(self._locales[t])
+        otra = Entrada.desde_bits(remota)
+        if self.local == 0:
+            return paso(estado, local, self.mascaras, otra)
+        return paso(estado, otra, self.mascaras, local)
+
+    def _resimular(self):
+        t0 = self._rehacer_desde
+        if t0 is None:
+            return
+        self._rehacer_desde = None
+        estado = self._estados[t0]
+        for t in range(t0, self.tick):
+            estado = self._simular(t, estado)
+        self.estado = estado
+        self._estados[self.tick] = estado
+        self.rollbacks += 1
+        self.resimulados += self.tick - t0
+
+    def _recortar(self):
+        # Nunca se vuelve antes del primer tick sin confirmar: lo anterior se tira
+        corte = min(self.confirmado, self.tick)
+        while self._base < corte:
+            t = self._base
+            del self._estados[t]
+            self._usadas.pop(t, None)
+            if t < self.confirmado - 1:
+                self._remotas.pop(t, None)
+            if t < self._ack_remoto:
+                self._locales.pop(t, None)
+            self._base += 1
+        # El estado en `corte` ya es definitivo: su huella va en los mensajes
+        if corte > self._ultima_huella[0]:
+            h = self._huellero(self._estados[corte])
+            self._huellas[corte] = h
+            self._huellas.pop(corte - HUELLAS_GUARDADAS, None)
+            self._ultima_huella = (corte, h)
+            remota = self._huella_remota
+            if remota is not None and remota[0] <= corte:
+                self._huella_remota = None
+                self._comparar_huella(*remota)
+
+    def avanzar(self, entrada: Entrada) -> bool:
+        """
+        Simula UN tick con la entrada local. Aplica antes los rollbacks
+        pendientes. Devuelve False (sin simular ni guardar la entrada) si ya
+        vamos `ventana` ticks por delante de lo que confirmó el otro.
+        """
+        self._resimular()
+        if self.tick - self.confirmado >= self.ventana:
+            self.esperas += 1
+            return False
+        self._locales[self.tick + self.retardo] = entrada.bits()
+        self.estado = self._simular(self.tick, self.estado)
+        self.tick += 1
+        self._estados[self.tick] = self.estado
+        self._recortar()
+        return True
+
+    def estado_confirmado(self) -> Tuple[int, EstadoJuego]:
+        """
+        (tick, estado) más reciente que ya no puede cambiar: simulado solo con
+        entradas reales de los dos. Es el que conviene para decidir el fin de
+        la partida o comparar entre máquinas.
+        """
+        self._resimular()
+        t = min(self.confirmado, self.tick)
+        return t, self._estados[t]
@@ -0,0 +1,81 @@
+import argparse
+import sys
+import time
+from typing import Iterator
+from .flujo import inicializar_juego
+from .paso import Entrada, paso
+from .rng import siguiente_semilla
+
+# ============================================================================
+# sim.py — Simulación headless del núcleo (sin pygame, sin ventana)
+# Uso:  python -m nucleo.sim --ticks 100000 --partidas 4 --entrada azar
+# Corre paso() en un bucle cerrado con entradas generadas y reporta
+# ticks por segundo: sirve como prueba de carga del núcleo puro.
+# Si el jugador muere, arranca otra partida (misma semilla + número de vida).
+# ============================================================================
+
+
+def entradas(politica: str, semilla: int) -> Iterator[Entrada]:
+    """
+    Genera entradas infinitas y deterministas:
+    - "quieto": no hace nada
+    - "zigzag": va y viene cada 90 ticks disparando siempre
+    - "azar":   bits al azar con el mismo LCG del núcleo (reproducible)
+    """
+    t = 0
+    s = semilla
+    while True:
+        if politica == "quieto":
+            yield Entrada()
+        elif politica == "zigzag":
+            yield Entrada.desde_bits((1 if (t // 90) % 2 else 2) | 4)
+        else:
+            s, r = siguiente_semilla(s)
+            yield Entrada.desde_bits(r >> 29)   # los 3 bits altos (los bajos del LCG son pobres)
+        t += 1
+
+
+def simular(ticks: int, semilla: int = 42, politica: str = "azar"):
+    """
+    Corre `ticks` pasos y devuelve (estado_final, resumen) donde resumen
+    cuenta vidas usadas, puntaje máximo y modos visitados.
+    """
+    estado = inicializar_juego(semilla)
+    fuente = entradas(politica, semilla)
+    vidas, maximo, modos = 1, 0, {estado.modo}
+    for _ in range(ticks):
+        estado = paso(estado, next(fuente))
+        modos.add(estado.modo)
+        if not estado.jugador.vivo:
+            maximo = max(maximo, estado.puntaje)
+            estado = inicializar_juego(semilla + vidas)
+            vidas += 1
+    maximo = max(maximo, estado.puntaje)
+    return estado, {"vidas": vidas, "puntaje_max": maximo, "modos": sorted(m.value for m in modos)}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m nucleo.sim", description="Simulación headless del núcleo")
+    ap.add_argument("--ticks", type=int, default=20_000, help="ticks por partida (60 = 1 s de juego)")
+    ap.add_argument("--partidas", type=int, default=1, help="partidas independientes (semillas seguidas)")
+    ap.add_argument("--semilla", type=int, default=42)
+    ap.add_argument("--entrada", choices=("azar", "zigzag", "quieto"), default="azar")
+    args = ap.parse_args(argv)
+
+    total = 0
+    t0 = time.perf_counter()
+    for k in range(args.partidas):
+        estado, resumen = simular(args.ticks, args.semilla + 1000 * k, args.entrada)
+        total += args.ticks
+        print(f"partida {k}: modo={estado.modo.value} puntaje={estado.puntaje} "
+              f"vidas={resumen['vidas']} max={resumen['puntaje_max']} modos={','.join(resumen['modos'])}")
+    dt = time.perf_counter() - t0
+    print(f"{total} ticks en {dt:.2f} s → {total / dt:,.0f} ticks/s "
+          f"({total / dt / 60:,.1f}x tiempo real)")
+    if "pygame" in sys.modules:
+        print("aviso: pygame quedó importado (el núcleo no debería necesitarlo)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
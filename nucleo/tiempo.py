@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from .estados import EstadoJuego
+
+# ============================================================================
+# tiempo.py — Paso de tiempo fijo + interpolación para dibujar
+# El núcleo avanza de a ticks FIJOS (las velocidades son “por tick”), pero
+# la pantalla puede ir a 30, 60, 144 o 240 FPS. El bucle acumula el tiempo
+# real de cada frame y corre tantos ticks como entren:
+#   acum, n = acumular(acum, dt)      # n ticks de 1/hz segundos (puede ser 0)
+#   ...n veces paso(...)...
+#   dibujar(interpolar(anterior, estado, acum.alfa))
+# - Si un frame tarda mucho, se ponen al día hasta `max_pasos` ticks; lo
+#   que sobra se TIRA (el juego se frena un instante en vez de entrar en la
+#   “espiral de la muerte”: cada vez más ticks por frame, cada vez más lento)
+# - alfa ∈ [0, 1) dice cuánto del próximo tick ya pasó: se dibuja entre el
+#   estado anterior y el actual (un tick de retraso, pero sin saltos)
+# ============================================================================
+
+
+@dataclass(frozen=True, slots=True)
+class Acumulador:
+    """
+    Tiempo real todavía no simulado. hz = ticks por segundo del núcleo
+    (60: las velocidades del juego están pensadas así); max_pasos = tope
+    de ticks por frame para ponerse al día.
+    """
+    hz: int = 60
+    max_pasos: int = 6      # ~100 ms a 60 Hz
+    resto: float = 0.0
+
+    @property
+    def paso(self) -> float:
+        return 1.0 / self.hz
+
+    @property
+    def alfa(self) -> float:
+        """Fracción del próximo tick ya transcurrida (para interpolar)."""
+        return min(1.0, self.resto * self.hz)
+
+
+def acumular(acum: Acumulador, dt: float) -> Tuple[Acumulador, int]:
+    """
+    Suma `dt` segundos y devuelve (acumulador_nuevo, ticks_a_correr).
+    Nunca devuelve más de max_pasos; en ese caso descarta el tiempo de más.
+    """
+    resto = acum.resto + max(0.0, dt)
+    n = int(resto * acum.hz)
+    if n > acum.max_pasos:
+        n, resto = acum.max_pasos, 0.0
+    else:
+        resto -= n / acum.hz
+    return Acumulador(acum.hz, acum.max_pasos, max(0.0, resto)), n
+
+
+def _entre(a: int, b: int, alfa: float) -> int:
+    return round(a + (b - a) * alfa)
+
+
+def interpolar(anterior: Optional[EstadoJuego], actual: EstadoJuego, alfa: float) -> EstadoJuego:
+    """
+    Estado SOLO PARA DIBUJAR, con las posiciones a `alfa` entre `anterior` y
+    `actual` (alfa 0 → como anterior, 1 → actual). No se vuelve a simular.
+    - proyectiles y meteoros: su posición de antes es la actual menos su
+      velocidad (no hace falta emparejarlos entre estados)
+    - cortina del jefe: sus balas, `1 - alfa` ticks atrás en su curva
+    - naves, jefe y enemigos: entre su posición anterior y la actual (los
+      enemigos por índice, solo si no cambió la cantidad)
+    - explosiones y todo lo demás: como en `actual`
+    """
+    if anterior is None or alfa >= 1.0:
+        return actual
+    atras = 1.0 - alfa
+    bonus = actual.ia.meteor_bonus
+    cambios = {
+        "meteoros": tuple(m.con(x=round(m.x - m.velocidad_x * atras),
+                                y=round(m.y - (m.velocidad_y + bonus) * atras)) for m in actual.meteoros),
+        "balas": tuple(b.con_y(round(b.y - b.velocidad_y * atras)) for b in actual.balas),
+        "balas_enemigas": tuple(b.con(x=round(b.x - b.velocidad_x * atras), y=round(b.y - b.velocidad_y * atras))
+                                for b in actual.balas_enemigas),
+        "jugador": actual.jugador.con_x(_entre(anterior.jugador.x, actual.jugador.x, alfa)),
+    }
+    if actual.jugador2 is not None and anterior.jugador2 is not None:
+        cambios["jugador2"] = actual.jugador2.con_x(_entre(anterior.jugador2.x, actual.jugador2.x, alfa))
+    if len(actual.enemigos) == len(anterior.enemigos):
+        cambios["enemigos"] = tuple(e.con(x=_entre(p.x, e.x, alfa), y=_entre(p.y, e.y, alfa))
+                                    for p, e in zip(anterior.enemigos, actual.enemigos))
+    if actual.boss is not None and anterior.boss is not None:
+        b, p = actual.boss, anterior.boss
+        cambios["boss"] = b.con(x=_entre(p.x, b.x, alfa), y=_entre(p.y, b.y, alfa))
+    if actual.cortina is not None:
+        cambios["cortina"] = actual.cortina.atrasada(atras)
+    return actual.con(**cambios)
@@ -0,0 +1,87 @@
+from typing import Sequence, Tuple
+
+# ============================================================================
+# vectorizado.py — Núcleo de colisiones AABB con NumPy (OPCIONAL)
+# El núcleo sigue funcionando solo con la librería estándar: si NumPy no
+# está instalado, disponible() devuelve False y se usa la rejilla escalar.
+# Con escenas grandes (cientos de balas en la pelea del jefe) empaquetamos
+# las coordenadas en arreglos y calculamos TODA la matriz de impactos de una.
+# ============================================================================
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+
+# A partir de cuántos pares A×B compensa pagar la conversión a arreglos.
+# Por debajo, la rejilla de broadphase.py es más rápida (escenas chicas).
+UMBRAL_PARES = 512
+
+Rect = Tuple[int, int, int, int]
+
+
+def disponible() -> bool:
+    """True si NumPy está instalado y se puede usar el camino vectorizado."""
+    return np is not None
+
+
+def conviene(n_a: int, n_b: int) -> bool:
+    """Selección automática: solo vectorizamos si hay NumPy y suficientes pares."""
+    return np is not None and n_a * n_b >= UMBRAL_PARES
+
+
+def _columnas(rects: Sequence[Rect]):
+    """Empaqueta una secuencia de (x, y, w, h) en cuatro columnas int64."""
+    arr = np.asarray(rects, dtype=np.int64).reshape(-1, 4)
+    return arr[:, 0], arr[:, 1], arr[:, 2], arr[:, 3]
+
+
+def matriz_impactos(rects_a: Sequence[Rect], rects_b: Sequence[Rect]):
+    """
+    Matriz booleana (len(A) × len(B)) con la misma regla que _rects_collide:
+    M[i, j] es True si A[i] y B[j] se traslapan. Se calcula con broadcasting.
+    """
+    ax, ay, aw, ah = _columnas(rects_a)
+    bx, by, bw, bh = _columnas(rects_b)
+    ax, ay, aw, ah = ax[:, None], ay[:, None], aw[:, None], ah[:, None]
+    return (ax < bx + bw) & (ax + aw > bx) & (ay < by + bh) & (ay + ah > by)
+
+
+def pares_en_colision_np(rects_a: Sequence[Rect], rects_b: Sequence[Rect]) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Misma salida que broadphase.pares_en_colision: para cada A, los índices
+    de B que choca, en orden ascendente (así el “primer impacto gana” de los
+    bucles con break se respeta igual que en el camino escalar).
+    """
+    n_a = len(rects_a)
+    if n_a == 0 or len(rects_b) == 0:
+        return ((),) * n_a
+    filas, cols = np.nonzero(matriz_impactos(rects_a, rects_b))  # orden fila-mayor
+    res = [()] * n_a
+    if len(filas):
+        cortes = np.flatnonzero(np.diff(filas)) + 1
+        for grupo_f, grupo_c in zip(np.split(filas, cortes), np.split(cols, cortes)):
+            res[int(grupo_f[0])] = tuple(grupo_c.tolist())
+    return tuple(res)
+
+
+def primer_impacto(rects_a: Sequence[Rect], rects_b: Sequence[Rect], elegibles: Sequence[bool]) -> Tuple[int, ...]:
+    """
+    Resuelve “primer impacto gana” igual que el bucle original con break:
+    cada A (en orden) se queda con el PRIMER B elegible que toca, y ese B
+    deja de ser elegible para las A siguientes. Devuelve el índice de B
+    (o -1) por cada A. Solo iteramos las filas que tienen algún impacto.
+    """
+    n_a = len(rects_a)
+    if n_a == 0 or len(rects_b) == 0:
+        return (-1,) * n_a
+    libres = np.asarray(elegibles, dtype=bool).copy()
+    m = matriz_impactos(rects_a, rects_b)
+    res = [-1] * n_a
+    for i in np.flatnonzero(m.any(axis=1)).tolist():
+        cand = np.flatnonzero(m[i] & libres)
+        if len(cand):
+            j = int(cand[0])
+            res[i] = j
+            libres[j] = False
+    return tuple(res)
@@ -0,0 +1,221 @@
+import struct
+import zlib
+from typing import List
+from .codec import ESQUEMAS, _JUEGO, _VALORES, _MODOS, _EVENTOS, _bytes_le
+from .rng import mezclar64 as _mezclar
+
+# ============================================================================
+# zobrist.py — Huella de 64 bits de EstadoJuego, incremental por tick
+# Para detectar desincronizaciones (repeticiones, red), fijar “trazas
+# doradas” en los tests (“en el tick 2000 la huella es X”) y como clave de
+# caché para bots que buscan jugadas.
+# Estilo Zobrist: cada campo de EstadoJuego aporta un valor MEZCLADO y la
+# huella es el XOR de todos; si un campo cambia se saca su aporte viejo y
+# se pone el nuevo (dos XOR). Saber QUÉ cambió es gratis: el núcleo es
+# inmutable, lo que no cambió es el MISMO objeto (`is`). Una secuencia
+# aporta la SUMA (mod 2^64) de la huella mezclada de cada entidad, más su
+# largo: las que se fueron se restan, las nuevas se suman y las que siguen
+# ahí (en cualquier posición) no se tocan. Qué cambió se encuentra
+# comparando la tupla con la del tick anterior por tramos (rebanadas, en C);
+# la huella de una entidad (lo caro, en Python) es solo para las nuevas.
+# Por eso la huella de una secuencia no depende del orden de sus entidades.
+#   h = HuellaIncremental()
+#   for ...: estado = paso(...); clave = h(estado)
+# huella_estado(estado) calcula una sola vez (mismo valor, sin historia).
+# ============================================================================
+
+_M = (1 << 64) - 1
+_P = 0x100000001B3          # primo de FNV-64: combina secuencias respetando el orden
+_DOBLE, _Q = struct.Struct("<d"), struct.Struct("<Q")
+
+
+def _clave(nombre: str) -> int:
+    """Clave fija (impar) de 64 bits para un campo: no depende del proceso ni de la plataforma."""
+    return _mezclar(zlib.crc32(nombre.encode())) | 1
+
+
+def _bits(v: float) -> int:
+    return _Q.unpack(_DOBLE.pack(v))[0]
+
+
+def _huella_tupla(t) -> int:
+    acc = len(t)
+    for v in t:
+        acc = (acc * _P + v) & _M
+    return acc
+
+
+def _generar(cls, esquema: str):
+    """
+    Huella de UNA entidad: suma de valor × clave por campo (mod 2^64),
+    generada con exec como los codificadores de codec.py. Las mezclas
+    caras quedan para el nivel de arriba.
+    """
+    partes = []
+    ns = {"_bits": _bits, "_tupla": _huella_tupla}
+    for campo in esquema.split():
+        n, t = campo.split(":")
+        k = _clave(f"{cls.__name__}.{n}")
+        if t == "f":
+            partes.append(f"_bits(o.{n}) * {k}")
+        elif t == "e":
+            ns[f"_idx_{n}"] = {v: i + 1 for i, v in enumerate(_VALORES[n])}
+            partes.append(f"_idx_{n}[o.{n}] * {k}")
+        elif t == "t":
+            partes.append(f"_tupla(o.{n}) * {k}")
+        else:   # enteros y booleanos (bool es int)
+            partes.append(f"o.{n} * {k}")
+    base = _clave(cls.__name__)
+    # Sin recortar a 64 bits acá: lo hace quien la combina
+    exec(f"def h(o):\n    return {' + '.join(partes)} + {base}\n", ns)
+    return ns["h"]
+
+
+_H = {cls: _generar(cls, esq) for cls, esq in ESQUEMAS.items()}
+_CLAVES = tuple(_clave(f"EstadoJuego.{c}") for c, _, _ in _JUEGO)
+_NINGUNO = _clave("None")
+_LARGO = _clave("largo")
+
+
+def _huella_eventos(eventos) -> int:
+    acc = len(eventos)
+    for ev in eventos:
+        acc = (acc * _P + _EVENTOS.index(ev.tipo) + 1) & _M
+        for x in ev.detalle:
+            v = x if isinstance(x, int) else zlib.crc32(str(x).encode("utf-8")) + (1 << 40)
+            acc = (acc * _P + v) & _M
+    return acc
+
+
+def _huella_cortina(c) -> int:
+    """Cortina del jefe: tick + CRC de cada columna (sus bytes little endian)."""
+    acc = (c.tick * _P + len(c)) & _M
+    for col in c.columnas():
+        acc = (acc * _P + zlib.crc32(_bytes_le(col))) & _M
+    return acc
+
+
+def _comun(a, i: int, b, j: int) -> int:
+    """
+    Largo del tramo igual desde a[i] y b[j]. Compara rebanadas (el bucle
+    queda en C y casi siempre son los mismos objetos): primero todo el
+    resto, si no galopando y después bisección. Antes de cada rebanada se
+    mira si su ÚLTIMO elemento es el mismo objeto: si no, ni se compara
+    (así casi nunca se llega al __eq__ de las entidades).
+    """
+    n = min(len(a) - i, len(b) - j)
+    if n == 0 or a[i] is not b[j]:
+        return 0
+    if a[i + n - 1] is b[j + n - 1] and a[i:i + n] == b[j:j + n]:
+        return n
+    lo, hi, salto = 1, n, 2
+    while lo + salto < hi:
+        fin = lo + salto
+        if a[i + fin - 1] is not b[j + fin - 1] or a[i + lo:i + fin] != b[j + lo:j + fin]:
+            hi = fin
+            break
+        lo = fin
+        salto *= 2
+    while hi - lo > 1:
+        medio = (lo + hi) // 2
+        if a[i + medio - 1] is b[j + medio - 1] and a[i + lo:i + medio] == b[j + lo:j + medio]:
+            lo = medio
+        else:
+            hi = medio
+    return lo
+
+
+def _alinear(previas, hs: List[int], suma: int, elems, h):
+    """
+    Pasa de `previas` (con sus huellas mezcladas `hs` y su suma) a `elems`:
+    recorre los tramos en común, resta las que se fueron y suma las nuevas.
+    → (huellas de elems, suma). Solo se calcula la huella de lo nuevo.
+    """
+    n, m = len(previas), len(elems)
+    nuevas: List[int] = []
+    i = j = 0
+    posicion = None                      # id → índice en previas (solo si hace falta)
+    while i < n and j < m:
+        x = elems[j]
+        if previas[i] is x:
+            c = _comun(previas, i, elems, j)
+            nuevas += hs[i:i + c]
+            i += c
+            j += c
+            continue
+        if posicion is None:
+            for d in range(i + 1, min(n, i + 9)):      # ¿se fueron unas pocas?
+                if previas[d] is x:
+                    break
+            else:
+                posicion = {id(e): p for p, e in enumerate(previas)}
+                d = posicion.get(id(x), -1)
+        else:
+            d = posicion.get(id(x), -1)
+        if d > i:                        # previas[i:d] se fueron
+            suma -= sum(hs[i:d])
+            i = d
+        else:                            # x es nueva
+            v = _mezclar(h(x) & _M)
+            nuevas.append(v)
+            suma += v
+            j += 1
+    suma -= sum(hs[i:])
+    for x in elems[j:]:
+        v = _mezclar(h(x) & _M)
+        nuevas.append(v)
+        suma += v
+    return nuevas, suma & _M
+
+
+class HuellaIncremental:
+    """
+    Calculadora de huellas que recuerda el estado anterior: llamarla con
+    los estados de una partida EN ORDEN (o con cualquier estado: si no
+    comparte nada con el anterior simplemente calcula todo).
+    """
+    __slots__ = ("_anterior", "_aportes", "_secuencias", "_total")
+
+    def __init__(self):
+        self._anterior = None
+        self._aportes: List[int] = [0] * len(_JUEGO)      # aporte YA mezclado de cada campo
+        self._secuencias = [((), [], 0)] * len(_JUEGO)    # (entidades, huellas mezcladas, suma) del tick anterior
+        self._total = 0
+
+    def _valor(self, k: int, tipo: str, cls, valor) -> int:
+        if tipo == "seq":
+            elems = valor if type(valor) is tuple else tuple(valor)
+            previas, hs, suma = self._secuencias[k]
+            hs, suma = _alinear(previas, hs, suma, elems, _H[cls])
+            self._secuencias[k] = (elems, hs, suma)
+            return (suma + len(elems) * _LARGO) & _M
+        if tipo == "obj":
+            return _H[cls](valor) & _M
+        if tipo == "opcional":
+            return _NINGUNO if valor is None else _H[cls](valor) & _M
+        if tipo == "modo":
+            return _MODOS.index(valor)
+        if tipo == "eventos":
+            return _huella_eventos(valor)
+        if tipo == "cortina":
+            return _NINGUNO if valor is None else _huella_cortina(valor)
+        return valor & _M   # int
+
+    def __call__(self, estado) -> int:
+        anterior = self._anterior
+        total = self._total
+        for k, (campo, tipo, cls) in enumerate(_JUEGO):
+            valor = getattr(estado, campo)
+            if anterior is not None and valor is getattr(anterior, campo):
+                continue
+            nuevo = _mezclar(self._valor(k, tipo, cls, valor) ^ _CLAVES[k])
+            total ^= self._aportes[k] ^ nuevo
+            self._aportes[k] = nuevo
+        self._anterior = estado
+        self._total = total
+        return total
+
+
+def huella_estado(estado) -> int:
+    """Huella de 64 bits de un estado suelto (igual a la de HuellaIncremental)."""
+    return HuellaIncremental()(estado)
@@ -16,7 +16,7 @@ from nucleo.constantes import (
 
 from nucleo.enums_eventos import ModoJuego, EventoTipo
 from nucleo.geom import _rects_collide, _clamp
-from nucleo.rng import siguiente_semilla, azar_en_rango
+from nucleo.rng import siguiente_semilla, azar_en_rango, azar_flujo
 
 from nucleo.estados import (
     EstadoJugador, EstadoMeteoro, EstadoBala,
@@ -277,3 +277,1080 @@ def test_logica_juego_transiciones_sin_romper():
     e_alto = replace(e, puntaje=1000)
     e3 = logica_juego(e_alto)
     assert e3.modo in (ModoJuego.ENEMIGOS, ModoJuego.MIXTO, ModoJuego.JEFE)
+
+
+# -----------------------------
+# Broadphase (rejilla uniforme)
+# -----------------------------
+from nucleo.broadphase import construir_rejilla, consultar, pares_en_colision
+
+def _rects_azar(semilla, n, w, h):
+    rects, s = [], semilla
+    for _ in range(n):
+        s, x = azar_en_rango(s, -60, ANCHO + 20)
+        s, y = azar_en_rango(s, -160, ALTO + 20)
+        rects.append((x, y, w, h))
+    return tuple(rects), s
+
+def test_rejilla_igual_a_fuerza_bruta():
+    metas, s = _rects_azar(7, 60, 50, 50)
+    balas, _ = _rects_azar(s, 120, BULLET_W, BULLET_H)
+    rejilla = construir_rejilla(metas)
+    pares = pares_en_colision(balas, rejilla)
+    for b, hits in zip(balas, pares):
+        esperado = tuple(i for i, m in enumerate(metas) if _rects_collide(*b, *m))
+        assert hits == esperado
+
+def test_rejilla_rect_grande_cruza_celdas():
+    rejilla = construir_rejilla(((0, 0, 10, 10), (350, 250, BOSS_W, BOSS_H)))
+    # un punto en la esquina opuesta del jefe cae en otra celda pero choca igual
+    assert consultar(rejilla, 350 + BOSS_W - 5, 250 + BOSS_H - 5, 5, 5) == (1,)
+    assert consultar(rejilla, 20, 20, 5, 5) == ()
+
+def test_colisiones_con_rejilla_primer_impacto_gana():
+    # dos enemigos solapados: la bala se la lleva el de menor índice
+    e1 = EstadoEnemigo(100, 100, 0, 1, spawn_protect=0, entrando=False)
+    e2 = EstadoEnemigo(110, 100, 0, 1, spawn_protect=0, entrando=False)
+    e = replace(_estado_basico(), enemigos=(e1, e2), balas=(EstadoBala(115, 110),), modo=ModoJuego.ENEMIGOS)
+    e2_ = detectar_colisiones_enemigo(e)
+    assert e2_.enemigos[0].explotando and e2_.enemigos[1].vivo
+    assert e2_.balas == tuple() and e2_.puntaje == 50
+
+
+# -----------------------------
+# Kernel NumPy (opcional)
+# -----------------------------
+from nucleo import vectorizado
+from nucleo.broadphase import pares
+
+def test_pares_numpy_igual_a_rejilla():
+    pytest.importorskip("numpy")
+    metas, s = _rects_azar(11, 40, 50, 50)
+    balas, _ = _rects_azar(s, 300, BULLET_W, BULLET_H)
+    assert vectorizado.pares_en_colision_np(balas, metas) == pares_en_colision(balas, construir_rejilla(metas))
+
+def test_primer_impacto_numpy_respeta_break():
+    pytest.importorskip("numpy")
+    enemigos = ((100, 100, 60, 60), (110, 100, 60, 60), (400, 100, 60, 60))
+    balas = ((115, 110, 10, 25), (120, 110, 10, 25), (125, 110, 10, 25), (410, 110, 10, 25))
+    # la 1ª bala se lleva al enemigo 0, la 2ª al 1, la 3ª ya no encuentra a nadie
+    assert vectorizado.primer_impacto(balas, enemigos, (True, True, True)) == (0, 1, -1, 2)
+    assert vectorizado.primer_impacto(balas, enemigos, (False, True, True)) == (1, -1, -1, 2)
+
+def test_colisiones_sin_numpy_usan_camino_escalar(monkeypatch):
+    monkeypatch.setattr(vectorizado, "np", None)
+    assert not vectorizado.conviene(10_000, 10_000)
+    metas, s = _rects_azar(3, 20, 50, 50)
+    balas, _ = _rects_azar(s, 50, BULLET_W, BULLET_H)
+    assert pares(balas, metas) == pares_en_colision(balas, construir_rejilla(metas))
+
+
+# -----------------------------
+# Colisión barrida (continua)
+# -----------------------------
+from nucleo.geom import _swept_collide
+
+def test_swept_collide_detecta_tunel():
+    # bala 10×25 que en un tick salta de y=140 a y=40 sobre un objetivo en y=100..150
+    assert not _rects_collide(100, 40, 10, 25, 100, 100, 50, 50)
+    assert _swept_collide(100, 140, 100, 40, 10, 25, 100, 100, 50, 50)
+    # sin movimiento equivale al AABB discreto
+    assert _swept_collide(0, 0, 0, 0, 10, 10, 5, 5, 10, 10)
+    assert not _swept_collide(0, 0, 0, 0, 10, 10, 11, 0, 10, 10)
+
+def test_swept_collide_diagonal_que_pasa_de_largo():
+    # la caja envolvente toca la esquina pero la trayectoria real no
+    assert not _swept_collide(0, 0, 100, 100, 10, 10, 80, 0, 20, 20)
+
+def test_macro_paso_con_barrido_no_pierde_impactos():
+    m = EstadoMeteoro(100, 100, 0, 0, ancho=50, alto=50)
+    balas = actualizar_balas((EstadoBala(100, 140),), pasos=10)
+    assert balas[0].y == 40
+    e = replace(_estado_basico(), meteoros=(m,), balas=balas)
+    assert len(detectar_colisiones(e).meteoros) == 1            # discreto: se lo salta
+    e2 = detectar_colisiones(e, pasos_barrido=10)
+    assert len(e2.meteoros) == 0 and len(e2.balas) == 0 and e2.puntaje == 10
+
+def test_barrido_balas_enemigas_y_jefe():
+    j = EstadoJugador(100, 500, 7, True, 0)
+    be = actualizar_balas_enemigas((EstadoBalaEnemiga(x=110, y=420, velocidad_y=40),), pasos=4)
+    e = replace(_estado_basico(), jugador=j, balas_enemigas=be, modo=ModoJuego.ENEMIGOS)
+    assert detectar_colisiones_enemigo(e).jugador.corazones == 7
+    assert detectar_colisiones_enemigo(e, pasos_barrido=4).jugador.corazones == 6
+    boss = EstadoBoss(x=100, y=100, vida=20, vivo=True, entrando=False)
+    e = replace(_estado_basico(), boss=boss, balas=(EstadoBala(120, 40, velocidad_y=-100),), modo=ModoJuego.JEFE)
+    assert detectar_colisiones_jefe(e).boss.vida == 20
+    assert detectar_colisiones_jefe(e, pasos_barrido=1).boss.vida == 10
+
+
+def test_paso_barre_el_recorrido_del_tick():
+    # Una bala enemiga que en un tick salta por encima de la nave igual la toca
+    j = EstadoJugador(100, 500, 7, True, 0)
+    be = (EstadoBalaEnemiga(x=120, y=440, velocidad_y=150),)
+    e = replace(_estado_basico(), jugador=j, balas_enemigas=be, modo=ModoJuego.ENEMIGOS)
+    assert detectar_colisiones_enemigo(replace(e, balas_enemigas=actualizar_balas_enemigas(be))).jugador.corazones == 7
+    assert paso(e, NADA).jugador.corazones == 6
+
+# -----------------------------
+# Hitboxes por máscara de bits
+# -----------------------------
+from nucleo.mascaras import empaquetar_filas, mascara_llena, _mascaras_collide
+
+def _mascara_circulo(d):
+    r = d / 2
+    return empaquetar_filas([[(x + .5 - r) ** 2 + (y + .5 - r) ** 2 <= r * r for x in range(d)] for y in range(d)])
+
+def test_empaquetar_filas_bits():
+    m = empaquetar_filas([[True, False, True], [False, False, False]])
+    assert (m.ancho, m.alto, m.filas) == (3, 2, (0b101, 0))
+    assert mascara_llena(3, 2).filas == (0b111, 0b111)
+
+def test_mascaras_collide_con_desplazamiento():
+    punto = empaquetar_filas([[True]])
+    m = empaquetar_filas([[False, True], [False, False]])
+    assert _mascaras_collide(m, 10, 10, punto, 11, 10)
+    assert not _mascaras_collide(m, 10, 10, punto, 10, 10)
+    assert _mascaras_collide(punto, 11, 10, m, 10, 10)   # dx negativo
+
+def test_meteoro_redondo_no_golpea_en_la_esquina():
+    m = EstadoMeteoro(100, 100, 0, 0, ancho=50, alto=50)
+    b = EstadoBala(92, 80)   # roza la esquina superior izquierda del AABB
+    e = replace(_estado_basico(), meteoros=(m,), balas=(b,))
+    mascaras = {"meteoro": _mascara_circulo(50)}
+    assert len(detectar_colisiones(e).meteoros) == 0
+    assert len(detectar_colisiones(e, mascaras=mascaras).meteoros) == 1
+    centro = replace(e, balas=(EstadoBala(120, 110),))
+    assert len(detectar_colisiones(centro, mascaras=mascaras).meteoros) == 0
+
+def test_mascara_de_otro_tamano_usa_rectangulo():
+    boss = EstadoBoss(x=100, y=100, vida=20, vivo=True, entrando=False)
+    e = replace(_estado_basico(), boss=boss, balas=(EstadoBala(100, 100),), modo=ModoJuego.JEFE)
+    chica = empaquetar_filas([[False]])
+    assert detectar_colisiones_jefe(e, mascaras={"jefe": chica}).boss.vida == 10
+
+
+# -----------------------------
+# Etapa única de colisiones (tabla de capas)
+# -----------------------------
+from nucleo.colisiones import resolver_colisiones
+
+def test_resolver_colisiones_invul_una_sola_vez():
+    e = replace(_estado_basico(), jugador=EstadoJugador(100, 500, 7, True, 10), modo=ModoJuego.MIXTO)
+    # antes: detectar_colisiones_enemigo + detectar_colisiones descontaban 2 frames
+    assert detectar_colisiones(detectar_colisiones_enemigo(e)).jugador.invul_frames == 8
+    assert resolver_colisiones(e).jugador.invul_frames == 9
+
+def test_resolver_colisiones_una_pasada_todas_las_capas():
+    j = EstadoJugador(100, 500, 7, True, 0)
+    ene = EstadoEnemigo(300, 100, 0, 1, spawn_protect=0, entrando=False)
+    m = EstadoMeteoro(500, 100, 0, 0)
+    boss = EstadoBoss(x=600, y=300, vida=20, vivo=True, entrando=False)
+    balas = (EstadoBala(305, 110), EstadoBala(505, 110), EstadoBala(610, 310))
+    e = replace(_estado_basico(), jugador=j, enemigos=(ene,), meteoros=(m,), boss=boss, balas=balas,
+                balas_enemigas=(EstadoBalaEnemiga(x=110, y=510),), modo=ModoJuego.JEFE)
+    e2 = resolver_colisiones(e)
+    assert e2.balas == tuple() and e2.meteoros == tuple() and e2.balas_enemigas == tuple()
+    assert e2.enemigos[0].explotando and e2.boss.vida == 10
+    assert e2.puntaje == 60 and e2.jugador.corazones == 6
+
+def test_resolver_colisiones_orden_de_capas_es_prioridad():
+    # una bala sobre un enemigo y un meteoro a la vez: la primera capa se la queda
+    ene = EstadoEnemigo(100, 100, 0, 1, spawn_protect=0, entrando=False)
+    m = EstadoMeteoro(100, 100, 0, 0)
+    e = replace(_estado_basico(), enemigos=(ene,), meteoros=(m,), balas=(EstadoBala(105, 105),))
+    assert resolver_colisiones(e).puntaje == 50
+    al_reves = (("balas", "meteoros"), ("balas", "enemigos"))
+    assert resolver_colisiones(e, capas=al_reves).puntaje == 10
+    with pytest.raises(ValueError):
+        resolver_colisiones(e, capas=(("meteoros", "boss"),))
+
+
+# -----------------------------
+# Slots + atajos .con / .con_<campo>
+# -----------------------------
+from dataclasses import FrozenInstanceError, fields as _campos
+
+def test_con_equivale_a_replace_en_todas_las_clases():
+    e = inicializar_juego(semilla=3)
+    muestras = (e, e.jugador, e.meteoros[0], e.ia, EstadoBala(1, 2), EstadoBalaEnemiga(3, 4),
+                EstadoEnemigo(1, 2, 3, 1), crear_jefe(), EstadoExplosion(1, 2, "enemy"))
+    for obj in muestras:
+        primero = _campos(obj)[0].name
+        assert obj.con(**{primero: 7}) == replace(obj, **{primero: 7})
+        assert getattr(obj, "con_" + primero)(7) == replace(obj, **{primero: 7})
+        assert obj.con() == obj and obj.con() is not obj
+
+def test_estados_tienen_slots_y_siguen_inmutables():
+    j = EstadoJugador(1, 2, 3, True)
+    assert not hasattr(j, "__dict__")
+    for cls in (EstadoJugador, EstadoMeteoro, EstadoBala, EstadoBalaEnemiga, EstadoEnemigo,
+                EstadoBoss, EstadoExplosion, EstadoIA, EstadoJuego):
+        assert "__slots__" in vars(cls)
+    with pytest.raises(FrozenInstanceError):
+        j.x = 5
+    j2 = j.con_invul_frames(9)
+    assert j.invul_frames == 0 and j2.invul_frames == 9
+
+def test_con_rechaza_campos_desconocidos():
+    with pytest.raises(TypeError):
+        EstadoJugador(1, 2, 3, True).con(velocidad=4)
+    with pytest.raises(TypeError):
+        EstadoJugador(1, 2, 3, True).con(5)        # solo por nombre, como replace
+
+# -----------------------------
+# Edición transitoria (editar / congelar)
+# -----------------------------
+from nucleo.edicion import editar
+
+def _tick_meteoritos(e):
+    e = resolver_colisiones(e)
+    e = reponer_meteoros(e)
+    return logica_juego(avanzar_explosiones(e))
+
+def test_edicion_da_el_mismo_estado_que_la_cadena_pura():
+    e = replace(inicializar_juego(semilla=5), puntaje=290,
+                balas=(EstadoBala(100, 100),), meteoros=(EstadoMeteoro(100, 100, 0, 0),))
+    ed = editar(e)
+    assert _tick_meteoritos(ed) is ed                 # las funciones escriben sobre la edición
+    final = ed.congelar()
+    assert isinstance(final, EstadoJuego) and final == _tick_meteoritos(e)
+    assert final.modo == ModoJuego.ENEMIGOS
+
+def test_edicion_no_toca_el_estado_original():
+    e = inicializar_juego()
+    ed = editar(e).con(puntaje=99).con_balas((EstadoBala(1, 2),))
+    assert e.puntaje == 0 and e.balas == ()
+    assert ed.puntaje == 99 and ed.congelar().balas == (EstadoBala(1, 2),)
+
+def test_edicion_congelada_queda_cerrada():
+    ed = editar(inicializar_juego())
+    ed.congelar()
+    with pytest.raises(RuntimeError):
+        ed.con(puntaje=1)
+    with pytest.raises(RuntimeError):
+        ed.congelar()
+
+# -----------------------------
+# Tick puro: paso(estado, entrada)
+# -----------------------------
+from nucleo.paso import Entrada, paso
+from nucleo.constantes import FIRE_RATE_FRAMES, SPAWN_GRACE_TICKS
+from nucleo.sim import simular
+
+def test_entrada_bits_ida_y_vuelta():
+    for b in range(8):
+        assert Entrada.desde_bits(b).bits() == b
+    assert Entrada(izquierda=True, disparo=True).bits() == 5
+
+def test_paso_cadencia_de_disparo_y_eventos():
+    e = inicializar_juego()
+    fuego = Entrada(disparo=True)
+    e1 = paso(e, fuego)
+    assert len(e1.balas) == 1 and e1.fire_cooldown == FIRE_RATE_FRAMES
+    assert [ev.tipo for ev in e1.eventos] == [EventoTipo.DISPARO]
+    e2 = paso(e1, fuego)                                # en cooldown: no dispara
+    assert len(e2.balas) == 1 and e2.eventos == ()      # y los eventos viejos se descartan
+    for _ in range(FIRE_RATE_FRAMES - 1):
+        e2 = paso(e2, fuego)
+    assert len(e2.balas) == 2
+
+def test_paso_gracia_de_spawn_y_simulacion_determinista():
+    e = inicializar_juego()
+    assert e.gracia_spawn == SPAWN_GRACE_TICKS
+    e = replace(e, meteoros=(EstadoMeteoro(e.jugador.x, e.jugador.y, 0, 0),))
+    for _ in range(5):
+        e = paso(e)
+    assert e.jugador.vivo and e.jugador.corazones == 7 and e.gracia_spawn == SPAWN_GRACE_TICKS - 5
+    assert simular(300, semilla=9) == simular(300, semilla=9)
+
+# -----------------------------
+# Partidas en lote (procesos)
+# -----------------------------
+import json
+from dataclasses import asdict
+from nucleo.lote import ResultadoPartida, jugar_partida, correr_lote, resumir, main as lote_main
+
+def test_lote_partida_determinista_y_con_tope():
+    r = jugar_partida(3, "zigzag", max_ticks=200)
+    assert r == jugar_partida(3, "zigzag", max_ticks=200)
+    assert r.ticks == 200 and r.sobrevivio and r.modo_max == "meteoritos"
+
+def test_lote_en_procesos_da_lo_mismo_que_en_serie():
+    serie = sorted(correr_lote(range(6), "azar", 150, trabajadores=1), key=lambda r: r.semilla)
+    pool = sorted(correr_lote(range(6), "azar", 150, trabajadores=2, tam_tanda=2), key=lambda r: r.semilla)
+    assert serie == pool and [r.semilla for r in pool] == list(range(6))
+
+def test_lote_resumen_agregado():
+    rs = [ResultadoPartida(s, p, t, m, 0, 0, False)
+          for s, (p, t, m) in enumerate([(100, 50, "meteoritos"), (300, 80, "enemigos"), (200, 60, "enemigos")])]
+    res = resumir(rs)
+    assert res["partidas"] == 3 and res["puntaje_mediana"] == 200 and res["puntaje_max"] == 300
+    assert res["modo_max"] == {"meteoritos": 1, "enemigos": 2, "mixto": 0, "jefe": 0}
+    assert resumir([]) == {"partidas": 0}
+
+def test_lote_cli_emite_cada_partida_por_stdout(capsys, tmp_path):
+    base = ["--semillas", "3", "--max-ticks", "40", "--trabajadores", "1"]
+    assert lote_main(base) == 0
+    out, err = capsys.readouterr()
+    filas = sorted((json.loads(l) for l in out.splitlines()), key=lambda d: d["semilla"])
+    assert filas == [asdict(jugar_partida(s, "azar", 40)) for s in range(3)]
+    assert json.loads(err)["partidas"] == 3                # el resumen, aparte (stderr)
+    lote_main(base + ["--formato", "csv"])
+    out, _ = capsys.readouterr()
+    assert out.splitlines()[0].startswith("semilla,puntaje") and len(out.splitlines()) == 4
+    # Con --salida las partidas van al archivo y el resumen a stdout
+    lote_main(base + ["--salida", str(tmp_path / "p.jsonl")])
+    out, err = capsys.readouterr()
+    assert json.loads(out)["partidas"] == 3 and not err
+    assert len((tmp_path / "p.jsonl").read_text().splitlines()) == 3
+
+# -----------------------------
+# Partidas en lockstep (NumPy)
+# -----------------------------
+from nucleo import lockstep
+
+def test_lockstep_azar_vectorizado_igual_al_escalar():
+    np = pytest.importorskip("numpy")
+    semillas = np.array([0, 7, 42, 2**64 - 1], dtype=np.uint64)
+    s2, r = lockstep.azar_flujo_np(semillas, -3, np.array([3, 3, 3, 900]),
+                                   mascara=np.array([True, True, False, True]))
+    for k, s in enumerate(semillas.tolist()):
+        if k == 2:
+            assert s2[k] == s                     # fuera de la máscara no consume semilla
+        else:
+            assert (int(s2[k]), r[k]) == azar_flujo(s, -3, 900 if k == 3 else 3)
+
+def _mascara_elipse(w, h):
+    return empaquetar_filas([[((x + .5) / w - .5) ** 2 + ((y + .5) / h - .5) ** 2 <= .25
+                              for x in range(w)] for y in range(h)])
+
+MASCARAS_ELIPSE = {"jugador": _mascara_elipse(PLAYER_W, PLAYER_H), "meteoro": _mascara_circulo(50),
+                   "enemigo": _mascara_elipse(ENEMY_W, ENEMY_H), "bala_enemiga": _mascara_elipse(EBULLET_W, EBULLET_H)}
+
+@pytest.mark.parametrize("mascaras", [None, MASCARAS_ELIPSE], ids=["aabb", "mascaras"])
+def test_lockstep_cada_fila_igual_a_paso_escalar(mascaras):
+    np = pytest.importorskip("numpy")
+    def inicio(s):
+        e = inicializar_juego(s)    # umbrales bajos + gracia larga: recorre todos los modos
+        return e.con(ia=e.ia.con(mix_threshold=350, mixed_rounds_target=1), gracia_spawn=10**6)
+    estados = [inicio(s) for s in range(4)]
+    lote = lockstep.PartidasNP.desde_estados(estados, mascaras)
+    bits = np.random.default_rng(5).integers(0, 8, (1500, 4)) | 4
+    modos = set()
+    for fila in bits:
+        lote.paso(fila)
+        estados = [paso(e, Entrada.desde_bits(int(b)), mascaras) for e, b in zip(estados, fila)]
+        assert lote.estados() == estados
+        modos.update(e.modo for e in estados)
+    assert ModoJuego.ENEMIGOS in modos and ModoJuego.MIXTO in modos
+
+def test_lockstep_barrido_de_balas_rapidas_igual_al_escalar():
+    np = pytest.importorskip("numpy")
+    rng = random.Random(3)
+    base = replace(_estado_basico(), modo=ModoJuego.ENEMIGOS)
+    estados = [base.con(balas_enemigas=tuple(
+        EstadoBalaEnemiga(rng.randint(280, 460), rng.randint(430, 620), rng.randint(-45, 45), rng.choice((0, 0, 9, -30)))
+        for _ in range(3))) for _ in range(300)]
+    lote = lockstep.PartidasNP.desde_estados(estados)
+    lote.paso(NADA)
+    estados = [paso(e, NADA) for e in estados]
+    assert lote.estados() == estados
+    golpeadas = sum(e.jugador.corazones == 6 for e in estados)
+    assert 0 < golpeadas < len(estados)
+
+def test_lockstep_crece_capacidad_sin_perder_orden():
+    pytest.importorskip("numpy")
+    lote = lockstep.PartidasNP(2, capacidad=1)
+    e = inicializar_juego(1)
+    lote._escribir(0, e)
+    lote._escribir(1, e.con(balas=tuple(EstadoBala(10 * k, 300) for k in range(5))))
+    assert lote.estado(1).balas == tuple(EstadoBala(10 * k, 300) for k in range(5))
+    assert lote.estado(0) == e and lote.meteoros.capacidad >= 8
+
+# -----------------------------
+# Entorno reset/step (estilo Gym)
+# -----------------------------
+from nucleo.entorno import Entorno, VecEntorno, observar, OBS_TAM, N_ACCIONES
+
+def test_entorno_observacion_fija_y_recompensa_por_puntaje():
+    env = Entorno(semilla=4, max_ticks=50)
+    obs, info = env.reset()
+    assert len(obs) == OBS_TAM and info["puntaje"] == 0 and N_ACCIONES == 8
+    e = env.estado.con(enemigos=crear_enemigos(7, 1)[0], balas_enemigas=(EstadoBalaEnemiga(0, 0),) * 20)
+    assert len(observar(e)) == OBS_TAM            # sobrantes se recortan, faltantes son 0
+    total, fin = 0.0, None
+    for t in range(60):
+        obs, r, term, trunc, info = env.step(5)
+        total += r
+        if term or trunc:
+            fin = (t, trunc)
+            break
+    assert fin == (49, True) and total == info["puntaje"]
+
+def test_entorno_reset_con_semilla_es_reproducible():
+    a, b = Entorno(), Entorno()
+    assert a.reset(seed=7)[0] == b.reset(seed=7)[0]
+    assert [a.step(t % 8)[:3] for t in range(100)] == [b.step(t % 8)[:3] for t in range(100)]
+
+def test_vec_entorno_en_procesos_igual_que_en_serie():
+    from array import array
+    f32 = lambda filas: [list(array("f", f)) for f in filas]   # la memoria compartida guarda float32
+    acciones = [[(t + i) % 8 for i in range(3)] for t in range(40)]
+    serie = [Entorno(i * 1_000_003, max_ticks=1000) for i in range(3)]
+    esperado = [env.reset()[0] for env in serie]
+    with VecEntorno(3, max_ticks=1000, trabajadores=2) as venv:
+        obs = venv.reset()
+        assert [list(map(float, f)) for f in obs] == f32(esperado)
+        for fila in acciones:
+            obs, rec, term, trunc = venv.step(fila)
+            pasos = [env.step(a) for env, a in zip(serie, fila)]
+            assert list(rec) == [p[1] for p in pasos]
+        assert [list(map(float, f)) for f in obs] == f32(p[0] for p in pasos)
+        assert venv.puntajes() == [env.estado.puntaje for env in serie]
+
+# -----------------------------
+# Repeticiones (registro de entradas)
+# -----------------------------
+from nucleo.repeticion import (
+    Repeticion, codificar, decodificar, verificar, reproducir, huella_mascaras, corridas, ESC,
+    grabar, verificar_rapido,
+)
+from nucleo.mascaras import mascara_llena
+from nucleo.sim import entradas
+
+def _teclas(ticks, semilla=5):
+    fuente = entradas("zigzag", semilla)
+    return bytes(next(fuente).bits() | (ESC if t == 10 else 0) for t in range(ticks))
+
+def _grabar(ticks, semilla=5):
+    teclas = _teclas(ticks, semilla)
+    estado = inicializar_juego(semilla)
+    for t in teclas:
+        estado = paso(estado, Entrada.desde_bits(t))
+    return Repeticion(semilla, teclas, estado.puntaje)
+
+def test_repeticion_ida_y_vuelta_compacta():
+    rep = Repeticion(5, _teclas(36_000), 12_345)
+    datos = codificar(rep)
+    assert decodificar(datos) == rep
+    assert len(datos) < 4096                                  # 10 min de zigzag en pocos KB
+    assert corridas(bytes([1, 1, 5, 5, 5, 1])) == [(1, 2), (5, 3), (1, 1)]
+    dañado = bytearray(datos); dañado[30] ^= 1
+    with pytest.raises(ValueError):
+        decodificar(bytes(dañado))
+    with pytest.raises(ValueError):
+        decodificar(b"XXXX" + datos[4:])
+
+def test_repeticion_verifica_puntaje_y_detecta_trampa():
+    rep = _grabar(900)
+    ok, final = verificar(rep)
+    assert ok and final.puntaje == rep.puntaje > 0
+    assert list(reproducir(rep))[-1] == final
+    assert not verificar(Repeticion(rep.semilla, rep.teclas, rep.puntaje + 10))[0]
+
+def test_repeticion_exige_las_mismas_mascaras():
+    mascaras = {"jugador": mascara_llena(PLAYER_W, PLAYER_H)}
+    assert huella_mascaras(None) == 0 and huella_mascaras(mascaras) != 0
+    rep = _grabar(50)
+    with pytest.raises(ValueError):
+        verificar(rep, mascaras)
+    assert verificar(Repeticion(rep.semilla, rep.teclas, rep.puntaje, huella_mascaras(mascaras)), mascaras)[0]
+
+def test_repeticion_con_fotos_verifica_por_tramos():
+    pytest.importorskip("numpy")
+    rep, final = grabar(5, _teclas(1000), cada_foto=150)
+    assert len(rep.fotos) == 6 and rep.huella_final != 0           # el último tramo: 100 ticks
+    assert decodificar(codificar(rep)) == rep
+    assert verificar_rapido(rep) == (True, final) == verificar(rep)
+    # Fotos cambiadas de lugar o una tecla tocada a mitad de un tramo: no verifica
+    assert not verificar_rapido(replace(rep, fotos=(rep.fotos[1], rep.fotos[0]) + rep.fotos[2:]))[0]
+    trucha = replace(rep, teclas=rep.teclas[:460] + bytes([1]) * 30 + rep.teclas[490:])
+    assert not verificar_rapido(trucha)[0] and not verificar(trucha)[0]
+    with pytest.raises(ValueError):
+        codificar(replace(rep, fotos=rep.fotos[:-1]))
+    # Sin fotos verificar_rapido es verificar
+    sin_fotos = replace(rep, cada_foto=0, fotos=())
+    assert decodificar(codificar(sin_fotos)) == sin_fotos and verificar_rapido(sin_fotos) == (True, final)
+
+def test_repeticion_con_mascaras_tambien_va_por_tramos(monkeypatch):
+    pytest.importorskip("numpy")
+    rep, final = grabar(5, _teclas(1000), cada_foto=150, mascaras=MASCARAS_ELIPSE)
+    assert rep.huella == huella_mascaras(MASCARAS_ELIPSE) and verificar(rep, MASCARAS_ELIPSE) == (True, final)
+    import nucleo.repeticion as repeticion
+    monkeypatch.setattr(repeticion, "verificar", None)      # que no pueda caer al tick a tick
+    assert verificar_rapido(rep, MASCARAS_ELIPSE) == (True, final)
+
+# -----------------------------
+# Codec de instantáneas
+# -----------------------------
+import pickle
+from nucleo import codec
+from nucleo.enums_eventos import Evento
+
+def test_codec_ida_y_vuelta_con_jefe_y_eventos():
+    e = replace(
+        _estado_basico(),
+        boss=EstadoBoss(x=100, y=-5, vida=20, vivo=True, entrando=False, fase="burst"),
+        explosiones=(EstadoExplosion(3, -40, "enemy", 9),),
+        balas_enemigas=(EstadoBalaEnemiga(1, 2, 5, -3),),
+        eventos=(Evento(EventoTipo.JEFE_MUERTO, ("boss", -70_000, 3)),),
+        ia=replace(_ia_basica(), dificultad=1.0 / 3, velocidad_reaccion=2.5),
+        modo=ModoJuego.JEFE, puntaje=123_456_789, semilla_azar=2**32 - 1,
+    )
+    datos = codec.codificar(e)
+    assert codec.decodificar(datos) == e
+    assert len(datos) < len(pickle.dumps(e)) // 3
+
+def test_codec_delta_sobre_una_partida():
+    estado, fuente = inicializar_juego(3), entradas("azar", 3)
+    completo = delta = 0
+    for _ in range(600):
+        nuevo = paso(estado, next(fuente))
+        d = codec.codificar(nuevo, estado)
+        assert codec.decodificar(d, estado) == nuevo
+        completo += len(codec.codificar(nuevo))
+        delta += len(d)
+        estado = nuevo
+    assert delta < completo
+    # Sin cambios, un delta es la cabecera y una máscara vacía
+    assert len(codec.codificar(estado, estado)) == 5
+
+def test_codec_rechaza_datos_invalidos():
+    datos = codec.codificar(inicializar_juego(1))
+    for malo in (b"XX" + datos[2:], datos[:2] + bytes([99]) + datos[3:], datos[:-3], datos + b"\0"):
+        with pytest.raises(ValueError):
+            codec.decodificar(malo)
+    with pytest.raises(ValueError):
+        codec.decodificar(codec.codificar(inicializar_juego(1), inicializar_juego(2)))
+
+# -----------------------------
+# Cooperativo + rollback
+# -----------------------------
+import random
+from nucleo.paso import hay_naves_vivas
+from nucleo.rollback import SesionRollback
+
+def test_cooperativo_dos_naves_independientes():
+    e = inicializar_juego(4, cooperativo=True)
+    assert inicializar_juego(4).jugador2 is None and e.jugador2.x > e.jugador.x
+    e2 = paso(e, Entrada(izquierda=True), None, Entrada(derecha=True, disparo=True))
+    assert (e2.jugador.x, e2.jugador2.x) == (e.jugador.x - 5, e.jugador2.x + 5)
+    assert len(e2.balas) == 1 and e2.fire_cooldown == 0 and e2.fire_cooldown2 > 0
+    # Una bala enemiga sobre la nave 2 solo la daña a ella; sin la 1 la partida sigue
+    j2 = e2.jugador2.con(invul_frames=0)
+    e3 = replace(e2, gracia_spawn=0, modo=ModoJuego.ENEMIGOS, jugador2=j2,
+                 jugador=e2.jugador.con(corazones=0, vivo=False),
+                 balas_enemigas=(EstadoBalaEnemiga(j2.x + 10, j2.y, velocidad_y=0),))
+    e4 = paso(e3)
+    assert e4.jugador2.corazones == 6 and not e4.balas_enemigas and hay_naves_vivas(e4)
+    assert codec.decodificar(codec.codificar(e4)) == e4
+
+def _partida_en_red(n, demora, perdida, retardo=0):
+    ini = inicializar_juego(7, cooperativo=True)
+    sesiones = (SesionRollback(ini, 0, retardo=retardo), SesionRollback(ini, 1, retardo=retardo))
+    fuentes, jugadas, cola, azar = (entradas("azar", 1), entradas("zigzag", 2)), ([], []), [], random.Random(3)
+    for frame in range(n + 60):
+        for k, s in enumerate(sesiones):
+            for m in [m for m in cola if m[0] <= frame and m[1] == k]:
+                cola.remove(m)
+                s.recibir(m[2])
+            if s.tick < n:
+                ent = next(fuentes[k])
+                if s.avanzar(ent):
+                    jugadas[k].append(ent)
+            if frame >= n or azar.random() >= perdida:   # al final ya no se pierde nada
+                cola.append((frame + demora + azar.randint(-2, 2), 1 - k, s.mensaje()))
+    offline = ini
+    # Con retardo, la entrada dada en el tick t se juega en t + retardo
+    for a, b in zip(([Entrada()] * retardo + jugadas[0])[:n], [Entrada()] * retardo + jugadas[1]):
+        offline = paso(offline, a, None, b)
+    return sesiones, offline
+
+def test_rollback_converge_con_latencia_y_perdida():
+    for demora, retardo in ((3, 0), (6, 2)):   # ~100 y ~200 ms de ida y vuelta
+        sesiones, offline = _partida_en_red(400, demora, 0.1, retardo)
+        for s in sesiones:
+            assert s.estado_confirmado() == (400, offline)
+            assert s.esperas == 0 and len(s._estados) <= s.ventana + 1
+        assert sum(s.rollbacks for s in sesiones) > 0
+
+def test_rollback_ventana_y_mensajes_invalidos():
+    s = SesionRollback(inicializar_juego(1, cooperativo=True), 0, ventana=5)
+    assert all(s.avanzar(Entrada(derecha=True)) for _ in range(5))
+    assert not s.avanzar(Entrada()) and s.tick == 5 and s.esperas == 1
+    with pytest.raises(ValueError):
+        s.recibir(b"XX" + s.mensaje()[2:])
+    with pytest.raises(ValueError):
+        SesionRollback(inicializar_juego(1), 0)
+
+# -----------------------------
+# Huella incremental (Zobrist)
+# -----------------------------
+from nucleo.zobrist import HuellaIncremental, huella_estado
+
+def test_huella_incremental_igual_a_la_completa():
+    e, fuente, h = inicializar_juego(8), entradas("azar", 8), HuellaIncremental()
+    vistas = set()
+    for t in range(400):
+        e = paso(e, next(fuente))
+        vistas.add(h(e))
+        if t % 50 == 0:
+            assert h(e) == huella_estado(e) < 2**64
+    assert len(vistas) == 400
+    # No depende del orden dentro de una secuencia, sí de cada campo
+    assert huella_estado(e.con(puntaje=e.puntaje + 1)) != huella_estado(e)
+    assert huella_estado(e.con(meteoros=e.meteoros[::-1])) == huella_estado(e)
+    assert huella_estado(e.con(meteoros=e.meteoros[1:])) != huella_estado(e)
+
+def test_huella_incremental_con_secuencias_que_cambian_al_azar():
+    # Bajas en cualquier lugar, altas, reemplazos, repetidas y vaciar: siempre igual a la completa
+    rng = random.Random(4)
+    pool = [EstadoBalaEnemiga(x=i, y=rng.randint(0, 600)) for i in range(300)]
+    base, h = inicializar_juego(1), HuellaIncremental()
+    balas = ()
+    for _ in range(400):
+        balas = list(balas)
+        for _ in range(rng.randint(0, 3)):
+            op = rng.random()
+            if op < 0.3 and balas:
+                del balas[rng.randrange(len(balas))]
+            elif op < 0.4 and balas:
+                del balas[:rng.randint(1, 20)]
+            elif op < 0.6 and balas:
+                balas[rng.randrange(len(balas))] = rng.choice(pool)
+            elif op < 0.62:
+                balas = []
+            else:
+                balas.insert(rng.randint(0, len(balas)), rng.choice(pool))
+        balas = tuple(balas)
+        e = base.con(balas_enemigas=balas)
+        assert h(e) == huella_estado(e)
+
+def test_huella_traza_dorada():
+    # Si esto cambia, cambió la jugabilidad (a propósito o no): revisar antes de actualizar
+    e, fuente, h = inicializar_juego(42), entradas("azar", 42), HuellaIncremental()
+    for _ in range(2000):
+        e = paso(e, next(fuente))
+        huella = h(e)
+    assert (e.puntaje, e.modo) == (400, ModoJuego.ENEMIGOS)
+    assert huella == 0xC444048F50CF6149
+
+def test_huella_detecta_desincronizacion():
+    # Rollback: dos extremos que no arrancan igual se delatan con la huella
+    a = SesionRollback(inicializar_juego(1, cooperativo=True), 0)
+    b = SesionRollback(inicializar_juego(2, cooperativo=True), 1)
+    a.recibir(b.mensaje())
+    assert a.desincronizado == 0
+    # Repetición: mismo puntaje pero otro estado final → no verifica
+    rep = _grabar(300)
+    final = verificar(rep)[1]
+    assert verificar(replace(rep, huella_final=huella_estado(final)))[0]
+    assert not verificar(replace(rep, huella_final=huella_estado(final) ^ 1))[0]
+    assert decodificar(codificar(replace(rep, huella_final=7))).huella_final == 7
+
+# -----------------------------
+# Paso fijo + interpolación
+# -----------------------------
+from nucleo.tiempo import Acumulador, acumular, interpolar
+
+@pytest.mark.parametrize("fps", [30, 60, 144, 240])
+def test_acumulador_mismos_ticks_a_cualquier_fps(fps):
+    acum, total = Acumulador(60), 0
+    for _ in range(fps * 2):                 # 2 segundos de frames
+        acum, n = acumular(acum, 1 / fps)
+        assert n <= acum.max_pasos and 0 <= acum.alfa <= 1
+        total += n
+    assert abs(total - 120) <= 1
+
+def test_acumulador_no_entra_en_espiral():
+    acum, n = acumular(Acumulador(60, max_pasos=6), 2.0)   # un frame trabado 2 s
+    assert (n, acum.resto) == (6, 0.0)
+    acum, n = acumular(acum, 1 / 120)
+    assert n == 0 and acum.alfa == pytest.approx(0.5)
+
+def test_interpolar_entre_dos_ticks():
+    e, fuente = inicializar_juego(5), entradas("azar", 5)
+    for _ in range(300):
+        e = paso(e, next(fuente))
+    a, b = e, paso(e, Entrada(derecha=True, disparo=True))
+    assert interpolar(a, b, 1.0) is b and interpolar(None, b, 0.3) is b
+    cero = interpolar(a, b, 0.0)
+    assert cero.jugador.x == a.jugador.x and cero.puntaje == b.puntaje
+    previos = {(m.x, m.y) for m in a.meteoros}
+    assert sum((m.x, m.y) in previos for m in cero.meteoros) >= len(b.meteoros) - 1
+    medio = interpolar(a, b, 0.5)
+    assert min(a.jugador.x, b.jugador.x) <= medio.jugador.x <= max(a.jugador.x, b.jugador.x)
+
+# -----------------------------
+# Historial (viaje en el tiempo)
+# -----------------------------
+from nucleo.historial import Historial
+
+def _historial(n, semilla=6, **kw):
+    h, e, fuente, estados = Historial(**kw), inicializar_juego(semilla), entradas("azar", semilla), []
+    h.guardar(0, e); estados.append(e)
+    for t in range(1, n + 1):
+        e = paso(e, next(fuente))
+        h.guardar(t, e); estados.append(e)
+    return h, estados
+
+def test_historial_reconstruye_cualquier_tick():
+    h, estados = _historial(400, cada=32)
+    # Adelante de a uno (usa el cursor), saltos hacia atrás y bordes de bloque
+    for t in list(range(100, 140)) + [399, 5, 0, 31, 32, 33, 400, 250]:
+        assert huella_estado(h.estado(t)) == huella_estado(estados[t])
+    with pytest.raises(KeyError):
+        h.estado(401)
+    with pytest.raises(ValueError):
+        h.guardar(7, estados[7])
+
+def test_historial_memoria_plana():
+    h, estados = _historial(3000, cada=50, presupuesto=40_000)
+    assert h.bytes <= 40_000 and h.ultimo == 3000
+    assert h.primero > 0 and h.primero % 50 == 0
+    with pytest.raises(KeyError):
+        h.estado(0)
+    assert huella_estado(h.estado(h.primero)) == huella_estado(estados[h.primero])
+
+def test_historial_retomar_desde_el_pasado():
+    h, estados = _historial(300, cada=40)
+    antes = h.bytes
+    h.recortar(150)
+    assert h.ultimo == 150 and h.bytes < antes
+    # Se sigue jugando desde ahí con otra entrada: la historia nueva es la que vale
+    e = h.estado(150)
+    for t in range(151, 260):
+        e = paso(e, Entrada(izquierda=True, disparo=t % 2 == 0))
+        h.guardar(t, e)
+    assert huella_estado(h.estado(259)) == huella_estado(e)
+    assert huella_estado(h.estado(120)) == huella_estado(estados[120])
+
+# -----------------------------
+# Azar por flujos
+# -----------------------------
+from nucleo.rng import flujo_de, sacar, saltar, lote, lote_rangos, saltar_semilla
+
+def test_flujo_lote_y_saltos_coinciden_con_tiradas_sueltas():
+    s = flujo_de(42, "meteoros")
+    uno_a_uno, t = [], s
+    for _ in range(50):
+        t, v = azar_flujo(t, -140, -100)
+        uno_a_uno.append(v)
+    assert lote(s, 50, -140, -100) == (t, tuple(uno_a_uno)) and saltar(s, 50) == t
+    assert all(-140 <= v <= -100 for v in uno_a_uno) and len(set(uno_a_uno)) > 20
+    t, (a, b) = lote_rangos(saltar(s, 7), ((0, 9), (5, 5)))
+    assert a == azar_flujo(saltar(s, 7), 0, 9)[1] and b == 5 and t == saltar(s, 9)
+    assert sacar(s)[0] == saltar(s, 1)
+    # Nombres distintos → flujos distintos; el LCG viejo también salta en O(log n)
+    assert len({flujo_de(42, n) for n in ("meteoros", "enemigos", "disparos", "jefe")} | {flujo_de(43, "meteoros")}) == 5
+    x = 12345
+    for _ in range(1000):
+        x, _ = siguiente_semilla(x)
+    assert saltar_semilla(12345, 1000) == x and saltar_semilla(7, 0) == 7
+
+def test_flujos_independientes_entre_consumidores():
+    # Tirar de más en el flujo de enemigos NO cambia los meteoros (y viceversa)
+    a = inicializar_juego(3)
+    b = a.con(azar_enemigos=saltar(a.azar_enemigos, 1))
+    for _ in range(3000):
+        a, b = paso(a, Entrada(disparo=True)), paso(b, Entrada(disparo=True))
+        if a.modo != ModoJuego.METEORITOS:
+            break
+    assert a.modo == b.modo == ModoJuego.ENEMIGOS
+    assert a.semilla_azar == b.semilla_azar and a.azar_disparos == b.azar_disparos
+    assert [(e.patrulla_min_x, e.direccion) for e in a.enemigos] != [(e.patrulla_min_x, e.direccion) for e in b.enemigos]
+
+def test_reponer_meteoros_en_lote_igual_que_de_a_uno():
+    e = inicializar_juego(4).con(meteoros=())
+    nuevo = reponer_meteoros(e)
+    s, esperados = e.semilla_azar, []
+    for _ in range(8):
+        s, x = azar_flujo(s, 0, ANCHO - 40)
+        s, y = azar_flujo(s, -140, -100)
+        s, vx = azar_flujo(s, -3, 3)
+        s, vy = azar_flujo(s, 1, 4)
+        esperados.append(EstadoMeteoro(x, y, vx, vy))
+    assert nuevo.meteoros == tuple(esperados) and nuevo.semilla_azar == s
+
+
+# -----------------------------
+# Vecinos por cubetas (enemigos)
+# -----------------------------
+from nucleo.enemigos import ENEMIGOS_DIRECTOS, _lider_directo, _lider_cubetas, _empuje_directo, _empuje_cubetas
+
+def _enjambre(rng, n, apretado=False):
+    ancho = 200 if apretado else ANCHO - ENEMY_W
+    return tuple(EstadoEnemigo(x=rng.randint(0, ancho), y=rng.randint(-ENEMY_H, 300 if not apretado else 120),
+                               velocidad_x=2, direccion=rng.choice((1, -1)),
+                               vivo=rng.random() > 0.1, entrando=rng.random() < 0.2,
+                               explotando=rng.random() < 0.1)
+                 for _ in range(n))
+
+@pytest.mark.parametrize("n", [0, 1, 13, 60, 300])
+def test_cubetas_igual_que_barrido_directo(n):
+    rng = random.Random(n)
+    for ronda in range(40):
+        enemigos = _enjambre(rng, n, apretado=ronda % 2 == 0)
+        jugador = EstadoJugador(x=rng.randint(0, ANCHO - 60), y=500, corazones=7, vivo=True)
+        assert _lider_cubetas(enemigos, jugador) == _lider_directo(enemigos, jugador)
+        assert _empuje_cubetas(enemigos) == _empuje_directo(enemigos)
+
+def test_lider_empate_gana_el_menor_indice():
+    # Dos enemigos a la misma distancia del jugador (uno a cada lado) + relleno lejos
+    jugador = EstadoJugador(x=300, y=500, corazones=7, vivo=True)
+    cerca = (EstadoEnemigo(x=330, y=90, velocidad_x=2, direccion=1),
+             EstadoEnemigo(x=270, y=90, velocidad_x=2, direccion=1))
+    relleno = tuple(EstadoEnemigo(x=700, y=90, velocidad_x=2, direccion=1) for _ in range(ENEMIGOS_DIRECTOS))
+    for enemigos in (relleno + cerca, relleno + cerca[::-1]):
+        assert _lider_cubetas(enemigos, jugador) == _lider_directo(enemigos, jugador) == ENEMIGOS_DIRECTOS
+
+def test_enjambre_grande_actualizar_igual_que_directo(monkeypatch):
+    import nucleo.enemigos as mod
+    rng = random.Random(7)
+    enemigos = _enjambre(rng, 200, apretado=True)
+    jugador = EstadoJugador(x=100, y=500, corazones=7, vivo=True)
+    rapido = actualizar_enemigos_ia(enemigos, jugador, _ia_basica())
+    monkeypatch.setattr(mod, "ENEMIGOS_DIRECTOS", 10_000)
+    assert actualizar_enemigos_ia(enemigos, jugador, _ia_basica()) == rapido
+
+
+# -----------------------------
+# Comportamientos por tabla
+# -----------------------------
+from nucleo.comportamientos import (
+    TABLAS, TRAYECTORIAS, COMPORTAMIENTOS, OLEADAS, ORDEN_OLEADAS, FIN, ALINEADO, LIBRE, compilar,
+)
+from nucleo.enemigos import crear_oleada
+
+def test_tablas_compiladas_y_errores_de_datos():
+    assert all(r[0] == (0, 0) for r in TRAYECTORIAS.values())
+    assert TRAYECTORIAS["vaiven"][-1] == (0, 0)          # el vaivén se encadena consigo mismo
+    for k in range(1, len(TABLAS.nombres)):
+        assert len(TABLAS.dx[k]) == len(TABLAS.dy[k]) == TABLAS.largo[k] + 1
+    assert set(ORDEN_OLEADAS) - {"clasica"} <= set(OLEADAS)
+    with pytest.raises(ValueError, match="trayectoria"):
+        compilar(TRAYECTORIAS, {"x": {"entra": ("no_existe", {FIN: LIBRE})}})
+    with pytest.raises(ValueError, match="estado"):
+        compilar(TRAYECTORIAS, {"x": {"entra": ("bajada", {FIN: "otro"})}})
+    with pytest.raises(ValueError, match="fin"):
+        compilar(TRAYECTORIAS, {"x": {"entra": ("bajada", {ALINEADO: LIBRE})}})
+
+@pytest.mark.parametrize("cant", [5, 7, 12])
+@pytest.mark.parametrize("nombre", sorted(OLEADAS))
+def test_oleada_por_tabla_en_pantalla_y_sin_azar(nombre, cant):
+    enemigos, s = crear_oleada(nombre, cant, 99)       # 7 y 12: los bucles de la punta tocan el borde
+    assert s == 99 and all(e.tramo and e.entrando for e in enemigos)
+    lejos = EstadoJugador(x=-500, y=500, corazones=7, vivo=True)     # que nadie “pique”
+    for _ in range(600):
+        enemigos = actualizar_enemigos_ia(enemigos, lejos, _ia_basica())
+        assert all(0 <= e.x <= ANCHO - ENEMY_W and e.y <= 200 for e in enemigos)
+    assert not any(e.entrando for e in enemigos)
+    if all(COMPORTAMIENTOS[c]["entra"][1][FIN] == LIBRE for c in OLEADAS[nombre].comportamientos):
+        # Terminó la tabla: IA clásica, patrullando alrededor de donde quedó
+        assert all(e.tramo == 0 and e.patrulla_min_x < e.patrulla_max_x for e in enemigos)
+
+def test_primer_ciclo_solo_oleadas_clasicas_y_despues_rotan():
+    base = replace(_estado_basico(), azar_enemigos=77)
+    for modo, campo in ((ModoJuego.ENEMIGOS, "oleada"), (ModoJuego.MIXTO, "mixed_waves_spawned")):
+        for n in range(1, len(ORDEN_OLEADAS) + 1):
+            ia = base.ia.con(**{campo: n}, wave_cooldown=0, mix_threshold=10**6, mixed_rounds_target=99)
+            e = logica_juego(base.con(modo=modo, ia=ia))
+            assert (e.enemigos, e.azar_enemigos) == crear_enemigos(5, 77)      # como antes de las tablas
+            e = logica_juego(base.con(modo=modo, ia=ia.con(cycles=1)))
+            assert e.enemigos == crear_oleada(ORDEN_OLEADAS[n % len(ORDEN_OLEADAS)], 5, 77)[0]
+
+def test_picada_al_quedar_alineado_y_lockstep_igual():
+    e = crear_oleada("picada", 1, 0)[0][0]
+    jugador = EstadoJugador(x=e.x, y=500, corazones=7, vivo=True)
+    for _ in range(TABLAS.largo[e.tramo]):
+        (e,) = actualizar_enemigos_ia((e,), jugador, _ia_basica())
+    acecha = e.tramo
+    assert TABLAS.nombres[acecha] == "picada.acecha" and not e.entrando
+    (e,) = actualizar_enemigos_ia((e,), jugador, _ia_basica())       # debajo: pica enseguida
+    assert TABLAS.nombres[e.tramo] == "picada.cae" and (e.ancla_x, e.ancla_y) == (e.x, e.y)
+
+    np = pytest.importorskip("numpy")
+    estados = []
+    for k, nombre in enumerate(ORDEN_OLEADAS):
+        base = inicializar_juego(k).con(gracia_spawn=10**6)
+        enemigos, _ = crear_oleada(nombre, 12, 1)        # 12: con bucles contra el borde
+        estados.append(base.con(modo=ModoJuego.ENEMIGOS, meteoros=(), enemigos=enemigos, puntaje=300,
+                                ia=base.ia.con(oleada=1, mix_threshold=10**6)))
+    lote = lockstep.PartidasNP.desde_estados(estados)
+    for fila in np.random.default_rng(3).integers(0, 8, (500, len(estados))):
+        lote.paso(fila)
+        estados = [paso(e, Entrada.desde_bits(int(b))) for e, b in zip(estados, fila)]
+        assert lote.estados() == estados
+
+
+# -----------------------------
+# Patrones del jefe (cortina)
+# -----------------------------
+from nucleo import patrones
+from nucleo.patrones import Cortina, Emisor, PATRONES, emitir
+from nucleo.paso import NADA
+
+def _descargas(ia, ticks):
+    boss, c, lejos = crear_jefe().con(entrando=False, y=20), Cortina(), EstadoJugador(300, 500, 7, True)
+    for _ in range(ticks):
+        boss, c = emitir(boss, c.avanzar(), ia, lejos)
+    return boss, c
+
+def test_emision_determinista_y_cadencia_por_dificultad():
+    ia = _ia_basica()
+    (b1, c1), (b2, c2) = _descargas(ia, 200), _descargas(ia, 200)
+    assert b1 == b2 and c1 == c2 and len(c1) > 0
+    assert b1.patron == 0 and b1.patron_t == 200
+    _, dificil = _descargas(ia.con(dificultad=12.0), 200)
+    assert len(dificil) > len(c1)                        # más dificultad → menos ticks entre descargas
+    assert Emisor(5, cadencia=10, por_dificultad=1.0, cadencia_min=4).cada(100) == 4
+    # Al terminar la fase pasa a la siguiente (en ronda)
+    b, _ = _descargas(ia, PATRONES[0][2])
+    assert (b.patron, b.patron_t) == (1, 0)
+    # Entrando (o sin jefe) no dispara
+    assert emitir(crear_jefe(), Cortina(), ia, EstadoJugador(0, 0, 7, True))[1] == Cortina()
+
+def test_cortina_codec_completo_y_delta_con_huella():
+    e = replace(_estado_basico(), modo=ModoJuego.JEFE, boss=crear_jefe().con(entrando=False),
+                jugador=EstadoJugador(-1000, 500, 7, True), cortina=Cortina())
+    previo, marcas = None, set()
+    for _ in range(150):
+        previo, e = e, paso(e, NADA)
+        for base in (None, previo):
+            d = codec.codificar(e, base)
+            assert codec.decodificar(d, base) == e
+            assert huella_estado(codec.decodificar(d, base)) == huella_estado(e)
+        marcas.add(len(e.cortina) - len(previo.cortina))
+    assert len(e.cortina) > 20 and len(marcas) > 1        # hubo ticks con y sin balas nuevas
+    # Delta de un tick: solo lo nuevo (nada de las columnas enteras)
+    assert len(codec.codificar(e, previo)) < len(codec.codificar(e)) // 4
+    assert huella_estado(e) != huella_estado(e.con(cortina=e.cortina.sin([0])))
+
+def _cortina_al_azar(semilla, lotes=40, n=50):
+    rng = random.Random(semilla)
+    c = Cortina()
+    for _ in range(lotes):
+        c = c.avanzar().agregar([rng.uniform(0, ANCHO) for _ in range(n)], [rng.uniform(0, ALTO) for _ in range(n)],
+                                [math.cos(a) for a in (rng.uniform(0, 6.3) for _ in range(n))],
+                                [math.sin(a) for a in (rng.uniform(0, 6.3) for _ in range(n))],
+                                rng.randrange(len(patrones.CURVAS)))
+    return c
+
+def test_cortina_dos_mil_balas_limpieza_y_choques():
+    c = _cortina_al_azar(5)
+    assert len(c) > 1800                                  # algunas ya salieron
+    sig = c.avanzar()
+    xs, ys = c.avanzar().posiciones()                     # sin la caché: posiciones recalculadas
+    assert sig.posiciones() == (xs, ys) and len(sig) <= len(c)
+    assert all(-patrones.MARGEN <= x <= ANCHO + patrones.MARGEN for x in xs)
+    # Mismo resultado que calcular bala por bala
+    rect = (300, 300, PLAYER_W, PLAYER_H)
+    fuerza = [i for i, (x, y) in enumerate(zip(xs, ys))
+              if _rects_collide(x - patrones.RADIO, y - patrones.RADIO, 2 * patrones.RADIO, 2 * patrones.RADIO, *rect)]
+    assert sig.tocadas(rect) == fuerza and fuerza
+    # En resolver_colisiones: las que tocan se van y la nave pierde UN corazón
+    e = replace(_estado_basico(), modo=ModoJuego.JEFE, jugador=EstadoJugador(300, 300, 7, True), cortina=sig)
+    e2 = resolver_colisiones(e)
+    assert len(e2.cortina) == len(sig) - len(fuerza) and e2.jugador.corazones == 6
+    assert not e2.cortina.tocadas(rect)
+
+def _recorrido(c):
+    """Todo lo observable de una cortina a lo largo de unos ticks (posiciones, choques, sin, atrasada)."""
+    salida = []
+    for k in range(60):
+        c = c.avanzar()
+        toca = c.tocadas((200 + 3 * k, 250, PLAYER_W, PLAYER_H))
+        salida.append((c.posiciones(), c.atrasada(0.3).posiciones(), toca))
+        c = c.sin(toca[::2] + [0])
+        salida.append((c.posiciones(), c.columnas()))
+    return salida, c
+
+@pytest.mark.skipif(patrones.np is None, reason="sin NumPy")
+def test_cortina_numpy_igual_bit_a_bit_al_camino_escalar(monkeypatch):
+    con, c_con = _recorrido(_cortina_al_azar(8))
+    monkeypatch.setattr(patrones, "np", None)
+    sin_np, c_sin = _recorrido(_cortina_al_azar(8))
+    assert con == sin_np and c_con == c_sin               # floats idénticos, no “parecidos”
+    assert len(c_con) >= patrones.UMBRAL_NP and isinstance(c_sin.posiciones()[0], list)
+
+def test_jefe_en_paso_dispara_solo_con_la_cortina():
+    e = replace(_estado_basico(), modo=ModoJuego.JEFE, boss=crear_jefe().con(entrando=False),
+                jugador=EstadoJugador(-1000, 500, 7, True), cortina=Cortina(), balas_enemigas=())
+    for _ in range(300):
+        e = paso(e, NADA)
+        assert e.balas_enemigas == ()                     # nada de disparo_jefe: solo patrones
+    assert len(e.cortina) > 20
+
+
+# -----------------------------
+# Jefe por partes (BVH)
+# -----------------------------
+from nucleo import partes
+from nucleo.partes import ARMAZON, BVH, NUCLEO_IDX, Parte, construir_bvh, golpear, parte_tocada
+
+def test_bvh_igual_a_fuerza_bruta_y_datos_validados():
+    rng = random.Random(11)
+    for _ in range(2000):
+        vidas = [rng.choice((0, 1, 50)) for _ in ARMAZON]
+        x, y = rng.randint(-30, BOSS_W + 10), rng.randint(-30, BOSS_H + 10)
+        w, h = rng.randint(1, 30), rng.randint(1, 30)
+        fuerza = next((k for k, p in enumerate(ARMAZON) if vidas[k] > 0 and
+                       _rects_collide(x, y, w, h, p.x, p.y, p.w, p.h)), -1)
+        assert parte_tocada(vidas, x, y, w, h) == fuerza
+    # La raíz envuelve todo y cada hoja tiene a lo sumo HOJA partes
+    assert sorted(h[0] for n in BVH for h in n[6]) == list(range(len(ARMAZON)))
+    assert all(len(n[6]) <= partes.HOJA for n in BVH)
+    with pytest.raises(ValueError, match="núcleo"):
+        construir_bvh(ARMAZON[:NUCLEO_IDX])
+    with pytest.raises(ValueError, match="caja del jefe"):
+        construir_bvh(ARMAZON + (Parte("afuera", partes.PLACA, BOSS_W - 5, 0, 10, 10, 10),))
+
+def test_balas_contra_partes_placa_nucleo_y_muerte():
+    boss = crear_jefe().con(x=100, y=20, entrando=False)
+    abajo, nucleo = ARMAZON[0], ARMAZON[NUCLEO_IDX]
+    cx = boss.x + nucleo.x + nucleo.w // 2 - BULLET_W // 2
+    # Fuera de la caja de afuera: el mismo jefe (ni se mira el árbol)
+    assert golpear(boss, [(0, 400, BULLET_W, BULLET_H)]) == (boss, [], [])
+    # Bala que toca placa y núcleo a la vez: la placa tapa hasta que se rompe
+    debajo = boss.y + abajo.y - 10
+    balas = tuple(EstadoBala(cx, debajo) for _ in range(abajo.vida // 10 + 2))
+    e = replace(_estado_basico(), modo=ModoJuego.JEFE, boss=boss, balas=balas)
+    e2 = resolver_colisiones(e)
+    assert e2.boss.partes[0] == 0 and e2.boss.partes[NUCLEO_IDX] == nucleo.vida - 20
+    assert e2.boss.vida == nucleo.vida - 20 and e2.balas == ()
+    assert e2.puntaje == e.puntaje + abajo.puntos and len(e2.explosiones) == 1
+    # Núcleo a cero: el jefe muere (una vez) aunque las torretas sigan enteras
+    casi = boss.con(partes=(0,) * NUCLEO_IDX + (10,), vida=10)
+    e3 = resolver_colisiones(replace(e, boss=casi, balas=balas[:3]))
+    assert not e3.boss.vivo and e3.boss.vida == 0 and len(e3.balas) == 2
+    assert [ev.tipo for ev in e3.eventos].count(EventoTipo.JEFE_MUERTO) == 1
+
+def test_mascara_del_jefe_cuenta_con_partes():
+    # La caja del núcleo acepta la bala, pero si la silueta está vacía ahí, la bala pasa de largo
+    boss = crear_jefe().con(x=100, y=20, entrando=False)
+    nucleo = ARMAZON[NUCLEO_IDX]
+    bala = EstadoBala(boss.x + nucleo.x + 2, boss.y + nucleo.y + 2)
+    e = replace(_estado_basico(), modo=ModoJuego.JEFE, boss=boss, balas=(bala,))
+    hueca = empaquetar_filas([[False] * BOSS_W for _ in range(BOSS_H)])
+    assert resolver_colisiones(e, mascaras={"jefe": hueca}).boss == boss
+    e2 = resolver_colisiones(e, mascaras={"jefe": mascara_llena(BOSS_W, BOSS_H)})
+    assert e2.boss.partes[NUCLEO_IDX] == nucleo.vida - 10 and e2.balas == ()
+
+def test_torreta_rota_no_dispara_y_codec_de_partes():
+    ia = _ia_basica()
+    boss = crear_jefe().con(entrando=False, fase="burst", cooldown=0)
+    assert len(disparo_jefe(boss, ia)[1]) == 2
+    torretas = [k for k, p in enumerate(ARMAZON) if p.tipo == partes.TORRETA]
+    sin_izq = boss.con(partes=tuple(0 if k == torretas[0] else v for k, v in enumerate(boss.partes)))
+    (bala,) = disparo_jefe(sin_izq, ia)[1]
+    assert bala.x > boss.x + BOSS_W // 2
+    # Los emisores que salen de una torreta rota se callan (anillo: 1 central + 2 en torretas)
+    anillo = sin_izq.con(patron=2, patron_t=0)
+    jug = EstadoJugador(300, 500, 7, True)
+    assert len(emitir(anillo, Cortina(), ia, jug)[1]) < len(emitir(boss.con(patron=2), Cortina(), ia, jug)[1])
+    # Codec (completo y delta) y huella con la vida de cada parte
+    e = replace(_estado_basico(), modo=ModoJuego.JEFE, boss=boss)
+    e2 = e.con(boss=sin_izq)
+    for base in (None, e):
+        assert codec.decodificar(codec.codificar(e2, base), base) == e2
+    assert huella_estado(e2) != huella_estado(e)